@@ -1,3 +1,7 @@
+import os
+import threading
+from typing import List
+
 class StorageInterface:
     """
     Interface para armazenamento de arquivos e dados. Permite trocar implementação facilmente (local, cloud, mock, etc).
@@ -8,14 +12,33 @@ class StorageInterface:
     def load(self, path: str) -> bytes:
         raise NotImplementedError("Implementação de storage não definida.")
 
+    def delete(self, path: str) -> bool:
+        raise NotImplementedError("Implementação de storage não definida.")
+
+    def exists(self, path: str) -> bool:
+        raise NotImplementedError("Implementação de storage não definida.")
+
+    def list(self, prefix: str) -> List[str]:
+        """Lista os caminhos sob o prefixo (diretório), do mais antigo para o mais recente"""
+        raise NotImplementedError("Implementação de storage não definida.")
+
+    def size(self, path: str) -> int:
+        raise NotImplementedError("Implementação de storage não definida.")
+
 class LocalStorage(StorageInterface):
     """
     Implementação local para armazenamento em disco.
     """
     def save(self, path: str, data: bytes) -> bool:
         try:
-            with open(path, 'wb') as f:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Escrita atômica: leitores concorrentes nunca veem arquivo parcial
+            tmp_path = f"{path}.tmp{os.getpid()}-{threading.get_ident()}"
+            with open(tmp_path, 'wb') as f:
                 f.write(data)
+            os.replace(tmp_path, path)
             return True
         except Exception:
             return False
@@ -26,3 +49,28 @@ class LocalStorage(StorageInterface):
                 return f.read()
         except Exception:
             return b''
+
+    def delete(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except Exception:
+            return False
+
+    def exists(self, path: str) -> bool:
+        return os.path.isfile(path)
+
+    def list(self, prefix: str) -> List[str]:
+        paths = []
+        for root, _, files in os.walk(prefix):
+            paths.extend(os.path.join(root, name) for name in files if '.tmp' not in name)
+        try:
+            return sorted(paths, key=os.path.getmtime)
+        except OSError:
+            return sorted(paths)
+
+    def size(self, path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
@@ -1,11 +1,22 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Depends
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 import os
+from typing import Optional
 from .services.classifier_service import AdvancedClassifierService
 from .services.file_processor import FileProcessor
-from .models import EmailResponse, HealthResponse, ModelInfo, StatisticsResponse
+from .services.mailbox_ingestion_service import MailboxIngestionService
+from .services.job_service import JobService
+from .services.online_learning_service import OnlineLearningService
+from .services.pdf_extraction_pool import shutdown_pdf_extraction_pool
+from .models import (
+    EmailResponse, HealthResponse, ModelInfo, StatisticsResponse, BatchClassificationRequest, JobResponse,
+    FeedbackRequest, FeedbackResponse
+)
 from .utils.logger import setup_logger
+from .utils.document_chunking import PAGE_SEPARATOR
 from datetime import datetime
 
 # Configurar logger customizado
@@ -37,6 +48,8 @@ app.add_middleware(
 
 # Inicializar serviço de classificação global
 classifier_service = None
+job_service = None
+online_learning_service = None
 
 @app.on_event("startup")
 async def startup_event():
@@ -44,13 +57,33 @@ async def startup_event():
     global classifier_service
     try:
         model_path = os.getenv("ADVANCED_MODEL_PATH", "./datasets/advanced_model.pkl")
-        classifier_service = AdvancedClassifierService(model_path=model_path)
+        classifier_service = AdvancedClassifierService(
+            model_path=model_path, online_learning=get_online_learning_service()
+        )
         logger.info("✅ Aplicação iniciada com sucesso")
 
         health = classifier_service.health_check()
         logger.info(f"Status de saúde: {health['status']}")
     except Exception as e:
         logger.error(f"❌ Erro na inicialização: {e}")
+    try:
+        await get_job_service().start()
+    except Exception as e:
+        logger.error(f"❌ Erro ao iniciar fila de jobs: {e}")
+    try:
+        await get_online_learning_service().start()
+    except Exception as e:
+        logger.error(f"❌ Erro ao iniciar aprendizado incremental: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Encerrar fila de jobs, aprendizado incremental e workers de extração de PDF"""
+    if job_service is not None:
+        await job_service.stop()
+    if online_learning_service is not None:
+        # Salva um último snapshot com as correções já aprendidas
+        await online_learning_service.stop()
+    shutdown_pdf_extraction_pool()
 
 def get_classifier_service() -> AdvancedClassifierService:
     """
@@ -63,9 +96,33 @@ def get_classifier_service() -> AdvancedClassifierService:
     global classifier_service
     if classifier_service is None:
         model_path = os.getenv("ADVANCED_MODEL_PATH", "./datasets/advanced_model.pkl")
-        classifier_service = AdvancedClassifierService(model_path=model_path)
+        classifier_service = AdvancedClassifierService(
+            model_path=model_path, online_learning=get_online_learning_service()
+        )
     return classifier_service
 
+def get_online_learning_service() -> OnlineLearningService:
+    """
+    Retorna o serviço de aprendizado incremental (configurado pelas variáveis ONLINE_* e FEEDBACK_DB_PATH).
+    Returns:
+        OnlineLearningService: Instância global do serviço.
+    """
+    global online_learning_service
+    if online_learning_service is None:
+        online_learning_service = OnlineLearningService.from_env()
+    return online_learning_service
+
+def get_job_service() -> JobService:
+    """
+    Dependency para obter a fila de jobs assíncronos (configurada pelas variáveis JOB_*).
+    Returns:
+        JobService: Instância global da fila de jobs.
+    """
+    global job_service
+    if job_service is None:
+        job_service = JobService.from_env(get_classifier_service)
+    return job_service
+
 # ==================== ENDPOINTS KEEP-ALIVE ====================
 
 @app.api_route("/", methods=["GET", "HEAD"])
@@ -83,6 +140,9 @@ async def root():
         "endpoints": {
             "classify": "/api/classify",
             "classify_file": "/api/classify-file",
+            "classify_mailbox": "/api/classify-mailbox",
+            "jobs": "/api/jobs",
+            "feedback": "/api/feedback",
             "health": "/api/health",
             "ping": "/ping",
             "docs": "/docs"
@@ -112,7 +172,7 @@ async def health_check(
 ):
     # Health check completo
     try:
-        health_status = service.health_check()
+        health_status = await run_in_threadpool(service.health_check)
         
         if health_status['status'] == 'healthy':
             status_code = 200
@@ -152,7 +212,7 @@ async def warmup(
     try:
         # Texto dummy para warm-up
         dummy_text = "Este é um email de teste para aquecimento do sistema."
-        result = service.classify(dummy_text)
+        result = await run_in_threadpool(service.classify, dummy_text)
         
         return {
             "status": "warmed_up",
@@ -206,8 +266,8 @@ async def classify_email(
                 status_code=400,
                 detail="Texto muito longo. Máximo de 50.000 caracteres."
             )
-        # Classificar
-        result = service.classify(text)
+        # Classificar fora do loop de eventos: requisições idênticas simultâneas são coalescidas
+        result = await run_in_threadpool(service.classify, text)
         logger.info(f"✅ Classificação concluída: {result.classification} ({result.confidence:.2%})")
         return result
     except HTTPException:
@@ -224,13 +284,18 @@ async def classify_email(
 
 @app.post("/api/classify-file", response_model=EmailResponse)
 async def classify_file(
-    file: UploadFile = File(..., description="Arquivo .txt ou .pdf contendo o email"),
+    file: UploadFile = File(..., description="Arquivo .txt, .pdf ou .eml contendo o email"),
+    document_mode: Optional[bool] = Query(
+        None, description="Classificar por trechos (páginas/parágrafos); padrão: DOCUMENT_MODE"
+    ),
     service: AdvancedClassifierService = Depends(get_classifier_service)
 ):
     """
     Classifica email a partir de arquivo enviado.
     Args:
-        file (UploadFile): Arquivo .txt ou .pdf contendo o email.
+        file (UploadFile): Arquivo .txt, .pdf ou .eml contendo o email.
+        document_mode (Optional[bool]): Classificação por trechos com agregação das probabilidades.
+            Sem o parâmetro, DOCUMENT_MODE decide (auto: PDFs com mais de uma página).
         service (AdvancedClassifierService): Serviço de classificação injetado.
     Returns:
         EmailResponse: Resultado da classificação do email extraído do arquivo.
@@ -245,20 +310,24 @@ async def classify_file(
                 detail="Nenhum arquivo foi enviado"
             )
         # Processar arquivo
-        text = await FileProcessor.process_uploaded_file(file)
+        text, extraction_info = await FileProcessor.process_uploaded_file_with_info(file)
         if len(text.strip()) < 10:
             raise HTTPException(
                 status_code=400,
                 detail="Arquivo contém muito pouco texto para classificação (mínimo 10 caracteres)."
             )
         # Classificar
-        result = service.classify(text)
+        if document_mode is None:
+            setting = os.getenv("DOCUMENT_MODE", "auto").strip().lower()
+            document_mode = setting == "true" or (setting == "auto" and PAGE_SEPARATOR in text)
+        result = await run_in_threadpool(service.classify_document if document_mode else service.classify, text)
         # Adicionar informações do arquivo
         result.additional_info.update({
             'filename': file.filename,
             'file_size': len(text),
             'extraction_method': 'file_upload',
-            'file_type': file.content_type
+            'file_type': file.content_type,
+            **extraction_info
         })
         logger.info(f"✅ Arquivo classificado: {result.classification} ({result.confidence:.2%})")
         return result
@@ -271,6 +340,134 @@ async def classify_file(
             detail=f"Erro interno no processamento: {str(e)}"
         )
 
+@app.post("/api/classify-mailbox")
+async def classify_mailbox(
+    file: UploadFile = File(..., description="Exportação de emails: .eml, .mbox ou .zip com arquivos .eml/.mbox"),
+    service: AdvancedClassifierService = Depends(get_classifier_service)
+):
+    """
+    Classifica todas as mensagens de uma exportação de emails.
+    As mensagens são lidas em fluxo e classificadas em lotes; a resposta é NDJSON
+    (application/x-ndjson), com uma linha por mensagem e uma linha final de resumo.
+    Args:
+        file (UploadFile): Arquivo .eml, .mbox ou .zip.
+        service (AdvancedClassifierService): Serviço de classificação injetado.
+    Returns:
+        StreamingResponse: Resultados por mensagem em NDJSON.
+    Raises:
+        HTTPException: Para arquivos inválidos, grandes demais ou modelo indisponível.
+    """
+    logger.info(f"📬 Ingestão de arquivo de emails: {file.filename}")
+    if not service.classifier:
+        raise HTTPException(status_code=503, detail="Classificador indisponível no momento")
+    upload = await FileProcessor.read_mailbox_upload(file)
+    ingestion = MailboxIngestionService.from_env(service)
+    try:
+        ingestion.validate(upload, file.filename)
+    except Exception:
+        upload.close()
+        raise
+    return StreamingResponse(
+        ingestion.stream_results(upload, file.filename),
+        media_type="application/x-ndjson",
+        # Garante a remoção do arquivo temporário mesmo se o cliente desconectar
+        background=BackgroundTask(upload.close)
+    )
+
+@app.post("/api/feedback", response_model=FeedbackResponse, status_code=201)
+async def submit_feedback(
+    request: FeedbackRequest,
+    service: AdvancedClassifierService = Depends(get_classifier_service)
+):
+    """
+    Registra a correção de uma classificação.
+    As correções são aplicadas ao modelo incremental em pequenos lotes, em segundo plano.
+    Args:
+        request (FeedbackRequest): Texto do email e classificação correta.
+        service (AdvancedClassifierService): Serviço de classificação injetado.
+    Returns:
+        FeedbackResponse: Identificador da correção e correções pendentes.
+    Raises:
+        HTTPException: Para classificação inválida ou registro indisponível.
+    """
+    result = await run_in_threadpool(service.record_feedback, request.text, request.label, request.predicted_label)
+    logger.info(f"📝 Correção registrada: {request.predicted_label or '?'} -> {request.label}")
+    return FeedbackResponse(**result)
+
+# ==================== JOBS ASSÍNCRONOS ====================
+
+@app.post("/api/jobs/classify-file", response_model=JobResponse, status_code=202)
+async def submit_file_job(
+    file: UploadFile = File(..., description="Arquivo .txt, .pdf ou .eml contendo o email"),
+    lane: str = Form("interactive", description="Prioridade do job (interactive/bulk)"),
+    jobs: JobService = Depends(get_job_service)
+):
+    """
+    Enfileira a classificação de um arquivo e retorna imediatamente o id do job.
+    Args:
+        file (UploadFile): Arquivo .txt, .pdf ou .eml.
+        lane (str): Prioridade do job.
+        jobs (JobService): Fila de jobs injetada.
+    Returns:
+        JobResponse: Job criado (status queued).
+    Raises:
+        HTTPException: Para arquivos inválidos, prioridade inválida ou fila cheia.
+    """
+    FileProcessor.validate_single_email_file(file)
+    upload = await FileProcessor.read_upload(file)
+    try:
+        job = await jobs.submit_file(upload, file.filename, lane)
+    finally:
+        upload.close()
+    return JobResponse.from_job(job)
+
+@app.post("/api/jobs/classify-batch", response_model=JobResponse, status_code=202)
+async def submit_batch_job(
+    request: BatchClassificationRequest,
+    jobs: JobService = Depends(get_job_service)
+):
+    """
+    Enfileira a classificação de uma lista de textos e retorna imediatamente o id do job.
+    Args:
+        request (BatchClassificationRequest): Textos e prioridade do job.
+        jobs (JobService): Fila de jobs injetada.
+    Returns:
+        JobResponse: Job criado (status queued).
+    """
+    job = await jobs.submit_batch(request.texts, request.lane)
+    return JobResponse.from_job(job)
+
+@app.get("/api/jobs/{job_id}", response_model=JobResponse)
+async def get_job_status(job_id: str, jobs: JobService = Depends(get_job_service)):
+    """
+    Consulta status e progresso de um job.
+    Args:
+        job_id (str): Identificador do job.
+        jobs (JobService): Fila de jobs injetada.
+    Returns:
+        JobResponse: Estado atual do job.
+    """
+    return JobResponse.from_job(await jobs.get_job(job_id))
+
+@app.get("/api/jobs/{job_id}/result")
+async def get_job_result(job_id: str, jobs: JobService = Depends(get_job_service)):
+    """
+    Retorna o resultado de um job concluído.
+    Args:
+        job_id (str): Identificador do job.
+        jobs (JobService): Fila de jobs injetada.
+    Returns:
+        dict: Estado do job e resultado (EmailResponse para arquivos, lista de resultados para lotes).
+    Raises:
+        HTTPException: 404 se o job não existir, 409 se ainda não estiver concluído ou tiver falhado.
+    """
+    job = await jobs.get_job(job_id)
+    if job['status'] == 'failed':
+        raise HTTPException(status_code=409, detail=f"Job falhou: {job['error']}")
+    if job['status'] != 'completed':
+        raise HTTPException(status_code=409, detail=f"Job ainda não concluído (status: {job['status']})")
+    return {'job_id': job_id, 'status': job['status'], 'result': job['result']}
+
 @app.get("/api/health")
 async def health_check(service: AdvancedClassifierService = Depends(get_classifier_service)):
     """
@@ -281,7 +478,7 @@ async def health_check(service: AdvancedClassifierService = Depends(get_classifi
         JSONResponse: Status de saúde da aplicação e dos modelos.
     """
     try:
-        health_status = service.health_check()
+        health_status = await run_in_threadpool(service.health_check)
         if health_status['status'] == 'healthy':
             status_code = 200
         elif health_status['status'] == 'degraded':
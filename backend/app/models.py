@@ -69,6 +69,14 @@ class ModelInfo(BaseModel):
     fallback_available: bool = Field(..., description="Se o fallback está disponível")
     fallback_enabled: bool = Field(..., description="Se o fallback está habilitado")
     fallback_type: Optional[str] = Field(None, description="Tipo do classificador de fallback")
+    classifier_mode: Optional[str] = Field(None, description="Modo de classificação (forest ou fast)")
+    fast_model_loaded: bool = Field(False, description="Se o modelo linear destilado está carregado")
+    cascade: Optional[Dict[str, Any]] = Field(None, description="Estatísticas da classificação em cascata")
+    circuit_breaker: Optional[Dict[str, Any]] = Field(None, description="Estado do disjuntor do classificador principal")
+    coalescing: Optional[Dict[str, Any]] = Field(None, description="Requisições idênticas simultâneas atendidas por uma única classificação")
+    near_duplicates: Optional[Dict[str, Any]] = Field(None, description="Índice de quase-duplicatas (MinHash/LSH) de emails recentes")
+    cleanup: Optional[Dict[str, Any]] = Field(None, description="Bytes removidos pela limpeza de histórico, assinaturas e avisos")
+    online_learning: Optional[Dict[str, Any]] = Field(None, description="Estado do modelo incremental")
 
 class StatisticsResponse(BaseModel):
     """
@@ -100,6 +108,79 @@ class TrainingResponse(BaseModel):
     model_info: Optional[ModelInfo] = Field(None, description="Informações do novo modelo")
     training_time: Optional[float] = Field(None, description="Tempo de treinamento em segundos")
 
+class BatchClassificationRequest(BaseModel):
+    """
+    Requisição de classificação assíncrona de vários textos
+    """
+    texts: List[str] = Field(..., min_length=1, max_length=10000, description="Textos dos emails")
+    lane: str = Field("bulk", pattern="^(interactive|bulk)$", description="Prioridade do job (interactive/bulk)")
+    
+    @validator('texts')
+    def validate_texts(cls, v):
+        for text in v:
+            if len(text.strip()) < 10 or len(text) > 50000:
+                raise ValueError('Cada texto deve ter entre 10 e 50.000 caracteres')
+        return v
+
+class JobResponse(BaseModel):
+    """
+    Estado de um job de classificação assíncrona
+    """
+    job_id: str = Field(..., description="Identificador do job")
+    kind: str = Field(..., description="Tipo do job (file/batch)")
+    lane: str = Field(..., description="Prioridade do job (interactive/bulk)")
+    status: str = Field(..., description="Status (queued/running/completed/failed)")
+    progress: float = Field(0.0, ge=0.0, le=1.0, description="Progresso (0-1)")
+    progress_message: Optional[str] = Field(None, description="Etapa atual")
+    error: Optional[str] = Field(None, description="Mensagem de erro se o job falhou")
+    created_at: datetime = Field(..., description="Momento da submissão")
+    started_at: Optional[datetime] = Field(None, description="Início do processamento")
+    finished_at: Optional[datetime] = Field(None, description="Fim do processamento")
+    expires_at: Optional[datetime] = Field(None, description="Momento em que o resultado será descartado")
+    
+    @classmethod
+    def from_job(cls, job: Dict[str, Any]) -> "JobResponse":
+        def to_datetime(value):
+            return datetime.utcfromtimestamp(value) if value else None
+        return cls(
+            job_id=job['id'],
+            kind=job['kind'],
+            lane=job['lane'],
+            status=job['status'],
+            progress=job['progress'],
+            progress_message=job.get('progress_message'),
+            error=job.get('error'),
+            created_at=to_datetime(job['created_at']),
+            started_at=to_datetime(job.get('started_at')),
+            finished_at=to_datetime(job.get('finished_at')),
+            expires_at=to_datetime(job.get('expires_at'))
+        )
+
+class FeedbackRequest(BaseModel):
+    """
+    Correção da classificação de um email, usada pelo aprendizado incremental
+    """
+    text: str = Field(..., min_length=10, max_length=50000, description="Texto do email classificado")
+    label: str = Field(..., description="Classificação correta (PRODUTIVO/IMPRODUTIVO)")
+    predicted_label: Optional[str] = Field(None, description="Classificação retornada pela API, se conhecida")
+    
+    @validator('label', 'predicted_label')
+    def validate_label(cls, v):
+        if v is None:
+            return v
+        v = v.strip().upper()
+        if v not in ['PRODUTIVO', 'IMPRODUTIVO']:
+            raise ValueError('Classificação deve ser PRODUTIVO ou IMPRODUTIVO')
+        return v
+
+class FeedbackResponse(BaseModel):
+    """
+    Confirmação do registro de uma correção
+    """
+    feedback_id: int = Field(..., description="Identificador da correção")
+    pending: int = Field(..., description="Correções aguardando o próximo lote de atualização")
+    online_mode: str = Field(..., description="Modo do modelo incremental (off/shadow/serve)")
+
 class ErrorResponse(BaseModel):
     """
     Resposta padrão para erros
@@ -121,4 +202,4 @@ class Config:
             "confidence": 0.87,
             "processing_time": 0.045
         }
-    }
\ No newline at end of file
+    }
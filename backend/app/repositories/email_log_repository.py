@@ -1,4 +1,6 @@
+import os
 import logging
+from collections import deque
 
 logger = logging.getLogger(__name__)
 
@@ -6,14 +8,22 @@ class EmailLogRepository:
     """
     Repositório para persistência de logs de classificação de emails.
     Permite trocar facilmente o backend de armazenamento (arquivo, banco, etc).
+    Opcionalmente encaminha cada log para um repositório de captura de tráfego.
+    Em memória ficam só os max_entries logs mais recentes: lotes, jobs e caixas
+    de email importadas não acumulam todos os textos no processo.
     """
-    def __init__(self):
+    def __init__(self, capture_repository=None, max_entries: int = None):
+        if max_entries is None:
+            max_entries = int(os.getenv("EMAIL_LOG_MAX_ENTRIES", "1000"))
         # Exemplo: pode ser adaptado para salvar em arquivo, banco, etc
-        self.logs = []
+        self.logs = deque(maxlen=max(0, max_entries))
+        self.capture_repository = capture_repository
 
     def save_log(self, log_data: dict):
         self.logs.append(log_data)
-        logger.info(f"Log de classificação salvo: {log_data}")
+        logger.debug(f"Log de classificação salvo: {log_data.get('method')} ({len(log_data.get('input', ''))} caracteres)")
+        if self.capture_repository:
+            self.capture_repository.record(log_data)
 
     def get_all_logs(self):
-        return self.logs
+        return list(self.logs)
@@ -0,0 +1,71 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class FeedbackRepository:
+    """
+    Repositório persistente de correções de classificação enviadas pelos usuários (SQLite).
+    Cada correção fica pendente até ser consumida pelo aprendizado incremental.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Conexão única compartilhada entre o event loop e as threads do pool, serializada pelo lock
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS feedback (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    text TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    predicted_label TEXT,
+                    created_at REAL NOT NULL,
+                    consumed_at REAL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_feedback_pending ON feedback(consumed_at, id)")
+
+    def _fetchall(self, query: str, args: tuple = ()) -> List[sqlite3.Row]:
+        # A leitura do cursor também usa a conexão compartilhada: fica dentro do lock
+        with self._lock:
+            return self._conn.execute(query, args).fetchall()
+
+    def add(self, text: str, label: str, predicted_label: Optional[str] = None) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "INSERT INTO feedback (text, label, predicted_label, created_at) VALUES (?, ?, ?, ?)",
+                (text, label, predicted_label, time.time())
+            ).lastrowid
+
+    def list_pending(self, limit: int) -> List[Dict[str, Any]]:
+        """Correções ainda não consumidas, em ordem de chegada"""
+        rows = self._fetchall(
+            "SELECT id, text, label FROM feedback WHERE consumed_at IS NULL ORDER BY id LIMIT ?", (limit,)
+        )
+        return [dict(row) for row in rows]
+
+    def mark_consumed(self, ids: List[int]):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany("UPDATE feedback SET consumed_at = ? WHERE id = ?", [(now, i) for i in ids])
+
+    def count_pending(self) -> int:
+        return self._fetchall("SELECT COUNT(*) FROM feedback WHERE consumed_at IS NULL")[0][0]
+
+    def count_total(self) -> int:
+        return self._fetchall("SELECT COUNT(*) FROM feedback")[0][0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,143 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class JobRepository:
+    """
+    Repositório persistente de jobs de classificação assíncrona (SQLite).
+    Guarda estado, progresso, parâmetros e resultado de cada job; os arquivos
+    enviados ficam em disco, referenciados por payload_path.
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Conexão única compartilhada entre o event loop e as threads do pool, serializada pelo lock
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    lane TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    params TEXT,
+                    payload_path TEXT,
+                    progress REAL NOT NULL DEFAULT 0,
+                    progress_message TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    expires_at REAL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_expires ON jobs(expires_at)")
+
+    def _execute(self, query: str, args: tuple = ()) -> int:
+        """Executa um comando e retorna o número de linhas afetadas"""
+        with self._lock:
+            return self._conn.execute(query, args).rowcount
+
+    def _fetchall(self, query: str, args: tuple = ()) -> List[sqlite3.Row]:
+        # A leitura do cursor também usa a conexão compartilhada: fica dentro do lock
+        with self._lock:
+            return self._conn.execute(query, args).fetchall()
+
+    def create(self, job_id: str, kind: str, lane: str, params: Dict[str, Any],
+               payload_path: Optional[str] = None) -> Dict[str, Any]:
+        self._execute(
+            "INSERT INTO jobs (id, kind, lane, status, params, payload_path, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (job_id, kind, lane, self.STATUS_QUEUED, json.dumps(params, ensure_ascii=False), payload_path, time.time())
+        )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._fetchall("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return self._to_dict(rows[0]) if rows else None
+
+    def mark_running(self, job_id: str):
+        self._execute(
+            "UPDATE jobs SET status = ?, started_at = ?, progress = 0 WHERE id = ?",
+            (self.STATUS_RUNNING, time.time(), job_id)
+        )
+
+    def update_progress(self, job_id: str, progress: float, message: Optional[str] = None):
+        self._execute(
+            "UPDATE jobs SET progress = ?, progress_message = ? WHERE id = ?",
+            (min(max(progress, 0.0), 1.0), message, job_id)
+        )
+
+    def complete(self, job_id: str, result: Any, ttl_seconds: float):
+        now = time.time()
+        self._execute(
+            "UPDATE jobs SET status = ?, progress = 1, result = ?, finished_at = ?, expires_at = ? WHERE id = ?",
+            (self.STATUS_COMPLETED, json.dumps(result, ensure_ascii=False, default=str), now, now + ttl_seconds, job_id)
+        )
+
+    def fail(self, job_id: str, error: str, ttl_seconds: float):
+        now = time.time()
+        self._execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ?, expires_at = ? WHERE id = ?",
+            (self.STATUS_FAILED, error, now, now + ttl_seconds, job_id)
+        )
+
+    def list_pending(self) -> List[Dict[str, Any]]:
+        """Jobs não concluídos, em ordem de chegada (para reenfileirar após reinício)"""
+        rows = self._fetchall(
+            "SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY created_at",
+            (self.STATUS_QUEUED, self.STATUS_RUNNING)
+        )
+        return [self._to_dict(row) for row in rows]
+
+    def requeue_running(self) -> int:
+        """Jobs interrompidos por um reinício voltam para a fila"""
+        return self._execute(
+            "UPDATE jobs SET status = ?, started_at = NULL, progress = 0 WHERE status = ?",
+            (self.STATUS_QUEUED, self.STATUS_RUNNING)
+        )
+
+    def delete_expired(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Remove jobs finalizados com TTL vencido e retorna os registros removidos"""
+        now = now or time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, payload_path FROM jobs WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+            ).fetchall()
+            if rows:
+                self._conn.executemany("DELETE FROM jobs WHERE id = ?", [(row['id'],) for row in rows])
+        return [dict(row) for row in rows]
+
+    def count_by_status(self) -> Dict[str, int]:
+        rows = self._fetchall("SELECT status, COUNT(*) AS total FROM jobs GROUP BY status")
+        return {row['status']: row['total'] for row in rows}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        for key in ('params', 'result'):
+            if job.get(key) is not None:
+                job[key] = json.loads(job[key])
+        return job
@@ -0,0 +1,132 @@
+import os
+import re
+import json
+import time
+import random
+import hashlib
+import logging
+import threading
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Modos de retenção do texto original no arquivo de captura
+TEXT_MODES = ('none', 'redacted', 'full')
+
+_EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+_URL_PATTERN = re.compile(r'(?:https?://|www\.)\S+')
+_NUMBER_PATTERN = re.compile(r'\d+')
+
+
+def redact_text(text: str) -> str:
+    """
+    Remove dados pessoais óbvios (emails, URLs e números) preservando a estrutura do texto,
+    para que as features do classificador (has_email, has_url, has_phone...) continuem equivalentes no replay
+    """
+    text = _EMAIL_PATTERN.sub('usuario@exemplo.com', text)
+    text = _URL_PATTERN.sub('https://exemplo.com', text)
+    return _NUMBER_PATTERN.sub(lambda m: '0' * len(m.group()), text)
+
+
+class TrafficCaptureRepository:
+    """
+    Repositório de captura de tráfego de classificação em JSON Lines.
+    Cada linha registra o resultado de uma classificação e, se habilitado,
+    o texto enviado (completo ou anonimizado) para replay posterior.
+    A captura é opt-in: sem TRAFFIC_CAPTURE_PATH nada é gravado.
+    """
+    FORMAT_VERSION = 1
+
+    def __init__(self, path: str, text_mode: str = 'none', max_text_chars: int = 0,
+                 sample_rate: float = 1.0, max_bytes: int = 100 * 1024 * 1024):
+        if text_mode not in TEXT_MODES:
+            raise ValueError(f"Modo de texto inválido: {text_mode}. Use um de {', '.join(TEXT_MODES)}")
+        self.path = path
+        self.text_mode = text_mode
+        self.max_text_chars = max_text_chars
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["TrafficCaptureRepository"]:
+        """Cria o repositório a partir das variáveis de ambiente (None se a captura estiver desabilitada)"""
+        path = os.getenv("TRAFFIC_CAPTURE_PATH", "").strip()
+        if not path:
+            return None
+        try:
+            repository = cls(
+                path=path,
+                text_mode=os.getenv("TRAFFIC_CAPTURE_TEXT", "none").strip().lower(),
+                max_text_chars=int(os.getenv("TRAFFIC_CAPTURE_MAX_CHARS", "0")),
+                sample_rate=float(os.getenv("TRAFFIC_CAPTURE_SAMPLE_RATE", "1.0")),
+                max_bytes=int(float(os.getenv("TRAFFIC_CAPTURE_MAX_MB", "100")) * 1024 * 1024)
+            )
+        except ValueError as e:
+            logger.error(f"❌ Configuração de captura de tráfego inválida: {e}")
+            return None
+        logger.info(f"🎙️ Captura de tráfego habilitada em {path} (texto: {repository.text_mode})")
+        return repository
+
+    def _retained_text(self, text: str) -> Optional[str]:
+        if self.text_mode == 'none':
+            return None
+        if self.text_mode == 'redacted':
+            text = redact_text(text)
+        if self.max_text_chars > 0:
+            text = text[:self.max_text_chars]
+        return text
+
+    def build_record(self, log_data: dict) -> dict:
+        """Monta o registro de captura a partir do log de classificação"""
+        content = log_data.get('input') or ''
+        output = log_data.get('output') if isinstance(log_data.get('output'), dict) else {}
+        additional_info = output.get('additional_info') or {}
+        return {
+            'v': self.FORMAT_VERSION,
+            'ts': log_data.get('timestamp', time.time()),
+            'content_sha256': hashlib.sha256(content.encode('utf-8')).hexdigest(),
+            'text_length': len(content),
+            'text_mode': self.text_mode,
+            'text': self._retained_text(content),
+            'classification': output.get('classification'),
+            'confidence': output.get('confidence'),
+            'probabilities': additional_info.get('probabilities', {}),
+            'processing_time': output.get('processing_time'),
+            'method': log_data.get('method')
+        }
+
+    def record(self, log_data: dict) -> bool:
+        """Grava uma classificação no arquivo de captura (respeitando amostragem e limite de tamanho)"""
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return False
+        try:
+            line = json.dumps(self.build_record(log_data), ensure_ascii=False) + '\n'
+            with self._lock:
+                self._rotate_if_needed()
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line)
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao gravar captura de tráfego: {e}")
+            return False
+
+    def _rotate_if_needed(self):
+        try:
+            if os.path.getsize(self.path) >= self.max_bytes:
+                os.replace(self.path, self.path + '.1')
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def read(path: str) -> Iterator[dict]:
+        """Lê registros de um arquivo de captura ignorando linhas corrompidas"""
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"⚠️ Linha {line_number} inválida em {path}, ignorando")
@@ -1,5 +1,12 @@
 ## Serviços principais do Email Classifier
 
+# Definido antes dos imports: os serviços importam esta configuração do pacote
+DEFAULT_CLASSIFIER_CONFIG = {
+    "confidence_threshold": 0.6,
+    "max_file_size_mb": 10,
+    "supported_extensions": [".txt", ".pdf", ".eml", ".mbox", ".zip"],
+}
+
 from .advanced_classifier import AdvancedEmailClassifier
 from .classifier_service import AdvancedClassifierService
 from .file_processor import FileProcessor
@@ -9,9 +16,3 @@ __all__ = [
     "AdvancedClassifierService",
     "FileProcessor",
 ]
-
-DEFAULT_CLASSIFIER_CONFIG = {
-    "confidence_threshold": 0.6,
-    "max_file_size_mb": 10,
-    "supported_extensions": [".txt", ".pdf"],
-}
@@ -1,20 +1,22 @@
 # backend/app/services/advanced_classifier.py
+import os
 import pandas as pd
 import pickle
 import numpy as np
-import re
 import time
 import logging
+import threading
 from typing import Dict, List, Tuple, Optional
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, accuracy_score, confusion_matrix
-from sklearn.preprocessing import StandardScaler
 import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.stem import RSLPStemmer
+from ..utils.text_windowing import TextWindow, length_features
+from ..utils.email_cleanup import clean_email
+from ..utils.near_duplicate import NearDuplicateIndex
+from ..utils.preprocessing_cache import default_cache_path
+from .feature_pipeline import FeaturePipeline
+from .training_driver import TrainingDriver
 
 logger = logging.getLogger(__name__)
 
@@ -22,49 +24,62 @@ class AdvancedEmailClassifier:
     """
     Classificador avançado de emails para o projeto AutoU
     Agora recebe um repositório para persistência/carregamento do modelo.
+    
+    Modos de classificação:
+        forest: Random Forest (padrão)
+        fast: modelo linear destilado da floresta (scripts/distill_model.py), carregado
+            de fast_model_repository; sem ele, o modo fast usa a floresta
+    
+    Quase-duplicatas (NEAR_DUPLICATE_MODE):
+        off: desativado (padrão)
+        flag: classifica normalmente e informa em result['near_duplicate'] o email
+            recente parecido e, se ele já foi classificado pelo mesmo modelo, se a
+            classificação coincide
+        reuse: reaproveita as probabilidades do email recente parecido dadas pelo
+            mesmo modelo, sem passar por ele (classify, classify_cascade e
+            classify_batch)
     """
-    def __init__(self, model_path: str = None, model_repository=None):
+    MODE_FOREST = "forest"
+    MODE_FAST = "fast"
+    MODES = (MODE_FOREST, MODE_FAST)
+    NEAR_DUPLICATE_MODES = ("off", "flag", "reuse")
+    
+    def __init__(self, model_path: str = None, model_repository=None, fast_model_repository=None,
+                 mode: Optional[str] = None):
         self.model_path = model_path
         self.model_repository = model_repository
+        self.fast_model_repository = fast_model_repository
+        self.mode = (mode or os.getenv("CLASSIFIER_MODE", self.MODE_FOREST)).strip().lower()
+        if self.mode not in self.MODES:
+            logger.warning(f"⚠️ Modo de classificação inválido: {self.mode}. Usando {self.MODE_FOREST}")
+            self.mode = self.MODE_FOREST
         self.model = None
-        self.vectorizer = None
-        self.scaler = None
-        self.stemmer = RSLPStemmer()
-        # Palavras-chave otimizadas para contexto empresarial
-        self.productive_keywords = {
-            'erro', 'bug', 'falha', 'problema', 'defeito', 'crash',
-            'não funciona', 'quebrado', 'parou', 'travou', 'lento',
-            'preciso', 'solicito', 'gostaria', 'como fazer', 'ajuda',
-            'suporte', 'orientação', 'instrução', 'tutorial',
-            'urgente', 'crítico', 'importante', 'prioritário', 'asap',
-            'deadline', 'prazo', 'vencimento',
-            'configuração', 'instalação', 'setup', 'integração',
-            'api', 'sistema', 'plataforma', 'aplicativo', 'software',
-            'login', 'senha', 'acesso', 'bloqueado', 'desabilitado',
-            'permissão', 'autenticação', 'conta',
-            'pagamento', 'cobrança', 'fatura', 'contrato', 'renovação',
-            'cancelamento', 'reembolso', 'upgrade', 'downgrade',
-            'status', 'andamento', 'protocolo', 'número', 'código',
-            'relatório', 'dados', 'informações', 'detalhes'
-        }
-        self.unproductive_keywords = {
-            'obrigado', 'obrigada', 'agradeço', 'agradecimento',
-            'gratidão', 'grato', 'grata', 'reconhecido',
-            'parabéns', 'felicitações', 'congratulações',
-            'sucesso', 'conquista', 'vitória', 'prêmio',
-            'aniversário', 'nascimento', 'casamento', 'formatura',
-            'festa', 'comemoração', 'celebração',
-            'natal', 'ano novo', 'páscoa', 'feriado', 'férias',
-            'final de semana', 'descanso',
-            'cumprimentos', 'saudações', 'abraços', 'beijos',
-            'tenha um bom dia', 'boa sorte', 'tudo de bom',
-            'família', 'saúde', 'melhoras', 'cuidados',
-            'felicidade', 'alegria', 'paz'
-        }
+        self.distilled_model = None
+        # Pré-processamento, features, TF-IDF e escala: o mesmo pipeline do treinamento
+        self.pipeline = FeaturePipeline()
+        self.distilled_pipeline: Optional[FeaturePipeline] = None
+        self.productive_keywords = self.pipeline.productive_keywords
+        self.unproductive_keywords = self.pipeline.unproductive_keywords
+        # Histórico citado, assinaturas e avisos legais são removidos antes do pré-processamento
+        self.cleanup_enabled = os.getenv("EMAIL_CLEANUP_ENABLED", "true").lower() == "true"
+        self.cleanup_stats = {'texts': 0, 'bytes_in': 0, 'bytes_removed': 0}
+        self._stats_lock = threading.Lock()
+        # Estágio de palavras-chave da cascata: só decide com esta vantagem líquida de palavras-chave
+        self.keyword_min_margin = int(os.getenv("CASCADE_KEYWORD_MIN_MARGIN", "2"))
+        # Emails longos são classificados por uma janela (início + fim ou frases principais)
+        self.text_window = TextWindow.from_env(self.productive_keywords | self.unproductive_keywords)
+        # Emails de template (mudam só nomes, datas, protocolos) reaproveitam classificações recentes
+        self.near_duplicate_mode = os.getenv("NEAR_DUPLICATE_MODE", "off").strip().lower()
+        if self.near_duplicate_mode not in self.NEAR_DUPLICATE_MODES:
+            logger.warning(f"⚠️ Modo de quase-duplicatas inválido: {self.near_duplicate_mode}. Desativando")
+            self.near_duplicate_mode = "off"
+        self.near_duplicates = NearDuplicateIndex.from_env() if self.near_duplicate_mode != "off" else None
         self._download_nltk_resources()
         # Carregar modelo via repositório
         if self.model_repository and self.model_repository.model_exists():
             self._load_model_from_repository()
+        if self.fast_model_repository and self.fast_model_repository.model_exists():
+            self._load_distilled_model_from_repository()
     
     def _download_nltk_resources(self):
         """Baixa recursos necessários do NLTK"""
@@ -83,9 +98,9 @@ class AdvancedEmailClassifier:
         try:
             model_data = self.model_repository.load()
             if model_data:
+                self.pipeline = FeaturePipeline.from_artifact(model_data)
                 self.model = model_data['model']
-                self.vectorizer = model_data['vectorizer']
-                self.scaler = model_data.get('scaler')
+                self._clear_near_duplicates()
                 logger.info(f"✅ Modelo avançado carregado via repositório")
             else:
                 self.model = None
@@ -93,199 +108,495 @@ class AdvancedEmailClassifier:
             logger.error(f"❌ Erro ao carregar modelo via repositório: {e}")
             self.model = None
     
-    def preprocess_text(self, text: str) -> str:
-        """Preprocessa texto para análise"""
-        if not text:
-            return ""
-        
-        text = text.lower()
-        text = re.sub(r'[^\w\s\?!.,;:]', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
-        
+    def _load_distilled_model_from_repository(self):
+        """Carrega o modelo linear destilado (modo fast)"""
         try:
-            stopwords_pt = set(stopwords.words('portuguese'))
-            tokens = word_tokenize(text, language='portuguese')
-            
-            processed_tokens = []
-            for token in tokens:
-                if (len(token) > 2 and 
-                    (token not in stopwords_pt or 
-                     token in self.productive_keywords or 
-                     token in self.unproductive_keywords)):
-                    
-                    try:
-                        stemmed = self.stemmer.stem(token)
-                        processed_tokens.append(stemmed)
-                    except:
-                        processed_tokens.append(token)
-            
-            return ' '.join(processed_tokens)
-            
+            model_data = self.fast_model_repository.load()
+            if model_data:
+                self.distilled_pipeline = FeaturePipeline.from_artifact(model_data)
+                self.distilled_model = model_data['model']
+                self._clear_near_duplicates()
+                logger.info(f"✅ Modelo destilado carregado (modo padrão: {self.mode})")
         except Exception as e:
-            logger.warning(f"Erro no processamento NLTK: {e}")
-            return text
+            logger.error(f"❌ Erro ao carregar modelo destilado: {e}")
+            self.distilled_model = None
+    
+    @property
+    def vectorizer(self):
+        return self.pipeline.vectorizer
+    
+    @vectorizer.setter
+    def vectorizer(self, vectorizer):
+        self.pipeline.vectorizer = vectorizer
+    
+    @property
+    def scaler(self):
+        return self.pipeline.scaler
+    
+    @scaler.setter
+    def scaler(self, scaler):
+        self.pipeline.scaler = scaler
+    
+    def _resolve_tier(self, mode: Optional[str] = None) -> Tuple[str, object, FeaturePipeline]:
+        """Modelo e pipeline do modo pedido (fast sem modelo destilado usa a floresta)"""
+        if (mode or self.mode) == self.MODE_FAST and self.distilled_model is not None:
+            return self.MODE_FAST, self.distilled_model, self.distilled_pipeline
+        return self.MODE_FOREST, self.model, self.pipeline
+    
+    def _build_matrix(self, processed_texts: List[str], features_list: List[Dict[str, float]],
+                      pipeline: Optional[FeaturePipeline] = None):
+        """Matriz [TF-IDF | features escaladas] de vários textos"""
+        return (pipeline or self.pipeline).transform_batch(processed_texts, features_list)
+    
+    def build_matrix(self, contents: List[str], processed_texts: Optional[List[str]] = None):
+        """
+        Matriz de entrada da floresta para vários emails (usada na destilação)
+        
+        Args:
+            contents: Textos originais (as features numéricas são extraídas deles)
+            processed_texts: Textos já pré-processados, se disponíveis
+        """
+        windows = [self.text_window.apply(content) for content in contents]
+        if processed_texts is None:
+            processed_texts = [self.preprocess_text(window) for window in windows]
+        return self._build_matrix(
+            processed_texts, [self.extract_window_features(content, window) for content, window in zip(contents, windows)]
+        )
+    
+    def preprocess_text(self, text: str) -> str:
+        """Preprocessa texto para análise"""
+        return self.pipeline.preprocess(text)
+    
+    def clean_content(self, content: str) -> Tuple[str, Optional[Dict[str, int]]]:
+        """Remove histórico citado, assinatura e avisos legais; retorna o texto e os bytes removidos"""
+        if not self.cleanup_enabled:
+            return content, None
+        cleaned, removed = clean_email(content)
+        bytes_in = len(content.encode('utf-8'))
+        with self._stats_lock:
+            stats = self.cleanup_stats
+            stats['texts'] += 1
+            stats['bytes_in'] += bytes_in
+            stats['bytes_removed'] += removed['bytes_removed']
+        return cleaned, removed
+    
+    def get_cleanup_stats(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self.cleanup_stats)
+        return {
+            'enabled': self.cleanup_enabled,
+            **stats,
+            'removed_ratio': stats['bytes_removed'] / stats['bytes_in'] if stats['bytes_in'] else None
+        }
+    
+    def get_near_duplicate_stats(self) -> Optional[Dict]:
+        if not self.near_duplicates:
+            return None
+        return {'mode': self.near_duplicate_mode, **self.near_duplicates.get_stats()}
+    
+    def extract_window_features(self, content: str, window: str) -> Dict[str, float]:
+        """Features da janela, com as features de tamanho calculadas sobre o texto completo"""
+        features = self.extract_features(window)
+        if window is not content:
+            features.update(length_features(content))
+            # Mesma definição do treinamento (tokenizador de frases), não a contagem de pontuação
+            features['sentence_count'] = self.pipeline.count_sentences(content)
+        return features
     
     def extract_features(self, text: str) -> Dict[str, float]:
         """Extrai características avançadas do texto (19 features fixas)"""
-        features = {}
-        
-        features['length'] = len(text)
-        features['word_count'] = len(text.split())
-        
-        try:
-            sentences = sent_tokenize(text, language='portuguese')
-            features['sentence_count'] = len(sentences)
-        except:
-            features['sentence_count'] = text.count('.') + text.count('!') + text.count('?')
-        
-        words = text.split()
-        features['avg_word_length'] = np.mean([len(word) for word in words]) if words else 0
-        
-        features['question_marks'] = text.count('?')
-        features['exclamation_marks'] = text.count('!')
-        features['periods'] = text.count('.')
-        features['commas'] = text.count(',')
-        
-        features['uppercase_ratio'] = sum(1 for c in text if c.isupper()) / len(text) if text else 0
-        features['repeated_chars'] = len(re.findall(r'(.)\1{2,}', text))
-        
-        features['has_email'] = 1 if re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text) else 0
-        features['has_phone'] = 1 if re.search(r'\b\d{8,11}\b', text) else 0
-        features['has_url'] = 1 if re.search(r'http[s]?://|www\.', text) else 0
-        features['has_numbers'] = 1 if re.search(r'\d+', text) else 0
-        features['has_time'] = 1 if re.search(r'\d{1,2}:\d{2}', text) else 0
-        features['has_date'] = 1 if re.search(r'\d{1,2}/\d{1,2}', text) else 0
-        
-        text_lower = text.lower()
-        productive_count = sum(1 for keyword in self.productive_keywords if keyword in text_lower)
-        unproductive_count = sum(1 for keyword in self.unproductive_keywords if keyword in text_lower)
-        
-        features['productive_keywords'] = productive_count
-        features['unproductive_keywords'] = unproductive_count
-        features['keyword_ratio'] = productive_count / (unproductive_count + 1)
+        return self.pipeline.extract_features(text)
+    
+    def prepare(self, content: str) -> Dict:
+        """Pré-processamento e features de um email, reaproveitáveis entre modelos (cascata)"""
+        cleaned, cleanup = self.clean_content(content)
+        window = self.text_window.apply(cleaned)
+        features = self.extract_window_features(cleaned, window)
+        return {
+            'processed_text': self.preprocess_text(window),
+            'features': features,
+            'window_length': len(window),
+            'cleanup': cleanup
+        }
+    
+    def _predict_proba_prepared(self, prepared: Dict, model, pipeline: FeaturePipeline) -> np.ndarray:
+        """Probabilidades de um email já preparado por prepare()"""
+        X_combined = pipeline.transform(prepared['processed_text'], prepared['features'])
+        # predict equivale ao argmax de predict_proba: uma única passada pelo modelo
+        return model.predict_proba(X_combined)[0]
+    
+    def _clear_near_duplicates(self):
+        # Classificações guardadas vieram do modelo anterior
+        if getattr(self, 'near_duplicates', None):
+            self.near_duplicates.clear()
+    
+    def _find_near_duplicate(self, processed_text: str) -> Optional[Dict]:
+        """
+        Procura um email recente parecido, pelos shingles do texto pré-processado
+        
+        Returns:
+            Optional[Dict]: None com o índice desativado; senão 'signature' (None se o texto
+                é curto demais para comparar) e, havendo email parecido, 'entry_id',
+                'by_tier' (probabilidades guardadas por tier) e 'similarity'
+        """
+        if not self.near_duplicates:
+            return None
+        signature = self.near_duplicates.signature(processed_text)
+        lookup = {'signature': signature}
+        if signature is not None:
+            match = self.near_duplicates.query(signature)
+            if match is not None:
+                lookup['entry_id'], lookup['by_tier'], lookup['similarity'] = match
+        return lookup
+    
+    def _reusable_probabilities(self, lookup: Optional[Dict], tier: str) -> Optional[Dict[str, float]]:
+        """Probabilidades do email parecido para este tier, se o modo reuse permite reaproveitá-las"""
+        if self.near_duplicate_mode != "reuse" or not lookup or 'by_tier' not in lookup:
+            return None
+        probabilities = lookup['by_tier'].get(tier)
+        return dict(probabilities) if probabilities is not None else None
+    
+    def _record_near_duplicate(self, lookup: Optional[Dict], result: Dict):
+        """
+        Guarda um resultado calculado pelo modelo no índice de quase-duplicatas
+        
+        Com email parecido já no índice, o resultado entra na mesma entrada (se o tier
+        ainda não tinha resultado) ou é comparado ao anterior do mesmo tier em
+        result['near_duplicate'].
+        """
+        if not lookup or lookup['signature'] is None:
+            return
+        tier = result['model_tier']
+        if 'by_tier' not in lookup:
+            self.near_duplicates.add(lookup['signature'], {tier: result['probabilities']})
+            return
+        info = {'similarity': lookup['similarity'], 'reused': False}
+        previous = lookup['by_tier'].get(tier)
+        if previous is None:
+            self.near_duplicates.store(lookup['entry_id'], tier, result['probabilities'])
+        else:
+            info['previous_classification'] = max(previous, key=previous.get)
+            info['agrees'] = info['previous_classification'] == result['classification']
+        result['near_duplicate'] = info
+    
+    def keyword_scores(self, features: Dict[str, float]) -> Dict[str, float]:
+        """
+        Probabilidades pelas contagens de palavras-chave (suavização de Laplace)
+        
+        Com vantagem líquida menor que keyword_min_margin (uma palavra comum como
+        "obrigado" ou "sistema" sozinha, ou nenhuma) o resultado é 0.5/0.5, ou seja,
+        confiança mínima: o estágio não decide e o email segue para a floresta.
+        """
+        productive = features.get('productive_keywords', 0)
+        unproductive = features.get('unproductive_keywords', 0)
+        if abs(productive - unproductive) < self.keyword_min_margin:
+            return {'IMPRODUTIVO': 0.5, 'PRODUTIVO': 0.5}
+        productive_prob = (productive + 1) / (productive + unproductive + 2)
+        return {'IMPRODUTIVO': 1 - productive_prob, 'PRODUTIVO': productive_prob}
+    
+    def _build_result(self, content: str, prepared: Dict, probabilities: Dict[str, float],
+                      tier: str, start_time: float) -> Dict:
+        prediction = max(probabilities, key=probabilities.get)
+        confidence = probabilities[prediction]
+        features = prepared['features']
+        suggested_response = self._generate_intelligent_response(prediction, content, features)
+        
+        result = {
+            'classification': prediction,
+            'confidence': float(confidence),
+            'probabilities': probabilities,
+            'suggested_response': suggested_response,
+            'processing_time': time.time() - start_time,
+            'features_detected': features,
+            'text_length': len(content),
+            'processed_text_length': len(prepared['processed_text']),
+            'window_length': prepared['window_length'],
+            'cleanup': prepared['cleanup'],
+            'model_tier': tier
+        }
         
-        return features
+        logger.info(f"Email classificado como {prediction} (confiança: {confidence:.3f})")
+        return result
     
-    def classify(self, content: str) -> Dict:
-        """Classifica email e retorna resultado detalhado"""
+    def classify(self, content: str, mode: Optional[str] = None) -> Dict:
+        """
+        Classifica email e retorna resultado detalhado
+        
+        Args:
+            content: Texto do email
+            mode: 'forest' ou 'fast' (padrão: modo configurado no classificador)
+        """
         start_time = time.time()
+        tier, model, pipeline = self._resolve_tier(mode)
         
-        if not self.model:
+        if not model:
             raise ValueError("Modelo não foi carregado. Execute o treinamento primeiro.")
         
         try:
-            processed_text = self.preprocess_text(content)
-            features = self.extract_features(content)
-            feature_array = np.array(list(features.values())).reshape(1, -1)
+            prepared = self.prepare(content)
+            lookup = self._find_near_duplicate(prepared['processed_text'])
+            reused = self._reusable_probabilities(lookup, tier)
+            if reused is not None:
+                result = self._build_result(content, prepared, reused, tier, start_time)
+                result['near_duplicate'] = {'similarity': lookup['similarity'], 'reused': True}
+                return result
             
-            text_vec = self.vectorizer.transform([processed_text])
-            
-            if self.scaler:
-                feature_array = self.scaler.transform(feature_array)
+            probabilities = self._predict_proba_prepared(prepared, model, pipeline)
+            result = self._build_result(
+                content, prepared,
+                {label: float(prob) for label, prob in zip(model.classes_, probabilities)},
+                tier, start_time
+            )
+            self._record_near_duplicate(lookup, result)
+            return result
             
-            try:
-                from scipy.sparse import hstack
-                X_combined = hstack([text_vec, feature_array])
-            except ImportError:
-                X_combined = text_vec
+        except Exception as e:
+            logger.error(f"Erro na classificação: {str(e)}")
+            raise
+    
+    def classify_cascade(self, content: str, threshold: float) -> Dict:
+        """
+        Classificação em cascata: um estágio barato decide sozinho quando está confiante
+        
+        O primeiro estágio é o modelo linear destilado, se carregado, ou a contagem de
+        palavras-chave. Emails com confiança abaixo de threshold seguem para a floresta,
+        reaproveitando o pré-processamento. result['cascade'] informa o estágio que
+        decidiu e a latência de cada etapa. No modo reuse de quase-duplicatas, um
+        email parecido já decidido pela floresta, ou por um primeiro estágio
+        confiante, dispensa os dois estágios (sem result['cascade']).
+        
+        Args:
+            content: Texto do email
+            threshold: Confiança mínima do primeiro estágio para não escalar
+        """
+        start_time = time.time()
+        if not self.model:
+            raise ValueError("Modelo não foi carregado. Execute o treinamento primeiro.")
+        
+        try:
+            prepared = self.prepare(content)
+            first_stage = self.MODE_FAST if self.distilled_model is not None else "keywords"
+            lookup = self._find_near_duplicate(prepared['processed_text'])
+            for tier in (self.MODE_FOREST, first_stage):
+                reused = self._reusable_probabilities(lookup, tier)
+                if reused is not None and (tier == self.MODE_FOREST or max(reused.values()) >= threshold):
+                    result = self._build_result(content, prepared, reused, tier, start_time)
+                    result['near_duplicate'] = {'similarity': lookup['similarity'], 'reused': True}
+                    return result
             
-            prediction = self.model.predict(X_combined)[0]
-            probabilities = self.model.predict_proba(X_combined)[0]
-            confidence = max(probabilities)
+            stage_start = time.time()
+            timings = {'prepare_ms': (stage_start - start_time) * 1000}
             
-            suggested_response = self._generate_intelligent_response(prediction, content, features)
+            if first_stage == self.MODE_FAST:
+                model = self.distilled_model
+                probabilities = self._predict_proba_prepared(prepared, model, self.distilled_pipeline)
+                probabilities = {label: float(prob) for label, prob in zip(model.classes_, probabilities)}
+            else:
+                probabilities = self.keyword_scores(prepared['features'])
+            first_confidence = max(probabilities.values())
+            timings['first_stage_ms'] = (time.time() - stage_start) * 1000
             
-            processing_time = time.time() - start_time
+            tier = first_stage
+            escalated = first_confidence < threshold
+            if escalated:
+                stage_start = time.time()
+                tier = self.MODE_FOREST
+                forest_probabilities = self._predict_proba_prepared(prepared, self.model, self.pipeline)
+                probabilities = {label: float(prob) for label, prob in zip(self.model.classes_, forest_probabilities)}
+                timings['forest_ms'] = (time.time() - stage_start) * 1000
             
-            result = {
-                'classification': prediction,
-                'confidence': float(confidence),
-                'probabilities': {
-                    label: float(prob) for label, prob 
-                    in zip(self.model.classes_, probabilities)
-                },
-                'suggested_response': suggested_response,
-                'processing_time': processing_time,
-                'features_detected': features,
-                'text_length': len(content),
-                'processed_text_length': len(processed_text)
+            result = self._build_result(content, prepared, probabilities, tier, start_time)
+            result['cascade'] = {
+                'first_stage': first_stage,
+                'first_stage_confidence': float(first_confidence),
+                'threshold': threshold,
+                'escalated': escalated,
+                **timings
             }
-            
-            logger.info(f"Email classificado como {prediction} (confiança: {confidence:.3f})")
+            self._record_near_duplicate(lookup, result)
             return result
             
         except Exception as e:
             logger.error(f"Erro na classificação: {str(e)}")
             raise
+
+    def _prepare_batch(self, contents: List[str]) -> Dict:
+        """Limpeza, janelas, pré-processamento e features de vários emails (prepare em lote)"""
+        cleaned = [self.clean_content(content) for content in contents]
+        windows = [self.text_window.apply(text) for text, _ in cleaned]
+        return {
+            'cleanup': [removed for _, removed in cleaned],
+            'windows': windows,
+            'processed_texts': [self.preprocess_text(window) for window in windows],
+            'features': [self.extract_window_features(text, window) for (text, _), window in zip(cleaned, windows)]
+        }
     
-    def train_model(self, dataset_path: str) -> Dict[str, float]:
-        """Treina o modelo com dataset"""
+    def predict_proba_batch(self, contents: List[str], mode: Optional[str] = None) -> Dict:
+        """
+        Probabilidades de vários textos com uma única vetorização e uma única chamada ao modelo
+        
+        Returns:
+            Dict: tier, classes, probabilities (n x classes) e, por texto, cleanup
+                (bytes removidos), windows, processed_texts e features
+        """
+        tier, model, pipeline = self._resolve_tier(mode)
+        if not model:
+            raise ValueError("Modelo não foi carregado. Execute o treinamento primeiro.")
+        
+        batch = self._prepare_batch(contents)
+        X_combined = self._build_matrix(batch['processed_texts'], batch['features'], pipeline)
+        
+        # predict equivale ao argmax de predict_proba: uma única passada pelas árvores
+        return {
+            **batch,
+            'tier': tier,
+            'classes': model.classes_,
+            'probabilities': model.predict_proba(X_combined)
+        }
+
+    def classify_batch(self, contents: List[str], mode: Optional[str] = None) -> List[Dict]:
+        """
+        Classifica vários emails com uma única vetorização e uma única chamada ao modelo
+
+        No modo reuse de quase-duplicatas, só os emails sem email parecido recente
+        passam pelo modelo.
+
+        Args:
+            contents: Textos dos emails
+            mode: 'forest' ou 'fast' (padrão: modo configurado no classificador)
+
+        Returns:
+            List[Dict]: Um resultado por email, no mesmo formato de classify
+                (processing_time é o tempo do lote dividido pelo número de emails)
+        """
+        start_time = time.time()
+        tier, model, pipeline = self._resolve_tier(mode)
+        if not model:
+            raise ValueError("Modelo não foi carregado. Execute o treinamento primeiro.")
+        if not contents:
+            return []
+
+        try:
+            batch = self._prepare_batch(contents)
+            lookups = [self._find_near_duplicate(processed_text) for processed_text in batch['processed_texts']]
+            probabilities_list = [self._reusable_probabilities(lookup, tier) for lookup in lookups]
+            pending = [index for index, probabilities in enumerate(probabilities_list) if probabilities is None]
+            if pending:
+                X_combined = self._build_matrix(
+                    [batch['processed_texts'][index] for index in pending],
+                    [batch['features'][index] for index in pending],
+                    pipeline
+                )
+                for index, probabilities in zip(pending, model.predict_proba(X_combined)):
+                    probabilities_list[index] = {label: float(prob) for label, prob in zip(model.classes_, probabilities)}
+            pending = set(pending)
+
+            results = []
+            for index, (content, window, processed_text, features, cleanup, probabilities, lookup) in enumerate(zip(
+                contents, batch['windows'], batch['processed_texts'], batch['features'], batch['cleanup'],
+                probabilities_list, lookups
+            )):
+                prediction = max(probabilities, key=probabilities.get)
+                result = {
+                    'classification': prediction,
+                    'confidence': float(probabilities[prediction]),
+                    'probabilities': probabilities,
+                    'suggested_response': self._generate_intelligent_response(prediction, content, features),
+                    'features_detected': features,
+                    'text_length': len(content),
+                    'processed_text_length': len(processed_text),
+                    'window_length': len(window),
+                    'cleanup': cleanup,
+                    'model_tier': tier
+                }
+                if index in pending:
+                    self._record_near_duplicate(lookup, result)
+                else:
+                    result['near_duplicate'] = {'similarity': lookup['similarity'], 'reused': True}
+                results.append(result)
+
+            processing_time = time.time() - start_time
+            for result in results:
+                result['processing_time'] = processing_time / len(results)
+
+            logger.info(f"Lote de {len(results)} emails classificado em {processing_time:.3f}s")
+            return results
+
+        except Exception as e:
+            logger.error(f"Erro na classificação em lote: {str(e)}")
+            raise
+
+    def train_model(self, dataset_path: str, preprocess_workers: Optional[int] = None,
+                    preprocess_cache_path: Optional[str] = None) -> Dict[str, float]:
+        """
+        Treina o modelo com dataset
+        
+        O pré-processamento é distribuído entre processos e persistido em cache
+        (padrão: default_cache_path(), fora do repositório), de modo que só linhas
+        novas ou alteradas são reprocessadas em um novo treinamento.
+        """
         logger.info("Iniciando treinamento do modelo avançado...")
         
         df = pd.read_csv(dataset_path)
         if 'text' not in df.columns or 'label' not in df.columns:
             raise ValueError("CSV deve conter colunas 'text' e 'label'")
         
-        df['processed_text'] = df['text'].apply(self.preprocess_text)
-        feature_dicts = df['processed_text'].apply(self.extract_features)
-        feature_df = pd.DataFrame(feature_dicts.tolist())
-        
+        if preprocess_workers is None:
+            preprocess_workers = int(os.getenv("PREPROCESS_WORKERS", "0")) or None
+        if preprocess_cache_path is None:
+            preprocess_cache_path = default_cache_path()
+        texts = df['text'].astype(str).tolist()
+        df['processed_text'], _ = self.pipeline.preprocess_many(
+            texts, cache_path=preprocess_cache_path, workers=preprocess_workers
+        )
+        # Features do texto original, como na classificação
         X_text = df['processed_text'].values
-        X_features = feature_df.values
+        X_features = self.pipeline.feature_matrix([self.extract_features(text) for text in texts])
         y = df['label'].values
         
         X_text_train, X_text_test, X_feat_train, X_feat_test, y_train, y_test = train_test_split(
             X_text, X_features, y, test_size=0.2, random_state=42, stratify=y
         )
         
-        self.vectorizer = TfidfVectorizer(
-            max_features=5000,
-            ngram_range=(1, 2),
-            min_df=2,
-            max_df=0.95,
-            sublinear_tf=True
-        )
-        
-        X_text_train_vec = self.vectorizer.fit_transform(X_text_train)
-        X_text_test_vec = self.vectorizer.transform(X_text_test)
-        
-        self.scaler = StandardScaler()
-        X_feat_train_scaled = self.scaler.fit_transform(X_feat_train)
-        X_feat_test_scaled = self.scaler.transform(X_feat_test)
+        vectorizer_params = {
+            'max_features': 5000,
+            'ngram_range': (1, 2),
+            'min_df': 2,
+            'max_df': 0.95,
+            'sublinear_tf': True
+        }
+        model_params = {
+            'n_estimators': 200,
+            'max_depth': 20,
+            'min_samples_split': 5,
+            'min_samples_leaf': 2,
+            'random_state': 42,
+            'class_weight': 'balanced'
+        }
+        driver = TrainingDriver.from_env()
         
-        from scipy.sparse import hstack
-        X_train_combined = hstack([X_text_train_vec, X_feat_train_scaled])
-        X_test_combined = hstack([X_text_test_vec, X_feat_test_scaled])
+        X_train_combined = self.pipeline.fit_transform(X_text_train, X_feat_train, vectorizer_params)
+        X_test_combined = self.pipeline.transform_batch(X_text_test, X_feat_test)
         
-        self.model = RandomForestClassifier(
-            n_estimators=200,
-            max_depth=20,
-            min_samples_split=5,
-            min_samples_leaf=2,
-            random_state=42,
-            class_weight='balanced'
-        )
+        self.model = RandomForestClassifier(**model_params, n_jobs=driver.cpu_budget)
         
         self.model.fit(X_train_combined, y_train)
         
         y_pred = self.model.predict(X_test_combined)
         accuracy = accuracy_score(y_test, y_pred)
-        cv_scores = cross_val_score(self.model, X_train_combined, y_train, cv=5)
-        
-        model_data = {
-            'model': self.model,
-            'vectorizer': self.vectorizer,
-            'scaler': self.scaler
-        }
+        cv_report = driver.cross_validate(X_text_train, X_feat_train, y_train, vectorizer_params, model_params)
+        cv_scores = np.array(cv_report['scores'])
         
         with open(self.model_path, 'wb') as f:
-            pickle.dump(model_data, f)
+            pickle.dump(self.pipeline.to_artifact(self.model), f)
+        self._clear_near_duplicates()
         
         print("\n" + "="*50)
         print("📊 RELATÓRIO DE TREINAMENTO")
         print("="*50)
         print(f"✅ Acurácia no teste: {accuracy:.3f}")
         print(f"✅ Cross-validation média: {cv_scores.mean():.3f} (±{cv_scores.std()*2:.3f})")
+        print(TrainingDriver.format_report(cv_report))
         print("\n📋 Relatório de classificação:")
         print(classification_report(y_test, y_pred))
         
@@ -0,0 +1,156 @@
+# backend/app/services/circuit_breaker.py
+import os
+import time
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class CircuitCall:
+    """Chamada reservada por CircuitBreaker.acquire; probe indica a chamada de teste do modo meio aberto"""
+    __slots__ = ('probe',)
+
+    def __init__(self, probe: bool = False):
+        self.probe = probe
+
+class CircuitBreaker:
+    """
+    Disjuntor do classificador principal.
+
+    Fechado: as chamadas passam e cada resultado (latência, sucesso) entra em uma
+    janela deslizante. O disjuntor abre quando há chamadas demais em andamento
+    (fila), quando a taxa de erro ou a latência p95 da janela passa do limite.
+    Aberto: as chamadas são recusadas (o serviço usa o fallback) por open_seconds.
+    Meio aberto: passa uma chamada de teste por vez; half_open_probes sucessos
+    rápidos seguidos fecham o disjuntor, qualquer falha o abre novamente.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, max_in_flight: int = 32, latency_threshold_ms: float = 2000.0,
+                 error_rate_threshold: float = 0.5, window_size: int = 50, min_calls: int = 10,
+                 open_seconds: float = 15.0, half_open_probes: int = 3):
+        self.max_in_flight = max_in_flight
+        self.latency_threshold_ms = latency_threshold_ms
+        self.error_rate_threshold = error_rate_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_probes = max(1, half_open_probes)
+
+        self.state = self.CLOSED
+        self.last_trip_reason: Optional[str] = None
+        self._window: Deque[Tuple[float, bool]] = deque(maxlen=window_size)
+        self._in_flight = 0
+        self._probe_in_flight = False
+        self._probe_successes = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+        self.stats = {'trips': 0, 'rejected': 0, 'probes': 0, 'recoveries': 0}
+
+    @classmethod
+    def from_env(cls) -> "CircuitBreaker":
+        """Cria o disjuntor a partir das variáveis de ambiente"""
+        return cls(
+            max_in_flight=int(os.getenv("CIRCUIT_MAX_IN_FLIGHT", "32")),
+            latency_threshold_ms=float(os.getenv("CIRCUIT_LATENCY_MS", "2000")),
+            error_rate_threshold=float(os.getenv("CIRCUIT_ERROR_RATE", "0.5")),
+            window_size=int(os.getenv("CIRCUIT_WINDOW", "50")),
+            min_calls=int(os.getenv("CIRCUIT_MIN_CALLS", "10")),
+            open_seconds=float(os.getenv("CIRCUIT_OPEN_SECONDS", "15")),
+            half_open_probes=int(os.getenv("CIRCUIT_HALF_OPEN_PROBES", "3"))
+        )
+
+    def acquire(self) -> Optional[CircuitCall]:
+        """
+        Reserva uma chamada ao classificador principal
+
+        Returns:
+            Optional[CircuitCall]: A reserva, a devolver em release, ou None se a
+                chamada foi recusada
+        """
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                self.state = self.HALF_OPEN
+                self._probe_successes = 0
+                logger.info("🔌 Disjuntor meio aberto: testando o classificador principal")
+
+            if self.state == self.CLOSED:
+                if self._in_flight >= self.max_in_flight:
+                    self._trip(f"fila ({self._in_flight} chamadas em andamento)")
+                    self.stats['rejected'] += 1
+                    return None
+                self._in_flight += 1
+                return CircuitCall()
+
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self._in_flight += 1
+                self.stats['probes'] += 1
+                return CircuitCall(probe=True)
+
+            self.stats['rejected'] += 1
+            return None
+
+    def release(self, call: CircuitCall, latency_seconds: float, success: bool):
+        """
+        Registra o resultado de uma chamada reservada por acquire
+
+        Só a própria chamada de teste decide o modo meio aberto: chamadas reservadas
+        com o disjuntor fechado que terminam depois que ele abriu são ignoradas.
+        """
+        latency_ms = latency_seconds * 1000
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+
+            if call.probe:
+                if self.state != self.HALF_OPEN or not self._probe_in_flight:
+                    return
+                self._probe_in_flight = False
+                if success and latency_ms <= self.latency_threshold_ms:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_probes:
+                        self.state = self.CLOSED
+                        self._window.clear()
+                        self.stats['recoveries'] += 1
+                        logger.info("✅ Disjuntor fechado: classificador principal restabelecido")
+                else:
+                    self._trip("falha no teste do modo meio aberto")
+                return
+
+            if self.state != self.CLOSED:
+                return
+            self._window.append((latency_ms, success))
+            if len(self._window) < self.min_calls:
+                return
+            error_rate = sum(1 for _, ok in self._window if not ok) / len(self._window)
+            if error_rate >= self.error_rate_threshold:
+                self._trip(f"taxa de erro {error_rate:.0%}")
+                return
+            latencies = sorted(latency for latency, _ in self._window)
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            if p95 > self.latency_threshold_ms:
+                self._trip(f"latência p95 {p95:.0f}ms")
+
+    def _trip(self, reason: str):
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self.last_trip_reason = reason
+        self.stats['trips'] += 1
+        logger.warning(f"⚠️ Disjuntor aberto ({reason}): usando o fallback por {self.open_seconds:.0f}s")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            window = list(self._window)
+            return {
+                'state': self.state,
+                'in_flight': self._in_flight,
+                'last_trip_reason': self.last_trip_reason,
+                'window_calls': len(window),
+                'window_error_rate': sum(1 for _, ok in window if not ok) / len(window) if window else None,
+                **self.stats
+            }
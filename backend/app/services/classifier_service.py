@@ -1,11 +1,23 @@
 # backend/app/services/classifier_service.py
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+import hashlib
 import logging
 import os
+import time
+import threading
+import unicodedata
+from fastapi import HTTPException
 from ..models import EmailResponse
 from .advanced_classifier import AdvancedEmailClassifier
 from ..repositories.advanced_model_repository import AdvancedModelRepository
 from ..repositories.email_log_repository import EmailLogRepository
+from ..repositories.traffic_capture_repository import TrafficCaptureRepository
+from .online_learning_service import OnlineLearningService
+from .circuit_breaker import CircuitBreaker, CircuitCall
+from .fallback_classifier import KeywordFallbackClassifier
+from .document_classifier import DocumentClassifier
+from ..utils.single_flight import SingleFlight
+from . import DEFAULT_CLASSIFIER_CONFIG
 
 logger = logging.getLogger(__name__)
 
@@ -14,15 +26,35 @@ class AdvancedClassifierService:
     Serviço de classificação avançada integrado à estrutura existente
     """
 
-    def __init__(self, model_path: str = "./datasets/advanced_model.pkl", fallback_enabled: bool = True):
+    def __init__(self, model_path: str = "./datasets/advanced_model.pkl", fallback_enabled: bool = True,
+                 online_learning: Optional[OnlineLearningService] = None):
         self.model_path = model_path
         self.fallback_enabled = fallback_enabled
+        self.online_learning = online_learning
         self.classifier = None
         self.fallback_classifier = None
         self.model_repository = AdvancedModelRepository(model_path)
-        self.log_repository = EmailLogRepository()
+        # Modelo linear destilado da floresta (modo fast, CLASSIFIER_MODE=fast)
+        self.fast_model_path = os.getenv("FAST_MODEL_PATH", "./datasets/advanced_model_fast.pkl")
+        self.fast_model_repository = AdvancedModelRepository(self.fast_model_path)
+        # Cascata: estágio barato primeiro, floresta só abaixo do limiar de confiança
+        self.cascade_enabled = os.getenv("CLASSIFIER_CASCADE", "false").lower() == "true"
+        self.cascade_threshold = float(os.getenv(
+            "CASCADE_CONFIDENCE_THRESHOLD", str(DEFAULT_CLASSIFIER_CONFIG['confidence_threshold'])
+        ))
+        self.cascade_stats = {'requests': 0, 'escalations': 0, 'first_stage_ms': 0.0, 'forest_ms': 0.0}
+        # Contadores atualizados pelas threads do pool
+        self._stats_lock = threading.Lock()
+        self.log_repository = EmailLogRepository(capture_repository=TrafficCaptureRepository.from_env())
+        # Disjuntor: com o classificador principal lento ou falhando, o tráfego vai para o fallback
+        self.circuit_breaker = CircuitBreaker.from_env() if fallback_enabled else None
+        # Emails idênticos classificados ao mesmo tempo compartilham uma única classificação
+        self.single_flight = SingleFlight() if os.getenv("CLASSIFY_COALESCING", "true").lower() == "true" else None
+        self.batch_duplicates = 0
         # Tentar carregar modelo avançado
         self._initialize_classifier()
+        if self.fallback_enabled:
+            self._initialize_fallback()
         
     
     def _initialize_classifier(self):
@@ -31,7 +63,8 @@ class AdvancedClassifierService:
             if self.model_repository.model_exists():
                 self.classifier = AdvancedEmailClassifier(
                     model_path=self.model_path,
-                    model_repository=self.model_repository
+                    model_repository=self.model_repository,
+                    fast_model_repository=self.fast_model_repository
                 )
                 logger.info(f"✅ Classificador avançado carregado de {self.model_path}")
             else:
@@ -40,31 +73,297 @@ class AdvancedClassifierService:
         except Exception as e:
             logger.error(f"❌ Erro ao carregar classificador avançado: {e}")
     
+    def _initialize_fallback(self):
+        """Fallback por palavras-chave; usa as palavras e respostas do classificador avançado, mesmo sem modelo"""
+        try:
+            self.fallback_classifier = KeywordFallbackClassifier(self.classifier or AdvancedEmailClassifier())
+        except Exception as e:
+            logger.error(f"❌ Erro ao criar classificador de fallback: {e}")
+
+    def _acquire_main(self) -> Optional[CircuitCall]:
+        """Reserva do classificador principal, se ele deve atender (carregado e disjuntor permitindo)"""
+        if not self.classifier:
+            return None
+        return self.circuit_breaker.acquire() if self.circuit_breaker else CircuitCall()
+
+    def _release_main(self, call: CircuitCall, started_at: float, success: bool, count: int = 1):
+        if self.circuit_breaker:
+            self.circuit_breaker.release(call, (time.perf_counter() - started_at) / max(1, count), success)
+
+    def _fallback_reason(self) -> str:
+        if not self.classifier:
+            return "unavailable"
+        return "circuit_open"
+
+    @staticmethod
+    def _content_key(content: str) -> str:
+        """Hash do conteúdo normalizado (Unicode NFC, espaços colapsados)"""
+        normalized = ' '.join(unicodedata.normalize('NFC', content).split())
+        return hashlib.blake2b(normalized.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _coalesced_copy(self, received_at: float, content: str, email_response: EmailResponse) -> EmailResponse:
+        """Cópia da resposta compartilhada para outra requisição (cada uma pode alterar a sua), com log próprio"""
+        copy = email_response.model_copy(deep=True)
+        copy.additional_info['coalesced'] = True
+        self._save_log(received_at, content, copy, copy.method_used)
+        return copy
+
     def classify(self, content: str) -> EmailResponse:
         """
         Classifica email usando o melhor classificador disponível e registra log.
+        
+        O fallback atende quando o modelo avançado não está carregado, quando falha ou
+        quando o disjuntor está aberto; method_used indica o caminho
+        (fallback_unavailable, fallback_error ou fallback_circuit_open).
+        Requisições simultâneas com o mesmo conteúdo normalizado aguardam uma única
+        classificação (additional_info['coalesced'] nas que não a executaram).
         """
         if not content or not content.strip():
             raise ValueError("Conteúdo do email não pode estar vazio")
+        if not self.single_flight:
+            return self._classify_one(content)
+        received_at = time.time()
+        email_response, shared, waiters = self.single_flight.do(
+            self._content_key(content), lambda: self._classify_one(content)
+        )
+        if shared:
+            return self._coalesced_copy(received_at, content, email_response)
+        # Com outras requisições aguardando, o objeto compartilhado não pode ser alterado por quem executou
+        return email_response.model_copy(deep=True) if waiters else email_response
+
+    def _classify_one(self, content: str) -> EmailResponse:
+        received_at = time.time()
+        fallback_reason = self._fallback_reason()
         # Tentar classificador avançado primeiro
-        if self.classifier:
+        call = self._acquire_main()
+        if call:
+            started_at = time.perf_counter()
             try:
-                result = self.classifier.classify(content)
-                email_response = self._convert_to_email_response(result, method="advanced")
-                # Registrar log da classificação
-                self.log_repository.save_log({
-                    "input": content,
-                    "output": email_response.model_dump() if hasattr(email_response, "model_dump") else str(email_response),
-                    "method": "advanced"
-                })
-                return email_response
+                if self.cascade_enabled:
+                    result = self.classifier.classify_cascade(content, self.cascade_threshold)
+                    if 'cascade' in result:
+                        self._record_cascade(result['cascade'])
+                    method = f"cascade_{result['model_tier']}"
+                else:
+                    result = self.classifier.classify(content)
+                    method = "advanced_fast" if result.get('model_tier') == AdvancedEmailClassifier.MODE_FAST else "advanced"
+                if result.get('near_duplicate', {}).get('reused'):
+                    method = "near_duplicate"
             except Exception as e:
+                self._release_main(call, started_at, success=False)
                 logger.error(f"Erro no classificador avançado: {e}")
                 if not self.fallback_enabled:
                     raise
+                fallback_reason = "error"
+            else:
+                self._release_main(call, started_at, success=True)
+                online_prediction = self._apply_online_learning(content, result)
+                if online_prediction and online_prediction['served']:
+                    method = "online"
+                email_response = self._convert_to_email_response(result, method=method)
+                if 'cascade' in result:
+                    email_response.additional_info['cascade'] = result['cascade']
+                if 'near_duplicate' in result:
+                    email_response.additional_info['near_duplicate'] = result['near_duplicate']
+                if online_prediction:
+                    email_response.additional_info['online_model'] = online_prediction
+                self._save_log(received_at, content, email_response, method)
+                return email_response
+
+        if self.fallback_enabled and self.fallback_classifier:
+            return self._classify_fallback([content], fallback_reason, received_at)[0]
         # Se nenhum classificador está disponível
         raise RuntimeError("Nenhum classificador está disponível no momento")
-    
+
+    def classify_document(self, content: str) -> EmailResponse:
+        """
+        Classifica um documento longo por trechos (páginas ou parágrafos) e registra log.
+        
+        Sem o classificador avançado (ou com o disjuntor aberto), o documento é
+        classificado inteiro pelo caminho normal, com fallback.
+        """
+        if not content or not content.strip():
+            raise ValueError("Conteúdo do email não pode estar vazio")
+        call = self._acquire_main()
+        if not call:
+            return self.classify(content)
+        received_at = time.time()
+        started_at = time.perf_counter()
+        try:
+            result = DocumentClassifier.from_env(self.classifier).classify(content)
+        except Exception:
+            self._release_main(call, started_at, success=False)
+            raise
+        document = result['document']
+        self._release_main(call, started_at, success=True, count=document['chunks_classified'])
+        method = f"document_{document['aggregation']}"
+        email_response = self._convert_to_email_response(result, method=method)
+        email_response.additional_info['document'] = document
+        self._save_log(received_at, content, email_response, method)
+        return email_response
+
+    def _classify_fallback(self, contents: List[str], reason: str, received_at: float) -> List[EmailResponse]:
+        method = f"fallback_{reason}"
+        responses = []
+        for result in self.fallback_classifier.classify_batch(contents):
+            email_response = self._convert_to_email_response(result, method=method)
+            if self.circuit_breaker:
+                email_response.additional_info['circuit_state'] = self.circuit_breaker.state
+            responses.append(email_response)
+        for content, email_response in zip(contents, responses):
+            self._save_log(received_at, content, email_response, method)
+        return responses
+
+    def _save_log(self, received_at: float, content: str, email_response: EmailResponse, method: str):
+        """Registrar log da classificação"""
+        self.log_repository.save_log({
+            "timestamp": received_at,
+            "input": content,
+            "output": email_response.model_dump() if hasattr(email_response, "model_dump") else str(email_response),
+            "method": method
+        })
+
+    def classify_batch(self, contents: List[str]) -> List[EmailResponse]:
+        """
+        Classifica um lote de emails em uma única chamada ao modelo e registra log de cada um.
+        
+        Textos repetidos no lote (mesmo conteúdo normalizado) são classificados uma vez.
+        """
+        if any(not content or not content.strip() for content in contents):
+            raise ValueError("Conteúdo do email não pode estar vazio")
+        if not self.single_flight:
+            return self._classify_batch(contents)
+        keys = [self._content_key(content) for content in contents]
+        positions: Dict[str, int] = {}
+        unique_contents: List[str] = []
+        for content, key in zip(contents, keys):
+            if key not in positions:
+                positions[key] = len(unique_contents)
+                unique_contents.append(content)
+        if len(unique_contents) == len(contents):
+            return self._classify_batch(contents)
+
+        received_at = time.time()
+        with self._stats_lock:
+            self.batch_duplicates += len(contents) - len(unique_contents)
+        unique_responses = self._classify_batch(unique_contents)
+        responses = []
+        answered = set()
+        for content, key in zip(contents, keys):
+            index = positions[key]
+            if index in answered:
+                responses.append(self._coalesced_copy(received_at, content, unique_responses[index]))
+            else:
+                answered.add(index)
+                responses.append(unique_responses[index])
+        return responses
+
+    def _classify_batch(self, contents: List[str]) -> List[EmailResponse]:
+        received_at = time.time()
+        fallback_reason = self._fallback_reason()
+        call = self._acquire_main()
+        if call:
+            started_at = time.perf_counter()
+            try:
+                results = self.classifier.classify_batch(contents)
+            except Exception as e:
+                self._release_main(call, started_at, success=False)
+                logger.error(f"Erro no classificador avançado (lote): {e}")
+                if not self.fallback_enabled:
+                    raise
+                fallback_reason = "error"
+            else:
+                self._release_main(call, started_at, success=True, count=len(contents))
+                return self._batch_responses(contents, results, received_at)
+
+        if self.fallback_enabled and self.fallback_classifier:
+            return self._classify_fallback(contents, fallback_reason, received_at)
+        raise RuntimeError("Nenhum classificador está disponível no momento")
+
+    def _batch_responses(self, contents: List[str], results: List[Dict], received_at: float) -> List[EmailResponse]:
+        responses = []
+        for content, result in zip(contents, results):
+            method = "advanced_fast_batch" if result.get('model_tier') == AdvancedEmailClassifier.MODE_FAST else "advanced_batch"
+            if result.get('near_duplicate', {}).get('reused'):
+                method = "near_duplicate_batch"
+            online_prediction = self._apply_online_learning(content, result)
+            if online_prediction and online_prediction['served']:
+                method = "online_batch"
+            email_response = self._convert_to_email_response(result, method=method)
+            if 'near_duplicate' in result:
+                email_response.additional_info['near_duplicate'] = result['near_duplicate']
+            if online_prediction:
+                email_response.additional_info['online_model'] = online_prediction
+            self._save_log(received_at, content, email_response, method)
+            responses.append(email_response)
+        return responses
+
+    def _record_cascade(self, cascade: Dict):
+        with self._stats_lock:
+            stats = self.cascade_stats
+            stats['requests'] += 1
+            stats['first_stage_ms'] += cascade['first_stage_ms']
+            if cascade['escalated']:
+                stats['escalations'] += 1
+                stats['forest_ms'] += cascade['forest_ms']
+
+    def get_cascade_stats(self) -> Optional[Dict]:
+        """Taxa de escalonamento e latência média de cada estágio desde o início do processo"""
+        if not self.cascade_enabled:
+            return None
+        with self._stats_lock:
+            stats = dict(self.cascade_stats)
+        requests, escalations = stats['requests'], stats['escalations']
+        return {
+            'threshold': self.cascade_threshold,
+            'first_stage': (AdvancedEmailClassifier.MODE_FAST
+                            if self.classifier and self.classifier.distilled_model is not None else "keywords"),
+            'requests': requests,
+            'escalations': escalations,
+            'escalation_rate': escalations / requests if requests else None,
+            'avg_first_stage_ms': stats['first_stage_ms'] / requests if requests else None,
+            'avg_forest_ms': stats['forest_ms'] / escalations if escalations else None
+        }
+
+    def get_coalescing_stats(self) -> Optional[Dict]:
+        """Requisições que aguardaram uma classificação idêntica em andamento e duplicatas em lotes"""
+        if not self.single_flight:
+            return None
+        stats = self.single_flight.stats
+        requests = stats['leaders'] + stats['coalesced']
+        with self._stats_lock:
+            batch_duplicates = self.batch_duplicates
+        return {
+            'in_flight': self.single_flight.in_flight(),
+            'classifications': stats['leaders'],
+            'coalesced': stats['coalesced'],
+            'coalesced_ratio': stats['coalesced'] / requests if requests else None,
+            'batch_duplicates': batch_duplicates
+        }
+
+    def _apply_online_learning(self, content: str, result: Dict) -> Optional[Dict]:
+        """Consulta o modelo incremental (shadow ou serve) e ajusta a resposta sugerida se a classe mudou"""
+        if not self.online_learning:
+            return None
+        forest_classification = result['classification']
+        prediction = self.online_learning.apply(content, result)
+        if prediction and result['classification'] != forest_classification:
+            result['suggested_response'] = self.classifier._generate_intelligent_response(
+                result['classification'], content, result.get('features_detected', {})
+            )
+        return prediction
+
+    def record_feedback(self, text: str, label: str, predicted_label: Optional[str] = None) -> Dict:
+        """
+        Registra a correção de uma classificação para o aprendizado incremental
+
+        Raises:
+            HTTPException: 503 se o aprendizado incremental não estiver configurado
+        """
+        if not self.online_learning:
+            raise HTTPException(status_code=503, detail="Registro de correções indisponível")
+        return self.online_learning.record_feedback(text, label, predicted_label)
+
     def _convert_to_email_response(self, result: Dict, method: str = "advanced") -> EmailResponse:
         """Converte resultado do classificador avançado para EmailResponse"""
         return EmailResponse(
@@ -76,7 +375,9 @@ class AdvancedClassifierService:
             additional_info={
                 'probabilities': result.get('probabilities', {}),
                 'features_detected': result.get('features_detected', {}),
-                'text_length': result.get('text_length', 0)
+                'text_length': result.get('text_length', 0),
+                'model_tier': result.get('model_tier'),
+                'cleanup': result.get('cleanup')
             }
         )
     
@@ -98,7 +399,15 @@ class AdvancedClassifierService:
             'advanced_model_path': self.model_path,
             'fallback_available': self.fallback_classifier is not None,
             'fallback_enabled': self.fallback_enabled,
-            'fallback_type': type(self.fallback_classifier).__name__ if self.fallback_classifier else None
+            'fallback_type': type(self.fallback_classifier).__name__ if self.fallback_classifier else None,
+            'classifier_mode': self.classifier.mode if self.classifier else None,
+            'fast_model_loaded': bool(self.classifier and self.classifier.distilled_model is not None),
+            'cascade': self.get_cascade_stats(),
+            'circuit_breaker': self.circuit_breaker.get_stats() if self.circuit_breaker else None,
+            'coalescing': self.get_coalescing_stats(),
+            'near_duplicates': self.classifier.get_near_duplicate_stats() if self.classifier else None,
+            'cleanup': self.classifier.get_cleanup_stats() if self.classifier else None,
+            'online_learning': self.online_learning.get_stats() if self.online_learning else None
         }
     
     def health_check(self) -> Dict:
@@ -115,6 +424,8 @@ class AdvancedClassifierService:
             status['test_classification'] = 'passed'
             status['test_result'] = test_result.classification
             status['test_method'] = test_result.method_used
+            if test_result.method_used.startswith("fallback"):
+                status['status'] = 'degraded'
         except Exception as e:
             status['status'] = 'degraded'
             status['test_classification'] = 'failed'
@@ -0,0 +1,128 @@
+# backend/app/services/document_classifier.py
+import os
+import time
+import logging
+from typing import Any, Dict, List
+import numpy as np
+from .advanced_classifier import AdvancedEmailClassifier
+from ..utils.document_chunking import AGGREGATIONS, CHUNK_MODES, aggregate_probabilities, split_chunks
+
+logger = logging.getLogger(__name__)
+
+class DocumentClassifier:
+    """
+    Classificação de documentos longos (PDFs de várias páginas) por trechos.
+
+    O texto é dividido em páginas ou parágrafos, os trechos são classificados em
+    lotes (uma chamada ao modelo por lote) e as probabilidades são agregadas
+    (max, mean ou length_weighted). Nas médias, entre um lote e outro, a
+    classificação para quando a confiança agregada atinge early_stop_confidence
+    e os trechos restantes já não podem inverter o resultado. Com max nunca há
+    parada antecipada: um único trecho ainda não lido pode inverter o resultado.
+    """
+
+    def __init__(self, classifier: AdvancedEmailClassifier, aggregation: str = "length_weighted",
+                 chunk_mode: str = "auto", max_chunk_chars: int = 2000, min_chunk_chars: int = 200,
+                 batch_size: int = 16, max_chunks: int = 200, early_stop_confidence: float = 0.8):
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Agregação inválida: {aggregation}. Use uma de {', '.join(AGGREGATIONS)}")
+        if chunk_mode not in CHUNK_MODES:
+            raise ValueError(f"Modo de divisão inválido: {chunk_mode}. Use um de {', '.join(CHUNK_MODES)}")
+        self.classifier = classifier
+        self.aggregation = aggregation
+        self.chunk_mode = chunk_mode
+        self.max_chunk_chars = max_chunk_chars
+        self.min_chunk_chars = min_chunk_chars
+        self.batch_size = max(1, batch_size)
+        self.max_chunks = max_chunks
+        self.early_stop_confidence = early_stop_confidence
+
+    @classmethod
+    def from_env(cls, classifier: AdvancedEmailClassifier) -> "DocumentClassifier":
+        """Cria o classificador de documentos a partir das variáveis de ambiente"""
+        return cls(
+            classifier,
+            aggregation=os.getenv("DOCUMENT_AGGREGATION", "length_weighted").strip().lower(),
+            chunk_mode=os.getenv("DOCUMENT_CHUNK_MODE", "auto").strip().lower(),
+            max_chunk_chars=int(os.getenv("DOCUMENT_CHUNK_MAX_CHARS", "2000")),
+            min_chunk_chars=int(os.getenv("DOCUMENT_CHUNK_MIN_CHARS", "200")),
+            batch_size=int(os.getenv("DOCUMENT_BATCH_CHUNKS", "16")),
+            max_chunks=int(os.getenv("DOCUMENT_MAX_CHUNKS", "200")),
+            early_stop_confidence=float(os.getenv("DOCUMENT_EARLY_STOP_CONFIDENCE", "0.8"))
+        )
+
+    def _decided(self, aggregate: Dict[str, float], seen_weight: float, remaining_weight: float) -> bool:
+        # Com max, um trecho restante com probabilidade 1 para a segunda classe sempre a iguala ou ultrapassa
+        if self.aggregation == "max":
+            return False
+        ranked = sorted(aggregate.values(), reverse=True)
+        if ranked[0] < self.early_stop_confidence:
+            return False
+        if len(ranked) < 2:
+            return True
+        # Pior caso: todos os trechos restantes com probabilidade 1 para a segunda classe
+        return (ranked[0] - ranked[1]) * seen_weight > remaining_weight
+
+    def classify(self, content: str) -> Dict[str, Any]:
+        """Classifica o documento; o resultado segue o formato de AdvancedEmailClassifier.classify"""
+        start_time = time.time()
+        chunks = split_chunks(content, self.chunk_mode, self.max_chunk_chars, self.min_chunk_chars)
+        truncated = bool(self.max_chunks) and len(chunks) > self.max_chunks
+        chunks = chunks[:self.max_chunks] if self.max_chunks else chunks
+        if not chunks:
+            raise ValueError("Documento sem texto para classificar")
+
+        lengths = [len(chunk) for chunk in chunks]
+        weights = lengths if self.aggregation == "length_weighted" else [1] * len(chunks)
+        total_weight = float(sum(weights))
+        chunk_results: List[Dict[str, Any]] = []
+        probabilities: List[Dict[str, float]] = []
+        early_stopped = False
+        tier = None
+
+        for start in range(0, len(chunks), self.batch_size):
+            batch = self.classifier.predict_proba_batch(chunks[start:start + self.batch_size])
+            tier, classes = batch['tier'], batch['classes']
+            for offset, row in enumerate(batch['probabilities']):
+                best = int(np.argmax(row))
+                probabilities.append({str(label): float(prob) for label, prob in zip(classes, row)})
+                chunk_results.append({
+                    'index': start + offset,
+                    'classification': str(classes[best]),
+                    'confidence': float(row[best]),
+                    'length': lengths[start + offset]
+                })
+            aggregate = aggregate_probabilities(probabilities, lengths[:len(probabilities)], self.aggregation)
+            seen_weight = float(sum(weights[:len(probabilities)]))
+            if len(probabilities) < len(chunks) and self._decided(
+                aggregate, seen_weight / total_weight, (total_weight - seen_weight) / total_weight
+            ):
+                early_stopped = True
+                break
+
+        prediction = max(aggregate, key=aggregate.get)
+        window = self.classifier.text_window.apply(content)
+        features = self.classifier.extract_window_features(content, window)
+        logger.info(
+            f"Documento classificado como {prediction} ({len(chunk_results)}/{len(chunks)} trechos, "
+            f"agregação {self.aggregation}{', parada antecipada' if early_stopped else ''})"
+        )
+        return {
+            'classification': prediction,
+            'confidence': float(aggregate[prediction]),
+            'probabilities': aggregate,
+            'suggested_response': self.classifier._generate_intelligent_response(prediction, content, features),
+            'processing_time': time.time() - start_time,
+            'features_detected': features,
+            'text_length': len(content),
+            'model_tier': tier,
+            'document': {
+                'aggregation': self.aggregation,
+                'chunk_mode': self.chunk_mode,
+                'chunks_total': len(chunks),
+                'chunks_classified': len(chunk_results),
+                'early_stopped': early_stopped,
+                'truncated': truncated,
+                'chunks': chunk_results
+            }
+        }
@@ -0,0 +1,160 @@
+# backend/app/services/extraction_cache_service.py
+import os
+import json
+import zlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from .file_storage_service import FileStorageService
+
+logger = logging.getLogger(__name__)
+
+# Incrementar quando a extração mudar de forma que invalide textos já armazenados
+EXTRACTION_CACHE_VERSION = 2
+
+
+class ExtractionCacheService:
+    """
+    Cache de texto extraído de arquivos, endereçado pelo SHA-256 dos bytes do upload.
+
+    Cada entrada é um único objeto no storage com o texto e os metadados da extração
+    compactados (zlib). O tamanho total é limitado a max_bytes com remoção LRU; o índice
+    de uso fica em memória e é reconstruído a partir do storage na inicialização.
+    """
+
+    ENTRY_SUFFIX = ".entry"
+
+    def __init__(self, cache_dir: str, max_bytes: int,
+                 storage_service: Optional[FileStorageService] = None,
+                 compression_level: int = 6):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.compression_level = compression_level
+        self.storage_service = storage_service or FileStorageService()
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'errors': 0}
+        if self.enabled:
+            self._load_index()
+
+    @classmethod
+    def from_env(cls) -> "ExtractionCacheService":
+        """Cria o cache a partir das variáveis de ambiente (EXTRACTION_CACHE_MAX_MB=0 desativa)"""
+        return cls(
+            cache_dir=os.getenv("EXTRACTION_CACHE_DIR", "./cache/extraction"),
+            max_bytes=int(float(os.getenv("EXTRACTION_CACHE_MAX_MB", "256")) * 1024 * 1024)
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _entry_path(self, key: str) -> str:
+        # Subdiretório pelo prefixo do hash evita diretórios com milhares de arquivos
+        return os.path.join(self.cache_dir, key[:2], key + self.ENTRY_SUFFIX)
+
+    @staticmethod
+    def make_key(sha256: str, kind: str, max_chars: int = 0) -> str:
+        """Chave da entrada: o mesmo conteúdo extraído com outro tipo ou orçamento gera outro texto"""
+        return f"{sha256}-{kind}-{max_chars}-v{EXTRACTION_CACHE_VERSION}"
+
+    def _load_index(self):
+        """Reconstrói o índice LRU a partir das entradas existentes (mais antigas primeiro)"""
+        for path in self.storage_service.list_files(self.cache_dir):
+            if not path.endswith(self.ENTRY_SUFFIX):
+                continue
+            key = os.path.basename(path)[:-len(self.ENTRY_SUFFIX)]
+            size = self.storage_service.file_size(path)
+            self._index[key] = size
+            self._total_bytes += size
+        if self._index:
+            logger.info(f"🗄️ Cache de extração: {len(self._index)} entradas ({self._total_bytes / 1024 / 1024:.1f}MB)")
+        self._evict()
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Busca o texto extraído de uma entrada
+
+        Returns:
+            Optional[Tuple[str, Dict]]: Texto e metadados da extração, ou None se ausente/corrompida
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            if key not in self._index:
+                self.stats['misses'] += 1
+                return None
+            self._index.move_to_end(key)
+
+        path = self._entry_path(key)
+        try:
+            entry = json.loads(zlib.decompress(self.storage_service.load_file(path)).decode('utf-8'))
+            text, metadata = entry['text'], entry['metadata']
+        except Exception as e:
+            logger.warning(f"⚠️ Entrada de cache inválida descartada ({key[:12]}): {e}")
+            with self._lock:
+                self.stats['errors'] += 1
+                self.stats['misses'] += 1
+                self._remove(key)
+            return None
+
+        with self._lock:
+            self.stats['hits'] += 1
+        return text, metadata
+
+    def put(self, key: str, text: str, metadata: Dict[str, Any]) -> bool:
+        """Armazena o texto extraído e os metadados, removendo as entradas menos usadas se necessário"""
+        if not self.enabled:
+            return False
+        data = zlib.compress(
+            json.dumps({'text': text, 'metadata': metadata}, ensure_ascii=False).encode('utf-8'),
+            self.compression_level
+        )
+        if len(data) > self.max_bytes:
+            return False
+        if not self.storage_service.save_file(self._entry_path(key), data):
+            with self._lock:
+                self.stats['errors'] += 1
+            logger.warning(f"⚠️ Não foi possível gravar entrada de cache ({key[:12]})")
+            return False
+
+        with self._lock:
+            self._total_bytes += len(data) - self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self.stats['stores'] += 1
+            self._evict()
+        return True
+
+    def _remove(self, key: str):
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+            self.storage_service.delete_file(self._entry_path(key))
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._index:
+            key = next(iter(self._index))
+            self._remove(key)
+            self.stats['evictions'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._index),
+                'size_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                **self.stats
+            }
+
+
+_extraction_cache: Optional[ExtractionCacheService] = None
+
+def get_extraction_cache() -> ExtractionCacheService:
+    """Retorna a instância global do cache de extração, criando-a se necessário"""
+    global _extraction_cache
+    if _extraction_cache is None:
+        _extraction_cache = ExtractionCacheService.from_env()
+    return _extraction_cache
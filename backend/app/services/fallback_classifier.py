@@ -0,0 +1,56 @@
+# backend/app/services/fallback_classifier.py
+import math
+import time
+import logging
+from typing import Dict, List
+from .advanced_classifier import AdvancedEmailClassifier
+
+logger = logging.getLogger(__name__)
+
+class KeywordFallbackClassifier:
+    """
+    Classificador de contingência sem modelo treinado.
+
+    Naive Bayes sobre as palavras-chave do AdvancedEmailClassifier: cada ocorrência
+    de palavra-chave produtiva (ou improdutiva) multiplica a razão de chances da
+    classe correspondente por keyword_odds. Custa apenas a extração de features,
+    e por isso atende quando a floresta está lenta, falhando ou não carregada.
+    Na ausência de palavras-chave o email é tratado como produtivo, para que
+    passe por um atendente.
+    """
+
+    def __init__(self, classifier: AdvancedEmailClassifier, keyword_odds: float = 3.0,
+                 productive_prior: float = 0.5):
+        # Só as palavras-chave, features e respostas do classificador são usadas; não exige modelo carregado
+        self.classifier = classifier
+        self.log_keyword_odds = math.log(keyword_odds)
+        self.log_prior_odds = math.log(productive_prior / (1 - productive_prior))
+
+    def predict_proba(self, features: Dict[str, float]) -> Dict[str, float]:
+        log_odds = self.log_prior_odds + self.log_keyword_odds * (
+            features.get('productive_keywords', 0) - features.get('unproductive_keywords', 0)
+        )
+        productive_prob = 1 / (1 + math.exp(-log_odds))
+        return {'PRODUTIVO': productive_prob, 'IMPRODUTIVO': 1 - productive_prob}
+
+    def classify(self, content: str) -> Dict:
+        """Classifica email no mesmo formato de AdvancedEmailClassifier.classify"""
+        start_time = time.time()
+        cleaned, cleanup = self.classifier.clean_content(content)
+        features = self.classifier.extract_features(cleaned)
+        probabilities = self.predict_proba(features)
+        prediction = max(probabilities, key=probabilities.get)
+        return {
+            'classification': prediction,
+            'confidence': float(probabilities[prediction]),
+            'probabilities': probabilities,
+            'suggested_response': self.classifier._generate_intelligent_response(prediction, content, features),
+            'processing_time': time.time() - start_time,
+            'features_detected': features,
+            'text_length': len(content),
+            'cleanup': cleanup,
+            'model_tier': 'fallback'
+        }
+
+    def classify_batch(self, contents: List[str]) -> List[Dict]:
+        return [self.classify(content) for content in contents]
@@ -0,0 +1,319 @@
+# backend/app/services/feature_pipeline.py
+import re
+import json
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from scipy.sparse import hstack
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import StandardScaler
+from nltk.corpus import stopwords
+from nltk.tokenize import word_tokenize, sent_tokenize
+from nltk.stem import RSLPStemmer
+from ..utils.preprocessing_cache import preprocess_texts
+from ..utils.fast_tfidf import FastTfidfTransformer
+
+logger = logging.getLogger(__name__)
+
+# Alterar sempre que o resultado de EmailTextPreprocessor mudar (invalida o cache de pré-processamento)
+PREPROCESSING_VERSION = "1"
+# Alterar sempre que FeaturePipeline.extract_features mudar (invalida os artefatos treinados)
+FEATURE_VERSION = "1"
+
+# Palavras-chave otimizadas para contexto empresarial
+PRODUCTIVE_KEYWORDS = frozenset({
+    'erro', 'bug', 'falha', 'problema', 'defeito', 'crash',
+    'não funciona', 'quebrado', 'parou', 'travou', 'lento',
+    'preciso', 'solicito', 'gostaria', 'como fazer', 'ajuda',
+    'suporte', 'orientação', 'instrução', 'tutorial',
+    'urgente', 'crítico', 'importante', 'prioritário', 'asap',
+    'deadline', 'prazo', 'vencimento',
+    'configuração', 'instalação', 'setup', 'integração',
+    'api', 'sistema', 'plataforma', 'aplicativo', 'software',
+    'login', 'senha', 'acesso', 'bloqueado', 'desabilitado',
+    'permissão', 'autenticação', 'conta',
+    'pagamento', 'cobrança', 'fatura', 'contrato', 'renovação',
+    'cancelamento', 'reembolso', 'upgrade', 'downgrade',
+    'status', 'andamento', 'protocolo', 'número', 'código',
+    'relatório', 'dados', 'informações', 'detalhes'
+})
+UNPRODUCTIVE_KEYWORDS = frozenset({
+    'obrigado', 'obrigada', 'agradeço', 'agradecimento',
+    'gratidão', 'grato', 'grata', 'reconhecido',
+    'parabéns', 'felicitações', 'congratulações',
+    'sucesso', 'conquista', 'vitória', 'prêmio',
+    'aniversário', 'nascimento', 'casamento', 'formatura',
+    'festa', 'comemoração', 'celebração',
+    'natal', 'ano novo', 'páscoa', 'feriado', 'férias',
+    'final de semana', 'descanso',
+    'cumprimentos', 'saudações', 'abraços', 'beijos',
+    'tenha um bom dia', 'boa sorte', 'tudo de bom',
+    'família', 'saúde', 'melhoras', 'cuidados',
+    'felicidade', 'alegria', 'paz'
+})
+
+# Ordem das colunas numéricas da matriz (e do StandardScaler)
+FEATURE_NAMES = (
+    'length', 'word_count', 'sentence_count', 'avg_word_length',
+    'question_marks', 'exclamation_marks', 'periods', 'commas',
+    'uppercase_ratio', 'repeated_chars',
+    'has_email', 'has_phone', 'has_url', 'has_numbers', 'has_time', 'has_date',
+    'productive_keywords', 'unproductive_keywords', 'keyword_ratio'
+)
+
+_REPEATED_CHARS = re.compile(r'(.)\1{2,}')
+_EMAIL = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE = re.compile(r'\b\d{8,11}\b')
+_URL = re.compile(r'http[s]?://|www\.')
+_NUMBER = re.compile(r'\d+')
+_TIME = re.compile(r'\d{1,2}:\d{2}')
+_DATE = re.compile(r'\d{1,2}/\d{1,2}')
+
+
+class EmailTextPreprocessor:
+    """
+    Pré-processamento de texto do classificador (normalização, stopwords e stemming).
+    Objeto picklable, para ser enviado a processos no treinamento paralelo: o stemmer
+    e as stopwords são carregados sob demanda em cada processo.
+    """
+
+    def __init__(self, keep_words: set):
+        self.keep_words = frozenset(keep_words)
+        self._stemmer = None
+        self._stopwords = None
+
+    def __getstate__(self):
+        return {'keep_words': self.keep_words}
+
+    def __setstate__(self, state):
+        self.__init__(state['keep_words'])
+
+    def _load(self):
+        if self._stopwords is None:
+            self._stemmer = RSLPStemmer()
+            self._stopwords = set(stopwords.words('portuguese'))
+
+    def cache_namespace(self) -> Optional[str]:
+        """Identificador no cache de pré-processamento; None sem os dados do NLTK (texto só normalizado)"""
+        try:
+            self._load()
+            word_tokenize("teste", language='portuguese')
+        except Exception:
+            return None
+        return f"{type(self).__qualname__}:nltk"
+
+    def __call__(self, text: str) -> str:
+        if not text:
+            return ""
+
+        text = text.lower()
+        text = re.sub(r'[^\w\s\?!.,;:]', ' ', text)
+        text = re.sub(r'\s+', ' ', text)
+
+        try:
+            self._load()
+            tokens = word_tokenize(text, language='portuguese')
+
+            processed_tokens = []
+            for token in tokens:
+                if len(token) > 2 and (token not in self._stopwords or token in self.keep_words):
+                    try:
+                        stemmed = self._stemmer.stem(token)
+                        processed_tokens.append(stemmed)
+                    except:
+                        processed_tokens.append(token)
+
+            return ' '.join(processed_tokens)
+
+        except Exception as e:
+            logger.warning(f"Erro no processamento NLTK: {e}")
+            return text
+
+
+class FeaturePipeline:
+    """
+    Pipeline único de features do classificador: pré-processamento → features → TF-IDF → escala.
+
+    O treinamento ajusta o pipeline (fit_transform) e o grava no artefato
+    (to_artifact); a API o reconstrói na carga (from_artifact). As features
+    numéricas são sempre extraídas do texto original e o TF-IDF do texto
+    pré-processado, nos dois caminhos. O artefato guarda a versão do pipeline
+    (hash das versões de pré-processamento e features, dos nomes das features e
+    das palavras-chave); uma versão diferente da do código recusa o artefato.
+    Artefatos antigos, sem versão, são carregados como legados.
+    """
+
+    def __init__(self, vectorizer=None, scaler=None, legacy: bool = False):
+        self.productive_keywords = PRODUCTIVE_KEYWORDS
+        self.unproductive_keywords = UNPRODUCTIVE_KEYWORDS
+        self.preprocessor = EmailTextPreprocessor(self.productive_keywords | self.unproductive_keywords)
+        self.vectorizer = vectorizer
+        self.scaler = scaler
+        self.legacy = legacy
+        self._row_transformer: Optional[FastTfidfTransformer] = None
+
+    @staticmethod
+    def version() -> str:
+        """Hash da definição do pipeline no código atual"""
+        definition = {
+            'preprocessing': PREPROCESSING_VERSION,
+            'features': FEATURE_VERSION,
+            'feature_names': list(FEATURE_NAMES),
+            'productive_keywords': sorted(PRODUCTIVE_KEYWORDS),
+            'unproductive_keywords': sorted(UNPRODUCTIVE_KEYWORDS)
+        }
+        return hashlib.sha256(json.dumps(definition, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.vectorizer is not None
+
+    # ==================== ARTEFATO ====================
+
+    @classmethod
+    def from_artifact(cls, model_data: Dict[str, Any]) -> "FeaturePipeline":
+        """
+        Pipeline ajustado de um artefato {model, vectorizer, scaler, pipeline}
+
+        Raises:
+            ValueError: Artefato treinado com outra versão do pipeline
+        """
+        info = model_data.get('pipeline')
+        if info is None:
+            logger.warning("⚠️ Artefato sem versão do pipeline (legado): re-treine para garantir "
+                           "as mesmas features do treinamento")
+            return cls(model_data['vectorizer'], model_data.get('scaler'), legacy=True)
+        if info.get('version') != cls.version():
+            raise ValueError(
+                f"Artefato treinado com o pipeline {info.get('version')}, código atual usa {cls.version()}. "
+                "Re-treine o modelo"
+            )
+        return cls(model_data['vectorizer'], model_data.get('scaler'))
+
+    def to_artifact(self, model, **extra) -> Dict[str, Any]:
+        """Artefato do modelo com o pipeline ajustado e sua versão (sem versão se o pipeline for legado)"""
+        artifact = {'model': model, 'vectorizer': self.vectorizer, 'scaler': self.scaler, **extra}
+        if not self.legacy:
+            artifact['pipeline'] = {
+                'version': self.version(),
+                'preprocessing_version': PREPROCESSING_VERSION,
+                'feature_version': FEATURE_VERSION,
+                'feature_names': list(FEATURE_NAMES)
+            }
+        return artifact
+
+    # ==================== ETAPAS ====================
+
+    def preprocess(self, text: str) -> str:
+        return self.preprocessor(text)
+
+    def preprocess_many(self, texts: Sequence[str], cache_path: Optional[str] = None,
+                        workers: Optional[int] = None) -> Tuple[List[str], Dict[str, Any]]:
+        """Pré-processamento de vários textos em processos, com cache em disco opcional"""
+        return preprocess_texts(texts, self.preprocessor, PREPROCESSING_VERSION, cache_path=cache_path, workers=workers)
+
+    @staticmethod
+    def count_sentences(text: str) -> int:
+        """Frases pelo tokenizador do NLTK (sem os dados dele, pela pontuação final)"""
+        try:
+            return len(sent_tokenize(text, language='portuguese'))
+        except:
+            return text.count('.') + text.count('!') + text.count('?')
+
+    def extract_features(self, text: str) -> Dict[str, float]:
+        """Extrai características avançadas do texto original (19 features, na ordem de FEATURE_NAMES)"""
+        features = {}
+
+        features['length'] = len(text)
+        words = text.split()
+        features['word_count'] = len(words)
+
+        features['sentence_count'] = self.count_sentences(text)
+
+        features['avg_word_length'] = np.mean([len(word) for word in words]) if words else 0
+
+        features['question_marks'] = text.count('?')
+        features['exclamation_marks'] = text.count('!')
+        features['periods'] = text.count('.')
+        features['commas'] = text.count(',')
+
+        features['uppercase_ratio'] = sum(1 for c in text if c.isupper()) / len(text) if text else 0
+        features['repeated_chars'] = len(_REPEATED_CHARS.findall(text))
+
+        features['has_email'] = 1 if _EMAIL.search(text) else 0
+        features['has_phone'] = 1 if _PHONE.search(text) else 0
+        features['has_url'] = 1 if _URL.search(text) else 0
+        features['has_numbers'] = 1 if _NUMBER.search(text) else 0
+        features['has_time'] = 1 if _TIME.search(text) else 0
+        features['has_date'] = 1 if _DATE.search(text) else 0
+
+        text_lower = text.lower()
+        productive_count = sum(1 for keyword in self.productive_keywords if keyword in text_lower)
+        unproductive_count = sum(1 for keyword in self.unproductive_keywords if keyword in text_lower)
+
+        features['productive_keywords'] = productive_count
+        features['unproductive_keywords'] = unproductive_count
+        features['keyword_ratio'] = productive_count / (unproductive_count + 1)
+
+        return features
+
+    @staticmethod
+    def feature_matrix(features: Union[Sequence[Dict[str, float]], np.ndarray]) -> np.ndarray:
+        """Matriz n x 19 das features, na ordem de FEATURE_NAMES"""
+        if isinstance(features, np.ndarray):
+            return features
+        return np.array([[row[name] for name in FEATURE_NAMES] for row in features], dtype=float)
+
+    # ==================== AJUSTE E TRANSFORMAÇÃO ====================
+
+    def fit_transform(self, processed_texts: Sequence[str], features, vectorizer_params: Dict[str, Any]):
+        """
+        Ajusta TF-IDF e StandardScaler e retorna a matriz de treino [TF-IDF | features escaladas]
+
+        Raises:
+            RuntimeError: Dados do NLTK ausentes (o artefato teria a versão do pipeline,
+                mas textos sem stopwords removidas nem stemming)
+        """
+        if self.preprocessor.cache_namespace() is None:
+            raise RuntimeError(
+                "Dados do NLTK ausentes (stopwords, punkt, rslp): o pré-processamento ficaria degradado. "
+                "Instale-os antes de treinar"
+            )
+        self.vectorizer = TfidfVectorizer(**vectorizer_params)
+        self.scaler = StandardScaler()
+        self.legacy = False
+        self._row_transformer = None
+        text_vec = self.vectorizer.fit_transform(processed_texts)
+        return hstack([text_vec, self.scaler.fit_transform(self.feature_matrix(features))]).tocsr()
+
+    def transform_batch(self, processed_texts: Sequence[str], features):
+        """Matriz [TF-IDF | features escaladas] de vários textos já pré-processados"""
+        text_vec = self.vectorizer.transform(processed_texts)
+        feature_array = self.feature_matrix(features)
+        if self.scaler:
+            feature_array = self.scaler.transform(feature_array)
+        return hstack([text_vec, feature_array]).tocsr()
+
+    def transform(self, processed_text: str, features: Dict[str, float]):
+        """Linha [TF-IDF | features escaladas] de um texto, pelo caminho rápido quando o vetorizador permite"""
+        row_transformer = self._get_row_transformer()
+        if row_transformer is None:
+            return self.transform_batch([processed_text], [features])
+        return row_transformer.transform_one(processed_text, self.feature_matrix([features])[0])
+
+    def transform_texts(self, texts: Sequence[str]):
+        """Matriz de textos originais: pré-processamento e features incluídos"""
+        return self.transform_batch([self.preprocess(text) for text in texts],
+                                    [self.extract_features(text) for text in texts])
+
+    def _get_row_transformer(self) -> Optional[FastTfidfTransformer]:
+        """Transformador de documento único (reconstruído se vetorizador ou scaler mudarem)"""
+        transformer = self._row_transformer
+        if transformer is not None and transformer.vectorizer is self.vectorizer and transformer.scaler is self.scaler:
+            return transformer
+        transformer = None
+        if self.scaler is not None and FastTfidfTransformer.supports(self.vectorizer):
+            transformer = FastTfidfTransformer(self.vectorizer, self.scaler)
+        self._row_transformer = transformer
+        return transformer
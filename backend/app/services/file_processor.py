@@ -1,16 +1,30 @@
-import PyPDF2
-import io
+import os
+import mmap
+import asyncio
 import logging
-from typing import Union
+from typing import Any, Dict, Optional, Tuple, Union
 from fastapi import HTTPException, UploadFile
+from ..utils.pdf_extraction import extract_pdf_text
+from ..utils.mailbox_parser import iter_messages
+from ..utils.upload_spool import SpooledUpload
+from .pdf_extraction_pool import get_pdf_extraction_pool
+from .extraction_cache_service import ExtractionCacheService, get_extraction_cache
 
 logger = logging.getLogger(__name__)
 
 class FileProcessor:
     """Processador de arquivos para extração de texto"""
     
-    SUPPORTED_EXTENSIONS = {'.txt', '.pdf'}
+    SUPPORTED_EXTENSIONS = {'.txt', '.pdf', '.eml', '.mbox', '.zip'}
+    # Arquivos com várias mensagens: processados apenas por /api/classify-mailbox
+    MAILBOX_EXTENSIONS = {'.mbox', '.zip'}
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+    MAILBOX_MAX_FILE_SIZE = int(os.getenv("MAILBOX_MAX_FILE_SIZE_MB", "200")) * 1024 * 1024
+    UPLOAD_CHUNK_SIZE = 64 * 1024
+    # Uploads maiores que o limite vão para arquivo temporário em vez de ficar em memória
+    UPLOAD_SPOOL_THRESHOLD = int(os.getenv("UPLOAD_SPOOL_THRESHOLD_KB", "1024")) * 1024
+    # Orçamento de caracteres extraídos de PDFs (a API de texto aceita no máximo 50.000)
+    PDF_CHAR_BUDGET = int(os.getenv("PDF_CHAR_BUDGET", "50000"))
     
     @classmethod
     async def process_uploaded_file(cls, file: UploadFile) -> str:
@@ -26,42 +40,33 @@ class FileProcessor:
         Raises:
             HTTPException: Se houver erro no processamento
         """
-        try:
-            # Validações básicas
-            cls._validate_file(file)
-            
-            # Ler conteúdo do arquivo
-            content = await file.read()
-            
-            # Validar tamanho
-            if len(content) > cls.MAX_FILE_SIZE:
-                raise HTTPException(
-                    status_code=413,
-                    detail=f"Arquivo muito grande. Máximo permitido: {cls.MAX_FILE_SIZE // (1024*1024)}MB"
-                )
-            
-            # Extrair texto baseado na extensão
-            filename_lower = file.filename.lower()
+        text, _ = await cls.process_uploaded_file_with_info(file)
+        return text
+    
+    @classmethod
+    async def process_uploaded_file_with_info(cls, file: UploadFile) -> Tuple[str, Dict[str, Any]]:
+        """
+        Processa arquivo enviado e extrai texto junto com metadados da extração
+        
+        Args:
+            file: Arquivo enviado via upload
             
-            if filename_lower.endswith('.pdf'):
-                text = cls._extract_text_from_pdf(content)
-            elif filename_lower.endswith('.txt'):
-                text = cls._extract_text_from_txt(content)
-            else:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Formato de arquivo não suportado"
-                )
+        Returns:
+            Tuple[str, Dict]: Texto extraído e informações da extração (páginas lidas/puladas, etc.)
             
-            # Validar se texto foi extraído
-            if not text.strip():
-                raise HTTPException(
-                    status_code=400,
-                    detail="Arquivo vazio ou não foi possível extrair texto legível"
-                )
+        Raises:
+            HTTPException: Se houver erro no processamento
+        """
+        try:
+            # Validações básicas
+            cls.validate_single_email_file(file)
             
-            logger.info(f"Texto extraído com sucesso: {len(text)} caracteres")
-            return text.strip()
+            # Ler conteúdo em blocos, validando o tamanho durante a leitura
+            upload = await cls.read_upload(file)
+            try:
+                return await cls.extract_text_from_upload(upload, file.filename)
+            finally:
+                upload.close()
             
         except HTTPException:
             raise
@@ -72,6 +77,148 @@ class FileProcessor:
                 detail=f"Erro interno no processamento do arquivo: {str(e)}"
             )
     
+    @classmethod
+    async def extract_text_from_upload(cls, upload: SpooledUpload, filename: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Extrai o texto de um upload já recebido (usado pelo endpoint e pelos jobs assíncronos)
+        
+        Args:
+            upload: Conteúdo recebido (o chamador continua responsável por fechá-lo)
+            filename: Nome do arquivo enviado (define o formato pela extensão)
+            
+        Returns:
+            Tuple[str, Dict]: Texto extraído e informações da extração
+            
+        Raises:
+            HTTPException: Se o formato não for suportado ou não houver texto legível
+        """
+        # Extrair texto baseado na extensão
+        filename_lower = filename.lower()
+        if filename_lower.endswith('.pdf'):
+            kind, max_chars = 'pdf', cls.PDF_CHAR_BUDGET
+        elif filename_lower.endswith('.txt'):
+            kind, max_chars = 'txt', 0
+        elif filename_lower.endswith('.eml'):
+            kind, max_chars = 'eml', 0
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail="Formato de arquivo não suportado"
+            )
+        
+        # Uploads repetidos (mesmos bytes) reaproveitam o texto já extraído
+        cache = get_extraction_cache()
+        cache_key = ExtractionCacheService.make_key(upload.sha256, kind, max_chars)
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(None, cache.get, cache_key) if cache.enabled else None
+        
+        if cached is not None:
+            text, extraction_info = cached
+            logger.info(f"🗄️ Texto recuperado do cache de extração ({upload.sha256[:12]})")
+        else:
+            extraction_info: Dict[str, Any] = {}
+            if kind == 'pdf':
+                # Parsing em processo isolado, com timeout e limite de memória
+                text, extraction_info = await get_pdf_extraction_pool().extract(upload, max_chars)
+            elif kind == 'eml':
+                with upload.open() as stream:
+                    text = cls._extract_text_from_eml(stream, filename)
+            else:
+                with upload.view() as content:
+                    text = cls._extract_text_from_txt(content)
+            if cache.enabled and text.strip():
+                await loop.run_in_executor(None, cache.put, cache_key, text, extraction_info)
+        
+        if cache.enabled:
+            extraction_info = {
+                **extraction_info,
+                'extraction_cache': 'hit' if cached is not None else 'miss',
+                'file_sha256': upload.sha256
+            }
+        
+        # Validar se texto foi extraído
+        if not text.strip():
+            raise HTTPException(
+                status_code=400,
+                detail="Arquivo vazio ou não foi possível extrair texto legível"
+            )
+        
+        logger.info(f"Texto extraído com sucesso: {len(text)} caracteres")
+        return text.strip(), extraction_info
+    
+    @classmethod
+    async def read_mailbox_upload(cls, file: UploadFile) -> SpooledUpload:
+        """
+        Valida e lê um arquivo de emails (.eml, .mbox ou .zip) para ingestão em massa
+        
+        Raises:
+            HTTPException: 400 se o formato não for suportado, 413 se exceder MAILBOX_MAX_FILE_SIZE
+        """
+        cls._validate_file(file)
+        if not file.filename.lower().endswith(('.eml', *cls.MAILBOX_EXTENSIONS)):
+            raise HTTPException(
+                status_code=400,
+                detail="Formato não suportado. Formatos aceitos: .eml, .mbox, .zip"
+            )
+        return await cls.read_upload(file, cls.MAILBOX_MAX_FILE_SIZE)
+    
+    @classmethod
+    def validate_single_email_file(cls, file: UploadFile) -> None:
+        """Valida arquivo com uma única mensagem (.txt, .pdf ou .eml)"""
+        cls._validate_file(file)
+        if cls.is_mailbox_file(file.filename):
+            raise HTTPException(
+                status_code=400,
+                detail="Arquivos .mbox e .zip contêm várias mensagens. Use o endpoint /api/classify-mailbox"
+            )
+    
+    @classmethod
+    def is_mailbox_file(cls, filename: str) -> bool:
+        """Indica se o arquivo pode conter várias mensagens"""
+        return filename.lower().endswith(tuple(cls.MAILBOX_EXTENSIONS))
+    
+    @classmethod
+    async def read_upload(cls, file: UploadFile, max_size: Optional[int] = None) -> SpooledUpload:
+        """
+        Lê o upload em blocos, rejeitando-o assim que passar do tamanho máximo.
+        O conteúdo fica em memória até UPLOAD_SPOOL_THRESHOLD e depois em arquivo
+        temporário; o SHA-256 é calculado durante a leitura.
+        
+        Args:
+            file: Arquivo enviado via upload
+            max_size: Tamanho máximo em bytes (padrão: MAX_FILE_SIZE)
+            
+        Returns:
+            SpooledUpload: Conteúdo recebido (o chamador deve fechá-lo)
+            
+        Raises:
+            HTTPException: 413 se o arquivo exceder o tamanho máximo
+        """
+        max_size = max_size or cls.MAX_FILE_SIZE
+        too_large = HTTPException(
+            status_code=413,
+            detail=f"Arquivo muito grande. Máximo permitido: {max_size // (1024*1024)}MB"
+        )
+        # Tamanho declarado, quando disponível, permite rejeitar sem ler nada
+        declared_size = getattr(file, 'size', None)
+        if isinstance(declared_size, int) and declared_size > max_size:
+            raise too_large
+        
+        upload = SpooledUpload(cls.UPLOAD_SPOOL_THRESHOLD)
+        try:
+            while True:
+                chunk = await file.read(cls.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                if upload.size + len(chunk) > max_size:
+                    raise too_large
+                upload.write(chunk)
+            upload.finalize()
+        except BaseException:
+            upload.close()
+            raise
+        return upload
+    
     @classmethod
     def _validate_file(cls, file: UploadFile) -> None:
         """Valida arquivo enviado"""
@@ -90,55 +237,40 @@ class FileProcessor:
             )
     
     @classmethod
-    def _extract_text_from_pdf(cls, pdf_content: bytes) -> str:
+    def _extract_text_from_pdf(cls, pdf_content: bytes, max_chars: Optional[int] = None) -> Tuple[str, Dict[str, Any]]:
         """
-        Extrai texto de arquivo PDF
+        Extrai texto de arquivo PDF no processo atual, página a página e respeitando o orçamento de caracteres.
+        Uploads da API usam o pool isolado (PDFExtractionPool); este método serve a scripts e ao modo sem workers.
         
         Args:
             pdf_content: Conteúdo do PDF em bytes
+            max_chars: Orçamento de caracteres (padrão: PDF_CHAR_BUDGET; 0 desativa o corte)
             
         Returns:
-            str: Texto extraído
+            Tuple[str, Dict]: Texto extraído e estatísticas de páginas lidas/puladas
         """
+        if max_chars is None:
+            max_chars = cls.PDF_CHAR_BUDGET
         try:
             logger.info("Iniciando extração de texto do PDF")
-            
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
-            
-            if len(pdf_reader.pages) == 0:
-                raise ValueError("PDF não contém páginas")
-            
-            text_parts = []
-            
-            for page_num, page in enumerate(pdf_reader.pages, 1):
-                try:
-                    page_text = page.extract_text()
-                    if page_text.strip():
-                        text_parts.append(page_text)
-                        logger.debug(f"Página {page_num}: {len(page_text)} caracteres extraídos")
-                except Exception as e:
-                    logger.warning(f"Erro ao extrair texto da página {page_num}: {str(e)}")
-                    continue
-            
-            if not text_parts:
-                raise ValueError("Não foi possível extrair texto de nenhuma página do PDF")
-            
-            full_text = '\n'.join(text_parts)
-            logger.info(f"PDF processado com sucesso: {len(pdf_reader.pages)} páginas, {len(full_text)} caracteres")
-            
-            return full_text
-            
+            full_text, stats = extract_pdf_text(pdf_content, max_chars)
+            logger.info(
+                f"PDF processado com sucesso: {stats['pages_read']}/{stats['pages_total']} páginas lidas, "
+                f"{stats['pages_skipped']} sem texto, {len(full_text)} caracteres"
+                + (" (orçamento atingido)" if stats['char_budget_reached'] else "")
+            )
+            return full_text, stats
         except Exception as e:
             logger.error(f"Erro ao processar PDF: {str(e)}")
             raise ValueError(f"Erro ao processar PDF: {str(e)}")
     
     @classmethod
-    def _extract_text_from_txt(cls, txt_content: bytes) -> str:
+    def _extract_text_from_txt(cls, txt_content: Union[bytes, memoryview, mmap.mmap]) -> str:
         """
         Extrai texto de arquivo TXT
         
         Args:
-            txt_content: Conteúdo do TXT em bytes
+            txt_content: Conteúdo do TXT em bytes (ou memoryview/mmap do upload, sem cópia)
             
         Returns:
             str: Texto extraído
@@ -151,7 +283,7 @@ class FileProcessor:
             
             for encoding in encodings:
                 try:
-                    text = txt_content.decode(encoding)
+                    text = str(txt_content, encoding)
                     logger.info(f"Arquivo TXT decodificado com sucesso usando {encoding}")
                     return text
                 except UnicodeDecodeError:
@@ -164,6 +296,26 @@ class FileProcessor:
             logger.error(f"Erro ao processar arquivo TXT: {str(e)}")
             raise ValueError(f"Erro ao processar arquivo TXT: {str(e)}")
     
+    @classmethod
+    def _extract_text_from_eml(cls, stream, filename: str) -> str:
+        """
+        Extrai assunto e corpo (text/plain, ou text/html convertido) de um arquivo .eml
+        
+        Args:
+            stream: Arquivo binário com a mensagem
+            filename: Nome do arquivo enviado
+            
+        Returns:
+            str: Texto extraído
+        """
+        try:
+            logger.info("Iniciando extração de texto do arquivo EML")
+            record = next(iter_messages(stream, filename))
+            return record['text']
+        except Exception as e:
+            logger.error(f"Erro ao processar arquivo EML: {str(e)}")
+            raise ValueError(f"Erro ao processar arquivo EML: {str(e)}")
+    
     @classmethod
     def get_file_info(cls, file: UploadFile) -> dict:
         """
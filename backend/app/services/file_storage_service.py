@@ -1,3 +1,4 @@
+from typing import List
 from ..interfaces.storage_interface import StorageInterface, LocalStorage
 
 class FileStorageService:
@@ -12,3 +13,15 @@ class FileStorageService:
 
     def load_file(self, path: str) -> bytes:
         return self.storage.load(path)
+
+    def delete_file(self, path: str) -> bool:
+        return self.storage.delete(path)
+
+    def file_exists(self, path: str) -> bool:
+        return self.storage.exists(path)
+
+    def list_files(self, prefix: str) -> List[str]:
+        return self.storage.list(prefix)
+
+    def file_size(self, path: str) -> int:
+        return self.storage.size(path)
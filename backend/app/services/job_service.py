@@ -0,0 +1,269 @@
+# backend/app/services/job_service.py
+import os
+import time
+import uuid
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+from fastapi import HTTPException
+from ..repositories.job_repository import JobRepository
+from ..utils.upload_spool import SpooledUpload
+from .classifier_service import AdvancedClassifierService
+from .file_processor import FileProcessor
+
+logger = logging.getLogger(__name__)
+
+class JobService:
+    """
+    Fila de jobs de classificação assíncrona com persistência em SQLite.
+
+    Os jobs são executados por um número fixo de workers no event loop da aplicação
+    (o trabalho pesado, inclusive o acesso ao SQLite e a serialização de
+    parâmetros e resultados, vai para threads e para o pool de extração de PDF). Há duas
+    faixas de prioridade: 'interactive' é sempre atendida primeiro e tem
+    interactive_reserved workers que jobs 'bulk' nunca ocupam, de modo que lotes
+    grandes não atrasam requisições interativas.
+    """
+
+    LANE_INTERACTIVE = "interactive"
+    LANE_BULK = "bulk"
+    LANES = (LANE_INTERACTIVE, LANE_BULK)
+
+    def __init__(self, repository: JobRepository,
+                 service_provider: Callable[[], AdvancedClassifierService],
+                 data_dir: str, max_workers: int = 2, interactive_reserved: int = 1,
+                 ttl_seconds: float = 3600, max_queued: int = 1000,
+                 cleanup_interval: float = 60, batch_chunk_size: int = 64):
+        self.repository = repository
+        self.service_provider = service_provider
+        self.data_dir = data_dir
+        self.max_workers = max(1, max_workers)
+        self.interactive_reserved = min(max(0, interactive_reserved), self.max_workers - 1)
+        self.ttl_seconds = ttl_seconds
+        self.max_queued = max_queued
+        self.cleanup_interval = cleanup_interval
+        self.batch_chunk_size = max(1, batch_chunk_size)
+        os.makedirs(data_dir, exist_ok=True)
+
+        self._queues: Dict[str, Deque[str]] = {lane: deque() for lane in self.LANES}
+        self._running: Dict[str, int] = {lane: 0 for lane in self.LANES}
+        self._condition: Optional[asyncio.Condition] = None
+        self._tasks: List[asyncio.Task] = []
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'expired': 0}
+
+    @classmethod
+    def from_env(cls, service_provider: Callable[[], AdvancedClassifierService]) -> "JobService":
+        """Cria a fila a partir das variáveis de ambiente"""
+        data_dir = os.getenv("JOB_DATA_DIR", "./jobs")
+        return cls(
+            repository=JobRepository(os.path.join(data_dir, "jobs.db")),
+            service_provider=service_provider,
+            data_dir=data_dir,
+            max_workers=int(os.getenv("JOB_WORKERS", "2")),
+            interactive_reserved=int(os.getenv("JOB_INTERACTIVE_RESERVED", "1")),
+            ttl_seconds=float(os.getenv("JOB_TTL_SECONDS", "3600")),
+            max_queued=int(os.getenv("JOB_MAX_QUEUED", "1000")),
+            cleanup_interval=float(os.getenv("JOB_CLEANUP_INTERVAL", "60"))
+        )
+
+    @property
+    def bulk_capacity(self) -> int:
+        """Máximo de jobs 'bulk' simultâneos (os demais workers ficam reservados para 'interactive')"""
+        return self.max_workers - self.interactive_reserved
+
+    # ==================== CICLO DE VIDA ====================
+
+    async def start(self):
+        """Reenfileira jobs pendentes (inclusive os interrompidos por reinício) e inicia os workers"""
+        if self._tasks:
+            return
+        self._condition = asyncio.Condition()
+        requeued = await asyncio.to_thread(self.repository.requeue_running)
+        for job in await asyncio.to_thread(self.repository.list_pending):
+            self._queues[job['lane']].append(job['id'])
+        pending = sum(len(queue) for queue in self._queues.values())
+        if pending:
+            logger.info(f"📋 {pending} jobs pendentes reenfileirados ({requeued} interrompidos)")
+        self._tasks = [asyncio.create_task(self._worker_loop()) for _ in range(self.max_workers)]
+        self._tasks.append(asyncio.create_task(self._cleanup_loop()))
+        logger.info(
+            f"✅ Fila de jobs iniciada: {self.max_workers} workers "
+            f"({self.interactive_reserved} reservados para jobs interativos)"
+        )
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # ==================== SUBMISSÃO E CONSULTA ====================
+
+    async def submit_file(self, upload: SpooledUpload, filename: str, lane: str = LANE_INTERACTIVE) -> Dict[str, Any]:
+        """Registra um job de classificação de arquivo; o conteúdo é movido para o diretório de jobs"""
+        self._check_capacity(lane)
+        job_id = uuid.uuid4().hex
+        extension = os.path.splitext(filename)[1].lower()
+        payload_path = os.path.join(self.data_dir, f"{job_id}{extension}")
+        await asyncio.to_thread(upload.persist, payload_path)
+        job = await asyncio.to_thread(
+            self.repository.create, job_id, 'file', lane, {'filename': filename}, payload_path
+        )
+        await self._enqueue(job)
+        return job
+
+    async def submit_batch(self, texts: List[str], lane: str = LANE_BULK) -> Dict[str, Any]:
+        """Registra um job de classificação de uma lista de textos"""
+        self._check_capacity(lane)
+        job = await asyncio.to_thread(self.repository.create, uuid.uuid4().hex, 'batch', lane, {'texts': texts})
+        await self._enqueue(job)
+        return job
+
+    async def get_job(self, job_id: str) -> Dict[str, Any]:
+        """
+        Raises:
+            HTTPException: 404 se o job não existir ou já tiver expirado
+        """
+        job = await asyncio.to_thread(self.repository.get, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job não encontrado ou expirado")
+        return job
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'workers': self.max_workers,
+            'interactive_reserved': self.interactive_reserved,
+            'queued': {lane: len(queue) for lane, queue in self._queues.items()},
+            'running': dict(self._running),
+            'jobs_by_status': self.repository.count_by_status(),
+            **self.stats
+        }
+
+    def _check_capacity(self, lane: str):
+        if lane not in self.LANES:
+            raise HTTPException(status_code=400, detail=f"Prioridade inválida. Use: {', '.join(self.LANES)}")
+        if sum(len(queue) for queue in self._queues.values()) >= self.max_queued:
+            raise HTTPException(status_code=429, detail="Fila de jobs cheia. Tente novamente mais tarde.")
+
+    async def _enqueue(self, job: Dict[str, Any]):
+        self.stats['submitted'] += 1
+        async with self._condition:
+            self._queues[job['lane']].append(job['id'])
+            self._condition.notify_all()
+        logger.info(f"📋 Job {job['id']} ({job['kind']}, {job['lane']}) enfileirado")
+
+    # ==================== EXECUÇÃO ====================
+
+    def _pick_lane(self) -> Optional[str]:
+        if self._queues[self.LANE_INTERACTIVE]:
+            return self.LANE_INTERACTIVE
+        if self._queues[self.LANE_BULK] and self._running[self.LANE_BULK] < self.bulk_capacity:
+            return self.LANE_BULK
+        return None
+
+    async def _worker_loop(self):
+        while True:
+            async with self._condition:
+                await self._condition.wait_for(lambda: self._pick_lane() is not None)
+                lane = self._pick_lane()
+                job_id = self._queues[lane].popleft()
+                self._running[lane] += 1
+            try:
+                await self._run_job(job_id)
+            finally:
+                async with self._condition:
+                    self._running[lane] -= 1
+                    # Libera uma vaga de 'bulk' para quem estiver aguardando
+                    self._condition.notify_all()
+
+    async def _run_job(self, job_id: str):
+        job = await asyncio.to_thread(self.repository.get, job_id)
+        if job is None or job['status'] != JobRepository.STATUS_QUEUED:
+            return
+        await asyncio.to_thread(self.repository.mark_running, job_id)
+        start_time = time.time()
+        try:
+            if job['kind'] == 'file':
+                result = await self._run_file_job(job)
+            else:
+                result = await self._run_batch_job(job)
+            await asyncio.to_thread(self.repository.complete, job_id, result, self.ttl_seconds)
+            self.stats['completed'] += 1
+            logger.info(f"✅ Job {job_id} concluído em {time.time() - start_time:.2f}s")
+        except asyncio.CancelledError:
+            # Encerramento da aplicação: o job volta para a fila no próximo start
+            raise
+        except HTTPException as e:
+            await self._fail(job_id, str(e.detail))
+        except Exception as e:
+            logger.error(f"❌ Erro no job {job_id}: {e}")
+            await self._fail(job_id, str(e))
+        await asyncio.to_thread(self._remove_payload, job)
+
+    @staticmethod
+    def _remove_payload(job: Dict[str, Any]):
+        payload_path = job.get('payload_path')
+        if payload_path and os.path.exists(payload_path):
+            os.remove(payload_path)
+
+    async def _fail(self, job_id: str, error: str):
+        await asyncio.to_thread(self.repository.fail, job_id, error, self.ttl_seconds)
+        self.stats['failed'] += 1
+        logger.warning(f"⚠️ Job {job_id} falhou: {error}")
+
+    async def _run_file_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        filename = job['params']['filename']
+        # O arquivo só é removido ao final do job (_remove_payload): se a aplicação for
+        # encerrada no meio da extração, o job é reenfileirado com o arquivo intacto
+        upload = SpooledUpload.from_path(job['payload_path'])
+        await asyncio.to_thread(self.repository.update_progress, job['id'], 0.1, "Extraindo texto")
+        text, extraction_info = await FileProcessor.extract_text_from_upload(upload, filename)
+        if len(text) < 10:
+            raise ValueError("Arquivo contém muito pouco texto para classificação (mínimo 10 caracteres).")
+
+        await asyncio.to_thread(self.repository.update_progress, job['id'], 0.6, "Classificando")
+        service = self.service_provider()
+        response = await asyncio.get_running_loop().run_in_executor(None, service.classify, text)
+        response.additional_info.update({
+            'filename': filename,
+            'file_size': len(text),
+            'extraction_method': 'file_upload',
+            **extraction_info
+        })
+        return response.model_dump()
+
+    async def _run_batch_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        texts = job['params']['texts']
+        service = self.service_provider()
+        loop = asyncio.get_running_loop()
+        results = []
+        for start in range(0, len(texts), self.batch_chunk_size):
+            chunk = texts[start:start + self.batch_chunk_size]
+            responses = await loop.run_in_executor(None, service.classify_batch, chunk)
+            results.extend(response.model_dump() for response in responses)
+            await asyncio.to_thread(
+                self.repository.update_progress,
+                job['id'], len(results) / len(texts), f"{len(results)}/{len(texts)} textos classificados"
+            )
+        return {'count': len(results), 'results': results}
+
+    # ==================== LIMPEZA ====================
+
+    async def _cleanup_loop(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.cleanup_expired)
+            except Exception as e:
+                logger.error(f"❌ Erro na limpeza de jobs expirados: {e}")
+            await asyncio.sleep(self.cleanup_interval)
+
+    def cleanup_expired(self) -> int:
+        """Remove jobs finalizados com TTL vencido (e arquivos remanescentes)"""
+        removed = self.repository.delete_expired()
+        for job in removed:
+            self._remove_payload(job)
+        if removed:
+            self.stats['expired'] += len(removed)
+            logger.info(f"🧹 {len(removed)} jobs expirados removidos")
+        return len(removed)
@@ -0,0 +1,149 @@
+# backend/app/services/mailbox_ingestion_service.py
+import os
+import json
+import time
+import zipfile
+import logging
+from typing import Any, Dict, Iterator, List, Optional
+from fastapi import HTTPException
+from ..utils.mailbox_parser import MailboxLimitError, MailboxLimits, iter_messages
+from ..utils.upload_spool import SpooledUpload
+from .classifier_service import AdvancedClassifierService
+
+logger = logging.getLogger(__name__)
+
+class MailboxIngestionService:
+    """
+    Ingestão em massa de exportações de email (.eml, .mbox ou .zip).
+    As mensagens são lidas em fluxo, classificadas em lotes e devolvidas como
+    NDJSON (uma linha JSON por mensagem, seguida de uma linha de resumo).
+    """
+
+    MIN_TEXT_LENGTH = 10
+
+    def __init__(self, classifier_service: AdvancedClassifierService,
+                 batch_size: int = 32, limits: Optional[MailboxLimits] = None):
+        self.classifier_service = classifier_service
+        self.batch_size = max(1, batch_size)
+        self.limits = limits or MailboxLimits()
+
+    @classmethod
+    def from_env(cls, classifier_service: AdvancedClassifierService) -> "MailboxIngestionService":
+        """Cria o serviço com lote e limites definidos nas variáveis de ambiente"""
+        return cls(
+            classifier_service,
+            batch_size=int(os.getenv("MAILBOX_BATCH_SIZE", "32")),
+            limits=MailboxLimits(
+                max_messages=int(os.getenv("MAILBOX_MAX_MESSAGES", "10000")),
+                max_total_bytes=int(os.getenv("MAILBOX_MAX_UNCOMPRESSED_MB", "500")) * 1024 * 1024,
+                max_compression_ratio=int(os.getenv("MAILBOX_MAX_COMPRESSION_RATIO", "100"))
+            )
+        )
+
+    @staticmethod
+    def validate(upload: SpooledUpload, filename: str):
+        """
+        Valida o arquivo antes de iniciar a resposta em fluxo (depois disso não há como retornar 400)
+
+        Raises:
+            HTTPException: 400 se o .zip for inválido
+        """
+        if filename.lower().endswith('.zip'):
+            with upload.open() as stream:
+                if not zipfile.is_zipfile(stream):
+                    raise HTTPException(status_code=400, detail="Arquivo .zip inválido ou corrompido")
+
+    def stream_results(self, upload: SpooledUpload, filename: str) -> Iterator[bytes]:
+        """
+        Gera as linhas NDJSON com o resultado de cada mensagem e o resumo final.
+        Limites excedidos no meio da leitura encerram o fluxo com uma linha de erro.
+        O upload é fechado ao final.
+        """
+        start_time = time.time()
+        summary: Dict[str, Any] = {
+            'messages': 0, 'classified': 0, 'skipped': 0, 'errors': 0, 'by_classification': {}
+        }
+        batch: List[Dict[str, Any]] = []
+        try:
+            with upload.open() as stream:
+                for index, record in enumerate(iter_messages(stream, filename, self.limits)):
+                    summary['messages'] += 1
+                    record['index'] = index
+                    batch.append(record)
+                    if len(batch) >= self.batch_size:
+                        yield from self._classify_batch(batch, summary)
+                        batch = []
+                if batch:
+                    yield from self._classify_batch(batch, summary)
+            summary['status'] = 'completed'
+        except MailboxLimitError as e:
+            logger.warning(f"⚠️ Ingestão interrompida por limite: {e}")
+            summary['status'] = 'aborted'
+            summary['error'] = str(e)
+        except Exception as e:
+            logger.error(f"❌ Erro na ingestão de {filename}: {e}")
+            summary['status'] = 'failed'
+            summary['error'] = str(e)
+        finally:
+            upload.close()
+
+        summary['elapsed_seconds'] = time.time() - start_time
+        logger.info(
+            f"📬 Ingestão de {filename}: {summary['classified']}/{summary['messages']} mensagens classificadas "
+            f"em {summary['elapsed_seconds']:.1f}s"
+        )
+        yield self._line({'summary': summary})
+
+    def _classify_batch(self, batch: List[Dict[str, Any]], summary: Dict[str, Any]) -> Iterator[bytes]:
+        """Classifica as mensagens do lote com texto suficiente e gera as linhas na ordem original"""
+        eligible = [record for record in batch if len(record['text']) >= self.MIN_TEXT_LENGTH]
+        responses: Dict[int, Any] = {}
+        batch_error = None
+        if eligible:
+            try:
+                classified = self.classifier_service.classify_batch([record['text'] for record in eligible])
+                responses = {record['index']: response for record, response in zip(eligible, classified)}
+            except Exception as e:
+                logger.error(f"Erro ao classificar lote de {len(eligible)} mensagens: {e}")
+                batch_error = str(e)
+
+        for record in batch:
+            if len(record['text']) < self.MIN_TEXT_LENGTH:
+                summary['skipped'] += 1
+                yield self._line(self._public_fields(
+                    record, status='skipped', reason='Mensagem sem texto suficiente para classificação'
+                ))
+            elif batch_error is not None:
+                summary['errors'] += 1
+                yield self._line(self._public_fields(record, status='error', error=batch_error))
+            else:
+                response = responses[record['index']]
+                summary['classified'] += 1
+                by_classification = summary['by_classification']
+                by_classification[response.classification] = by_classification.get(response.classification, 0) + 1
+                yield self._line(self._public_fields(
+                    record,
+                    status='classified',
+                    classification=response.classification,
+                    confidence=response.confidence,
+                    suggested_response=response.suggested_response,
+                    processing_time=response.processing_time
+                ))
+
+    @staticmethod
+    def _public_fields(record: Dict[str, Any], **extra) -> Dict[str, Any]:
+        """Campos da mensagem devolvidos ao cliente (o texto completo não é repetido)"""
+        return {
+            'index': record['index'],
+            'source': record['source'],
+            'message_id': record['message_id'],
+            'subject': record['subject'],
+            'from': record['from'],
+            'date': record['date'],
+            'text_length': len(record['text']),
+            **extra
+        }
+
+    @staticmethod
+    def _line(data: Dict[str, Any]) -> bytes:
+        return (json.dumps(data, ensure_ascii=False) + '\n').encode('utf-8')
@@ -0,0 +1,43 @@
+# backend/app/services/model_compaction.py
+import copy
+import logging
+from typing import Any, Dict
+from sklearn.feature_extraction.text import TfidfVectorizer
+from ..utils.compact_vectorizer import CompactTfidfVectorizer
+
+logger = logging.getLogger(__name__)
+
+# Atributos calculados no treinamento que a inferência nunca lê
+TRAINING_ONLY_ATTRIBUTES = ('oob_decision_function_', 'oob_prediction_', 'stop_words_')
+
+
+def strip_training_attributes(estimator: Any) -> Any:
+    """Cópia rasa do estimador sem os atributos usados apenas no treinamento"""
+    stripped = copy.copy(estimator)
+    for attribute in TRAINING_ONLY_ATTRIBUTES:
+        if attribute in stripped.__dict__:
+            delattr(stripped, attribute)
+    return stripped
+
+
+def compact_model_data(model_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Versão compacta de um artefato {model, vectorizer, scaler}: TF-IDF com vocabulário
+    em arrays (IDF float32) e estimadores sem atributos de treinamento
+
+    Args:
+        model_data: Artefato carregado do AdvancedModelRepository
+
+    Returns:
+        Dict: Novo artefato (o original não é alterado)
+    """
+    compacted = dict(model_data)
+    vectorizer = model_data.get('vectorizer')
+    if isinstance(vectorizer, TfidfVectorizer):
+        compacted['vectorizer'] = CompactTfidfVectorizer.from_vectorizer(vectorizer)
+    elif vectorizer is not None and not isinstance(vectorizer, CompactTfidfVectorizer):
+        logger.warning(f"⚠️ Vetorizador {type(vectorizer).__name__} não suportado; mantido sem compactação")
+    if model_data.get('model') is not None:
+        compacted['model'] = strip_training_attributes(model_data['model'])
+    compacted['compacted'] = True
+    return compacted
@@ -0,0 +1,300 @@
+# backend/app/services/online_learning_service.py
+import os
+import copy
+import time
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from ..repositories.advanced_model_repository import AdvancedModelRepository
+from ..repositories.feedback_repository import FeedbackRepository
+
+logger = logging.getLogger(__name__)
+
+class OnlineLearningService:
+    """
+    Aprendizado incremental a partir das correções enviadas pelos usuários.
+
+    O modelo é um HashingVectorizer (sem vocabulário, nada a reajustar) com um
+    SGDClassifier atualizado por partial_fit em pequenos lotes, em segundo plano.
+    Cada lote é aplicado em uma cópia do modelo, que substitui a atual ao final:
+    as classificações em andamento nunca veem um modelo parcialmente atualizado.
+    As correções são só emails que a floresta errou (e por isso desbalanceadas),
+    então o modelo parte de uma linha de base treinada no dataset de treinamento
+    (baseline_dataset_path), salva no snapshot.
+
+    Modos:
+        off: as correções são registradas, mas o modelo não é atualizado nem usado
+        shadow: o modelo é atualizado e sua predição acompanha a da floresta
+            (additional_info['online_model']), sem alterar a resposta
+        serve: a predição do modelo incremental substitui a da floresta quando ele
+            partiu da linha de base, já viu min_samples correções e tem confiança de
+            pelo menos serve_confidence; abaixo disso fica a resposta da floresta
+    """
+
+    MODE_OFF = "off"
+    MODE_SHADOW = "shadow"
+    MODE_SERVE = "serve"
+    MODES = (MODE_OFF, MODE_SHADOW, MODE_SERVE)
+
+    CLASSES = np.array(['IMPRODUTIVO', 'PRODUTIVO'])
+    BASELINE_EPOCHS = 5
+
+    def __init__(self, feedback_repository: FeedbackRepository, model_repository: AdvancedModelRepository,
+                 mode: str = MODE_SHADOW, batch_size: int = 32, update_interval: float = 30,
+                 snapshot_interval: float = 300, min_samples: int = 50,
+                 baseline_dataset_path: Optional[str] = None, serve_confidence: float = 0.8):
+        if mode not in self.MODES:
+            raise ValueError(f"Modo inválido: {mode}. Use um de {', '.join(self.MODES)}")
+        self.feedback_repository = feedback_repository
+        self.model_repository = model_repository
+        self.mode = mode
+        self.batch_size = max(1, batch_size)
+        self.update_interval = update_interval
+        self.snapshot_interval = snapshot_interval
+        self.min_samples = min_samples
+        self.baseline_dataset_path = baseline_dataset_path
+        self.serve_confidence = serve_confidence
+
+        self.vectorizer = HashingVectorizer(
+            n_features=2 ** 18, ngram_range=(1, 2), strip_accents='unicode', alternate_sign=False, norm='l2'
+        )
+        self.model: Optional[SGDClassifier] = None
+        self.samples_seen = 0
+        self.baseline_samples = 0
+        self.updates = 0
+        self._dirty = False
+        self._last_snapshot = time.time()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {'shadow_predictions': 0, 'shadow_agreements': 0, 'served': 0, 'kept_forest': 0,
+                      'snapshots': 0, 'errors': 0}
+        if self.mode != self.MODE_OFF:
+            self._load_snapshot()
+
+    @classmethod
+    def from_env(cls) -> "OnlineLearningService":
+        """Cria o serviço a partir das variáveis de ambiente"""
+        return cls(
+            feedback_repository=FeedbackRepository(os.getenv("FEEDBACK_DB_PATH", "./feedback/feedback.db")),
+            model_repository=AdvancedModelRepository(os.getenv("ONLINE_MODEL_PATH", "./datasets/online_model.pkl")),
+            mode=os.getenv("ONLINE_LEARNING_MODE", cls.MODE_OFF).strip().lower(),
+            batch_size=int(os.getenv("ONLINE_BATCH_SIZE", "32")),
+            update_interval=float(os.getenv("ONLINE_UPDATE_INTERVAL", "30")),
+            snapshot_interval=float(os.getenv("ONLINE_SNAPSHOT_INTERVAL", "300")),
+            min_samples=int(os.getenv("ONLINE_MIN_SAMPLES", "50")),
+            baseline_dataset_path=os.getenv("ONLINE_BASELINE_DATASET", "./datasets/dataset_balanced_2000.csv"),
+            serve_confidence=float(os.getenv("ONLINE_SERVE_CONFIDENCE", "0.8"))
+        )
+
+    @property
+    def ready(self) -> bool:
+        """O modelo só é usado depois de ter visto correções suficientes"""
+        return self.model is not None and self.samples_seen >= self.min_samples
+
+    def _new_model(self) -> SGDClassifier:
+        return SGDClassifier(loss='log_loss', alpha=1e-5, random_state=42)
+
+    def _load_snapshot(self):
+        if not self.model_repository.model_exists():
+            return
+        snapshot = self.model_repository.load()
+        if snapshot and snapshot.get('kind') == 'online':
+            self.model = snapshot['model']
+            self.vectorizer = snapshot['vectorizer']
+            self.samples_seen = snapshot.get('samples_seen', 0)
+            self.baseline_samples = snapshot.get('baseline_samples', 0)
+            self.updates = snapshot.get('updates', 0)
+            logger.info(f"✅ Modelo incremental restaurado ({self.samples_seen} correções aprendidas)")
+
+    def warm_start(self) -> int:
+        """
+        Treina a linha de base no dataset de treinamento (colunas text e label) e a salva
+
+        Returns:
+            int: Exemplos da linha de base (0 se o dataset não está disponível)
+        """
+        path = self.baseline_dataset_path
+        if not path or not os.path.exists(path):
+            logger.warning(f"⚠️ Dataset da linha de base não encontrado ({path}): o modo serve fica desativado")
+            return 0
+        start_time = time.time()
+        df = pd.read_csv(path)
+        X = self.vectorizer.transform(df['text'].astype(str).tolist())
+        y = df['label'].astype(str).values
+        model = copy.deepcopy(self.model) if self.model is not None else self._new_model()
+        rng = np.random.RandomState(42)
+        for _ in range(self.BASELINE_EPOCHS):
+            order = rng.permutation(len(y))
+            model.partial_fit(X[order], y[order], classes=self.CLASSES)
+        self.model = model
+        self.baseline_samples = len(y)
+        self._dirty = True
+        self.snapshot()
+        logger.info(f"✅ Linha de base do modelo incremental: {len(y)} exemplos em {time.time() - start_time:.2f}s")
+        return len(y)
+
+    # ==================== CICLO DE VIDA ====================
+
+    async def start(self):
+        """Inicia a atualização em segundo plano (nada a fazer no modo off)"""
+        if self.mode == self.MODE_OFF or self._task:
+            return
+        if not self.baseline_samples:
+            await asyncio.get_running_loop().run_in_executor(None, self.warm_start)
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._update_loop())
+        logger.info(
+            f"✅ Aprendizado incremental iniciado (modo {self.mode}, lotes de {self.batch_size}, "
+            f"{self.feedback_repository.count_pending()} correções pendentes)"
+        )
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._dirty:
+            self.snapshot()
+
+    async def _update_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.update_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                while await loop.run_in_executor(None, self.update_once):
+                    pass
+                if self._dirty and time.time() - self._last_snapshot >= self.snapshot_interval:
+                    await loop.run_in_executor(None, self.snapshot)
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"❌ Erro na atualização do modelo incremental: {e}")
+
+    # ==================== CORREÇÕES E ATUALIZAÇÃO ====================
+
+    def record_feedback(self, text: str, label: str, predicted_label: Optional[str] = None) -> Dict[str, Any]:
+        """Registra uma correção; um lote completo antecipa a próxima atualização"""
+        if label not in self.CLASSES:
+            raise HTTPException(status_code=400, detail=f"Classificação inválida. Use: {', '.join(self.CLASSES)}")
+        feedback_id = self.feedback_repository.add(text, label, predicted_label)
+        pending = self.feedback_repository.count_pending()
+        if self._wakeup is not None and pending >= self.batch_size:
+            self._wakeup.set()
+        return {'feedback_id': feedback_id, 'pending': pending, 'online_mode': self.mode}
+
+    def update_once(self) -> int:
+        """
+        Aplica um lote de correções pendentes ao modelo
+
+        Returns:
+            int: Correções consumidas (0 se não havia correções pendentes)
+        """
+        pending = self.feedback_repository.list_pending(self.batch_size)
+        if not pending:
+            return 0
+
+        start_time = time.time()
+        X = self.vectorizer.transform([item['text'] for item in pending])
+        y = np.array([item['label'] for item in pending])
+        model = copy.deepcopy(self.model) if self.model is not None else self._new_model()
+        model.partial_fit(X, y, classes=self.CLASSES)
+        self.model = model
+
+        self.feedback_repository.mark_consumed([item['id'] for item in pending])
+        self.samples_seen += len(pending)
+        self.updates += 1
+        self._dirty = True
+        logger.info(
+            f"🧠 Modelo incremental atualizado com {len(pending)} correções em {time.time() - start_time:.3f}s "
+            f"(total: {self.samples_seen})"
+        )
+        return len(pending)
+
+    def snapshot(self) -> bool:
+        """Persiste o modelo atual via AdvancedModelRepository"""
+        if self.model is None:
+            return False
+        saved = self.model_repository.save({
+            'kind': 'online',
+            'model': self.model,
+            'vectorizer': self.vectorizer,
+            'samples_seen': self.samples_seen,
+            'baseline_samples': self.baseline_samples,
+            'updates': self.updates,
+            'saved_at': time.time()
+        })
+        if saved:
+            self._dirty = False
+            self._last_snapshot = time.time()
+            self.stats['snapshots'] += 1
+        return saved
+
+    # ==================== PREDIÇÃO ====================
+
+    def predict(self, content: str) -> Dict[str, Any]:
+        model = self.model
+        probabilities = model.predict_proba(self.vectorizer.transform([content]))[0]
+        best = int(np.argmax(probabilities))
+        return {
+            'classification': str(model.classes_[best]),
+            'confidence': float(probabilities[best]),
+            'probabilities': {str(label): float(prob) for label, prob in zip(model.classes_, probabilities)}
+        }
+
+    def apply(self, content: str, result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Combina a predição do modelo incremental com o resultado da floresta
+
+        No modo shadow só anexa a predição; no modo serve substitui classificação,
+        confiança e probabilidades do resultado quando o modelo partiu da linha de
+        base e tem confiança de pelo menos serve_confidence (prediction['served']).
+
+        Returns:
+            Optional[Dict]: Predição do modelo incremental (None se não foi usado)
+        """
+        if self.mode == self.MODE_OFF or not self.ready:
+            return None
+        try:
+            prediction = self.predict(content)
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"❌ Erro na predição do modelo incremental: {e}")
+            return None
+
+        prediction['agrees_with_forest'] = prediction['classification'] == result['classification']
+        prediction['served'] = (self.mode == self.MODE_SERVE and self.baseline_samples > 0
+                                and prediction['confidence'] >= self.serve_confidence)
+        if self.mode == self.MODE_SHADOW:
+            self.stats['shadow_predictions'] += 1
+            self.stats['shadow_agreements'] += int(prediction['agrees_with_forest'])
+        elif not prediction['served']:
+            self.stats['kept_forest'] += 1
+        else:
+            self.stats['served'] += 1
+            prediction['forest_classification'] = result['classification']
+            result['classification'] = prediction['classification']
+            result['confidence'] = prediction['confidence']
+            result['probabilities'] = prediction['probabilities']
+        return prediction
+
+    def get_stats(self) -> Dict[str, Any]:
+        shadow = self.stats['shadow_predictions']
+        return {
+            'mode': self.mode,
+            'ready': self.ready,
+            'samples_seen': self.samples_seen,
+            'baseline_samples': self.baseline_samples,
+            'serve_confidence': self.serve_confidence,
+            'updates': self.updates,
+            'pending_feedback': self.feedback_repository.count_pending(),
+            'shadow_agreement_rate': self.stats['shadow_agreements'] / shadow if shadow else None,
+            **self.stats
+        }
@@ -0,0 +1,303 @@
+# backend/app/services/pdf_extraction_pool.py
+import os
+import asyncio
+import logging
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from fastapi import HTTPException
+from ..utils.pdf_extraction import (
+    PDFSource,
+    extract_pdf_page_range,
+    extract_pdf_text,
+    extract_pdf_text_from_source,
+    join_page_texts,
+    limit_worker_memory,
+    new_extraction_stats
+)
+from ..utils.upload_spool import SpooledUpload
+
+logger = logging.getLogger(__name__)
+
+class PDFExtractionPool:
+    """
+    Pool de processos dedicado à extração de texto de PDFs.
+    Cada arquivo roda em um processo isolado com timeout de parede, limite de
+    espaço de endereçamento (RLIMIT_AS) e reciclagem automática dos workers,
+    para que PDFs patológicos não travem o event loop nem a memória da API.
+
+    O PDF é entregue aos workers por um arquivo (o temporário do upload ou, para uploads
+    mantidos em memória, um gravado para a extração), lido via mmap sem cópia. Documentos acima de
+    parallel_page_threshold páginas têm suas faixas de páginas distribuídas entre
+    um segundo pool (parallel_workers processos) e remontadas em ordem.
+    """
+
+    def __init__(self, max_workers: int = 2, timeout: float = 30.0,
+                 memory_limit_mb: int = 1024, max_tasks_per_child: int = 50,
+                 parallel_workers: int = 0, parallel_page_threshold: int = 100):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_tasks_per_child = max_tasks_per_child
+        self.parallel_workers = parallel_workers
+        self.parallel_page_threshold = parallel_page_threshold
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._range_executor: Optional[ProcessPoolExecutor] = None
+        self._generation = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._parallel_lock: Optional[asyncio.Lock] = None
+        self.stats = {'completed': 0, 'parallel': 0, 'timeouts': 0, 'crashes': 0, 'restarts': 0}
+
+    @classmethod
+    def from_env(cls) -> "PDFExtractionPool":
+        """Cria o pool a partir das variáveis de ambiente"""
+        return cls(
+            max_workers=int(os.getenv("PDF_WORKERS", "2")),
+            timeout=float(os.getenv("PDF_EXTRACTION_TIMEOUT", os.getenv("PROCESSING_TIMEOUT", "30"))),
+            memory_limit_mb=int(os.getenv("PDF_WORKER_MEMORY_MB", "1024")),
+            max_tasks_per_child=int(os.getenv("PDF_WORKER_MAX_TASKS", "50")),
+            parallel_workers=int(os.getenv("PDF_PARALLEL_WORKERS", str(min(4, os.cpu_count() or 1)))),
+            parallel_page_threshold=int(os.getenv("PDF_PARALLEL_PAGE_THRESHOLD", "100"))
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    @property
+    def parallel_enabled(self) -> bool:
+        return self.parallel_workers > 1 and self.parallel_page_threshold > 0
+
+    def _create_executor(self, max_workers: int) -> ProcessPoolExecutor:
+        # spawn: workers não herdam o estado (modelo, threads) do processo da API
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=limit_worker_memory,
+            initargs=(self.memory_limit_mb,),
+            max_tasks_per_child=self.max_tasks_per_child or None
+        )
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = self._create_executor(self.max_workers)
+        return self._executor
+
+    def _get_range_executor(self) -> ProcessPoolExecutor:
+        if self._range_executor is None:
+            self._range_executor = self._create_executor(self.parallel_workers)
+        return self._range_executor
+
+    def _restart(self, reason: str):
+        """Encerra à força os workers atuais e descarta os executores (recriados sob demanda)"""
+        executors = [self._executor, self._range_executor]
+        self._executor = None
+        self._range_executor = None
+        self._generation += 1
+        self.stats['restarts'] += 1
+        logger.warning(f"♻️ Reiniciando pool de extração de PDF: {reason}")
+        for executor in executors:
+            if executor is None:
+                continue
+            for process in list(getattr(executor, '_processes', {}).values()):
+                if process.is_alive():
+                    process.kill()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _page_ranges(self, page_count: int) -> List[Tuple[int, int]]:
+        """Divide as páginas em faixas contíguas (duas por worker, para balancear a carga)"""
+        pages_per_range = max(8, -(-page_count // (self.parallel_workers * 2)))
+        return [(start, min(start + pages_per_range, page_count))
+                for start in range(0, page_count, pages_per_range)]
+
+    async def _extract_from_source(self, source: PDFSource, max_chars: int) -> Tuple[str, Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        threshold = self.parallel_page_threshold if self.parallel_enabled else 0
+        text, stats = await loop.run_in_executor(
+            self._get_executor(), extract_pdf_text_from_source, source, max_chars, threshold
+        )
+        if text is not None:
+            return text, stats
+
+        # Documento grande: distribuir faixas de páginas (um documento paralelo por vez)
+        if self._parallel_lock is None:
+            self._parallel_lock = asyncio.Lock()
+        async with self._parallel_lock:
+            return await self._extract_parallel(source, max_chars, stats['pages_total'])
+
+    async def _extract_parallel(self, source: PDFSource, max_chars: int, page_count: int) -> Tuple[str, Dict[str, Any]]:
+        """Extrai faixas de páginas em paralelo e remonta em ordem, cancelando o restante ao atingir o orçamento"""
+        loop = asyncio.get_running_loop()
+        executor = self._get_range_executor()
+        futures = [
+            loop.run_in_executor(executor, extract_pdf_page_range, source, start, end)
+            for start, end in self._page_ranges(page_count)
+        ]
+        stats = new_extraction_stats(page_count)
+        stats['parallel_ranges'] = len(futures)
+        text_parts = []
+        total_chars = 0
+        try:
+            for future in futures:
+                page_texts, range_stats = await future
+                for key in ('pages_read', 'pages_skipped', 'pages_failed'):
+                    stats[key] += range_stats[key]
+                for page_text in page_texts:
+                    text_parts.append(page_text)
+                    total_chars += len(page_text) + 1
+                    if max_chars and total_chars >= max_chars:
+                        stats['char_budget_reached'] = True
+                        break
+                if stats['char_budget_reached']:
+                    break
+        finally:
+            # Faixas ainda não iniciadas são descartadas
+            for future in futures:
+                future.cancel()
+        self.stats['parallel'] += 1
+        return join_page_texts(text_parts, max_chars), stats
+
+    async def extract(self, pdf_content: Union[bytes, SpooledUpload], max_chars: int = 0) -> Tuple[str, Dict[str, Any]]:
+        """
+        Extrai texto do PDF em um worker isolado
+
+        Args:
+            pdf_content: Bytes do PDF ou upload já recebido (em memória ou em arquivo temporário)
+            max_chars: Orçamento de caracteres (0 desativa o corte)
+
+        Raises:
+            HTTPException: 504 se estourar o timeout, 422 se o PDF for inválido,
+                excessivamente complexo ou derrubar o worker
+        """
+        if not self.enabled:
+            return await asyncio.get_running_loop().run_in_executor(None, _extract_inline, pdf_content, max_chars)
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+
+        # O timeout conta a partir da obtenção de um worker livre, não da espera na fila
+        async with self._slots:
+            with self._pdf_source(pdf_content) as source:
+                for attempt in range(2):
+                    generation = self._generation
+                    try:
+                        result = await asyncio.wait_for(
+                            self._extract_from_source(source, max_chars),
+                            timeout=self.timeout
+                        )
+                        self.stats['completed'] += 1
+                        return result
+                    except asyncio.TimeoutError:
+                        self.stats['timeouts'] += 1
+                        self._restart(f"extração excedeu {self.timeout:g}s")
+                        raise HTTPException(
+                            status_code=504,
+                            detail=f"Tempo limite de processamento do PDF excedido ({self.timeout:g}s)"
+                        )
+                    except BrokenProcessPool:
+                        if generation != self._generation and attempt == 0:
+                            # Worker derrubado pelo reinício causado por outro arquivo: tentar de novo
+                            continue
+                        self.stats['crashes'] += 1
+                        if generation == self._generation:
+                            self._restart("worker encerrado inesperadamente")
+                        if attempt == 0:
+                            continue
+                        raise HTTPException(
+                            status_code=422,
+                            detail="Não foi possível processar o PDF: arquivo malformado ou complexo demais"
+                        )
+                    except MemoryError:
+                        self.stats['crashes'] += 1
+                        raise HTTPException(
+                            status_code=422,
+                            detail=f"PDF excede o limite de memória de processamento ({self.memory_limit_mb}MB)"
+                        )
+                    except ValueError as e:
+                        raise HTTPException(status_code=422, detail=f"Erro ao processar PDF: {str(e)}")
+                    except Exception as e:
+                        logger.error(f"Erro ao processar PDF no worker: {str(e)}")
+                        raise HTTPException(status_code=422, detail=f"Erro ao processar PDF: {str(e)}")
+
+    @staticmethod
+    @contextmanager
+    def _pdf_source(pdf_content: Union[bytes, SpooledUpload]) -> Iterator[PDFSource]:
+        """
+        Origem do PDF para os workers, sem cópia serializada por tarefa: o arquivo temporário
+        do upload quando existir, senão um arquivo temporário gravado com o conteúdo
+        """
+        if not isinstance(pdf_content, SpooledUpload):
+            with _temporary_file_source(pdf_content) as source:
+                yield source
+        elif pdf_content.on_disk:
+            pdf_content.finalize()
+            yield ('file', pdf_content.path, pdf_content.size)
+        else:
+            with pdf_content.view() as view, _temporary_file_source(view) as source:
+                yield source
+
+    def shutdown(self):
+        """Encerra os workers (chamado no shutdown da aplicação)"""
+        for executor in (self._executor, self._range_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self._range_executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'workers': self.max_workers,
+            'timeout_seconds': self.timeout,
+            'memory_limit_mb': self.memory_limit_mb,
+            'parallel_workers': self.parallel_workers if self.parallel_enabled else 0,
+            'parallel_page_threshold': self.parallel_page_threshold,
+            **self.stats
+        }
+
+
+@contextmanager
+def _temporary_file_source(data: Union[bytes, memoryview]) -> Iterator[PDFSource]:
+    """
+    Grava o conteúdo em um arquivo temporário, removido ao sair do contexto
+
+    Os workers o mapeiam com mmap (leitura nativa, sem cópia); memória compartilhada
+    exigiria copiar o documento inteiro ou lê-lo por um stream em Python, mais lento.
+    """
+    with tempfile.NamedTemporaryFile(prefix="pdf_", delete=False) as f:
+        f.write(data)
+        path = f.name
+    try:
+        yield ('file', path, len(data))
+    finally:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def _extract_inline(pdf_content: Union[bytes, SpooledUpload], max_chars: int) -> Tuple[str, Dict[str, Any]]:
+    """Extração no próprio processo da API (PDF_WORKERS=0), executada em thread"""
+    if isinstance(pdf_content, SpooledUpload):
+        with pdf_content.view() as view:
+            return extract_pdf_text(view, max_chars)
+    return extract_pdf_text(pdf_content, max_chars)
+
+
+_pdf_extraction_pool: Optional[PDFExtractionPool] = None
+
+def get_pdf_extraction_pool() -> PDFExtractionPool:
+    """Retorna a instância global do pool de extração, criando-a se necessário"""
+    global _pdf_extraction_pool
+    if _pdf_extraction_pool is None:
+        _pdf_extraction_pool = PDFExtractionPool.from_env()
+    return _pdf_extraction_pool
+
+def shutdown_pdf_extraction_pool():
+    """Encerra o pool global de extração, se existir"""
+    global _pdf_extraction_pool
+    if _pdf_extraction_pool is not None:
+        _pdf_extraction_pool.shutdown()
+        _pdf_extraction_pool = None
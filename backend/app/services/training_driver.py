@@ -0,0 +1,227 @@
+# backend/app/services/training_driver.py
+import os
+import time
+import pickle
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from joblib import Parallel, delayed
+from scipy.sparse import hstack
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.preprocessing import StandardScaler
+
+logger = logging.getLogger(__name__)
+
+
+def _fit_fold_transforms(vectorizer_params: Dict[str, Any], text_train, text_test, feat_train, feat_test):
+    """Ajusta TF-IDF e StandardScaler no treino do fold e transforma treino e validação"""
+    start_time = time.perf_counter()
+    vectorizer = TfidfVectorizer(**vectorizer_params)
+    scaler = StandardScaler()
+    X_train = hstack([vectorizer.fit_transform(text_train), scaler.fit_transform(feat_train)]).tocsr()
+    X_test = hstack([vectorizer.transform(text_test), scaler.transform(feat_test)]).tocsr()
+    return {
+        'vectorizer': vectorizer,
+        'scaler': scaler,
+        'X_train': X_train,
+        'X_test': X_test,
+        'vectorize_seconds': time.perf_counter() - start_time
+    }
+
+
+def _median_seconds(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start_time)
+    return float(np.median(timings))
+
+
+def _fit_and_score_fold(model_params: Dict[str, Any], n_jobs: int, X_train, y_train, X_test, y_test,
+                        profile_batch: int = 0):
+    """Treina a floresta no fold e mede a acurácia na validação (e, se pedido, latência e tamanho)"""
+    model = RandomForestClassifier(**{**model_params, 'n_jobs': n_jobs})
+    start_time = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    accuracy = accuracy_score(y_test, model.predict(X_test))
+    result = {'accuracy': accuracy, 'fit_seconds': fit_seconds, 'score_seconds': time.perf_counter() - start_time}
+
+    if profile_batch:
+        # Inferência como na API: um processo, n_jobs=1 (a latência não depende do orçamento de treino)
+        model.set_params(n_jobs=1)
+        batch = X_test[:profile_batch]
+        result['profile'] = {
+            'model_bytes': len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)),
+            'predict_single_ms': _median_seconds(lambda: model.predict_proba(X_test[:1]), 15) * 1000,
+            'predict_batch_ms': _median_seconds(lambda: model.predict_proba(batch), 5) * 1000,
+            'batch_size': batch.shape[0]
+        }
+    return result
+
+
+class TrainingDriver:
+    """
+    Validação cruzada paralela do classificador (TF-IDF + features numéricas + Random Forest).
+
+    Os folds rodam em processos separados dentro de um orçamento de CPU: com
+    cpu_budget=8 e 5 folds, são 5 folds simultâneos com 1 thread por floresta; com
+    2 folds, 2 folds com 4 threads cada. As divisões dos folds e as transformações
+    ajustadas (vetorizador e scaler) de cada fold ficam em cache por dataset e
+    configuração do vetorizador, de modo que candidatos que só mudam parâmetros da
+    floresta não revetorizam os textos.
+    """
+
+    def __init__(self, n_splits: int = 5, random_state: int = 42,
+                 cpu_budget: Optional[int] = None, max_cached_configs: int = 4):
+        self.n_splits = n_splits
+        self.random_state = random_state
+        self.cpu_budget = max(1, cpu_budget or os.cpu_count() or 1)
+        self.max_cached_configs = max(1, max_cached_configs)
+        self._splits: Dict[str, List[Tuple[np.ndarray, np.ndarray]]] = {}
+        self._transforms: "OrderedDict[Tuple[str, str], List[Dict[str, Any]]]" = OrderedDict()
+        self.stats = {'transform_cache_hits': 0, 'transform_cache_misses': 0}
+
+    @classmethod
+    def from_env(cls) -> "TrainingDriver":
+        """Cria o driver a partir das variáveis de ambiente"""
+        return cls(
+            n_splits=int(os.getenv("TRAINING_CV_FOLDS", "5")),
+            cpu_budget=int(os.getenv("TRAINING_CPU_BUDGET", "0")) or None
+        )
+
+    @property
+    def parallel_folds(self) -> int:
+        return min(self.n_splits, self.cpu_budget)
+
+    @property
+    def threads_per_fold(self) -> int:
+        """Threads de cada floresta para que folds simultâneos não ultrapassem o orçamento"""
+        return max(1, self.cpu_budget // self.parallel_folds)
+
+    @staticmethod
+    def fingerprint(texts: Sequence[str], y: Sequence[Any]) -> str:
+        """Identifica o dataset (textos e rótulos) para reaproveitar divisões e transformações"""
+        hasher = hashlib.sha256()
+        for text, label in zip(texts, y):
+            hasher.update(f"{label}\0{text}\0".encode('utf-8', errors='surrogatepass'))
+        return hasher.hexdigest()
+
+    def get_splits(self, dataset_key: str, y: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Divisões estratificadas dos folds (calculadas uma vez por dataset)"""
+        if dataset_key not in self._splits:
+            folds = StratifiedKFold(n_splits=self.n_splits, shuffle=True, random_state=self.random_state)
+            self._splits[dataset_key] = list(folds.split(np.zeros(len(y)), y))
+        return self._splits[dataset_key]
+
+    def get_fold_transforms(self, dataset_key: str, X_text: np.ndarray, X_features: np.ndarray,
+                            y: np.ndarray, vectorizer_params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Transformações ajustadas de cada fold para uma configuração do vetorizador
+
+        Returns:
+            Tuple[List[Dict], bool]: Transformações por fold e se vieram do cache
+        """
+        cache_key = (dataset_key, repr(sorted(vectorizer_params.items())))
+        if cache_key in self._transforms:
+            self._transforms.move_to_end(cache_key)
+            self.stats['transform_cache_hits'] += 1
+            return self._transforms[cache_key], True
+
+        self.stats['transform_cache_misses'] += 1
+        splits = self.get_splits(dataset_key, y)
+        transforms = Parallel(n_jobs=self.parallel_folds)(
+            delayed(_fit_fold_transforms)(
+                vectorizer_params, X_text[train_idx], X_text[test_idx],
+                X_features[train_idx], X_features[test_idx]
+            )
+            for train_idx, test_idx in splits
+        )
+        self._transforms[cache_key] = transforms
+        while len(self._transforms) > self.max_cached_configs:
+            self._transforms.popitem(last=False)
+        return transforms, False
+
+    def cross_validate(self, X_text: Sequence[str], X_features: np.ndarray, y: Sequence[Any],
+                       vectorizer_params: Dict[str, Any], model_params: Dict[str, Any],
+                       dataset_key: Optional[str] = None, profile_batch: int = 0) -> Dict[str, Any]:
+        """
+        Validação cruzada de uma configuração, com tempos de vetorização, treino e avaliação por fold
+
+        Args:
+            X_text: Textos pré-processados
+            X_features: Features numéricas (sem escala; o scaler é ajustado em cada fold)
+            y: Rótulos
+            vectorizer_params: Parâmetros do TfidfVectorizer
+            model_params: Parâmetros do RandomForestClassifier (n_jobs é definido pelo driver)
+            dataset_key: Identificador do dataset (padrão: fingerprint dos textos e rótulos)
+            profile_batch: Se > 0, mede no primeiro fold o tamanho serializado da floresta e a
+                latência de predict_proba para 1 linha e para um lote desse tamanho
+
+        Returns:
+            Dict: Acurácia média e desvio, tempos totais e detalhamento por fold
+        """
+        start_time = time.perf_counter()
+        X_text = np.asarray(X_text, dtype=object)
+        X_features = np.asarray(X_features)
+        y = np.asarray(y)
+        dataset_key = dataset_key or self.fingerprint(X_text, y)
+
+        transforms, cached = self.get_fold_transforms(dataset_key, X_text, X_features, y, vectorizer_params)
+        splits = self.get_splits(dataset_key, y)
+        results = Parallel(n_jobs=self.parallel_folds)(
+            delayed(_fit_and_score_fold)(
+                model_params, self.threads_per_fold,
+                fold['X_train'], y[train_idx], fold['X_test'], y[test_idx],
+                profile_batch if index == 0 else 0
+            )
+            for index, (fold, (train_idx, test_idx)) in enumerate(zip(transforms, splits))
+        )
+
+        folds = []
+        for index, (fold, result) in enumerate(zip(transforms, results)):
+            folds.append({
+                'fold': index,
+                'accuracy': result['accuracy'],
+                # Transformações reaproveitadas do cache não custam vetorização nesta execução
+                'vectorize_seconds': 0.0 if cached else fold['vectorize_seconds'],
+                'fit_seconds': result['fit_seconds'],
+                'score_seconds': result['score_seconds']
+            })
+        scores = np.array([fold['accuracy'] for fold in folds])
+        report = {
+            'cv_mean': float(scores.mean()),
+            'cv_std': float(scores.std()),
+            'scores': scores.tolist(),
+            'folds': folds,
+            'transforms_cached': cached,
+            'parallel_folds': self.parallel_folds,
+            'threads_per_fold': self.threads_per_fold,
+            'wall_seconds': time.perf_counter() - start_time
+        }
+        if profile_batch:
+            report['profile'] = results[0]['profile']
+        logger.info(
+            f"📊 CV {self.n_splits} folds: {report['cv_mean']:.3f} (±{report['cv_std'] * 2:.3f}) "
+            f"em {report['wall_seconds']:.1f}s ({self.parallel_folds} folds em paralelo, "
+            f"{self.threads_per_fold} threads por floresta)"
+        )
+        return report
+
+    @staticmethod
+    def format_report(report: Dict[str, Any]) -> str:
+        """Tabela de tempos por fold para exibição nos scripts de treinamento"""
+        lines = [f"{'fold':>4} {'acurácia':>9} {'vetorizar':>10} {'treinar':>9} {'avaliar':>9}"]
+        for fold in report['folds']:
+            lines.append(
+                f"{fold['fold']:>4} {fold['accuracy']:>9.3f} {fold['vectorize_seconds']:>9.2f}s "
+                f"{fold['fit_seconds']:>8.2f}s {fold['score_seconds']:>8.2f}s"
+            )
+        return "\n".join(lines)
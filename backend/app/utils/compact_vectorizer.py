@@ -0,0 +1,107 @@
+"""
+TF-IDF compacto para servir modelos já treinados.
+
+O TfidfVectorizer ajustado carrega atributos que só servem ao treinamento
+(stop_words_ com todos os termos descartados por max_df/min_df/max_features) e
+o vocabulário como dict de strings, ambos copiados para cada worker. A versão
+compacta guarda apenas um hash de 64 bits de cada termo (array ordenado), a
+coluna correspondente e o IDF em float32; a análise do texto (acentos,
+tokenização e n-gramas) continua sendo a do sklearn, com os mesmos parâmetros.
+"""
+
+import hashlib
+from collections import Counter
+from typing import Any, Dict, Iterable
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+
+def term_hash(term: str) -> int:
+    """Hash estável entre processos (ao contrário de hash()), usado como chave do vocabulário"""
+    return int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class CompactTfidfVectorizer:
+    """Transformação TF-IDF equivalente à do TfidfVectorizer ajustado, com vocabulário em arrays"""
+
+    def __init__(self, params: Dict[str, Any], term_hashes: np.ndarray, columns: np.ndarray, idf: np.ndarray):
+        self.params = params
+        self.term_hashes = term_hashes
+        self.columns = columns
+        self.idf = idf
+        self._analyzer = None
+
+    @classmethod
+    def from_vectorizer(cls, vectorizer: TfidfVectorizer, idf_dtype=np.float32) -> "CompactTfidfVectorizer":
+        """
+        Cria a versão compacta a partir de um TfidfVectorizer ajustado
+
+        Raises:
+            ValueError: Se dois termos do vocabulário tiverem o mesmo hash
+        """
+        terms = list(vectorizer.vocabulary_)
+        hashes = np.fromiter((term_hash(term) for term in terms), dtype=np.uint64, count=len(terms))
+        columns = np.fromiter((vectorizer.vocabulary_[term] for term in terms), dtype=np.int32, count=len(terms))
+        order = np.argsort(hashes)
+        hashes, columns = hashes[order], columns[order]
+        if len(hashes) > 1 and np.any(hashes[1:] == hashes[:-1]):
+            raise ValueError("Colisão de hash no vocabulário; mantenha o TfidfVectorizer original")
+        params = {key: value for key, value in vectorizer.get_params().items() if key != 'vocabulary'}
+        idf = vectorizer.idf_.astype(idf_dtype) if vectorizer.use_idf else None
+        return cls(params, hashes, columns, idf)
+
+    @property
+    def n_features(self) -> int:
+        return len(self.columns)
+
+    def build_analyzer(self):
+        """Analisador do sklearn (acentos, tokenização e n-gramas) com os parâmetros do treinamento"""
+        if self._analyzer is None:
+            self._analyzer = TfidfVectorizer(**self.params).build_analyzer()
+        return self._analyzer
+
+    def lookup(self, terms: Iterable[str]) -> Dict[int, int]:
+        """Contagem por coluna dos termos presentes no vocabulário"""
+        counts = Counter(terms)
+        if not counts or not len(self.term_hashes):
+            return {}
+        hashes = np.fromiter((term_hash(term) for term in counts), dtype=np.uint64, count=len(counts))
+        positions = np.minimum(np.searchsorted(self.term_hashes, hashes), len(self.term_hashes) - 1)
+        found = self.term_hashes[positions] == hashes
+        frequencies = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+        return dict(zip(self.columns[positions[found]].tolist(), frequencies[found].tolist()))
+
+    def transform(self, raw_documents: Iterable[str]) -> sp.csr_matrix:
+        """Mesma matriz de TfidfVectorizer.transform (a menos da precisão do IDF)"""
+        analyze = self.build_analyzer()
+        indptr, indices, values = [0], [], []
+        for document in raw_documents:
+            row = self.lookup(analyze(document))
+            columns = sorted(row)
+            indices.extend(columns)
+            values.extend(row[column] for column in columns)
+            indptr.append(len(indices))
+
+        dtype = self.params.get('dtype', np.float64)
+        X = sp.csr_matrix(
+            (np.asarray(values, dtype=dtype), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int32)),
+            shape=(len(indptr) - 1, self.n_features)
+        )
+        if self.params.get('binary'):
+            X.data.fill(1)
+        if self.params.get('sublinear_tf'):
+            np.log(X.data, X.data)
+            X.data += 1
+        if self.idf is not None:
+            X.data *= self.idf[X.indices]
+        if self.params.get('norm'):
+            X = normalize(X, norm=self.params['norm'], copy=False)
+        return X
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_analyzer'] = None
+        return state
@@ -0,0 +1,90 @@
+"""
+Divisão de documentos longos em trechos e agregação das probabilidades dos trechos.
+
+Páginas de PDF chegam separadas por form feed (\\f, ver join_page_texts);
+sem quebras de página, o texto é dividido em parágrafos (linhas em branco).
+Trechos muito curtos são unidos ao seguinte e trechos longos demais são
+cortados em espaços, para que cada um tenha um tamanho parecido com o dos
+emails de treinamento.
+"""
+
+import re
+from typing import Dict, List, Sequence
+
+PAGE_SEPARATOR = "\f"
+
+_PARAGRAPH_SPLIT = re.compile(r'\n\s*\n')
+
+CHUNK_MODES = ("auto", "page", "paragraph")
+AGGREGATIONS = ("max", "mean", "length_weighted")
+
+
+def _split_long(piece: str, max_chars: int) -> List[str]:
+    parts = []
+    while len(piece) > max_chars:
+        cut = piece.rfind(' ', 0, max_chars)
+        cut = cut if cut > 0 else max_chars
+        parts.append(piece[:cut])
+        piece = piece[cut:].lstrip()
+    if piece:
+        parts.append(piece)
+    return parts
+
+
+def split_chunks(text: str, mode: str = "auto", max_chars: int = 2000, min_chars: int = 200) -> List[str]:
+    """
+    Trechos do documento, na ordem original
+
+    Args:
+        text: Texto completo
+        mode: page (form feed), paragraph (linhas em branco) ou auto (páginas, se houver)
+        max_chars: Tamanho máximo de um trecho
+        min_chars: Trechos menores são unidos ao seguinte
+    """
+    if mode not in CHUNK_MODES:
+        raise ValueError(f"Modo de divisão inválido: {mode}. Use um de {', '.join(CHUNK_MODES)}")
+    if mode == "page" or (mode == "auto" and PAGE_SEPARATOR in text):
+        pieces = text.split(PAGE_SEPARATOR)
+    else:
+        pieces = _PARAGRAPH_SPLIT.split(text)
+
+    chunks: List[str] = []
+    pending = ""
+    for piece in (piece.strip() for piece in pieces):
+        if not piece:
+            continue
+        pending = f"{pending}\n\n{piece}" if pending else piece
+        if len(pending) >= min_chars:
+            chunks.extend(_split_long(pending, max_chars))
+            pending = ""
+    if pending:
+        if chunks and len(chunks[-1]) + len(pending) <= max_chars:
+            chunks[-1] = f"{chunks[-1]}\n\n{pending}"
+        else:
+            chunks.append(pending)
+    return chunks
+
+
+def aggregate_probabilities(probabilities: Sequence[Dict[str, float]], lengths: Sequence[int],
+                            rule: str = "mean") -> Dict[str, float]:
+    """
+    Probabilidades do documento a partir das dos trechos
+
+    max: maior probabilidade de cada classe entre os trechos (renormalizada);
+    um único trecho confiante decide o documento.
+    mean: média simples. length_weighted: média ponderada pelo tamanho dos trechos.
+    """
+    if rule not in AGGREGATIONS:
+        raise ValueError(f"Agregação inválida: {rule}. Use uma de {', '.join(AGGREGATIONS)}")
+    labels = list(probabilities[0])
+    if rule == "max":
+        scores = {label: max(chunk[label] for chunk in probabilities) for label in labels}
+    else:
+        weights = lengths if rule == "length_weighted" else [1] * len(probabilities)
+        total = float(sum(weights)) or 1.0
+        scores = {
+            label: sum(chunk[label] * weight for chunk, weight in zip(probabilities, weights)) / total
+            for label in labels
+        }
+    normalizer = sum(scores.values()) or 1.0
+    return {label: score / normalizer for label, score in scores.items()}
@@ -0,0 +1,178 @@
+"""
+Limpeza de emails antes da classificação.
+
+Emails reais trazem o histórico da conversa citado, assinaturas e avisos
+legais: texto que não ajuda a classificar a mensagem nova e que ainda assim
+seria tokenizado, reduzido a radicais e vetorizado. A limpeza remove, com
+expressões pré-compiladas e uma única passada pelas linhas:
+
+- histórico citado: tudo a partir do primeiro cabeçalho de resposta
+  ("Em ... escreveu:", "On ... wrote:", "-----Mensagem original-----",
+  blocos De:/Enviado:/Para:) e linhas iniciadas por ">"
+- assinaturas: a partir do delimitador "-- " ou de "Enviado do meu ...", e o
+  bloco final após a despedida (Atenciosamente, Abraços, ...) quando ele só tem
+  linhas de assinatura: nome, cargo, telefone, email ou site, sem pontuação de
+  frase nem palavras de pedido
+- avisos legais: parágrafos no fim do email, depois do corpo, iniciados por
+  fórmulas como "Esta mensagem pode conter..." e com termos de
+  confidencialidade (sigilo, destinatário, recebida por engano, ...)
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+_REPLY_HEADER = re.compile(
+    r'^\s*(?:'
+    r'em\s.{1,200}\sescreveu\s*:'
+    r'|on\s.{1,200}\swrote\s*:'
+    r'|-{2,}\s*(?:mensagem original|original message)\s*-{2,}'
+    r'|_{10,}'
+    r')\s*$',
+    re.IGNORECASE
+)
+_OUTLOOK_FROM = re.compile(r'^\s*\*?(?:de|from)\s*:\*?\s+\S', re.IGNORECASE)
+_OUTLOOK_FIELD = re.compile(r'^\s*\*?(?:enviad[oa]|sent|data|date|para|to|assunto|subject)\s*:', re.IGNORECASE)
+_QUOTED_LINE = re.compile(r'^\s*>')
+_SIGNATURE_START = re.compile(
+    r'^(?:--\s*|__\s*|enviado do meu .*|enviado de meu .*|sent from my .*|get outlook for .*|obter o outlook para .*)$',
+    re.IGNORECASE
+)
+_CLOSING = re.compile(
+    r'^\s*(?:atenciosamente|att\.?|at\.te|abra[çc]os?|cordialmente|saudações|sds\.?|grato|grata'
+    r'|obrigad[oa]|muito obrigad[oa]|best regards|kind regards|regards|thanks|cheers)\s*[,.!]?\s*$',
+    re.IGNORECASE
+)
+_DISCLAIMER_START = re.compile(
+    r'^\s*(?:aviso(?: legal)?\s*:|confidencial(?:idade)?\s*:|disclaimer\s*:'
+    r'|esta mensagem(?:,| e seus anexos| e quaisquer anexos)? (?:é|pode conter|contém)'
+    r'|este e-?mail(?: e seus anexos)? (?:é|pode conter|contém)'
+    r'|as informações contidas nest[ae]'
+    r'|this (?:e-?mail|message)(?: and any attachments)? (?:is|may contain|contains))',
+    re.IGNORECASE
+)
+_CONFIDENTIALITY = re.compile(
+    r'confidencia|sigil|privilegiad|destinat[áa]ri|por engano|proibid|n[ãa]o autorizad'
+    r'|confidential|privileged|intended recipient|in error|prohibited',
+    re.IGNORECASE
+)
+
+_CONTACT_LINE = re.compile(
+    r'(?:\S+@\S+\.\w+|https?://|www\.|(?:tel|fone|cel|phone|mobile|ramal|whatsapp)\b|^[\s+()\d.-]{8,}$)',
+    re.IGNORECASE
+)
+_SENTENCE_PUNCTUATION = re.compile(r'[?!;]|\.\s+\S|\.$')
+_REQUEST_WORDS = re.compile(
+    r'\b(?:preciso|precisamos|podem|poderia|pode|consegue|favor|solicit\w*|verific\w*|erro|problema|urgente'
+    r'|ajuda|bloquead[oa]|acesso|senha|status|pendente|aguardo|please|need|error|issue)\b',
+    re.IGNORECASE
+)
+
+# Bloco após a despedida considerado assinatura (nome, cargo, telefone)
+MAX_SIGNATURE_LINES = 6
+MAX_SIGNATURE_LINE_CHARS = 80
+MAX_SIGNATURE_LINE_WORDS = 8
+# Sem texto suficiente depois da limpeza, o email é classificado como chegou
+MIN_CLEAN_CHARS = 10
+
+CATEGORIES = ('quoted_history', 'disclaimer', 'signature')
+
+
+def _size(lines: List[str]) -> int:
+    return sum(len(line.encode('utf-8')) + 1 for line in lines)
+
+
+def _find_reply_header(lines: List[str]) -> int:
+    for index, line in enumerate(lines):
+        if _REPLY_HEADER.match(line):
+            return index
+        # Gmail quebra o cabeçalho longo em duas linhas
+        if index + 1 < len(lines) and _REPLY_HEADER.match(f"{line} {lines[index + 1]}"):
+            return index
+        if _OUTLOOK_FROM.match(line) and sum(
+            1 for following in lines[index + 1:index + 5] if _OUTLOOK_FIELD.match(following)
+        ) >= 2:
+            return index
+    return len(lines)
+
+
+def _is_signature_line(line: str) -> bool:
+    """Nome, cargo, telefone, email ou site; frases e pedidos nunca são assinatura"""
+    line = line.strip()
+    if len(line) > MAX_SIGNATURE_LINE_CHARS or _REQUEST_WORDS.search(line):
+        return False
+    if _CONTACT_LINE.search(line):
+        return True
+    return len(line.split()) <= MAX_SIGNATURE_LINE_WORDS and not _SENTENCE_PUNCTUATION.search(line)
+
+
+def _find_disclaimer(lines: List[str]) -> int:
+    """Início dos parágrafos de aviso legal no fim do email (len(lines) se não houver)"""
+    cut = end = len(lines)
+    while True:
+        while end and not lines[end - 1].strip():
+            end -= 1
+        start = end
+        while start and lines[start - 1].strip():
+            start -= 1
+        # O primeiro parágrafo é o corpo; aviso legal só depois dele
+        body_before = any(line.strip() for line in lines[:start])
+        paragraph = ' '.join(lines[start:end])
+        if not (body_before and _DISCLAIMER_START.match(lines[start]) and _CONFIDENTIALITY.search(paragraph)):
+            return cut
+        cut = end = start
+
+
+def _find_signature(lines: List[str]) -> int:
+    for index, line in enumerate(lines):
+        if _SIGNATURE_START.match(line.rstrip()):
+            return index
+    end = len(lines)
+    while end and not lines[end - 1].strip():
+        end -= 1
+    # Despedida perto do fim: o bloco final depois dela é assinatura se só tiver linhas de assinatura
+    for index in range(end - 1, max(-1, end - MAX_SIGNATURE_LINES - 2), -1):
+        if _CLOSING.match(lines[index]):
+            start = index + 1
+            while start < end and not lines[start].strip():
+                start += 1
+            # Um único bloco, o último do email, só com linhas de assinatura
+            if all(line.strip() and _is_signature_line(line) for line in lines[start:end]):
+                return index + 1
+            break
+    return len(lines)
+
+
+def clean_email(text: str) -> Tuple[str, Dict[str, int]]:
+    """
+    Remove histórico citado, avisos legais e assinatura
+
+    Returns:
+        Tuple[str, Dict]: Texto limpo e bytes (UTF-8) removidos por categoria,
+            mais o total em 'bytes_removed'
+    """
+    removed = dict.fromkeys(CATEGORIES, 0)
+    lines = text.split('\n')
+
+    cut = _find_reply_header(lines)
+    removed['quoted_history'] += _size(lines[cut:])
+    lines = lines[:cut]
+
+    kept: List[str] = []
+    for line in lines:
+        if _QUOTED_LINE.match(line):
+            removed['quoted_history'] += _size([line])
+        else:
+            kept.append(line)
+
+    cut = _find_disclaimer(kept)
+    removed['disclaimer'] += _size(kept[cut:])
+    kept = kept[:cut]
+
+    cut = _find_signature(kept)
+    removed['signature'] += _size(kept[cut:])
+    cleaned = '\n'.join(kept[:cut]).strip()
+
+    if len(cleaned) < MIN_CLEAN_CHARS:
+        return text, {**dict.fromkeys(CATEGORIES, 0), 'bytes_removed': 0}
+    removed['bytes_removed'] = sum(removed[category] for category in CATEGORIES)
+    return cleaned, removed
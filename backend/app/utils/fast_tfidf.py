@@ -0,0 +1,170 @@
+"""
+TF-IDF especializado para um único documento curto.
+
+Para um email de poucas dezenas de tokens, o custo de vectorizer.transform([texto])
+é dominado por overhead fixo do sklearn (normalização de acentos, geração de
+n-gramas, validações e montagem da matriz esparsa) e do scipy.sparse.hstack com
+as features numéricas. Este transformador é construído a partir do vetorizador
+ajustado (TfidfVectorizer ou CompactTfidfVectorizer) e do StandardScaler e
+monta diretamente a linha CSR final, com os mesmos valores: tf sublinear, IDF,
+normalização L2 e as features escaladas nas últimas colunas.
+"""
+
+import math
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from .compact_vectorizer import CompactTfidfVectorizer, term_hash
+
+
+def _fold_char(char: str) -> str:
+    """Mesma remoção de acentos de strip_accents='unicode' do sklearn, caractere a caractere"""
+    return ''.join(c for c in unicodedata.normalize('NFKD', char) if not unicodedata.combining(c))
+
+
+class _AccentFoldingTable(dict):
+    """Tabela para str.translate: Latin-1 e Latin Extended pré-calculados, demais sob demanda"""
+
+    def __init__(self):
+        super().__init__((code, _fold_char(chr(code))) for code in range(0x80, 0x250))
+
+    def __missing__(self, code: int) -> str:
+        folded = self[code] = _fold_char(chr(code))
+        return folded
+
+
+_ACCENT_FOLDING = _AccentFoldingTable()
+
+
+class FastTfidfTransformer:
+    """Linha CSR [TF-IDF | features escaladas] de um documento, equivalente ao caminho do sklearn"""
+
+    def __init__(self, vectorizer: Any, scaler: Any = None):
+        self.vectorizer = vectorizer
+        self.scaler = scaler
+        if isinstance(vectorizer, CompactTfidfVectorizer):
+            params = vectorizer.params
+            # Vocabulário compacto: a chave é o hash estável de cada termo
+            self._vocabulary = dict(zip(vectorizer.term_hashes.tolist(), vectorizer.columns.tolist()))
+            self._hash_terms = True
+            idf = vectorizer.idf
+            self.n_text_features = vectorizer.n_features
+        else:
+            params = vectorizer.get_params()
+            self._vocabulary = vectorizer.vocabulary_
+            self._hash_terms = False
+            idf = vectorizer.idf_ if vectorizer.use_idf else None
+            self.n_text_features = len(vectorizer.vocabulary_)
+
+        self._lowercase = params['lowercase']
+        self._strip_accents = params['strip_accents'] == 'unicode'
+        self._token_pattern = re.compile(params['token_pattern'])
+        self._min_n, self._max_n = params['ngram_range']
+        stop_words = TfidfVectorizer(**{k: v for k, v in params.items() if k != 'vocabulary'}).get_stop_words()
+        self._stop_words = frozenset(stop_words) if stop_words else None
+        self._binary = params['binary']
+        self._sublinear_tf = params['sublinear_tf']
+        self._norm = params['norm']
+        self._idf: Optional[List[float]] = idf.tolist() if idf is not None else None
+
+        self._mean = self._scale = None
+        self.n_dense_features = 0
+        if scaler is not None:
+            self._mean = scaler.mean_ if scaler.with_mean else None
+            self._scale = scaler.scale_ if scaler.with_std else None
+            self.n_dense_features = scaler.n_features_in_
+        self._dense_columns = np.arange(self.n_text_features, self.n_text_features + self.n_dense_features,
+                                        dtype=np.int32)
+        self.shape = (1, self.n_text_features + self.n_dense_features)
+
+    @staticmethod
+    def supports(vectorizer: Any) -> bool:
+        """Só vetorizadores de palavras com análise padrão (sem preprocessor/tokenizer próprios)"""
+        if isinstance(vectorizer, CompactTfidfVectorizer):
+            params = vectorizer.params
+        elif isinstance(vectorizer, TfidfVectorizer) and hasattr(vectorizer, 'vocabulary_'):
+            params = vectorizer.get_params()
+        else:
+            return False
+        return (params['analyzer'] == 'word' and params['preprocessor'] is None
+                and params['tokenizer'] is None and params['strip_accents'] in (None, 'unicode'))
+
+    def analyze(self, text: str) -> List[str]:
+        """Normalização, tokenização e n-gramas como no analisador 'word' do sklearn"""
+        if self._lowercase:
+            text = text.lower()
+        if self._strip_accents and not text.isascii():
+            text = text.translate(_ACCENT_FOLDING)
+        tokens = self._token_pattern.findall(text)
+        if self._stop_words is not None:
+            tokens = [token for token in tokens if token not in self._stop_words]
+
+        min_n, max_n = self._min_n, self._max_n
+        if max_n == 1:
+            return tokens
+        terms = list(tokens) if min_n == 1 else []
+        n_tokens = len(tokens)
+        for n in range(max(min_n, 2), min(max_n, n_tokens) + 1):
+            for start in range(n_tokens - n + 1):
+                terms.append(" ".join(tokens[start:start + n]))
+        return terms
+
+    def transform_text(self, text: str) -> Tuple[List[int], List[float]]:
+        """Colunas (ordenadas) e valores TF-IDF normalizados de um documento"""
+        vocabulary = self._vocabulary
+        counts: Dict[int, int] = {}
+        for term in self.analyze(text):
+            column = vocabulary.get(term_hash(term) if self._hash_terms else term)
+            if column is not None:
+                counts[column] = counts.get(column, 0) + 1
+
+        columns = sorted(counts)
+        values = []
+        for column in columns:
+            value = 1.0 if self._binary else float(counts[column])
+            if self._sublinear_tf:
+                value = math.log(value) + 1.0
+            if self._idf is not None:
+                value *= self._idf[column]
+            values.append(value)
+
+        if self._norm == 'l2':
+            norm = math.sqrt(sum(value * value for value in values))
+        elif self._norm == 'l1':
+            norm = sum(abs(value) for value in values)
+        else:
+            norm = 0.0
+        if norm > 0:
+            values = [value / norm for value in values]
+        return columns, values
+
+    def transform_one(self, text: str, features: Optional[np.ndarray] = None) -> sp.csr_matrix:
+        """
+        Linha CSR com o TF-IDF do texto pré-processado seguido das features escaladas
+
+        Args:
+            text: Texto pré-processado
+            features: Features numéricas sem escala (1D, na ordem do treinamento)
+        """
+        columns, values = self.transform_text(text)
+        indices = np.asarray(columns, dtype=np.int32)
+        data = np.asarray(values, dtype=np.float64)
+
+        if self.n_dense_features and features is not None:
+            dense = np.asarray(features, dtype=np.float64).ravel()
+            if self._mean is not None:
+                dense = dense - self._mean
+            if self._scale is not None:
+                dense = dense / self._scale
+            # hstack descarta zeros explícitos da parte densa; o mesmo aqui
+            nonzero = dense != 0
+            indices = np.concatenate([indices, self._dense_columns[nonzero]])
+            data = np.concatenate([data, dense[nonzero]])
+
+        indptr = np.array([0, len(indices)], dtype=np.int32)
+        return sp.csr_matrix((data, indices, indptr), shape=self.shape)
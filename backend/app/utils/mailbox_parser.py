@@ -0,0 +1,249 @@
+"""
+Leitura incremental de exportações de email (.eml, .mbox e .zip) com o módulo
+email da biblioteca padrão.
+
+As mensagens são geradas uma a uma: o mbox é dividido pelas linhas "From " enquanto
+é lido e cada membro do zip é descompactado em fluxo, sem extrair o arquivo inteiro
+para memória ou disco. Limites de quantidade, tamanho descompactado e taxa de
+compressão protegem contra zip bombs.
+"""
+
+import re
+import html
+import zipfile
+import logging
+from dataclasses import dataclass
+from email import policy
+from email.message import EmailMessage
+from email.parser import BytesFeedParser
+from typing import BinaryIO, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+MAILBOX_READ_CHUNK = 64 * 1024
+
+_HTML_BLOCK_PATTERN = re.compile(r'<(script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+_BLANK_LINES_PATTERN = re.compile(r'\n\s*\n+')
+
+
+class MailboxLimitError(ValueError):
+    """Arquivo excede os limites de ingestão (possível zip bomb)"""
+
+
+@dataclass
+class MailboxLimits:
+    """Limites aplicados durante a leitura de um arquivo de emails"""
+    max_messages: int = 10000
+    max_message_bytes: int = 10 * 1024 * 1024
+    max_total_bytes: int = 500 * 1024 * 1024
+    max_compression_ratio: int = 100
+    max_text_chars: int = 50000
+
+
+class _ByteBudget:
+    """Contabiliza bytes descompactados/lidos e interrompe ao estourar o total permitido"""
+
+    def __init__(self, limits: MailboxLimits):
+        self.limits = limits
+        self.total = 0
+
+    def consume(self, amount: int):
+        self.total += amount
+        if self.total > self.limits.max_total_bytes:
+            raise MailboxLimitError(
+                f"Conteúdo descompactado excede {self.limits.max_total_bytes // (1024 * 1024)}MB"
+            )
+
+
+def iter_messages(stream: BinaryIO, filename: str,
+                  limits: Optional[MailboxLimits] = None) -> Iterator[Dict[str, str]]:
+    """
+    Gera as mensagens de um arquivo .eml, .mbox ou .zip (com .eml/.mbox dentro)
+
+    Args:
+        stream: Arquivo binário posicionado no início (o .zip precisa suportar seek)
+        filename: Nome do arquivo enviado (define o formato pela extensão)
+        limits: Limites de ingestão
+
+    Yields:
+        Dict: source, message_id, subject, from, date e text de cada mensagem
+
+    Raises:
+        MailboxLimitError: Se algum limite for excedido
+        ValueError: Se o formato não for suportado ou o zip for inválido
+    """
+    limits = limits or MailboxLimits()
+    budget = _ByteBudget(limits)
+    name = filename.lower()
+    if name.endswith('.zip'):
+        messages = _iter_zip(stream, limits, budget)
+    elif name.endswith('.mbox'):
+        messages = _iter_mbox(stream, filename, limits, budget)
+    elif name.endswith('.eml'):
+        messages = _iter_single(stream, filename, limits, budget)
+    else:
+        raise ValueError(f"Formato de arquivo de emails não suportado: {filename}")
+
+    for count, (source, message) in enumerate(messages, 1):
+        if count > limits.max_messages:
+            raise MailboxLimitError(f"Arquivo contém mais de {limits.max_messages} mensagens")
+        yield message_to_record(message, source, limits.max_text_chars)
+
+
+def parse_eml(content: bytes) -> EmailMessage:
+    """Converte o conteúdo de um .eml em mensagem"""
+    parser = BytesFeedParser(policy=policy.default)
+    parser.feed(content)
+    return parser.close()
+
+
+def message_to_record(message: EmailMessage, source: str, max_text_chars: int = 0) -> Dict[str, str]:
+    """Extrai cabeçalhos principais e texto classificável (assunto + corpo) de uma mensagem"""
+    subject = _header(message, 'subject')
+    body = message_body_text(message)
+    text = f"{subject}\n\n{body}".strip() if subject else body.strip()
+    if max_text_chars:
+        text = text[:max_text_chars]
+    return {
+        'source': source,
+        'message_id': _header(message, 'message-id'),
+        'subject': subject,
+        'from': _header(message, 'from'),
+        'date': _header(message, 'date'),
+        'text': text
+    }
+
+
+def message_body_text(message: EmailMessage) -> str:
+    """Corpo da mensagem em texto: text/plain preferido, text/html convertido como alternativa"""
+    try:
+        part = message.get_body(preferencelist=('plain', 'html'))
+    except Exception:
+        part = None
+    if part is None:
+        return ''
+    try:
+        content = part.get_content()
+    except Exception:
+        payload = part.get_payload(decode=True) or b''
+        content = payload.decode(part.get_content_charset() or 'utf-8', errors='replace')
+    if not isinstance(content, str):
+        return ''
+    if part.get_content_subtype() == 'html':
+        content = _html_to_text(content)
+    return content
+
+
+def _html_to_text(content: str) -> str:
+    content = _HTML_BLOCK_PATTERN.sub(' ', content)
+    content = _HTML_TAG_PATTERN.sub(' ', content)
+    return _BLANK_LINES_PATTERN.sub('\n\n', html.unescape(content))
+
+
+def _header(message: EmailMessage, name: str) -> str:
+    try:
+        value = message.get(name)
+        return str(value).strip() if value is not None else ''
+    except Exception:
+        # Cabeçalhos malformados não devem impedir a classificação do corpo
+        return ''
+
+
+def _iter_single(stream: BinaryIO, source: str, limits: MailboxLimits,
+                 budget: _ByteBudget) -> Iterator[tuple]:
+    parser = BytesFeedParser(policy=policy.default)
+    size = 0
+    while True:
+        chunk = stream.read(MAILBOX_READ_CHUNK)
+        if not chunk:
+            break
+        size += len(chunk)
+        budget.consume(len(chunk))
+        if size > limits.max_message_bytes:
+            raise MailboxLimitError(f"Mensagem {source} excede o tamanho máximo")
+        parser.feed(chunk)
+    yield source, parser.close()
+
+
+def _iter_mbox(stream: BinaryIO, source: str, limits: MailboxLimits,
+               budget: _ByteBudget) -> Iterator[tuple]:
+    """Divide o mbox pelas linhas separadoras "From " enquanto lê, uma mensagem por vez"""
+    parser = None
+    size = 0
+    previous_blank = True
+    index = 0
+    # readline com limite: uma "linha" gigante sem quebra não é carregada inteira
+    for line in iter(lambda: stream.readline(MAILBOX_READ_CHUNK), b''):
+        budget.consume(len(line))
+        if line.startswith(b'From ') and previous_blank:
+            if parser is not None:
+                yield f"{source}#{index}", parser.close()
+            index += 1
+            parser = BytesFeedParser(policy=policy.default)
+            size = 0
+            previous_blank = False
+            continue
+        previous_blank = line in (b'\n', b'\r\n')
+        if parser is None:
+            # Conteúdo antes do primeiro separador não pertence a nenhuma mensagem
+            continue
+        size += len(line)
+        if size > limits.max_message_bytes:
+            raise MailboxLimitError(f"Mensagem {source}#{index} excede o tamanho máximo")
+        # Formato mboxrd: linhas ">From " escapadas voltam ao original
+        if line.startswith(b'>') and line.lstrip(b'>').startswith(b'From '):
+            line = line[1:]
+        parser.feed(line)
+    if parser is not None:
+        yield f"{source}#{index}", parser.close()
+
+
+def _iter_zip(stream: BinaryIO, limits: MailboxLimits, budget: _ByteBudget) -> Iterator[tuple]:
+    try:
+        archive = zipfile.ZipFile(stream)
+    except zipfile.BadZipFile:
+        raise ValueError("Arquivo .zip inválido ou corrompido")
+    with archive:
+        for info in archive.infolist():
+            name = info.filename
+            lower_name = name.lower()
+            if info.is_dir() or not lower_name.endswith(('.eml', '.mbox')):
+                logger.debug(f"Membro ignorado no zip: {name}")
+                continue
+            if info.flag_bits & 0x1:
+                raise ValueError(f"Membro criptografado no zip não suportado: {name}")
+            # Taxa declarada absurda denuncia zip bomb antes de descompactar
+            if info.compress_size and info.file_size / info.compress_size > limits.max_compression_ratio:
+                raise MailboxLimitError(f"Taxa de compressão suspeita em {name}")
+            if lower_name.endswith('.eml') and info.file_size > limits.max_message_bytes:
+                raise MailboxLimitError(f"Mensagem {name} excede o tamanho máximo")
+            with archive.open(info) as member:
+                # O tamanho declarado pode mentir: a leitura também é limitada
+                limited = _LimitedReader(member, info, limits)
+                if lower_name.endswith('.eml'):
+                    yield from _iter_single(limited, name, limits, budget)
+                else:
+                    yield from _iter_mbox(limited, name, limits, budget)
+
+
+class _LimitedReader:
+    """Leitor de membro do zip que aplica a taxa de compressão máxima ao volume realmente descompactado"""
+
+    def __init__(self, member: BinaryIO, info: zipfile.ZipInfo, limits: MailboxLimits):
+        self.member = member
+        self.name = info.filename
+        self.max_bytes = max(info.compress_size, 1) * limits.max_compression_ratio
+        self.read_bytes = 0
+
+    def _count(self, data: bytes) -> bytes:
+        self.read_bytes += len(data)
+        if self.read_bytes > self.max_bytes:
+            raise MailboxLimitError(f"Taxa de compressão suspeita em {self.name}")
+        return data
+
+    def read(self, size: int = -1) -> bytes:
+        return self._count(self.member.read(size))
+
+    def readline(self, size: int = -1) -> bytes:
+        return self._count(self.member.readline(size))
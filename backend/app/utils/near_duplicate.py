@@ -0,0 +1,182 @@
+"""
+Índice de quase-duplicatas (MinHash + LSH) para emails classificados recentemente.
+
+Emails gerados por template diferem só em nomes, datas ou números de
+protocolo, e um hash exato do texto não os reconhece. Cada texto
+pré-processado vira um conjunto de shingles (n-gramas de palavras, com
+tokens numéricos normalizados), resumido por uma assinatura MinHash de
+num_perm inteiros; a fração de posições iguais entre duas assinaturas estima
+a similaridade de Jaccard dos conjuntos. O LSH divide a assinatura em bandas:
+só os textos que coincidem em alguma banda inteira são comparados, então a
+consulta não percorre o índice.
+
+Cada entrada guarda um dicionário (por exemplo, probabilidades por modelo);
+query devolve uma cópia dele e store acrescenta chaves sob o lock do índice.
+A memória é limitada a capacity entradas (a menos usada recentemente sai
+primeiro) e entradas mais antigas que ttl_seconds são ignoradas e removidas.
+"""
+
+import os
+import time
+import zlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Primo de Mersenne 2^31 - 1: (a * x + b) cabe em uint64 para x de 32 bits
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+class _Entry:
+    __slots__ = ('signature', 'band_keys', 'payload', 'added_at')
+
+    def __init__(self, signature: np.ndarray, band_keys: List[bytes], payload: Dict[str, Any], added_at: float):
+        self.signature = signature
+        self.band_keys = band_keys
+        self.payload = payload
+        self.added_at = added_at
+
+
+class NearDuplicateIndex:
+    """Assinaturas MinHash em buckets LSH, com capacidade e validade limitadas"""
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16, shingle_size: int = 2,
+                 min_shingles: int = 4, capacity: int = 5000, ttl_seconds: float = 3600, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) deve ser múltiplo de bands ({bands})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = max(1, shingle_size)
+        self.min_shingles = min_shingles
+        self.capacity = capacity
+        self.ttl_seconds = ttl_seconds
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(_PRIME), size=(num_perm, 1)).astype(np.uint64)
+        self._b = rng.randint(0, int(_PRIME), size=(num_perm, 1)).astype(np.uint64)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._buckets: List[Dict[bytes, Set[int]]] = [{} for _ in range(bands)]
+        self._next_id = 0
+        self.stats = {'lookups': 0, 'hits': 0, 'inserts': 0, 'evictions': 0, 'skipped_short': 0,
+                      'lookup_seconds': 0.0}
+
+    @classmethod
+    def from_env(cls) -> "NearDuplicateIndex":
+        """Cria o índice a partir das variáveis de ambiente"""
+        return cls(
+            threshold=float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8")),
+            num_perm=int(os.getenv("NEAR_DUPLICATE_NUM_PERM", "64")),
+            bands=int(os.getenv("NEAR_DUPLICATE_BANDS", "16")),
+            capacity=int(os.getenv("NEAR_DUPLICATE_CAPACITY", "5000")),
+            ttl_seconds=float(os.getenv("NEAR_DUPLICATE_TTL_SECONDS", "3600"))
+        )
+
+    # ==================== ASSINATURAS ====================
+
+    def shingles(self, processed_text: str) -> Set[str]:
+        """n-gramas de palavras do texto pré-processado; tokens com dígitos viram '0' (protocolos, datas)"""
+        tokens = ['0' if any(c.isdigit() for c in token) else token for token in processed_text.split()]
+        size = self.shingle_size
+        if len(tokens) < size:
+            return set(tokens)
+        return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+    def signature(self, processed_text: str) -> Optional[np.ndarray]:
+        """Assinatura MinHash do texto (None se tiver poucos shingles para uma comparação confiável)"""
+        shingles = self.shingles(processed_text)
+        if len(shingles) < self.min_shingles:
+            with self._lock:
+                self.stats['skipped_short'] += 1
+            return None
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        return ((self._a * hashes + self._b) % _PRIME).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        rows = self.rows
+        return [signature[band * rows:(band + 1) * rows].tobytes() for band in range(self.bands)]
+
+    # ==================== CONSULTA E INSERÇÃO ====================
+
+    def query(self, signature: np.ndarray) -> Optional[Tuple[int, Dict[str, Any], float]]:
+        """Entrada mais parecida com similaridade estimada >= threshold: (id, cópia do payload, similaridade)"""
+        start_time = time.perf_counter()
+        band_keys = self._band_keys(signature)
+        now = time.time()
+        with self._lock:
+            self.stats['lookups'] += 1
+            candidates: Set[int] = set()
+            for buckets, key in zip(self._buckets, band_keys):
+                candidates.update(buckets.get(key, ()))
+            best_id, best_similarity = None, 0.0
+            for entry_id in candidates:
+                entry = self._entries[entry_id]
+                if self.ttl_seconds and now - entry.added_at > self.ttl_seconds:
+                    self._remove(entry_id)
+                    continue
+                similarity = float(np.count_nonzero(entry.signature == signature)) / self.num_perm
+                if similarity > best_similarity:
+                    best_id, best_similarity = entry_id, similarity
+            match = None
+            if best_id is not None and best_similarity >= self.threshold:
+                self._entries.move_to_end(best_id)
+                self.stats['hits'] += 1
+                match = (best_id, dict(self._entries[best_id].payload), best_similarity)
+            self.stats['lookup_seconds'] += time.perf_counter() - start_time
+        return match
+
+    def add(self, signature: np.ndarray, payload: Dict[str, Any]):
+        band_keys = self._band_keys(signature)
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = _Entry(signature, band_keys, payload, time.time())
+            for buckets, key in zip(self._buckets, band_keys):
+                buckets.setdefault(key, set()).add(entry_id)
+            self.stats['inserts'] += 1
+            while len(self._entries) > self.capacity:
+                self._remove(next(iter(self._entries)))
+                self.stats['evictions'] += 1
+
+    def store(self, entry_id: int, key: str, value: Any) -> bool:
+        """Acrescenta key ao payload da entrada, se ainda não existir (False se a entrada saiu do índice)"""
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            if entry is None:
+                return False
+            entry.payload.setdefault(key, value)
+            return True
+
+    def _remove(self, entry_id: int):
+        entry = self._entries.pop(entry_id)
+        for buckets, key in zip(self._buckets, entry.band_keys):
+            ids = buckets.get(key)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids:
+                    del buckets[key]
+
+    def clear(self):
+        """Descarta todas as entradas (por exemplo, quando o modelo que as classificou muda)"""
+        with self._lock:
+            self._entries.clear()
+            for buckets in self._buckets:
+                buckets.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            size = len(self._entries)
+        lookups = stats.pop('lookup_seconds')
+        return {
+            **stats,
+            'size': size,
+            'capacity': self.capacity,
+            'threshold': self.threshold,
+            'hit_rate': stats['hits'] / stats['lookups'] if stats['lookups'] else None,
+            'avg_lookup_ms': lookups / stats['lookups'] * 1000 if stats['lookups'] else None
+        }
@@ -0,0 +1,210 @@
+"""
+Extração de texto de PDFs com PyPDF2.
+
+Módulo propositalmente leve (não importa os serviços de classificação) para que
+possa ser carregado rapidamente pelos processos isolados de extração, que rodam
+com limite de memória.
+"""
+
+import io
+import mmap
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import PyPDF2
+
+logger = logging.getLogger(__name__)
+
+# Conteúdo aceito pelos extratores e origem (tipo, local, tamanho) entregue aos workers
+PDFContent = Union[bytes, memoryview, mmap.mmap]
+PDFSource = Tuple[str, str, int]
+
+
+def extract_pdf_text(pdf_content: PDFContent, max_chars: int = 0) -> Tuple[str, Dict[str, Any]]:
+    """
+    Extrai texto de um PDF página a página, parando ao atingir o orçamento de caracteres
+
+    Args:
+        pdf_content: Conteúdo do PDF em bytes (ou memoryview/mmap do upload)
+        max_chars: Orçamento de caracteres (0 desativa o corte)
+
+    Returns:
+        Tuple[str, Dict]: Texto extraído e estatísticas de páginas lidas/puladas
+
+    Raises:
+        ValueError: Se o PDF não tiver páginas ou nenhum texto extraível
+    """
+    return _extract_pages_serially(_open_reader(pdf_content), max_chars)
+
+
+def extract_pdf_text_from_source(source: PDFSource, max_chars: int = 0,
+                                 parallel_page_threshold: int = 0) -> Tuple[Optional[str], Dict[str, Any]]:
+    """
+    Versão para workers: abre o PDF a partir de um arquivo mapeado em memória, em vez de
+    recebê-lo serializado.
+    Se o documento tiver mais páginas que parallel_page_threshold, não extrai nada e retorna
+    (None, stats) para que o chamador distribua faixas de páginas entre vários workers.
+    """
+    with open_pdf_source(source) as pdf_content:
+        pdf_reader = _open_reader(pdf_content)
+        page_count = len(pdf_reader.pages)
+        if parallel_page_threshold and page_count > parallel_page_threshold:
+            return None, new_extraction_stats(page_count)
+        return _extract_pages_serially(pdf_reader, max_chars)
+
+
+def extract_pdf_page_range(source: PDFSource, start: int, end: int) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    Extrai o texto das páginas [start, end) de um PDF em arquivo
+
+    Returns:
+        Tuple[List[str], Dict]: Textos das páginas com conteúdo (em ordem) e estatísticas da faixa
+    """
+    with open_pdf_source(source) as pdf_content:
+        pdf_reader = _open_reader(pdf_content)
+        stats = new_extraction_stats(0)
+        return list(iter_pdf_pages(pdf_reader, stats, start, end)), stats
+
+
+@contextmanager
+def open_pdf_source(source: PDFSource) -> Iterator[PDFContent]:
+    """
+    Abre a origem do PDF nos workers: ('file', caminho, tamanho) é mapeado em memória (mmap)
+    sem cópia; cada worker lê só as partes do arquivo de que precisa, pelo cache de páginas
+    do sistema operacional
+    """
+    kind, location, size = source
+    if kind != 'file':
+        raise ValueError(f"Origem de PDF desconhecida: {kind}")
+    with open(location, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+def new_extraction_stats(page_count: int) -> Dict[str, Any]:
+    return {
+        'pages_total': page_count,
+        'pages_read': 0,
+        'pages_skipped': 0,
+        'pages_failed': 0,
+        'char_budget_reached': False
+    }
+
+
+def join_page_texts(text_parts: List[str], max_chars: int = 0) -> str:
+    """Junta os textos das páginas aplicando o orçamento de caracteres (páginas separadas por form feed)"""
+    if not text_parts:
+        raise ValueError("Não foi possível extrair texto de nenhuma página do PDF")
+    full_text = '\f'.join(text_parts)
+    if max_chars:
+        full_text = full_text[:max_chars]
+    return full_text
+
+
+def _extract_pages_serially(pdf_reader: PyPDF2.PdfReader, max_chars: int) -> Tuple[str, Dict[str, Any]]:
+    stats = new_extraction_stats(len(pdf_reader.pages))
+    text_parts = []
+    total_chars = 0
+    for page_text in iter_pdf_pages(pdf_reader, stats):
+        text_parts.append(page_text)
+        total_chars += len(page_text) + 1
+        if max_chars and total_chars >= max_chars:
+            stats['char_budget_reached'] = True
+            break
+    return join_page_texts(text_parts, max_chars), stats
+
+
+def _open_reader(pdf_content: PDFContent) -> PyPDF2.PdfReader:
+    # mmap já se comporta como stream; bytes e memoryview precisam de um BytesIO
+    stream = pdf_content if isinstance(pdf_content, mmap.mmap) else io.BytesIO(pdf_content)
+    pdf_reader = PyPDF2.PdfReader(stream)
+    if len(pdf_reader.pages) == 0:
+        raise ValueError("PDF não contém páginas")
+    return pdf_reader
+
+
+def iter_pdf_pages(pdf_reader: PyPDF2.PdfReader, stats: Dict[str, Any],
+                   start: int = 0, end: Optional[int] = None) -> Iterator[str]:
+    """
+    Gera o texto das páginas uma a uma, pulando sem extração as páginas sem camada de texto
+
+    Args:
+        pdf_reader: Leitor do PDF já aberto
+        stats: Dicionário de estatísticas atualizado a cada página
+        start: Índice da primeira página (base 0)
+        end: Índice final exclusivo (padrão: última página)
+
+    Yields:
+        str: Texto de cada página com conteúdo
+    """
+    pages = pdf_reader.pages
+    end = len(pages) if end is None else min(end, len(pages))
+    for index in range(start, end):
+        page_num = index + 1
+        page = pages[index]
+        if not page_has_text_layer(page):
+            stats['pages_skipped'] += 1
+            logger.debug(f"Página {page_num}: sem camada de texto, ignorada")
+            continue
+        try:
+            page_text = page.extract_text()
+        except Exception as e:
+            stats['pages_failed'] += 1
+            logger.warning(f"Erro ao extrair texto da página {page_num}: {str(e)}")
+            continue
+        stats['pages_read'] += 1
+        if page_text.strip():
+            logger.debug(f"Página {page_num}: {len(page_text)} caracteres extraídos")
+            yield page_text
+
+
+def page_has_text_layer(page) -> bool:
+    """
+    Verifica de forma barata se a página pode conter texto: sem fontes nos recursos
+    (da página ou de seus Form XObjects) não há o que extrair, como em páginas escaneadas
+    """
+    try:
+        if '/Contents' not in page:
+            return False
+        resources = page.get('/Resources')
+        if resources is None:
+            return False
+        resources = resources.get_object()
+        if '/Font' in resources:
+            return True
+        xobjects = resources.get('/XObject')
+        if xobjects is None:
+            return False
+        for xobject in xobjects.get_object().values():
+            xobject = xobject.get_object()
+            if xobject.get('/Subtype') == '/Form':
+                form_resources = xobject.get('/Resources')
+                if form_resources is None or '/Font' in form_resources.get_object():
+                    return True
+        return False
+    except Exception:
+        # Na dúvida, tentar a extração normal
+        return True
+
+
+def limit_worker_memory(memory_limit_mb: int) -> None:
+    """Inicializador dos processos de extração: aplica limite de espaço de endereçamento (RLIMIT_AS)"""
+    if memory_limit_mb <= 0:
+        return
+    try:
+        import resource
+    except ImportError:
+        # Plataformas sem o módulo resource (Windows) rodam sem limite
+        return
+    limit_bytes = memory_limit_mb * 1024 * 1024
+    try:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit_bytes = min(limit_bytes, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, limit_bytes))
+    except (ValueError, OSError) as e:
+        logger.warning(f"Não foi possível aplicar limite de memória de {memory_limit_mb}MB: {e}")
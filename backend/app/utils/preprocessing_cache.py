@@ -0,0 +1,146 @@
+"""
+Pré-processamento paralelo de textos com cache em disco.
+
+Cada texto pré-processado é armazenado em um SQLite local com chave
+SHA-256(identificador do pré-processador + versão + texto). Ao retreinar com um
+dataset que cresceu, apenas as linhas novas ou alteradas são processadas; as
+demais vêm do cache. O processamento das linhas ausentes é dividido em blocos
+distribuídos entre processos, por isso o pré-processador precisa ser picklable
+(função de módulo ou objeto com __call__).
+
+Um pré-processador pode definir cache_namespace(): o identificador usado nas
+chaves, ou None quando está em modo degradado (por exemplo, sem os dados do
+NLTK) e seus resultados não devem ser gravados nem lidos do cache. O cache fica
+por padrão fora da árvore do repositório (default_cache_path).
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Chaves consultadas por SELECT (abaixo do limite de variáveis do SQLite)
+_LOOKUP_BATCH = 500
+
+
+def default_cache_path() -> str:
+    """PREPROCESS_CACHE_PATH ou ~/.cache/autou/preprocess_cache.sqlite"""
+    return os.path.expanduser(os.getenv("PREPROCESS_CACHE_PATH", "~/.cache/autou/preprocess_cache.sqlite"))
+
+
+class PreprocessingCache:
+    """Cache persistente de textos pré-processados (SQLite)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS preprocessed (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    @staticmethod
+    def make_key(namespace: str, text: str) -> str:
+        return hashlib.sha256(f"{namespace}\0{text}".encode('utf-8', errors='surrogatepass')).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        unique_keys = list(dict.fromkeys(keys))
+        for start in range(0, len(unique_keys), _LOOKUP_BATCH):
+            batch = unique_keys[start:start + _LOOKUP_BATCH]
+            placeholders = ','.join('?' * len(batch))
+            rows = self._conn.execute(
+                f"SELECT key, value FROM preprocessed WHERE key IN ({placeholders})", batch
+            ).fetchall()
+            found.update(rows)
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, str]]):
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO preprocessed (key, value) VALUES (?, ?)", items)
+
+    def close(self):
+        self._conn.close()
+
+
+def _apply_chunk(preprocessor: Callable[[str], str], texts: List[str]) -> List[str]:
+    return [preprocessor(text) for text in texts]
+
+
+def preprocess_texts(texts: Sequence[str], preprocessor: Callable[[str], str], version: str,
+                     cache_path: Optional[str] = None, workers: Optional[int] = None,
+                     chunk_size: int = 250) -> Tuple[List[str], Dict[str, float]]:
+    """
+    Pré-processa textos em paralelo, reaproveitando o cache em disco
+
+    Args:
+        texts: Textos originais
+        preprocessor: Função picklable texto -> texto pré-processado
+        version: Versão do pré-processamento (alterar invalida o cache)
+        cache_path: Arquivo SQLite do cache (None desativa o cache)
+        workers: Processos para as linhas ausentes (padrão: núcleos; 1 = serial)
+        chunk_size: Textos por tarefa enviada aos processos
+
+    Returns:
+        Tuple[List[str], Dict]: Textos pré-processados (na ordem original) e estatísticas
+    """
+    start_time = time.perf_counter()
+    texts = ["" if text is None else str(text) for text in texts]
+    cache_namespace = getattr(preprocessor, 'cache_namespace', None)
+    if cache_namespace is not None:
+        name = cache_namespace()
+    else:
+        name = getattr(preprocessor, '__qualname__', type(preprocessor).__qualname__)
+    if name is None and cache_path:
+        logger.warning("⚠️ Pré-processador em modo degradado: resultados não serão gravados no cache")
+        cache_path = None
+    namespace = f"{name}:{version}"
+
+    cache = PreprocessingCache(cache_path) if cache_path else None
+    keys = [PreprocessingCache.make_key(namespace, text) for text in texts]
+    try:
+        cached = cache.get_many(keys) if cache else {}
+
+        # Textos repetidos no dataset são processados uma única vez
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        missing_keys = list(missing)
+        missing_texts = [missing[key] for key in missing_keys]
+        workers = workers or os.cpu_count() or 1
+        chunks = [missing_texts[i:i + chunk_size] for i in range(0, len(missing_texts), chunk_size)]
+        if workers > 1 and len(chunks) > 1:
+            # Importar NLTK em cada processo custa ~1s: só compensa com vários blocos
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+                results = executor.map(_apply_chunk, [preprocessor] * len(chunks), chunks)
+                processed = [value for chunk in results for value in chunk]
+        else:
+            processed = _apply_chunk(preprocessor, missing_texts)
+
+        computed = dict(zip(missing_keys, processed))
+        if cache and computed:
+            cache.put_many(computed.items())
+    finally:
+        if cache:
+            cache.close()
+
+    output = [cached[key] if key in cached else computed[key] for key in keys]
+    stats = {
+        'rows': len(texts),
+        'cache_hits': sum(1 for key in keys if key in cached),
+        'processed': len(computed),
+        'workers': min(workers, len(chunks)) if len(chunks) > 1 else 1,
+        'seconds': time.perf_counter() - start_time
+    }
+    logger.info(
+        f"Pré-processamento: {stats['rows']} linhas, {stats['cache_hits']} do cache, "
+        f"{stats['processed']} processadas em {stats['seconds']:.1f}s"
+    )
+    return output, stats
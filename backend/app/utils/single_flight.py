@@ -0,0 +1,70 @@
+"""
+Coalescência de chamadas idênticas em andamento (single-flight).
+
+Quando várias threads pedem o mesmo resultado ao mesmo tempo (por exemplo, o
+mesmo email de uma campanha chegando dezenas de vezes em milissegundos), só a
+primeira executa a função; as demais aguardam o mesmo Future e recebem o
+resultado (ou a exceção) dela. Nada fica guardado depois que a chamada
+termina: não é um cache, apenas evita trabalho repetido simultâneo. O estado
+é do processo; cada worker tem o seu.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Tuple
+
+
+class _Call:
+    __slots__ = ('future', 'waiters')
+
+    def __init__(self):
+        self.future: Future = Future()
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Uma execução por chave entre as chamadas simultâneas"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.stats = {'leaders': 0, 'coalesced': 0}
+
+    def do(self, key: str, func: Callable[[], Any]) -> Tuple[Any, bool, int]:
+        """
+        Executa func, ou aguarda a execução em andamento para a mesma chave
+
+        Returns:
+            Tuple: resultado, se foi compartilhado de outra chamada e, para quem
+                executou, quantas chamadas aguardaram o resultado
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats['leaders'] += 1
+            else:
+                call.waiters += 1
+                self.stats['coalesced'] += 1
+        if not leader:
+            return call.future.result(), True, 0
+
+        try:
+            result = func()
+        except BaseException as e:
+            self._finish(key)
+            call.future.set_exception(e)
+            raise
+        waiters = self._finish(key)
+        call.future.set_result(result)
+        return result, False, waiters
+
+    def _finish(self, key: str) -> int:
+        # Removida antes de publicar o resultado: chamadas posteriores começam uma nova execução
+        with self._lock:
+            return self._calls.pop(key).waiters
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,111 @@
+"""
+Janela de texto para classificar emails longos com custo limitado.
+
+O modelo foi treinado com emails curtos, mas a API aceita até 50.000
+caracteres; pré-processamento NLTK, features e n-gramas crescem com o
+tamanho do texto. Acima de max_chars, o classificador usa apenas uma janela:
+início + fim do email (head_tail) ou as top_k frases de maior pontuação
+(top_k), na ordem original. As features de tamanho continuam sendo
+calculadas sobre o texto completo (length_features; sentence_count fica a
+cargo do classificador, que a conta como no treinamento).
+"""
+
+import os
+import re
+from typing import Dict, Iterable, Optional
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+|\n+')
+_WORD = re.compile(r'\w+')
+
+
+def length_features(text: str) -> Dict[str, float]:
+    """Features que dependem do tamanho do texto, com operações baratas sobre o texto completo"""
+    return {
+        'length': len(text),
+        'word_count': len(text.split()),
+        'question_marks': text.count('?'),
+        'exclamation_marks': text.count('!'),
+        'periods': text.count('.'),
+        'commas': text.count(','),
+    }
+
+
+class TextWindow:
+    """Seleção de uma janela de até max_chars caracteres de um texto longo"""
+
+    NONE = "none"
+    HEAD_TAIL = "head_tail"
+    TOP_K = "top_k"
+    STRATEGIES = (NONE, HEAD_TAIL, TOP_K)
+
+    def __init__(self, strategy: str = HEAD_TAIL, max_chars: int = 4000, head_ratio: float = 0.6,
+                 top_k: int = 8, keywords: Optional[Iterable[str]] = None):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Estratégia de janela inválida: {strategy}. Use uma de {', '.join(self.STRATEGIES)}")
+        self.strategy = strategy
+        self.max_chars = max_chars
+        self.head_ratio = min(max(head_ratio, 0.0), 1.0)
+        self.top_k = max(1, top_k)
+        keywords = {keyword.lower() for keyword in (keywords or ())}
+        # Palavras isoladas por busca em conjunto; só as expressões exigem busca de substring
+        self._keyword_words = frozenset(keyword for keyword in keywords if ' ' not in keyword)
+        self._keyword_phrases = tuple(keyword for keyword in keywords if ' ' in keyword)
+
+    @classmethod
+    def from_env(cls, keywords: Optional[Iterable[str]] = None) -> "TextWindow":
+        """Cria a janela a partir das variáveis de ambiente"""
+        return cls(
+            strategy=os.getenv("CLASSIFY_WINDOW_STRATEGY", cls.HEAD_TAIL).strip().lower(),
+            max_chars=int(os.getenv("CLASSIFY_WINDOW_CHARS", "4000")),
+            head_ratio=float(os.getenv("CLASSIFY_WINDOW_HEAD_RATIO", "0.6")),
+            top_k=int(os.getenv("CLASSIFY_WINDOW_TOP_K", "8")),
+            keywords=keywords
+        )
+
+    def apply(self, text: str) -> str:
+        """Texto a classificar (o próprio texto se couber em max_chars ou sem estratégia)"""
+        if self.strategy == self.NONE or self.max_chars <= 0 or len(text) <= self.max_chars:
+            return text
+        if self.strategy == self.TOP_K:
+            return self._top_k(text)
+        return self._head_tail(text)
+
+    def _head_tail(self, text: str) -> str:
+        head_chars = int(self.max_chars * self.head_ratio)
+        tail_chars = self.max_chars - head_chars
+        # Cortar em espaço para não partir palavras nas bordas da janela
+        # (trecho com uma palavra só, ou só com espaços, fica sem corte)
+        head = text[:head_chars]
+        if head_chars and not text[head_chars].isspace() and any(c.isspace() for c in head):
+            parts = head.rsplit(None, 1)
+            head = parts[0] if len(parts) == 2 else head
+        tail = text[len(text) - tail_chars:] if tail_chars else ""
+        if tail and not text[len(text) - tail_chars - 1].isspace() and any(c.isspace() for c in tail):
+            parts = tail.split(None, 1)
+            tail = parts[1] if len(parts) == 2 else tail
+        return f"{head}\n{tail}" if tail else head
+
+    def score_sentence(self, sentence: str) -> float:
+        """Pontuação barata: palavras-chave, perguntas e exclamações, normalizada pelo tamanho"""
+        lowered = sentence.lower()
+        words = _WORD.findall(lowered)
+        if not words:
+            return 0.0
+        hits = sum(1 for word in words if word in self._keyword_words)
+        hits += sum(1 for phrase in self._keyword_phrases if phrase in lowered)
+        return (2 * hits + sentence.count('?') + 0.5 * sentence.count('!')) / (1 + len(words) ** 0.5)
+
+    def _top_k(self, text: str) -> str:
+        sentences = [sentence.strip() for sentence in _SENTENCE_SPLIT.split(text) if sentence.strip()]
+        if len(sentences) <= 1:
+            return self._head_tail(text)
+        # A primeira frase (assunto/abertura) sempre entra; as demais por pontuação
+        ranked = sorted(range(1, len(sentences)), key=lambda i: self.score_sentence(sentences[i]), reverse=True)
+        chosen, size = [0], len(sentences[0])
+        for index in ranked:
+            if len(chosen) >= self.top_k or size >= self.max_chars:
+                break
+            chosen.append(index)
+            size += len(sentences[index]) + 1
+        window = " ".join(sentences[i] for i in sorted(chosen))
+        return window[:self.max_chars]
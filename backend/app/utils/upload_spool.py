@@ -0,0 +1,131 @@
+"""
+Buffer de uploads com limite de memória.
+
+O conteúdo fica em memória até um limite configurável e, acima dele, é
+despejado em um arquivo temporário. O SHA-256 é calculado de forma
+incremental durante a escrita, sem uma segunda passada sobre os bytes.
+"""
+
+import io
+import os
+import mmap
+import shutil
+import hashlib
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Optional, Union
+
+
+class SpooledUpload:
+    """Conteúdo de um upload em memória ou em arquivo temporário, com hash incremental"""
+
+    def __init__(self, spool_threshold: int = 1024 * 1024):
+        self.spool_threshold = spool_threshold
+        self.size = 0
+        self._hasher = hashlib.sha256()
+        self._buffer: Optional[bytearray] = bytearray()
+        self._file = None
+        self.path: Optional[str] = None
+
+    @classmethod
+    def from_path(cls, path: str, chunk_size: int = 64 * 1024) -> "SpooledUpload":
+        """Reabre como upload um arquivo já salvo em disco (que passa a ser removido no close)"""
+        upload = cls(spool_threshold=0)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                upload._hasher.update(chunk)
+                upload.size += len(chunk)
+        upload._buffer = None
+        upload.path = path
+        return upload
+
+    def persist(self, path: str) -> None:
+        """Move o conteúdo para um caminho permanente (o upload deixa de ser dono do arquivo)"""
+        self.finalize()
+        if self.path is not None:
+            # shutil.move: o diretório de destino pode estar em outro sistema de arquivos
+            shutil.move(self.path, path)
+            self.path = None
+        else:
+            with open(path, 'wb') as f:
+                f.write(self._buffer)
+        self._buffer = None
+
+    @property
+    def sha256(self) -> str:
+        return self._hasher.hexdigest()
+
+    @property
+    def on_disk(self) -> bool:
+        return self.path is not None
+
+    def write(self, chunk: bytes) -> None:
+        """Acrescenta um bloco ao upload, migrando para disco ao passar do limite"""
+        self._hasher.update(chunk)
+        self.size += len(chunk)
+        if self._file is None and self.size > self.spool_threshold:
+            self._file = tempfile.NamedTemporaryFile(prefix="upload_", delete=False)
+            self.path = self._file.name
+            self._file.write(self._buffer)
+            self._buffer = None
+        if self._file is not None:
+            self._file.write(chunk)
+        else:
+            self._buffer.extend(chunk)
+
+    def finalize(self) -> None:
+        """Conclui a escrita (descarrega o arquivo temporário para leitura por outros processos)"""
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+
+    @contextmanager
+    def view(self) -> Iterator[Union[memoryview, mmap.mmap]]:
+        """
+        Acesso somente leitura ao conteúdo sem cópia: memoryview do buffer em memória
+        ou mapeamento (mmap) do arquivo temporário
+        """
+        self.finalize()
+        if self.path is None:
+            view = memoryview(self._buffer)
+            try:
+                yield view
+            finally:
+                view.release()
+            return
+        if self.size == 0:
+            yield memoryview(b"")
+            return
+        with open(self.path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield mapped
+            finally:
+                mapped.close()
+
+    @contextmanager
+    def open(self) -> Iterator[BinaryIO]:
+        """Arquivo binário somente leitura para consumo sequencial (o arquivo temporário é lido do disco)"""
+        self.finalize()
+        if self.path is None:
+            with io.BytesIO(self._buffer) as stream:
+                yield stream
+            return
+        with open(self.path, 'rb') as stream:
+            yield stream
+
+    def close(self) -> None:
+        """Libera o buffer e remove o arquivo temporário"""
+        self.finalize()
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+        self._buffer = None
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
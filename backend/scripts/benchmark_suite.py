@@ -0,0 +1,288 @@
+# backend/scripts/benchmark_suite.py
+"""
+Suíte de benchmarks do Email Classifier.
+
+Cada benchmark é um subcomando independente que mede um caminho crítico da API
+com dados sintéticos ou com o dataset do projeto.
+
+Usage:
+    python benchmark_suite.py pdf                          # extração serial vs. paralela
+    python benchmark_suite.py pdf --pages 200,500 --workers 4
+    python benchmark_suite.py cascade                      # cascata vs. só a floresta por limiar
+    python benchmark_suite.py cascade --thresholds 0.6,0.8 --first-stage keywords
+    python benchmark_suite.py length                       # janelas de texto por faixa de tamanho
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+# Permitir importar o pacote app a partir de backend/scripts
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.utils.pdf_extraction import extract_pdf_text
+from app.services import DEFAULT_CLASSIFIER_CONFIG
+from app.services.advanced_classifier import AdvancedEmailClassifier
+from app.services.pdf_extraction_pool import PDFExtractionPool
+from app.repositories.advanced_model_repository import AdvancedModelRepository
+from app.utils.text_windowing import TextWindow
+
+DATASETS_DIR = os.path.join(os.path.dirname(__file__), "..", "datasets")
+
+
+# ==================== DADOS SINTÉTICOS ====================
+
+def build_synthetic_pdf(page_count: int, lines_per_page: int = 45) -> bytes:
+    """Gera um PDF válido com texto em todas as páginas (fonte Helvetica padrão)"""
+    objects: List[bytes] = []
+
+    def add(obj: bytes) -> int:
+        objects.append(obj)
+        return len(objects)
+
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = add(b"")  # preenchido após criar as páginas
+    page_ids = []
+    for page in range(page_count):
+        lines = [b"BT /F1 10 Tf 40 800 Td 12 TL"]
+        for line in range(lines_per_page):
+            lines.append(
+                f"(Pagina {page + 1} clausula {line + 1}: o contratante solicita suporte ao sistema de faturamento) '"
+                .encode("latin-1")
+            )
+        lines.append(b"ET")
+        content = b"\n".join(lines)
+        content_id = add(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        page_ids.append(add(
+            f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>".encode()
+        ))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[pages_id - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+    catalog_id = add(f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode())
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode()
+    output += (f"trailer\n<< /Size {len(objects) + 1} /Root {catalog_id} 0 R >>\n"
+               f"startxref\n{xref_offset}\n%%EOF\n").encode()
+    return bytes(output)
+
+
+def build_long_emails(texts: List[str], labels: List[str], target_chars: int, samples: int,
+                      seed: int = 42) -> List[tuple]:
+    """Emails longos rotulados: um email do dataset seguido de outros da mesma classe até target_chars"""
+    rng = random.Random(seed)
+    by_label: Dict[str, List[str]] = {}
+    for text, label in zip(texts, labels):
+        by_label.setdefault(label, []).append(text)
+    emails = []
+    for index in rng.sample(range(len(texts)), min(samples, len(texts))):
+        parts, size = [texts[index]], len(texts[index])
+        while size < target_chars:
+            parts.append(rng.choice(by_label[labels[index]]))
+            size += len(parts[-1]) + 2
+        emails.append(("\n\n".join(parts)[:target_chars], labels[index]))
+    return emails
+
+
+def _median_time(func: Callable, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+# ==================== BENCHMARKS ====================
+
+def bench_pdf(args) -> Dict:
+    """Extração serial (loop de páginas) vs. extração paralela por faixas de páginas"""
+    page_counts = [int(p) for p in args.pages.split(',')]
+    pool = PDFExtractionPool(max_workers=1, timeout=600, parallel_workers=args.workers,
+                             parallel_page_threshold=1, max_tasks_per_child=0)
+    loop = asyncio.new_event_loop()
+    results = {}
+    try:
+        # Aquecer os workers para não medir o custo de spawn
+        loop.run_until_complete(pool.extract(build_synthetic_pdf(args.workers * 16), 0))
+
+        print(f"\n{'páginas':>8}{'tamanho':>12}{'serial (s)':>14}{'paralelo (s)':>16}{'speedup':>10}")
+        for page_count in page_counts:
+            pdf = build_synthetic_pdf(page_count)
+            serial_text = extract_pdf_text(pdf, 0)[0]
+            parallel_text = loop.run_until_complete(pool.extract(pdf, 0))[0]
+            if serial_text != parallel_text:
+                print(f"❌ Texto divergente entre os modos para {page_count} páginas")
+
+            serial = _median_time(lambda: extract_pdf_text(pdf, 0), args.repeat)
+            parallel = _median_time(lambda: loop.run_until_complete(pool.extract(pdf, 0)), args.repeat)
+            results[page_count] = {'serial_s': serial, 'parallel_s': parallel, 'speedup': serial / parallel}
+            print(f"{page_count:>8}{len(pdf) / 1024:>10.0f}KB{serial:>14.3f}{parallel:>16.3f}{serial / parallel:>9.2f}x")
+    finally:
+        pool.shutdown()
+        loop.close()
+    return results
+
+
+def bench_cascade(args) -> Dict:
+    """Taxa de escalonamento, latência por estágio e acurácia da cascata vs. só a floresta"""
+    import pandas as pd
+
+    fast_repository = AdvancedModelRepository(args.fast_model) if args.first_stage != "keywords" else None
+    classifier = AdvancedEmailClassifier(model_repository=AdvancedModelRepository(args.model),
+                                         fast_model_repository=fast_repository,
+                                         mode=AdvancedEmailClassifier.MODE_FOREST)
+    if classifier.model is None:
+        print(f"❌ Modelo não encontrado: {args.model}")
+        return {}
+    first_stage = AdvancedEmailClassifier.MODE_FAST if classifier.distilled_model is not None else "keywords"
+
+    df = pd.read_csv(args.dataset).dropna(subset=['text', 'label'])
+    if args.samples and args.samples < len(df):
+        df = df.sample(n=args.samples, random_state=42)
+    texts, labels = df['text'].astype(str).tolist(), df['label'].astype(str).tolist()
+    print(f"📊 {len(texts)} emails, primeiro estágio: {first_stage}")
+
+    classifier.classify(texts[0])  # aquecimento
+    forest, forest_ms = [], []
+    for text in texts:
+        start = time.perf_counter()
+        forest.append(classifier.classify(text)['classification'])
+        forest_ms.append((time.perf_counter() - start) * 1000)
+    forest_accuracy = statistics.mean(p == y for p, y in zip(forest, labels))
+    results = {'forest': {'accuracy': forest_accuracy, 'avg_ms': statistics.mean(forest_ms)}}
+
+    print(f"\n{'limiar':>8}{'escalados':>11}{'1º estágio':>12}{'floresta':>10}{'total':>9}"
+          f"{'acurácia':>10}{'vs floresta':>13}{'concordância':>14}")
+    print(f"{'floresta':>8}{'100.0%':>11}{'-':>12}{statistics.mean(forest_ms):>8.2f}ms"
+          f"{statistics.mean(forest_ms):>7.2f}ms{forest_accuracy:>10.2%}{'-':>13}{'-':>14}")
+    for threshold in (float(t) for t in args.thresholds.split(',')):
+        predictions, total_ms, first_ms, escalated_ms = [], [], [], []
+        for text in texts:
+            start = time.perf_counter()
+            result = classifier.classify_cascade(text, threshold)
+            total_ms.append((time.perf_counter() - start) * 1000)
+            predictions.append(result['classification'])
+            first_ms.append(result['cascade']['first_stage_ms'])
+            if result['cascade']['escalated']:
+                escalated_ms.append(result['cascade']['forest_ms'])
+
+        accuracy = statistics.mean(p == y for p, y in zip(predictions, labels))
+        agreement = statistics.mean(p == f for p, f in zip(predictions, forest))
+        escalation_rate = len(escalated_ms) / len(texts)
+        results[threshold] = {
+            'escalation_rate': escalation_rate,
+            'avg_first_stage_ms': statistics.mean(first_ms),
+            'avg_forest_ms': statistics.mean(escalated_ms) if escalated_ms else 0.0,
+            'avg_total_ms': statistics.mean(total_ms),
+            'accuracy': accuracy,
+            'accuracy_delta': accuracy - forest_accuracy,
+            'agreement_with_forest': agreement
+        }
+        row = results[threshold]
+        print(f"{threshold:>8.2f}{escalation_rate:>11.1%}{row['avg_first_stage_ms']:>10.3f}ms"
+              f"{row['avg_forest_ms']:>8.2f}ms{row['avg_total_ms']:>7.2f}ms{accuracy:>10.2%}"
+              f"{row['accuracy_delta']:>+13.2%}{agreement:>14.2%}")
+    return results
+
+
+def bench_length(args) -> Dict:
+    """Latência e acurácia por faixa de tamanho, sem janela e com cada estratégia de janela"""
+    import pandas as pd
+
+    classifier = AdvancedEmailClassifier(model_repository=AdvancedModelRepository(args.model),
+                                         mode=AdvancedEmailClassifier.MODE_FOREST)
+    if classifier.model is None:
+        print(f"❌ Modelo não encontrado: {args.model}")
+        return {}
+    df = pd.read_csv(args.dataset).dropna(subset=['text', 'label'])
+    texts, labels = df['text'].astype(str).tolist(), df['label'].astype(str).tolist()
+    keywords = classifier.productive_keywords | classifier.unproductive_keywords
+    strategies = [s.strip() for s in args.strategies.split(',')]
+
+    results = {}
+    print(f"\n{'caracteres':>11}{'janela':>11}{'ms/email':>10}{'acurácia':>10}{'vs none':>10}")
+    for target_chars in (int(b) for b in args.buckets.split(',')):
+        emails = build_long_emails(texts, labels, target_chars, args.samples)
+        baseline = None
+        for strategy in strategies:
+            classifier.text_window = TextWindow(strategy=strategy, max_chars=args.window_chars, keywords=keywords)
+            classifier.classify(emails[0][0])  # aquecimento
+            predictions, timings = [], []
+            for text, _ in emails:
+                start = time.perf_counter()
+                predictions.append(classifier.classify(text)['classification'])
+                timings.append((time.perf_counter() - start) * 1000)
+            accuracy = statistics.mean(p == label for p, (_, label) in zip(predictions, emails))
+            if baseline is None:
+                baseline = predictions
+            agreement = statistics.mean(p == b for p, b in zip(predictions, baseline))
+            results.setdefault(target_chars, {})[strategy] = {
+                'avg_ms': statistics.mean(timings), 'accuracy': accuracy, 'agreement_with_first': agreement
+            }
+            print(f"{target_chars:>11}{strategy:>11}{statistics.mean(timings):>10.2f}{accuracy:>10.2%}{agreement:>10.2%}")
+    return results
+
+
+BENCHMARKS = {
+    'pdf': bench_pdf,
+    'cascade': bench_cascade,
+    'length': bench_length,
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks do Email Classifier")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    pdf_parser = subparsers.add_parser("pdf", help="Extração de PDF serial vs. paralela")
+    pdf_parser.add_argument("--pages", default="100,300,600", help="Quantidades de páginas (separadas por vírgula)")
+    pdf_parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1), help="Workers paralelos")
+    pdf_parser.add_argument("--repeat", type=int, default=3, help="Repetições por medição (mediana)")
+
+    cascade_parser = subparsers.add_parser("cascade", help="Cascata (estágio barato + floresta) vs. só a floresta")
+    cascade_parser.add_argument("--model", default=os.getenv("ADVANCED_MODEL_PATH", os.path.join(DATASETS_DIR, "advanced_model.pkl")))
+    cascade_parser.add_argument("--fast-model", default=os.getenv("FAST_MODEL_PATH", os.path.join(DATASETS_DIR, "advanced_model_fast.pkl")),
+                                help="Modelo destilado usado como primeiro estágio, se existir")
+    cascade_parser.add_argument("--first-stage", choices=["auto", "keywords"], default="auto",
+                                help="auto: modelo destilado se existir, senão palavras-chave")
+    cascade_parser.add_argument("--dataset", default=os.path.join(DATASETS_DIR, "dataset_balanced_2000.csv"))
+    cascade_parser.add_argument("--samples", type=int, default=500, help="Emails amostrados do dataset (0 = todos)")
+    cascade_parser.add_argument("--thresholds", default=f"0.55,{DEFAULT_CLASSIFIER_CONFIG['confidence_threshold']},0.7,0.8,0.9",
+                                help="Limiares de confiança avaliados (separados por vírgula)")
+
+    length_parser = subparsers.add_parser("length", help="Janelas de texto (head_tail, top_k) por faixa de tamanho")
+    length_parser.add_argument("--model", default=os.getenv("ADVANCED_MODEL_PATH", os.path.join(DATASETS_DIR, "advanced_model.pkl")))
+    length_parser.add_argument("--dataset", default=os.path.join(DATASETS_DIR, "dataset_balanced_2000.csv"))
+    length_parser.add_argument("--buckets", default="500,2000,10000,50000", help="Tamanhos dos emails em caracteres")
+    length_parser.add_argument("--strategies", default="none,head_tail,top_k",
+                               help="Estratégias comparadas (a primeira é a referência de concordância)")
+    length_parser.add_argument("--window-chars", type=int, default=int(os.getenv("CLASSIFY_WINDOW_CHARS", "4000")))
+    length_parser.add_argument("--samples", type=int, default=50, help="Emails por faixa")
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    print(f"⏱️ BENCHMARK: {args.benchmark}")
+    print("="*60)
+    BENCHMARKS[args.benchmark](args)
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,327 @@
+# backend/scripts/bulk_classify.py
+"""
+Classificação offline em massa de emails históricos (CSV ou JSONL), sem passar pela API.
+
+O arquivo de entrada é lido em blocos, que são distribuídos para um pool de processos
+(cada worker carrega o modelo uma única vez). Os resultados são gravados em ordem,
+de forma incremental, em JSONL ou CSV. Um checkpoint é atualizado após cada bloco
+gravado: uma execução interrompida retoma do último bloco concluído.
+
+Usage:
+    python bulk_classify.py emails.csv --output resultados.jsonl
+    python bulk_classify.py emails.jsonl --output resultados.csv --workers 8 --chunk-size 2000
+    python bulk_classify.py emails.csv --output resultados.jsonl --id-column message_id --include-response
+    python bulk_classify.py emails.csv --output resultados.jsonl --restart   # ignora o checkpoint
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+# Permitir importar o pacote app a partir de backend/scripts
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(__file__), "..", "datasets", "advanced_model.pkl")
+CSV_FIELDS = ['row', 'id', 'classification', 'confidence', 'error']
+
+# Classificador de cada worker, carregado uma vez pelo inicializador do pool
+_worker_classifier = None
+
+
+# ==================== WORKERS ====================
+
+def init_worker(model_path: str):
+    """Inicializador do pool: carrega o modelo uma única vez por processo"""
+    global _worker_classifier
+    from app.services.advanced_classifier import AdvancedEmailClassifier
+    from app.repositories.advanced_model_repository import AdvancedModelRepository
+
+    _worker_classifier = AdvancedEmailClassifier(
+        model_path=model_path,
+        model_repository=AdvancedModelRepository(model_path)
+    )
+    if _worker_classifier.model is None:
+        raise RuntimeError(f"Não foi possível carregar o modelo: {model_path}")
+
+
+def classify_chunk(chunk_index: int, rows: List[Dict], include_response: bool) -> Tuple[int, List[Dict]]:
+    """Classifica um bloco de linhas ({'row', 'id', 'text'}) em uma única chamada ao modelo"""
+    valid = [row for row in rows if row['text'].strip()]
+    results = {}
+    if valid:
+        for row, result in zip(valid, _worker_classifier.classify_batch([row['text'] for row in valid])):
+            output = {
+                'classification': result['classification'],
+                'confidence': round(result['confidence'], 6),
+                'probabilities': {label: round(prob, 6) for label, prob in result['probabilities'].items()},
+                'error': None
+            }
+            if include_response:
+                output['suggested_response'] = result['suggested_response']
+            results[row['row']] = output
+
+    outputs = []
+    for row in rows:
+        output = results.get(row['row'], {'classification': None, 'confidence': None, 'error': 'texto vazio'})
+        outputs.append({'row': row['row'], 'id': row['id'], **output})
+    return chunk_index, outputs
+
+
+# ==================== LEITURA EM BLOCOS ====================
+
+def detect_format(path: str) -> str:
+    return 'jsonl' if path.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def iter_chunks(path: str, input_format: str, text_column: str, id_column: Optional[str],
+                chunk_size: int) -> Iterator[List[Dict]]:
+    """Lê a entrada em blocos de chunk_size linhas, sem carregar o arquivo inteiro"""
+    row_number = 0
+    if input_format == 'csv':
+        usecols = [text_column] + ([id_column] if id_column else [])
+        for frame in pd.read_csv(path, chunksize=chunk_size, usecols=usecols, dtype=str, keep_default_na=False):
+            rows = []
+            for record in frame.to_dict('records'):
+                rows.append({
+                    'row': row_number,
+                    'id': record[id_column] if id_column else row_number,
+                    'text': record[text_column]
+                })
+                row_number += 1
+            yield rows
+        return
+
+    rows = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            rows.append({
+                'row': row_number,
+                'id': record.get(id_column) if id_column else row_number,
+                'text': str(record.get(text_column) or '')
+            })
+            row_number += 1
+            if len(rows) >= chunk_size:
+                yield rows
+                rows = []
+    if rows:
+        yield rows
+
+
+def estimate_rows(path: str, input_format: str) -> int:
+    """Conta quebras de linha para estimar o total (aproximado em CSV com campos multilinha)"""
+    lines = 0
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(1024 * 1024)
+            if not block:
+                break
+            lines += block.count(b'\n')
+    return max(0, lines - 1) if input_format == 'csv' else lines
+
+
+# ==================== SAÍDA E CHECKPOINT ====================
+
+class ResultWriter:
+    """Grava resultados em JSONL ou CSV e registra checkpoints consistentes com o arquivo"""
+
+    def __init__(self, output_path: str, checkpoint_path: str, checkpoint: Dict):
+        self.output_path = output_path
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint = checkpoint
+        self.output_format = 'csv' if output_path.lower().endswith('.csv') else 'jsonl'
+
+        resuming = checkpoint['chunks_done'] > 0 and os.path.exists(output_path)
+        if resuming:
+            # Descartar o que foi escrito após o último checkpoint (bloco parcial)
+            with open(output_path, 'r+b') as f:
+                f.truncate(checkpoint['output_bytes'])
+        self.file = open(output_path, 'a' if resuming else 'w', encoding='utf-8', newline='')
+        self.csv_writer = None
+        if self.output_format == 'csv':
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=CSV_FIELDS, extrasaction='ignore')
+            if not resuming:
+                self.csv_writer.writeheader()
+
+    def write_chunk(self, results: List[Dict]):
+        for result in results:
+            if self.csv_writer:
+                self.csv_writer.writerow(result)
+            else:
+                self.file.write(json.dumps(result, ensure_ascii=False) + '\n')
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+        self.checkpoint['chunks_done'] += 1
+        self.checkpoint['rows_done'] += len(results)
+        self.checkpoint['output_bytes'] = os.path.getsize(self.output_path)
+        save_checkpoint(self.checkpoint_path, self.checkpoint)
+
+    def close(self):
+        self.file.close()
+
+
+def load_checkpoint(path: str, args) -> Dict:
+    """Carrega o checkpoint compatível com a execução atual ou cria um novo"""
+    fresh = {
+        'input': os.path.abspath(args.input),
+        'output': os.path.abspath(args.output),
+        'chunk_size': args.chunk_size,
+        'chunks_done': 0,
+        'rows_done': 0,
+        'output_bytes': 0
+    }
+    if args.restart or not os.path.exists(path) or not os.path.exists(args.output):
+        return fresh
+    with open(path, 'r', encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    for key in ('input', 'output', 'chunk_size'):
+        if checkpoint.get(key) != fresh[key]:
+            raise ValueError(
+                f"Checkpoint {path} não corresponde a esta execução ({key} diferente). Use --restart."
+            )
+    return checkpoint
+
+
+def save_checkpoint(path: str, checkpoint: Dict):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+# ==================== EXECUÇÃO ====================
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def print_progress(rows_done: int, rows_this_run: int, total_rows: int, elapsed: float):
+    rate = rows_this_run / elapsed if elapsed > 0 else 0.0
+    message = f"   ... {rows_done:,} linhas | {rate:,.0f} linhas/s"
+    if total_rows and rate > 0:
+        remaining = max(0, total_rows - rows_done)
+        message += f" | {min(rows_done / total_rows, 1.0):.1%} | ETA {format_duration(remaining / rate)}"
+    print(message, flush=True)
+
+
+def run(args) -> Dict:
+    input_format = args.input_format or detect_format(args.input)
+    checkpoint_path = args.checkpoint or args.output + '.checkpoint.json'
+    checkpoint = load_checkpoint(checkpoint_path, args)
+    skip_chunks = checkpoint['chunks_done']
+    if skip_chunks:
+        print(f"♻️ Retomando do checkpoint: {checkpoint['rows_done']:,} linhas ({skip_chunks} blocos) já gravadas")
+
+    total_rows = 0 if args.no_count else estimate_rows(args.input, input_format)
+    if total_rows:
+        print(f"📊 Aproximadamente {total_rows:,} linhas na entrada")
+
+    writer = ResultWriter(args.output, checkpoint_path, checkpoint)
+    max_in_flight = args.workers * 2
+    start = time.perf_counter()
+    rows_this_run = 0
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                                 initargs=(args.model,)) as executor:
+            pending = set()
+            completed: Dict[int, List[Dict]] = {}
+            next_to_write = skip_chunks
+
+            def drain(timeout: Optional[float]):
+                nonlocal next_to_write, rows_this_run, pending
+                if not pending:
+                    return
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk_index, results = future.result()
+                    completed[chunk_index] = results
+                # Gravar em ordem: blocos concluídos fora de ordem esperam os anteriores
+                while next_to_write in completed:
+                    results = completed.pop(next_to_write)
+                    writer.write_chunk(results)
+                    rows_this_run += len(results)
+                    next_to_write += 1
+                    print_progress(checkpoint['rows_done'], rows_this_run, total_rows,
+                                   time.perf_counter() - start)
+
+            chunks = iter_chunks(args.input, input_format, args.text_column, args.id_column, args.chunk_size)
+            for chunk_index, rows in enumerate(chunks):
+                if chunk_index < skip_chunks:
+                    continue
+                pending.add(executor.submit(classify_chunk, chunk_index, rows, args.include_response))
+                # Limitar blocos em voo mantém a memória constante em arquivos grandes
+                while len(pending) >= max_in_flight:
+                    drain(timeout=None)
+                drain(timeout=0)
+            while pending:
+                drain(timeout=None)
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    return {'rows_this_run': rows_this_run, 'rows_total': checkpoint['rows_done'], 'elapsed_seconds': elapsed}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Classificação offline em massa de emails (CSV/JSONL)")
+    parser.add_argument("input", help="Arquivo de entrada (.csv ou .jsonl)")
+    parser.add_argument("--output", required=True, help="Arquivo de saída (.jsonl ou .csv)")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH, help="Artefato do modelo (.pkl)")
+    parser.add_argument("--input-format", choices=['csv', 'jsonl'], default=None,
+                        help="Formato da entrada (padrão: pela extensão)")
+    parser.add_argument("--text-column", default="text", help="Coluna/campo com o texto do email")
+    parser.add_argument("--id-column", default=None, help="Coluna/campo de identificação copiado para a saída")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Linhas por bloco (padrão: 1000)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processos de classificação")
+    parser.add_argument("--checkpoint", default=None, help="Arquivo de checkpoint (padrão: <output>.checkpoint.json)")
+    parser.add_argument("--restart", action="store_true", help="Ignorar checkpoint existente e recomeçar")
+    parser.add_argument("--include-response", action="store_true", help="Incluir resposta sugerida (somente JSONL)")
+    parser.add_argument("--no-count", action="store_true", help="Não contar linhas da entrada (sem ETA)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    print("📦 CLASSIFICAÇÃO EM MASSA")
+    print("="*60)
+
+    if not os.path.exists(args.input):
+        print(f"❌ Arquivo de entrada não encontrado: {args.input}")
+        return False
+    if not os.path.exists(args.model):
+        print(f"❌ Modelo não encontrado: {args.model}")
+        print("💡 Execute primeiro: python train_with_balanced_dataset.py")
+        return False
+    print(f"📥 Entrada: {args.input}")
+    print(f"📤 Saída: {args.output}")
+    print(f"⚙️ {args.workers} workers, blocos de {args.chunk_size} linhas")
+
+    try:
+        summary = run(args)
+    except KeyboardInterrupt:
+        print("\n⏸️ Interrompido. Execute novamente o mesmo comando para retomar do checkpoint.")
+        return False
+    except Exception as e:
+        print(f"\n❌ ERRO DURANTE A CLASSIFICAÇÃO: {e}")
+        return False
+
+    rate = summary['rows_this_run'] / summary['elapsed_seconds'] if summary['elapsed_seconds'] > 0 else 0.0
+    print(f"\n✅ {summary['rows_this_run']:,} linhas classificadas nesta execução "
+          f"({summary['rows_total']:,} no total) em {format_duration(summary['elapsed_seconds'])} "
+          f"({rate:,.0f} linhas/s)")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
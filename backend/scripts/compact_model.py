@@ -0,0 +1,154 @@
+# backend/scripts/compact_model.py
+"""
+Compactação do artefato do classificador para servir.
+
+Remove atributos usados apenas no treinamento (stop_words_ do TF-IDF, dados
+out-of-bag da floresta) e troca o vocabulário do TF-IDF por arrays ordenados de
+hashes com IDF em float32. Mostra o tamanho de cada componente antes e depois,
+o custo de carregar o artefato e verifica se as predições continuam iguais.
+
+Usage:
+    python compact_model.py                                # gera advanced_model.compact.pkl
+    python compact_model.py --in-place                     # substitui o modelo após a verificação
+    python compact_model.py --model ../datasets/advanced_model_tuned.pkl --samples 2000
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Permitir importar o pacote app a partir de backend/scripts
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.advanced_classifier import AdvancedEmailClassifier
+from app.services.model_compaction import compact_model_data
+
+DATASETS_DIR = os.path.join(os.path.dirname(__file__), "..", "datasets")
+
+
+def measure_load(payload: bytes) -> Dict[str, float]:
+    """Tempo de unpickle e memória alocada ao carregar o artefato (o custo pago por cada worker)"""
+    start = time.perf_counter()
+    pickle.loads(payload)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    pickle.loads(payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': seconds, 'memory_bytes': peak}
+
+
+def size_report(original: Dict[str, Any], compacted: Dict[str, Any]):
+    print(f"\n{'componente':<14}{'antes':>12}{'depois':>12}{'redução':>10}")
+    for key in ('vectorizer', 'model', 'scaler'):
+        if original.get(key) is None:
+            continue
+        before = len(pickle.dumps(original[key], protocol=pickle.HIGHEST_PROTOCOL))
+        after = len(pickle.dumps(compacted[key], protocol=pickle.HIGHEST_PROTOCOL))
+        print(f"{key:<14}{before / 1024:>10.1f}KB{after / 1024:>10.1f}KB{1 - after / before:>10.1%}")
+
+    original_bytes = pickle.dumps(original, protocol=pickle.HIGHEST_PROTOCOL)
+    compacted_bytes = pickle.dumps(compacted, protocol=pickle.HIGHEST_PROTOCOL)
+    before, after = measure_load(original_bytes), measure_load(compacted_bytes)
+    print(f"{'total':<14}{len(original_bytes) / 1024:>10.1f}KB{len(compacted_bytes) / 1024:>10.1f}KB"
+          f"{1 - len(compacted_bytes) / len(original_bytes):>10.1%}")
+    print(f"{'carga (ms)':<14}{before['seconds'] * 1000:>12.1f}{after['seconds'] * 1000:>12.1f}")
+    print(f"{'memória':<14}{before['memory_bytes'] / 1024:>10.1f}KB{after['memory_bytes'] / 1024:>10.1f}KB")
+
+
+def parity_check(original: Dict[str, Any], compacted: Dict[str, Any], texts: List[str]) -> Dict[str, Any]:
+    """Compara matriz TF-IDF e predições dos dois artefatos no caminho real de classificação"""
+    classifier = AdvancedEmailClassifier()
+
+    def run(model_data):
+        classifier.model = model_data['model']
+        classifier.vectorizer = model_data['vectorizer']
+        classifier.scaler = model_data.get('scaler')
+        return classifier.classify_batch(texts)
+
+    processed = [classifier.preprocess_text(text) for text in texts]
+    difference = original['vectorizer'].transform(processed) - compacted['vectorizer'].transform(processed)
+    max_tfidf_diff = float(abs(difference).max()) if difference.nnz else 0.0
+
+    start = time.perf_counter()
+    original_results = run(original)
+    original_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    compacted_results = run(compacted)
+    compacted_seconds = time.perf_counter() - start
+
+    agreement = np.mean([a['classification'] == b['classification']
+                         for a, b in zip(original_results, compacted_results)])
+    max_prob_diff = max(
+        abs(a['probabilities'][label] - b['probabilities'][label])
+        for a, b in zip(original_results, compacted_results) for label in a['probabilities']
+    )
+    return {
+        'samples': len(texts),
+        'agreement': float(agreement),
+        'max_probability_diff': float(max_prob_diff),
+        'max_tfidf_diff': max_tfidf_diff,
+        'original_seconds': original_seconds,
+        'compacted_seconds': compacted_seconds
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compacta o artefato do classificador para servir")
+    parser.add_argument("--model", default=os.getenv("ADVANCED_MODEL_PATH", os.path.join(DATASETS_DIR, "advanced_model.pkl")))
+    parser.add_argument("--output", help="Destino do artefato compacto (padrão: <modelo>.compact.pkl)")
+    parser.add_argument("--in-place", action="store_true", help="Substitui o modelo original se a verificação passar")
+    parser.add_argument("--dataset", default=os.path.join(DATASETS_DIR, "dataset_balanced_2000.csv"),
+                        help="CSV com coluna 'text' para a verificação de paridade")
+    parser.add_argument("--samples", type=int, default=1000, help="Textos usados na verificação")
+    parser.add_argument("--min-agreement", type=float, default=1.0, help="Concordância mínima das predições")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    print("🗜️ COMPACTAÇÃO DO MODELO")
+    print("="*60)
+
+    if not os.path.exists(args.model):
+        print(f"❌ Modelo não encontrado: {args.model}")
+        return False
+    with open(args.model, 'rb') as f:
+        original = pickle.load(f)
+    if original.get('compacted'):
+        print("⚠️ O modelo já está compactado")
+        return True
+
+    compacted = compact_model_data(original)
+    size_report(original, compacted)
+
+    texts = pd.read_csv(args.dataset)['text'].astype(str).tolist()
+    texts = texts[:args.samples] if args.samples else texts
+    print(f"\n🔍 Verificando paridade em {len(texts)} textos...")
+    parity = parity_check(original, compacted, texts)
+    print(f"   Predições iguais: {parity['agreement']:.2%}")
+    print(f"   Maior diferença de probabilidade: {parity['max_probability_diff']:.2e}")
+    print(f"   Maior diferença no TF-IDF: {parity['max_tfidf_diff']:.2e}")
+    print(f"   Classificação do lote: {parity['original_seconds']:.2f}s -> {parity['compacted_seconds']:.2f}s")
+    if parity['agreement'] < args.min_agreement:
+        print(f"❌ Concordância abaixo do mínimo ({args.min_agreement:.2%}); artefato não salvo")
+        return False
+
+    output = args.model if args.in_place else (args.output or os.path.splitext(args.model)[0] + ".compact.pkl")
+    tmp_path = output + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(compacted, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, output)
+    print(f"\n✅ Artefato compacto salvo em: {output}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -1,646 +1,807 @@
-# backend/create_improved_dataset.py
-import pandas as pd
-import numpy as np
-import random
+# backend/scripts/create_improved_dataset.py
+"""
+Gerador de datasets de emails PRODUTIVOS e IMPRODUTIVOS.
+
+Os emails vêm de templates com todos os placeholders preenchidos e de emails
+escritos manualmente, combinados com saudação, complemento e despedida
+opcionais. A geração é determinística para uma mesma semente (cada lote tem
+seu próprio gerador, derivado da semente e do índice do lote), roda em vários
+processos e é gravada em shards CSV ou JSONL à medida que os lotes chegam.
+Duplicatas são descartadas por um conjunto de hashes de 8 bytes, sem manter
+os textos em memória.
+
+Sem argumentos, gera o dataset balanceado de 2000 emails usado no
+treinamento (datasets/dataset_balanced_2000.csv).
+
+Usage:
+    python create_improved_dataset.py
+    python create_improved_dataset.py --rows 1000000 --shards 8 --workers 4
+    python create_improved_dataset.py --rows 200000 --format jsonl --seed 7 --name carga
+"""
+import argparse
+import csv
+import hashlib
+import json
+import math
 import os
+import random
+import re
+import time
+from multiprocessing import Pool
+from typing import Dict, Iterator, List, Tuple
 
-def create_productive_emails():
-    """Gera emails produtivos variados e realistas"""
-    
-    # Templates de problemas técnicos
-    technical_problems = [
-        "Sistema {sistema} apresentando erro {erro} desde {tempo}",
-        "Não consigo acessar {modulo} - aparece mensagem {mensagem}",
-        "Falha na {operacao} do {sistema} durante {periodo}",
-        "Performance muito lenta no {funcionalidade} desde {tempo}",
-        "Erro {codigo} ao tentar {acao} no {sistema}",
-        "Problema de sincronização entre {sistema1} e {sistema2}",
-        "Timeout na {operacao} após {tempo} de processamento",
-        "Integração com {servico} não está funcionando",
-        "Backup automático falhando com erro {mensagem}",
-        "Dashboard não carrega dados de {periodo}"
-    ]
-    
-    # Templates de solicitações
-    requests = [
-        "Preciso de acesso ao {recurso} para {finalidade}",
-        "Como configurar {funcionalidade} no {sistema}?",
-        "Solicitação de permissão para {acao} em {modulo}",
-        "Preciso urgentemente {servico} para {projeto}",
-        "Como integrar {sistema} com {ferramenta_externa}?",
-        "Solicitação de aumento de limite em {recurso}",
-        "Preciso de orientação para {processo} no {sistema}",
-        "Como resolver problema de {tipo_problema} em {contexto}?",
-        "Solicitação de instalação de {software} para {finalidade}",
-        "Preciso exportar dados de {periodo} do {sistema}"
-    ]
-    
-    # Templates de status e acompanhamento
-    status_requests = [
-        "Qual o status da solicitação protocolo {numero}?",
-        "Quando será implementada a correção do {problema}?",
-        "Preciso acompanhar andamento de {processo} iniciado em {data}",
-        "Em que etapa está {solicitacao} enviada há {tempo}?",
-        "Quando teremos retorno sobre {questao} reportada?",
-        "Status da migração de {dados} agendada para {periodo}",
-        "Atualização sobre resolução de {problema} crítico",
-        "Acompanhamento do chamado {numero} aberto em {data}",
-        "Previsão para conclusão de {projeto} em andamento",
-        "Quando será liberada versão corrigida de {sistema}?"
-    ]
-    
-    # Templates de urgência
-    urgent = [
-        "URGENTE: {problema} impedindo {processo_critico}",
-        "Emergência: {sistema} fora do ar durante {evento_importante}",
-        "Crítico: perda de dados em {sistema} necessita {acao_imediata}",
-        "Prioridade alta: {cliente_importante} reporta {problema_grave}",
-        "Bloqueador: {funcionalidade_essencial} não funciona",
-        "Emergencial: {processo_negocio} parado por {motivo_tecnico}",
-        "Urgente: deadline em {tempo} e {impedimento} bloqueia entrega",
-        "Crítico: {falha_seguranca} detectada em {sistema_producao}",
-        "Emergência: {integracao_pagamento} com problemas na {evento_vendas}",
-        "Prioridade máxima: {sistema_core} instável em produção"
-    ]
-    
-    # Valores para substituição
-    valores = {
-        'sistema': ['CRM', 'ERP', 'e-commerce', 'dashboard', 'API', 'aplicativo mobile', 'plataforma', 'sistema financeiro'],
-        'erro': ['500', '404', '403', 'timeout', 'connection refused', 'database error'],
-        'tempo': ['manhã', 'ontem', 'segunda-feira', 'esta semana', '2 horas', 'hoje cedo'],
-        'modulo': ['relatórios', 'área financeira', 'gestão de usuários', 'módulo de vendas', 'painel administrativo'],
-        'mensagem': ['"acesso negado"', '"erro interno"', '"sessão expirada"', '"dados inválidos"'],
-        'operacao': ['importação', 'exportação', 'sincronização', 'backup', 'migração'],
-        'periodo': ['madrugada', 'horário comercial', 'final de semana', 'pico de acesso'],
-        'codigo': ['HTTP 500', 'ERR_001', 'CODE 403', 'SQL_ERROR'],
-        'acao': ['salvar dados', 'gerar relatório', 'fazer login', 'enviar email'],
-        'funcionalidade': ['busca avançada', 'filtros', 'exportação CSV', 'autenticação'],
-        'sistema1': ['Salesforce', 'SAP', 'aplicativo'], 
-        'sistema2': ['banco de dados', 'sistema legado', 'API externa'],
-        'servico': ['webhook', 'API REST', 'FTP', 'integração'],
-        'recurso': ['banco de dados', 'área administrativa', 'módulo financeiro'],
-        'finalidade': ['gerar relatórios mensais', 'configurar integrações', 'treinar equipe'],
-        'projeto': ['lançamento do produto', 'migração de dados', 'auditoria'],
-        'numero': ['#12345', '#67890', '#54321', '#98765'],
-        'problema': ['bug na autenticação', 'lentidão no sistema', 'erro de sincronização'],
-        'processo': ['migração de dados', 'implementação de feature', 'correção de bug'],
-        'data': ['segunda-feira', 'semana passada', '15/01', 'início do mês']
-    }
-    
-    all_templates = technical_problems + requests + status_requests + urgent
-    emails = []
-    
-    # Gerar emails usando templates
-    for i in range(800):  # 800 emails via templates
-        template = random.choice(all_templates)
-        email = template
-        
-        # Substituir placeholders
-        import re
-        placeholders = re.findall(r'\{(\w+)\}', template)
-        for placeholder in placeholders:
-            if placeholder in valores:
-                replacement = random.choice(valores[placeholder])
-                email = email.replace(f'{{{placeholder}}}', replacement)
-        
-        emails.append(email)
-    
-    # Adicionar emails específicos escritos manualmente (200)
-    specific_emails = [
-        "O login não está funcionando depois da atualização de ontem. Sempre aparece erro de credenciais.",
-        "Como faço para integrar nosso sistema com a API de pagamentos do PagSeguro?",
-        "Preciso urgentemente dos relatórios de vendas de dezembro para apresentação na diretoria.",
-        "Sistema travando constantemente quando tento importar planilha com mais de 1000 linhas.",
-        "Não consigo acessar o módulo financeiro - diz que não tenho permissão.",
-        "API retornando erro 500 em todas as requisições desde as 14h de hoje.",
-        "Como configurar backup automático para rodar todo domingo às 2h da manhã?",
-        "Cliente VIP reportando que não consegue finalizar compra no checkout.",
-        "Webhook de pagamento não está enviando notificações para nosso sistema.",
-        "Performance do dashboard extremamente lenta com mais de 100 usuários simultâneos.",
-        "Preciso resetar senha do usuário admin que foi bloqueada por tentativas incorretas.",
-        "Como exportar todos os dados de clientes dos últimos 6 meses em formato CSV?",
-        "Sistema de email marketing não está enviando campanhas agendadas.",
-        "Integração com correios parou de funcionar - rastreamento não atualiza.",
-        "Preciso de acesso de administrador para configurar novos usuários da filial.",
-        "Database connection timeout durante processo de sincronização noturna.",
-        "Como configurar SSL certificate no domínio principal da aplicação?",
-        "Módulo de estoque não está atualizando quantidades após vendas realizadas.",
-        "Erro de autenticação OAuth com Google Drive para backup de arquivos.",
-        "Sistema não permite upload de arquivos maiores que 5MB - como aumentar?",
-        # Mais 180 emails específicos variados...
-        "Falha na impressão automática de etiquetas de envio pela integração dos correios.",
-        "Como implementar autenticação de dois fatores para aumentar segurança?",
-        "Relatório de comissões não está calculando percentuais corretos para vendedores.",
-        "Sincronização com sistema contábil apresentando divergências nos valores.",
-        "Preciso configurar alertas automáticos para produtos com estoque baixo.",
-        "API de geolocalização retornando coordenadas incorretas para alguns endereços.",
-        "Sistema não está enviando emails de confirmação após cadastro de novos clientes.",
-        "Como migrar dados do sistema antigo mantendo histórico de 5 anos?",
-        "Módulo de chat online não carrega para clientes usando Internet Explorer.",
-        "Integração com WhatsApp Business API falhando na autenticação do token.",
-        "Como configurar regras de desconto automático baseadas no volume de compra?",
-        "Sistema de ponto eletrônico não registra entrada/saída de funcionários remotos.",
-        "Erro na geração de NFCe - webservice da Sefaz retorna rejeição 567.",
-        "Como implementar cache Redis para melhorar performance das consultas?",
-        "Módulo de CRM não está registrando histórico de interações com clientes.",
-        "Sistema não permite cadastro de produtos com código de barras duplicado.",
-        "Como configurar rotina automática de limpeza de logs antigos?",
-        "Integração com marketplace não está atualizando preços automaticamente.",
-        "Sistema de telefonia IP não transfere chamadas entre ramais.",
-        "Como implementar assinatura digital em contratos gerados pelo sistema?",
-        "Módulo financeiro não está calculando juros de mora automaticamente.",
-        "Sistema não valida CPF/CNPJ durante cadastro permitindo dados inválidos.",
-        "Como configurar dashboard personalizado para diferentes perfis de usuário?",
-        "Integração com sistema bancário não importa extratos automaticamente.",
-        "Sistema não permite edição de pedidos após confirmação - preciso alterar regra.",
-        "Como implementar log de auditoria para rastrear alterações nos dados?",
-        "Módulo de RH não calcula horas extras corretamente no fechamento mensal.",
-        "Sistema não envia notificações push para aplicativo mobile dos clientes.",
-        "Como configurar backup incremental para otimizar espaço de armazenamento?",
-        "Integração com transportadora não está calculando frete automaticamente.",
-        "Sistema permite cadastro de fornecedores com dados incompletos.",
-        "Como implementar aprovação em múltiplos níveis para compras acima de R$ 10k?",
-        "Módulo de qualidade não está registrando não conformidades corretamente.",
-        "Sistema não gera código de rastreamento para pedidos enviados via PAC.",
-        "Como configurar relatórios automáticos por email todos os segundas às 8h?",
-        "Integração com sistema de ponto não desconta pausas automáticas.",
-        "Sistema não permite cancelamento de notas fiscais já transmitidas.",
-        "Como implementar controle de versão para documentos armazenados?",
-        "Módulo de vendas não aplica desconto progressivo conforme volume.",
-        "Sistema não sincroniza agenda de compromissos com Google Calendar.",
-        "Como configurar alertas de vencimento 30 dias antes das licenças?",
-        "Integração com correios não calcula prazo de entrega automaticamente.",
-        "Sistema permite exclusão acidental de dados críticos sem confirmação.",
-        "Como implementar assinatura eletrônica em documentos PDF gerados?",
-        "Módulo de produção não controla sequência de operações automaticamente.",
-        "Sistema não valida se produto tem estoque suficiente antes de confirmar venda.",
-        "Como configurar sincronização bidirecional com sistema ERP corporativo?",
-        "Integração com gateway de pagamento não processa cartões internacionais.",
-        "Sistema não gera boletos com código de barras conforme padrão FEBRABAN.",
-        "Como implementar controle de acesso baseado em geolocalização?",
-        "Módulo de manutenção não agenda preventivas automaticamente.",
-        "Sistema não permite importação de planilhas com caracteres especiais.",
-        "Como configurar cache distribuído para aplicação com múltiplos servidores?",
-        "Integração com sistema tributário não calcula ICMS automaticamente.",
-        "Sistema não envia SMS de confirmação para números com DDD específicos.",
-        "Como implementar versionamento automático de banco de dados?",
-        "Módulo de logística não otimiza rotas de entrega automaticamente.",
-        "Sistema não permite configuração de horários diferentes por filial.",
-        "Como configurar monitoramento proativo de performance e disponibilidade?",
-        "Integração com marketplace não sincroniza variações de produtos.",
-        "Sistema não calcula comissões escalonadas baseadas em metas atingidas.",
-        "Como implementar autenticação SSO com Active Directory corporativo?",
-        "Módulo de compras não sugere fornecedores baseados no histórico de preços.",
-        "Sistema não permite personalização de campos obrigatórios por tipo de cliente.",
-        "Como configurar replicação automática de dados entre datacenters?",
-        "Integração com sistema contábil não exporta lançamentos automaticamente.",
-        "Sistema não valida se funcionário tem qualificação antes de alocar tarefa.",
-        "Como implementar sistema de aprovação digital com certificado A3?",
-        "Módulo de atendimento não roteia chamados baseado na especialização técnica.",
-        "Sistema não permite configuração de regras de negócio específicas por região.",
-        "Como configurar alertas inteligentes baseados em padrões de comportamento?",
-        "Integração com sistema de ponto não considera escalas de trabalho flexíveis.",
-        "Sistema não gera relatórios consolidados de múltiplas filiais automaticamente.",
-        "Como implementar criptografia end-to-end para dados sensíveis armazenados?",
-        "Módulo de projetos não calcula automaticamente desvios de cronograma e orçamento.",
-        "Sistema não permite configuração de workflows aprovação personalizados.",
-        "Como configurar sincronização em tempo real com sistemas legados via API?",
-        "Integração com plataforma de BI não exporta KPIs automaticamente.",
-        "Sistema não implementa controle de concorrência para edições simultâneas.",
-        "Como configurar disaster recovery automático com RTO menor que 1 hora?",
-        "Módulo de qualidade não rastreia origem de matérias-primas automaticamente.",
-        "Sistema não permite auditoria completa de alterações com timestamp detalhado.",
-        "Como implementar machine learning para detecção de fraudes em transações?",
-        "Integração com sistema tributário não calcula substituição tributária.",
-        "Sistema não otimiza consultas SQL causando timeout em relatórios complexos.",
-        "Como configurar load balancer para distribuir carga entre múltiplos servidores?",
-        "Módulo de vendas não sugere produtos complementares baseados no histórico.",
-        "Sistema não permite configuração de SLA diferenciado por tipo de cliente.",
-        "Como implementar versionamento semântico para releases da aplicação?",
-        "Integração com sistema de telefonia não registra gravações automaticamente.",
-        "Sistema não valida integridade referencial causando inconsistências nos dados.",
-        "Como configurar ambiente de homologação idêntico ao de produção?",
-        "Módulo de estoque não considera lead time de fornecedores no ponto de reposição.",
-        "Sistema não permite rollback automático em caso de falha na atualização.",
-        "Como implementar cache inteligente com invalidação baseada em dependências?",
-        "Integração com sistema bancário não processa TEDs automaticamente.",
-        "Sistema não monitora métricas de negócio em tempo real no dashboard executivo.",
-        "Como configurar pipeline CI/CD com testes automatizados e deploy gradual?",
-        "Módulo de RH não calcula provisões trabalhistas conforme legislação atualizada.",
-        "Sistema não permite configuração de alertas baseados em machine learning.",
-        "Como implementar arquitetura de microserviços mantendo consistência dos dados?",
-        "Integração com marketplace não sincroniza promoções e campanhas automaticamente.",
-        "Sistema não otimiza queries baseado no padrão de acesso dos usuários.",
-        "Como configurar monitoramento de infraestrutura com alertas preditivos?",
-        "Módulo de logística não considera restrições de trânsito para otimização de rotas.",
-        "Sistema não implementa cache distribuído com consistência eventual.",
-        "Como configurar autoscaling baseado em métricas customizadas de negócio?",
-        "Integração com sistema ERP não sincroniza centros de custo automaticamente.",
-        "Sistema não permite configuração de políticas de retenção de dados granulares.",
-        "Como implementar observabilidade completa com traces distribuídos?",
-        "Módulo de vendas não calcula automaticamente margem líquida por produto.",
-        "Sistema não permite configuração de ambientes multi-tenant com isolamento completo.",
-        "Como configurar backup contínuo com recovery point objetivo menor que 15 minutos?",
-        "Integração com gateway de pagamento não processa PIX automaticamente.",
-        "Sistema não implementa rate limiting para proteger APIs de sobrecarga.",
-        "Como configurar service mesh para comunicação segura entre microserviços?",
-        "Módulo de projetos não integra automaticamente com ferramentas de versionamento.",
-        "Sistema não permite configuração de políticas de segurança baseadas em contexto.",
-        "Como implementar feature flags para releases graduais e A/B testing?",
-        "Integração com plataforma de marketing não sincroniza campanhas automaticamente.",
-        "Sistema não otimiza armazenamento usando compressão e deduplicação inteligentes.",
-        "Como configurar ambiente de desenvolvimento com dados anonimizados?",
-        "Módulo de qualidade não rastreia automaticamente conformidade com ISO 9001.",
-        "Sistema não permite configuração de workflows adaptativos baseados em ML.",
-        "Como implementar zero-trust security com autenticação contínua?"
-    ]
-    
-    emails.extend(specific_emails)
-    
-    # Adicionar mais emails gerados para completar 1000
-    while len(emails) < 1000:
-        template = random.choice(all_templates)
-        email = template
-        
-        import re
-        placeholders = re.findall(r'\{(\w+)\}', template)
-        for placeholder in placeholders:
-            if placeholder in valores:
-                replacement = random.choice(valores[placeholder])
-                email = email.replace(f'{{{placeholder}}}', replacement)
-        
-        if email not in emails:  # Evitar duplicatas
-            emails.append(email)
-    
-    return emails[:1000]
-
-def create_unproductive_emails():
-    """Gera emails improdutivos variados e realistas"""
-    
-    # Templates de agradecimentos
-    thanks_templates = [
-        "Muito obrigado pelo {motivo} na {situacao}",
-        "Agradeço imensamente pela {qualidade} durante {contexto}",
-        "Gostaria de expressar minha gratidão pelo {aspecto}",
-        "Reconheço e agradeço a {caracteristica} da equipe",
-        "Muito grato pela {acao} realizada com {qualidade}",
-        "Obrigado por sempre nos atender com {caracteristica}",
-        "Agradeço pela {qualidade} demonstrada em {situacao}",
-        "Meu reconhecimento pelo {trabalho} excepcional",
-        "Gratidão pela {caracteristica} e {aspecto} demonstrados",
-        "Obrigada por fazer a diferença com {qualidade}"
-    ]
-    
-    # Templates de felicitações
-    congratulations_templates = [
-        "Parabéns pelo {conquista} da {organizacao}",
-        "Felicitações pela {realizacao} em {area}",
-        "Congratulações pelo {premio} recebido",
-        "Parabenizo toda equipe pelo {sucesso}",
-        "Que alegria saber do {acontecimento_positivo}",
-        "Celebrando junto com vocês o {marco}",
-        "Felicito a todos pela {conquista_coletiva}",
-        "Parabéns pela {inovacao} implementada",
-        "Congratulações pelo {crescimento} da empresa",
-        "Felicitações pelo {reconhecimento} merecido"
-    ]
-    
-    # Templates de feriados/ocasiões
-    holiday_templates = [
-        "Feliz {feriado} para toda a equipe!",
-        "Desejo a todos um {periodo} repleto de {sentimento}",
-        "Que este {feriado} seja de muita {qualidade_vida}",
-        "Aproveitem o {periodo} para {atividade_positiva}",
-        "Votos de {sentimento} neste {feriado} especial",
-        "Que o {periodo} traga {beneficio} para todos",
-        "Desejo um {feriado} abençoado e {adjetivo}",
-        "Que vocês tenham {periodo} maravilhoso",
-        "Boas {periodo} para você e sua família",
-        "Que este {feriado} seja repleto de {sentimento}"
-    ]
-    
-    # Templates de cortesia
-    courtesy_templates = [
-        "Tenha uma {periodo} repleta de {sentimento}",
-        "Desejo muito {sentimento} em seus projetos",
-        "Que sua {periodo} seja {adjetivo} e produtiva",
-        "Votos de {sentimento} e {qualidade} sempre",
-        "Que você tenha {periodo} abençoada",
-        "Desejo {sentimento} em todas suas {atividades}",
-        "Que {periodo} seja de muitas {coisas_positivas}",
-        "Sucesso e {sentimento} em tudo que fizer",
-        "Que sua {jornada} seja repleta de {beneficios}",
-        "Muita {qualidade} e {sentimento} sempre"
-    ]
-    
-    # Valores para substituição
-    valores_improdutivos = {
-        'motivo': ['excelente atendimento', 'rápida resposta', 'dedicação', 'profissionalismo', 'eficiência'],
-        'situacao': ['implementação', 'treinamento', 'reunião', 'processo de migração', 'projeto'],
-        'qualidade': ['atenção', 'cuidado', 'dedicação', 'paciência', 'cortesia'],
-        'contexto': ['suporte técnico', 'onboarding', 'consultoria', 'atendimento', 'implementação'],
-        'aspecto': ['comprometimento', 'qualidade técnica', 'agilidade', 'transparência'],
-        'caracteristica': ['profissionalismo', 'cortesia', 'eficiência', 'dedicação', 'atenção'],
-        'acao': ['resolução', 'implementação', 'configuração', 'consultoria', 'suporte'],
-        'trabalho': ['atendimento', 'suporte', 'desenvolvimento', 'consultoria', 'treinamento'],
-        'conquista': ['lançamento', 'crescimento', 'inovação', 'expansão', 'modernização'],
-        'organizacao': ['empresa', 'equipe', 'departamento', 'time', 'organização'],
-        'realizacao': ['projeto', 'implementação', 'resultado', 'conquista', 'melhoria'],
-        'area': ['tecnologia', 'atendimento', 'vendas', 'inovação', 'qualidade'],
-        'premio': ['reconhecimento', 'certificação', 'prêmio', 'distinção', 'homenagem'],
-        'sucesso': ['projeto', 'lançamento', 'resultado', 'implementação', 'crescimento'],
-        'feriado': ['Natal', 'Ano Novo', 'Páscoa', 'Dia das Mães', 'feriado'],
-        'periodo': ['semana', 'fim de semana', 'mês', 'período', 'temporada'],
-        'sentimento': ['felicidade', 'alegria', 'paz', 'harmonia', 'prosperidade'],
-        'adjetivo': ['maravilhoso', 'especial', 'abençoado', 'produtivo', 'inspirador'],
-        'atividades': ['projetos', 'empreendimentos', 'iniciativas', 'trabalhos', 'jornadas']
+DATASETS_DIR = os.path.join(os.path.dirname(__file__), "..", "datasets")
+
+_PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
+
+# ==================== EMAILS PRODUTIVOS ====================
+
+# Templates de problemas técnicos
+PRODUCTIVE_TECHNICAL = [
+    "Sistema {sistema} apresentando erro {erro} desde {tempo}",
+    "Não consigo acessar {modulo} - aparece mensagem {mensagem}",
+    "Falha na {operacao} do {sistema} durante {periodo}",
+    "Performance muito lenta no {funcionalidade} desde {tempo}",
+    "Erro {codigo} ao tentar {acao} no {sistema}",
+    "Problema de sincronização entre {sistema1} e {sistema2}",
+    "Timeout na {operacao} após {tempo} de processamento",
+    "Integração com {servico} não está funcionando",
+    "Backup automático falhando com erro {mensagem}",
+    "Dashboard não carrega dados de {periodo}"
+]
+
+# Templates de solicitações
+PRODUCTIVE_REQUESTS = [
+    "Preciso de acesso ao {recurso} para {finalidade}",
+    "Como configurar {funcionalidade} no {sistema}?",
+    "Solicitação de permissão para {acao} em {modulo}",
+    "Preciso urgentemente {servico} para {projeto}",
+    "Como integrar {sistema} com {ferramenta_externa}?",
+    "Solicitação de aumento de limite em {recurso}",
+    "Preciso de orientação para {processo} no {sistema}",
+    "Como resolver problema de {tipo_problema} em {contexto}?",
+    "Solicitação de instalação de {software} para {finalidade}",
+    "Preciso exportar dados de {periodo} do {sistema}"
+]
+
+# Templates de status e acompanhamento
+PRODUCTIVE_STATUS = [
+    "Qual o status da solicitação protocolo {numero}?",
+    "Quando será implementada a correção do {problema}?",
+    "Preciso acompanhar andamento de {processo} iniciado em {data}",
+    "Em que etapa está {solicitacao} enviada há {tempo}?",
+    "Quando teremos retorno sobre {questao} reportada?",
+    "Status da migração de {dados} agendada para {periodo}",
+    "Atualização sobre resolução de {problema} crítico",
+    "Acompanhamento do chamado {numero} aberto em {data}",
+    "Previsão para conclusão de {projeto} em andamento",
+    "Quando será liberada versão corrigida de {sistema}?"
+]
+
+# Templates de urgência
+PRODUCTIVE_URGENT = [
+    "URGENTE: {problema} impedindo {processo_critico}",
+    "Emergência: {sistema} fora do ar durante {evento_importante}",
+    "Crítico: perda de dados em {sistema} necessita {acao_imediata}",
+    "Prioridade alta: {cliente_importante} reporta {problema_grave}",
+    "Bloqueador: {funcionalidade_essencial} não funciona",
+    "Emergencial: {processo_negocio} parado por {motivo_tecnico}",
+    "Urgente: deadline em {tempo} e {impedimento} bloqueia entrega",
+    "Crítico: {falha_seguranca} detectada em {sistema_producao}",
+    "Emergência: {integracao_pagamento} com problemas na {evento_vendas}",
+    "Prioridade máxima: {sistema_core} instável em produção"
+]
+
+# Valores para substituição
+PRODUCTIVE_VALUES = {
+    'sistema': ['CRM', 'ERP', 'e-commerce', 'dashboard', 'API', 'aplicativo mobile', 'plataforma', 'sistema financeiro'],
+    'erro': ['500', '404', '403', 'timeout', 'connection refused', 'database error'],
+    'tempo': ['manhã', 'ontem', 'segunda-feira', 'esta semana', '2 horas', 'hoje cedo'],
+    'modulo': ['relatórios', 'área financeira', 'gestão de usuários', 'módulo de vendas', 'painel administrativo'],
+    'mensagem': ['"acesso negado"', '"erro interno"', '"sessão expirada"', '"dados inválidos"'],
+    'operacao': ['importação', 'exportação', 'sincronização', 'backup', 'migração'],
+    'periodo': ['madrugada', 'horário comercial', 'final de semana', 'pico de acesso'],
+    'codigo': ['HTTP 500', 'ERR_001', 'CODE 403', 'SQL_ERROR'],
+    'acao': ['salvar dados', 'gerar relatório', 'fazer login', 'enviar email'],
+    'funcionalidade': ['busca avançada', 'filtros', 'exportação CSV', 'autenticação'],
+    'sistema1': ['Salesforce', 'SAP', 'aplicativo'],
+    'sistema2': ['banco de dados', 'sistema legado', 'API externa'],
+    'servico': ['webhook', 'API REST', 'FTP', 'integração'],
+    'recurso': ['banco de dados', 'área administrativa', 'módulo financeiro'],
+    'finalidade': ['gerar relatórios mensais', 'configurar integrações', 'treinar equipe'],
+    'projeto': ['lançamento do produto', 'migração de dados', 'auditoria'],
+    'numero': ['#12345', '#67890', '#54321', '#98765'],
+    'problema': ['bug na autenticação', 'lentidão no sistema', 'erro de sincronização'],
+    'processo': ['migração de dados', 'implementação de feature', 'correção de bug'],
+    'data': ['segunda-feira', 'semana passada', '15/01', 'início do mês'],
+    'ferramenta_externa': ['Slack', 'Google Workspace', 'Microsoft Teams', 'Power BI', 'Zapier'],
+    'tipo_problema': ['permissão', 'lentidão', 'sincronização', 'autenticação', 'importação de dados'],
+    'contexto': ['produção', 'homologação', 'ambiente de testes', 'aplicativo mobile', 'fechamento mensal'],
+    'software': ['Power BI', 'VPN corporativa', 'antivírus', 'pacote Office', 'cliente SQL'],
+    'solicitacao': ['a requisição de acesso', 'o pedido de orçamento', 'a solicitação de reembolso', 'o chamado de suporte'],
+    'questao': ['a divergência no faturamento', 'a falha no login', 'a inconsistência no estoque', 'a cobrança duplicada'],
+    'dados': ['cadastro de clientes', 'histórico de pedidos', 'base de produtos', 'lançamentos contábeis'],
+    'processo_critico': ['o faturamento', 'a emissão de notas fiscais', 'o fechamento do caixa', 'a folha de pagamento'],
+    'evento_importante': ['a Black Friday', 'o fechamento do mês', 'a campanha de lançamento', 'a auditoria externa'],
+    'acao_imediata': ['restauração do backup', 'intervenção imediata', 'análise urgente', 'rollback da versão'],
+    'cliente_importante': ['cliente VIP', 'principal parceiro', 'cliente corporativo', 'maior distribuidor'],
+    'problema_grave': ['cobrança em duplicidade', 'pedidos perdidos', 'vazamento de dados', 'falha no checkout'],
+    'funcionalidade_essencial': ['login', 'checkout', 'emissão de boletos', 'envio de pedidos'],
+    'processo_negocio': ['faturamento', 'expedição', 'atendimento ao cliente', 'conciliação bancária'],
+    'motivo_tecnico': ['queda do servidor', 'certificado expirado', 'falha no banco de dados', 'erro de integração'],
+    'impedimento': ['falha no deploy', 'erro de permissão', 'ambiente indisponível', 'bug no build'],
+    'falha_seguranca': ['vulnerabilidade de SQL injection', 'acesso não autorizado', 'senha exposta', 'certificado inválido'],
+    'sistema_producao': ['servidor de produção', 'API pública', 'portal do cliente', 'banco de dados principal'],
+    'integracao_pagamento': ['gateway de pagamento', 'integração com PIX', 'processamento de cartões', 'emissão de boletos'],
+    'evento_vendas': ['Black Friday', 'campanha de Natal', 'liquidação de aniversário', 'promoção relâmpago'],
+    'sistema_core': ['ERP', 'banco de dados principal', 'sistema de pedidos', 'serviço de autenticação'],
+}
+
+# Emails escritos manualmente
+PRODUCTIVE_SPECIFIC = [
+    "O login não está funcionando depois da atualização de ontem. Sempre aparece erro de credenciais.",
+    "Como faço para integrar nosso sistema com a API de pagamentos do PagSeguro?",
+    "Preciso urgentemente dos relatórios de vendas de dezembro para apresentação na diretoria.",
+    "Sistema travando constantemente quando tento importar planilha com mais de 1000 linhas.",
+    "Não consigo acessar o módulo financeiro - diz que não tenho permissão.",
+    "API retornando erro 500 em todas as requisições desde as 14h de hoje.",
+    "Como configurar backup automático para rodar todo domingo às 2h da manhã?",
+    "Cliente VIP reportando que não consegue finalizar compra no checkout.",
+    "Webhook de pagamento não está enviando notificações para nosso sistema.",
+    "Performance do dashboard extremamente lenta com mais de 100 usuários simultâneos.",
+    "Preciso resetar senha do usuário admin que foi bloqueada por tentativas incorretas.",
+    "Como exportar todos os dados de clientes dos últimos 6 meses em formato CSV?",
+    "Sistema de email marketing não está enviando campanhas agendadas.",
+    "Integração com correios parou de funcionar - rastreamento não atualiza.",
+    "Preciso de acesso de administrador para configurar novos usuários da filial.",
+    "Database connection timeout durante processo de sincronização noturna.",
+    "Como configurar SSL certificate no domínio principal da aplicação?",
+    "Módulo de estoque não está atualizando quantidades após vendas realizadas.",
+    "Erro de autenticação OAuth com Google Drive para backup de arquivos.",
+    "Sistema não permite upload de arquivos maiores que 5MB - como aumentar?",
+    "Falha na impressão automática de etiquetas de envio pela integração dos correios.",
+    "Como implementar autenticação de dois fatores para aumentar segurança?",
+    "Relatório de comissões não está calculando percentuais corretos para vendedores.",
+    "Sincronização com sistema contábil apresentando divergências nos valores.",
+    "Preciso configurar alertas automáticos para produtos com estoque baixo.",
+    "API de geolocalização retornando coordenadas incorretas para alguns endereços.",
+    "Sistema não está enviando emails de confirmação após cadastro de novos clientes.",
+    "Como migrar dados do sistema antigo mantendo histórico de 5 anos?",
+    "Módulo de chat online não carrega para clientes usando Internet Explorer.",
+    "Integração com WhatsApp Business API falhando na autenticação do token.",
+    "Como configurar regras de desconto automático baseadas no volume de compra?",
+    "Sistema de ponto eletrônico não registra entrada/saída de funcionários remotos.",
+    "Erro na geração de NFCe - webservice da Sefaz retorna rejeição 567.",
+    "Como implementar cache Redis para melhorar performance das consultas?",
+    "Módulo de CRM não está registrando histórico de interações com clientes.",
+    "Sistema não permite cadastro de produtos com código de barras duplicado.",
+    "Como configurar rotina automática de limpeza de logs antigos?",
+    "Integração com marketplace não está atualizando preços automaticamente.",
+    "Sistema de telefonia IP não transfere chamadas entre ramais.",
+    "Como implementar assinatura digital em contratos gerados pelo sistema?",
+    "Módulo financeiro não está calculando juros de mora automaticamente.",
+    "Sistema não valida CPF/CNPJ durante cadastro permitindo dados inválidos.",
+    "Como configurar dashboard personalizado para diferentes perfis de usuário?",
+    "Integração com sistema bancário não importa extratos automaticamente.",
+    "Sistema não permite edição de pedidos após confirmação - preciso alterar regra.",
+    "Como implementar log de auditoria para rastrear alterações nos dados?",
+    "Módulo de RH não calcula horas extras corretamente no fechamento mensal.",
+    "Sistema não envia notificações push para aplicativo mobile dos clientes.",
+    "Como configurar backup incremental para otimizar espaço de armazenamento?",
+    "Integração com transportadora não está calculando frete automaticamente.",
+    "Sistema permite cadastro de fornecedores com dados incompletos.",
+    "Como implementar aprovação em múltiplos níveis para compras acima de R$ 10k?",
+    "Módulo de qualidade não está registrando não conformidades corretamente.",
+    "Sistema não gera código de rastreamento para pedidos enviados via PAC.",
+    "Como configurar relatórios automáticos por email todos os segundas às 8h?",
+    "Integração com sistema de ponto não desconta pausas automáticas.",
+    "Sistema não permite cancelamento de notas fiscais já transmitidas.",
+    "Como implementar controle de versão para documentos armazenados?",
+    "Módulo de vendas não aplica desconto progressivo conforme volume.",
+    "Sistema não sincroniza agenda de compromissos com Google Calendar.",
+    "Como configurar alertas de vencimento 30 dias antes das licenças?",
+    "Integração com correios não calcula prazo de entrega automaticamente.",
+    "Sistema permite exclusão acidental de dados críticos sem confirmação.",
+    "Como implementar assinatura eletrônica em documentos PDF gerados?",
+    "Módulo de produção não controla sequência de operações automaticamente.",
+    "Sistema não valida se produto tem estoque suficiente antes de confirmar venda.",
+    "Como configurar sincronização bidirecional com sistema ERP corporativo?",
+    "Integração com gateway de pagamento não processa cartões internacionais.",
+    "Sistema não gera boletos com código de barras conforme padrão FEBRABAN.",
+    "Como implementar controle de acesso baseado em geolocalização?",
+    "Módulo de manutenção não agenda preventivas automaticamente.",
+    "Sistema não permite importação de planilhas com caracteres especiais.",
+    "Como configurar cache distribuído para aplicação com múltiplos servidores?",
+    "Integração com sistema tributário não calcula ICMS automaticamente.",
+    "Sistema não envia SMS de confirmação para números com DDD específicos.",
+    "Como implementar versionamento automático de banco de dados?",
+    "Módulo de logística não otimiza rotas de entrega automaticamente.",
+    "Sistema não permite configuração de horários diferentes por filial.",
+    "Como configurar monitoramento proativo de performance e disponibilidade?",
+    "Integração com marketplace não sincroniza variações de produtos.",
+    "Sistema não calcula comissões escalonadas baseadas em metas atingidas.",
+    "Como implementar autenticação SSO com Active Directory corporativo?",
+    "Módulo de compras não sugere fornecedores baseados no histórico de preços.",
+    "Sistema não permite personalização de campos obrigatórios por tipo de cliente.",
+    "Como configurar replicação automática de dados entre datacenters?",
+    "Integração com sistema contábil não exporta lançamentos automaticamente.",
+    "Sistema não valida se funcionário tem qualificação antes de alocar tarefa.",
+    "Como implementar sistema de aprovação digital com certificado A3?",
+    "Módulo de atendimento não roteia chamados baseado na especialização técnica.",
+    "Sistema não permite configuração de regras de negócio específicas por região.",
+    "Como configurar alertas inteligentes baseados em padrões de comportamento?",
+    "Integração com sistema de ponto não considera escalas de trabalho flexíveis.",
+    "Sistema não gera relatórios consolidados de múltiplas filiais automaticamente.",
+    "Como implementar criptografia end-to-end para dados sensíveis armazenados?",
+    "Módulo de projetos não calcula automaticamente desvios de cronograma e orçamento.",
+    "Sistema não permite configuração de workflows aprovação personalizados.",
+    "Como configurar sincronização em tempo real com sistemas legados via API?",
+    "Integração com plataforma de BI não exporta KPIs automaticamente.",
+    "Sistema não implementa controle de concorrência para edições simultâneas.",
+    "Como configurar disaster recovery automático com RTO menor que 1 hora?",
+    "Módulo de qualidade não rastreia origem de matérias-primas automaticamente.",
+    "Sistema não permite auditoria completa de alterações com timestamp detalhado.",
+    "Como implementar machine learning para detecção de fraudes em transações?",
+    "Integração com sistema tributário não calcula substituição tributária.",
+    "Sistema não otimiza consultas SQL causando timeout em relatórios complexos.",
+    "Como configurar load balancer para distribuir carga entre múltiplos servidores?",
+    "Módulo de vendas não sugere produtos complementares baseados no histórico.",
+    "Sistema não permite configuração de SLA diferenciado por tipo de cliente.",
+    "Como implementar versionamento semântico para releases da aplicação?",
+    "Integração com sistema de telefonia não registra gravações automaticamente.",
+    "Sistema não valida integridade referencial causando inconsistências nos dados.",
+    "Como configurar ambiente de homologação idêntico ao de produção?",
+    "Módulo de estoque não considera lead time de fornecedores no ponto de reposição.",
+    "Sistema não permite rollback automático em caso de falha na atualização.",
+    "Como implementar cache inteligente com invalidação baseada em dependências?",
+    "Integração com sistema bancário não processa TEDs automaticamente.",
+    "Sistema não monitora métricas de negócio em tempo real no dashboard executivo.",
+    "Como configurar pipeline CI/CD com testes automatizados e deploy gradual?",
+    "Módulo de RH não calcula provisões trabalhistas conforme legislação atualizada.",
+    "Sistema não permite configuração de alertas baseados em machine learning.",
+    "Como implementar arquitetura de microserviços mantendo consistência dos dados?",
+    "Integração com marketplace não sincroniza promoções e campanhas automaticamente.",
+    "Sistema não otimiza queries baseado no padrão de acesso dos usuários.",
+    "Como configurar monitoramento de infraestrutura com alertas preditivos?",
+    "Módulo de logística não considera restrições de trânsito para otimização de rotas.",
+    "Sistema não implementa cache distribuído com consistência eventual.",
+    "Como configurar autoscaling baseado em métricas customizadas de negócio?",
+    "Integração com sistema ERP não sincroniza centros de custo automaticamente.",
+    "Sistema não permite configuração de políticas de retenção de dados granulares.",
+    "Como implementar observabilidade completa com traces distribuídos?",
+    "Módulo de vendas não calcula automaticamente margem líquida por produto.",
+    "Sistema não permite configuração de ambientes multi-tenant com isolamento completo.",
+    "Como configurar backup contínuo com recovery point objetivo menor que 15 minutos?",
+    "Integração com gateway de pagamento não processa PIX automaticamente.",
+    "Sistema não implementa rate limiting para proteger APIs de sobrecarga.",
+    "Como configurar service mesh para comunicação segura entre microserviços?",
+    "Módulo de projetos não integra automaticamente com ferramentas de versionamento.",
+    "Sistema não permite configuração de políticas de segurança baseadas em contexto.",
+    "Como implementar feature flags para releases graduais e A/B testing?",
+    "Integração com plataforma de marketing não sincroniza campanhas automaticamente.",
+    "Sistema não otimiza armazenamento usando compressão e deduplicação inteligentes.",
+    "Como configurar ambiente de desenvolvimento com dados anonimizados?",
+    "Módulo de qualidade não rastreia automaticamente conformidade com ISO 9001.",
+    "Sistema não permite configuração de workflows adaptativos baseados em ML.",
+    "Como implementar zero-trust security com autenticação contínua?"
+]
+
+# ==================== EMAILS IMPRODUTIVOS ====================
+
+# Templates de agradecimentos
+UNPRODUCTIVE_THANKS = [
+    "Muito obrigado pelo {motivo} na {situacao}",
+    "Agradeço imensamente pela {qualidade} durante {contexto}",
+    "Gostaria de expressar minha gratidão pelo {aspecto}",
+    "Reconheço e agradeço a {caracteristica} da equipe",
+    "Muito grato pela {acao} realizada com {qualidade}",
+    "Obrigado por sempre nos atender com {caracteristica}",
+    "Agradeço pela {qualidade} demonstrada em {situacao}",
+    "Meu reconhecimento pelo {trabalho} excepcional",
+    "Gratidão pela {caracteristica} e {aspecto} demonstrados",
+    "Obrigada por fazer a diferença com {qualidade}"
+]
+
+# Templates de felicitações
+UNPRODUCTIVE_CONGRATULATIONS = [
+    "Parabéns pelo {conquista} da {organizacao}",
+    "Felicitações pela {realizacao} em {area}",
+    "Congratulações pelo {premio} recebido",
+    "Parabenizo toda equipe pelo {sucesso}",
+    "Que alegria saber do {acontecimento_positivo}",
+    "Celebrando junto com vocês o {marco}",
+    "Felicito a todos pela {conquista_coletiva}",
+    "Parabéns pela {inovacao} implementada",
+    "Congratulações pelo {crescimento} da empresa",
+    "Felicitações pelo {reconhecimento} merecido"
+]
+
+# Templates de feriados/ocasiões
+UNPRODUCTIVE_HOLIDAY = [
+    "Feliz {feriado} para toda a equipe!",
+    "Desejo a todos um {periodo} repleto de {sentimento}",
+    "Que este {feriado} seja de muita {qualidade_vida}",
+    "Aproveitem o {periodo} para {atividade_positiva}",
+    "Votos de {sentimento} neste {feriado} especial",
+    "Que o {periodo} traga {beneficio} para todos",
+    "Desejo um {feriado} abençoado e {adjetivo}",
+    "Que vocês tenham {periodo} maravilhoso",
+    "Boas {periodo} para você e sua família",
+    "Que este {feriado} seja repleto de {sentimento}"
+]
+
+# Templates de cortesia
+UNPRODUCTIVE_COURTESY = [
+    "Tenha uma {periodo} repleta de {sentimento}",
+    "Desejo muito {sentimento} em seus projetos",
+    "Que sua {periodo} seja {adjetivo} e produtiva",
+    "Votos de {sentimento} e {qualidade} sempre",
+    "Que você tenha {periodo} abençoada",
+    "Desejo {sentimento} em todas suas {atividades}",
+    "Que {periodo} seja de muitas {coisas_positivas}",
+    "Sucesso e {sentimento} em tudo que fizer",
+    "Que sua {jornada} seja repleta de {beneficios}",
+    "Muita {qualidade} e {sentimento} sempre"
+]
+
+# Valores para substituição
+UNPRODUCTIVE_VALUES = {
+    'motivo': ['excelente atendimento', 'rápida resposta', 'dedicação', 'profissionalismo', 'eficiência'],
+    'situacao': ['implementação', 'treinamento', 'reunião', 'processo de migração', 'projeto'],
+    'qualidade': ['atenção', 'cuidado', 'dedicação', 'paciência', 'cortesia'],
+    'contexto': ['suporte técnico', 'onboarding', 'consultoria', 'atendimento', 'implementação'],
+    'aspecto': ['comprometimento', 'qualidade técnica', 'agilidade', 'transparência'],
+    'caracteristica': ['profissionalismo', 'cortesia', 'eficiência', 'dedicação', 'atenção'],
+    'acao': ['resolução', 'implementação', 'configuração', 'consultoria', 'suporte'],
+    'trabalho': ['atendimento', 'suporte', 'desenvolvimento', 'consultoria', 'treinamento'],
+    'conquista': ['lançamento', 'crescimento', 'inovação', 'expansão', 'modernização'],
+    'organizacao': ['empresa', 'equipe', 'departamento', 'time', 'organização'],
+    'realizacao': ['projeto', 'implementação', 'resultado', 'conquista', 'melhoria'],
+    'area': ['tecnologia', 'atendimento', 'vendas', 'inovação', 'qualidade'],
+    'premio': ['reconhecimento', 'certificação', 'prêmio', 'distinção', 'homenagem'],
+    'sucesso': ['projeto', 'lançamento', 'resultado', 'implementação', 'crescimento'],
+    'feriado': ['Natal', 'Ano Novo', 'Páscoa', 'Dia das Mães', 'feriado'],
+    'periodo': ['semana', 'fim de semana', 'mês', 'período', 'temporada'],
+    'sentimento': ['felicidade', 'alegria', 'paz', 'harmonia', 'prosperidade'],
+    'adjetivo': ['maravilhoso', 'especial', 'abençoado', 'produtivo', 'inspirador'],
+    'atividades': ['projetos', 'empreendimentos', 'iniciativas', 'trabalhos', 'jornadas'],
+    'acontecimento_positivo': ['aniversário da empresa', 'nascimento do bebê da Ana', 'resultado do trimestre', 'retorno da equipe'],
+    'marco': ['aniversário de 10 anos', 'milésimo cliente', 'fim do projeto', 'primeiro ano da parceria'],
+    'conquista_coletiva': ['meta batida', 'certificação ISO', 'entrega do projeto', 'expansão para novas cidades'],
+    'inovacao': ['nova identidade visual', 'melhoria no atendimento', 'nova política de home office', 'ideia criativa'],
+    'crescimento': ['crescimento', 'sucesso', 'desenvolvimento', 'fortalecimento'],
+    'reconhecimento': ['prêmio', 'destaque do ano', 'elogio da diretoria', 'título de melhor equipe'],
+    'qualidade_vida': ['paz', 'alegria', 'saúde', 'união', 'descanso'],
+    'atividade_positiva': ['descansar', 'curtir a família', 'recarregar as energias', 'viajar'],
+    'beneficio': ['alegria', 'saúde', 'conquistas', 'novas oportunidades', 'tranquilidade'],
+    'coisas_positivas': ['conquistas', 'alegrias', 'realizações', 'boas notícias'],
+    'jornada': ['semana', 'caminhada', 'carreira', 'trajetória'],
+    'beneficios': ['conquistas', 'alegrias', 'bons momentos', 'realizações'],
+}
+
+# Emails escritos manualmente
+UNPRODUCTIVE_SPECIFIC = [
+    "Muito obrigado pelo excelente atendimento prestado pela equipe de suporte!",
+    "Parabéns pelo lançamento do novo produto. Desejo muito sucesso para todos!",
+    "Feliz Natal e próspero Ano Novo para toda a equipe da empresa!",
+    "Agradeço imensamente pela dedicação demonstrada durante o processo de implementação.",
+    "Que alegria receber a notícia do crescimento da empresa! Parabéns a todos!",
+    "Tenha um ótimo final de semana e descanse bastante com a família.",
+    "Desejo felicidades e muito sucesso em todos os projetos futuros da equipe.",
+    "Obrigado por sempre nos atender com tanta cortesia e eficiência.",
+    "Feliz aniversário da empresa! Que sejam muitos anos de prosperidade!",
+    "Gratidão pela parceria sólida e pelo comprometimento demonstrado sempre.",
+    "Abraços calorosos e votos de muito sucesso em sua nova jornada profissional!",
+    "Que dia maravilhoso! Espero que esteja tudo bem com você e sua família.",
+    "Comemorando junto com vocês essa vitória tão bem merecida pela equipe!",
+    "Meu reconhecimento pelo trabalho excepcional desenvolvido por todos.",
+    "Desejo um período de férias relaxante e revigorante para toda a equipe.",
+    "Obrigada por fazer a diferença na vida de tantas pessoas através do trabalho.",
+    "Felicitações pelo prêmio recebido! Muito bem merecido pela qualidade do serviço!",
+    "Que sua semana seja repleta de alegrias, conquistas e muitas realizações.",
+    "Agradeço pela confiança depositada em nossos serviços ao longo dos anos.",
+    "Parabéns pela formatura! Que venham muitas oportunidades profissionais!",
+    "Muito obrigado pela apresentação inspiradora na conferência de ontem.",
+    "Feliz Dia das Mães para todas as colaboradoras! Vocês são incríveis!",
+    "Que orgulho saber do reconhecimento internacional recebido pela empresa!",
+    "Desejo uma Páscoa repleta de renovação e momentos especiais em família.",
+    "Parabéns pelo 10º aniversário da empresa! Que venham muitos outros!",
+    "Agradeço pela hospitalidade durante minha visita às instalações.",
+    "Feliz Dia dos Pais para todos os colaboradores! Aproveitam bem o dia!",
+    "Que satisfação ver o crescimento sustentável e responsável da organização!",
+    "Muito obrigado pelo convite para o evento de lançamento. Foi fantástico!",
+    "Desejo boas festas de fim de ano para todos os funcionários e famílias!",
+    "Parabéns pela certificação ISO obtida! Reflexo da qualidade do trabalho!",
+    "Feliz Dia Internacional da Mulher para todas as profissionais da empresa!",
+    "Que alegria saber da expansão para novos mercados! Sucesso garantido!",
+    "Obrigado pela oportunidade de participar do projeto piloto. Foi enriquecedor!",
+    "Desejo um 2024 repleto de inovações e conquistas para toda a equipe!",
+    "Parabéns pela conquista do prêmio de melhor empresa para trabalhar!",
+    "Muito grato pela mentoria e orientações valiosas durante o projeto.",
+    "Feliz aniversário! Que este novo ano de vida seja repleto de realizações!",
+    "Que orgulho fazer parte desta comunidade empresarial tão engajada!",
+    "Desejo uma semana produtiva e cheia de energia positiva para todos!",
+    "Parabéns pela implementação bem-sucedida da iniciativa de sustentabilidade!",
+    "Muito obrigado por compartilhar conhecimentos no workshop de capacitação.",
+    "Feliz Dia do Trabalhador! Reconhecimento merecido por toda dedicação!",
+    "Que satisfação ver os valores da empresa sendo vivenciados na prática!",
+    "Desejo muito sucesso na nova filial inaugurada! Crescimento merecido!",
+    "Parabéns pelo lançamento da campanha social! Iniciativa muito nobre!",
+    "Obrigado pela flexibilidade e compreensão durante o período de adaptação.",
+    "Feliz Dia dos Namorados! Que o amor esteja presente na vida de todos!",
+    "Que inspiração ver o engajamento da equipe com a responsabilidade social!",
+    "Desejo boas vindas aos novos colaboradores! Que se sintam em casa!",
+    "Parabéns pela modernização das instalações! Ambiente ainda melhor!",
+    "Muito grato pela cultura organizacional acolhedora e inspiradora.",
+    "Feliz Dia da Independência! Orgulho de fazer parte desta nação!",
+    "Que alegria ver a empresa sendo referência em inovação no setor!",
+    "Desejo um outono repleto de conquistas e momentos especiais para todos!",
+    "Parabéns pela política de diversidade e inclusão implementada!",
+    "Obrigado pela oportunidade de crescimento profissional oferecida.",
+    "Feliz Dia da Árvore! Que nossa consciência ambiental continue crescendo!",
+    "Que satisfação ver o comprometimento com a qualidade de vida dos funcionários!",
+    "Desejo um inverno aconchegante e cheio de momentos especiais em família!",
+    "Parabéns pela iniciativa de home office que promove equilíbrio vida-trabalho!",
+    "Muito obrigado pela palestra motivacional. Saí renovado e inspirado!",
+    "Feliz Dia do Meio Ambiente! Que nossa consciência ecológica cresça sempre!",
+    "Que orgulho ver a empresa apoiando causas sociais importantes na comunidade!",
+    "Desejo uma primavera florida e cheia de novos projetos para toda equipe!",
+    "Parabéns pela transparência na comunicação com todos os stakeholders!",
+    "Obrigado pela cultura de feedback construtivo que promove crescimento!",
+    "Feliz Dia Mundial da Saúde! Que o bem-estar seja prioridade sempre!",
+    "Que inspiração ver liderança feminina ocupando posições estratégicas!",
+    "Desejo um verão repleto de energia e realizações para todos!",
+    "Parabéns pela ética empresarial exemplar demonstrada em todas decisões!",
+    "Muito grato pelo ambiente colaborativo que estimula criatividade!",
+    "Feliz Dia da Consciência Negra! Viva a diversidade em nossa organização!",
+    "Que satisfação ver investimento contínuo em capacitação dos colaboradores!",
+    "Desejo feriado prolongado relaxante para recarregar as energias!",
+    "Parabéns pela governança corporativa transparente e responsável!",
+    "Obrigado por valorizar ideias inovadoras vindas de todos os níveis!",
+    "Feliz Dia Internacional da Paz! Que harmonia reine em nossos corações!",
+    "Que alegria ver programas de bem-estar promovendo saúde mental!",
+    "Desejo reuniões produtivas e decisões acertadas nesta semana!",
+    "Parabéns pela gestão sustentável que preserva recursos naturais!",
+    "Muito obrigado pela flexibilidade nos horários que facilita conciliação!",
+    "Feliz Dia da Educação! Investimento em conhecimento sempre compensa!",
+    "Que orgulho fazer parte de organização que valoriza desenvolvimento humano!",
+    "Desejo café da manhã energizante para começar bem esta segunda-feira!",
+    "Parabéns pela cultura organizacional que promove bem-estar coletivo!",
+    "Obrigado pela política de portas abertas que facilita comunicação!",
+    "Feliz Dia do Consumidor! Que foquemos sempre na satisfação total!",
+    "Que inspiração ver programas de voluntariado engajando colaboradores!",
+    "Desejo reunião de resultados positiva com metas superadas!",
+    "Parabéns pela modernização tecnológica que facilita nosso trabalho!",
+    "Muito grato pela oportunidade de fazer parte desta família empresarial!",
+    "Feliz Dia da Mulher Empreendedora! Força feminina transformando negócios!",
+    "Que satisfação ver investimento em infraestrutura melhorando ambiente!",
+    "Desejo almoço delicioso no novo refeitório inaugurado!",
+    "Parabéns pela comunicação interna eficiente que mantém todos informados!",
+    "Obrigado pela política de reconhecimento que valoriza bom desempenho!",
+    "Feliz Dia do Planeta Terra! Responsabilidade ambiental é compromisso nosso!",
+    "Que alegria ver programas de integração acolhendo novos talentos!",
+    "Desejo apresentação impactante para clientes na feira de negócios!",
+    "Parabéns pela inovação constante que mantém empresa competitiva!",
+    "Muito obrigado pela confiança depositada em minha capacidade profissional!",
+    "Feliz Dia do Livro! Conhecimento é ferramenta transformadora sempre!",
+    "Que orgulho ver responsabilidade social praticada concretamente!",
+    "Desejo workshop produtivo com aprendizados valiosos para todos!",
+    "Parabéns pela gestão participativa que valoriza opinião de todos!",
+    "Obrigado pela atmosfera positiva que torna trabalho mais prazeroso!",
+    "Feliz Dia da Família! Que equilibremos vida pessoal e profissional!",
+    "Que inspiração ver liderança jovem assumindo desafios importantes!",
+    "Desejo viagem corporativa segura e cheia de bons negócios!",
+    "Parabéns pela excelência operacional reconhecida pelo mercado!",
+    "Muito grato pela mentoria que acelera desenvolvimento de carreira!",
+    "Feliz Dia da Amizade! Que relacionamentos sejam sempre genuínos!",
+    "Que satisfação ver diversidade geracional enriquecendo nossa equipe!",
+    "Desejo evento de confraternização alegre para fortalecer vínculos!",
+    "Parabéns pela visão estratégica que antecipa tendências futuras!",
+    "Obrigado pela estabilidade que permite planejamento de longo prazo!",
+    "Feliz Dia da Gratidão! Reconhecimento sincero por tudo recebido!",
+    "Que alegria ver cultura de aprendizado contínuo sendo cultivada!",
+    "Desejo negociação bem-sucedida com fornecedores estratégicos!",
+    "Parabéns pela adaptabilidade demonstrada em tempos desafiadores!",
+    "Muito obrigado pela atmosfera colaborativa que potencializa resultados!",
+    "Feliz Dia da Criatividade! Inovação nasce de mentes abertas!",
+    "Que orgulho ver compromisso com excelência em todos processos!",
+    "Desejo treinamento enriquecedor que amplie competências técnicas!",
+    "Parabéns pela gestão eficiente que otimiza recursos disponíveis!",
+    "Obrigado pela flexibilidade que permite conciliar responsabilidades!",
+    "Feliz Dia da Esperança! Que futuro seja próspero para todos!",
+    "Que inspiração ver resiliência organizacional superando obstáculos!",
+    "Desejo auditoria tranquila com processos organizados e transparentes!",
+    "Parabéns pela cultura de segurança que protege todos colaboradores!",
+    "Muito grato pela oportunidade de contribuir com crescimento sustentável!",
+    "Feliz Dia da Tolerância! Respeito à diversidade fortalece organização!",
+    "Que satisfação ver programas de qualidade de vida surtindo efeito!",
+    "Desejo reunião estratégica produtiva definindo rumos futuros!",
+    "Parabéns pela comunicação assertiva que evita mal-entendidos!",
+    "Obrigado pela política de desenvolvimento que investe em pessoas!",
+    "Feliz Dia da Inovação! Criatividade transforma ideias em realidade!",
+    "Que alegria ver espírito empreendedor florescendo internamente!",
+    "Desejo lançamento exitoso do produto desenvolvido com dedicação!",
+    "Parabéns pela governança ética que orienta todas decisões!",
+    "Muito obrigado pela confiança que permite autonomia responsável!",
+    "Feliz Dia da Parceria! Colaboração gera resultados extraordinários!",
+    "Que orgulho ver sustentabilidade integrada ao modelo de negócio!",
+    "Desejo consultoria enriquecedora agregando valor aos processos!",
+    "Parabéns pela agilidade operacional que responde rapidamente ao mercado!",
+    "Obrigado pela cultura inclusiva que valoriza diferentes perspectivas!",
+    "Feliz Dia da Transformação! Mudanças positivas geram crescimento!",
+    "Que inspiração ver liderança inspiradora motivando equipes!",
+    "Desejo integração sistêmica bem-sucedida otimizando fluxos!",
+    "Parabéns pela visão humanizada que coloca pessoas no centro!",
+    "Muito grato pela estabilidade financeira que garante tranquilidade!",
+    "Feliz Dia da Excelência! Qualidade é compromisso de todos!",
+    "Que satisfação ver cultura organizacional sólida e inspiradora!",
+    "Desejo expansão internacional bem-planejada e bem-executada!",
+    "Parabéns pela transparência que fortalece relacionamentos!",
+    "Obrigado pela oportunidade de fazer diferença positiva!",
+    "Feliz Dia da Colaboração! União faz força em todos projetos!",
+    "Que alegria ver investimento contínuo em tecnologia de ponta!",
+    "Desejo certificação internacional reconhecendo nossa excelência!",
+    "Parabéns pela gestão participativa que engaja todos colaboradores!",
+    "Muito obrigado pela cultura de reconhecimento que motiva constantemente!",
+    "Feliz Dia da Sustentabilidade! Planeta agradece nossa consciência!",
+    "Que orgulho ver responsabilidade corporativa praticada diariamente!",
+    "Desejo parceria estratégica frutífera agregando valor mútuo!",
+    "Parabéns pela adaptação digital que moderniza operações!",
+    "Obrigado pela flexibilidade que permite equilíbrio vida-trabalho!",
+    "Feliz Dia da Diversidade! Diferenças enriquecem nossa organização!",
+    "Que inspiração ver inovação disruptiva transformando setor!",
+    "Desejo implementação suave de novos processos operacionais!",
+    "Parabéns pela liderança visionária que antecipa tendências!",
+    "Muito grato pela estabilidade que permite crescimento sustentável!",
+    "Feliz Dia da Qualidade! Excelência é nosso padrão sempre!",
+    "Que satisfação ver desenvolvimento de talentos internos!",
+    "Desejo auditoria externa positiva validando nossos processos!",
+    "Parabéns pela cultura de segurança que protege todos!",
+    "Obrigado pela oportunidade de liderar projetos desafiadores!",
+    "Feliz Dia da Ética! Integridade guia todas nossas ações!",
+    "Que alegria ver espírito colaborativo fortalecendo equipes!",
+    "Desejo migração tecnológica tranquila sem interrupções!",
+    "Parabéns pela gestão de mudanças eficiente e humanizada!",
+    "Muito obrigado pela confiança depositada em nossa capacidade!"
+]
+
+# ==================== COMPOSIÇÃO ====================
+
+# Partes opcionais que multiplicam as variações de cada corpo ("" = sem a parte)
+GREETINGS = ["", "Olá,", "Bom dia,", "Boa tarde,", "Prezados,", "Oi equipe,", "Olá, tudo bem?", "Caros colegas,"]
+PRODUCTIVE_COMPLEMENTS = [
+    "", "Podem verificar com prioridade?", "Fico no aguardo de um retorno.", "Segue em anexo o print do erro.",
+    "Isso está afetando vários usuários.", "Consegue me ajudar ainda hoje?", "Preciso de uma previsão de solução.",
+    "Já tentei reiniciar e não resolveu."
+]
+UNPRODUCTIVE_COMPLEMENTS = [
+    "", "Não é necessário responder.", "Um grande abraço a todos!", "Contem sempre comigo.",
+    "Foi um prazer trabalhar com vocês.", "Sigam com esse ótimo trabalho!", "Até a próxima!",
+    "Mensagem apenas para registrar meu carinho."
+]
+CLOSINGS = ["", "Atenciosamente,", "Obrigado,", "Abraços,", "Att.", "Cordialmente,", "Grato,", "Saudações,"]
+NAMES = ["Maria", "Carlos", "Ana", "João", "Fernanda", "Ricardo", "Equipe Financeira", "Suporte Comercial"]
+
+LABELS = {
+    'PRODUTIVO': {
+        'templates': PRODUCTIVE_TECHNICAL + PRODUCTIVE_REQUESTS + PRODUCTIVE_STATUS + PRODUCTIVE_URGENT,
+        'values': PRODUCTIVE_VALUES,
+        'specific': PRODUCTIVE_SPECIFIC,
+        'complements': PRODUCTIVE_COMPLEMENTS
+    },
+    'IMPRODUTIVO': {
+        'templates': UNPRODUCTIVE_THANKS + UNPRODUCTIVE_CONGRATULATIONS + UNPRODUCTIVE_HOLIDAY + UNPRODUCTIVE_COURTESY,
+        'values': UNPRODUCTIVE_VALUES,
+        'specific': UNPRODUCTIVE_SPECIFIC,
+        'complements': UNPRODUCTIVE_COMPLEMENTS
     }
-    
-    all_templates = thanks_templates + congratulations_templates + holiday_templates + courtesy_templates
-    emails = []
-    
-    # Gerar emails usando templates (600)
-    for i in range(600):
-        template = random.choice(all_templates)
-        email = template
-        
-        import re
-        placeholders = re.findall(r'\{(\w+)\}', template)
-        for placeholder in placeholders:
-            if placeholder in valores_improdutivos:
-                replacement = random.choice(valores_improdutivos[placeholder])
-                email = email.replace(f'{{{placeholder}}}', replacement)
-        
-        emails.append(email)
-    
-    # Emails específicos escritos manualmente (400)
-    specific_emails = [
-        "Muito obrigado pelo excelente atendimento prestado pela equipe de suporte!",
-        "Parabéns pelo lançamento do novo produto. Desejo muito sucesso para todos!",
-        "Feliz Natal e próspero Ano Novo para toda a equipe da empresa!",
-        "Agradeço imensamente pela dedicação demonstrada durante o processo de implementação.",
-        "Que alegria receber a notícia do crescimento da empresa! Parabéns a todos!",
-        "Tenha um ótimo final de semana e descanse bastante com a família.",
-        "Desejo felicidades e muito sucesso em todos os projetos futuros da equipe.",
-        "Obrigado por sempre nos atender com tanta cortesia e eficiência.",
-        "Feliz aniversário da empresa! Que sejam muitos anos de prosperidade!",
-        "Gratidão pela parceria sólida e pelo comprometimento demonstrado sempre.",
-        "Abraços calorosos e votos de muito sucesso em sua nova jornada profissional!",
-        "Que dia maravilhoso! Espero que esteja tudo bem com você e sua família.",
-        "Comemorando junto com vocês essa vitória tão bem merecida pela equipe!",
-        "Meu reconhecimento pelo trabalho excepcional desenvolvido por todos.",
-        "Desejo um período de férias relaxante e revigorante para toda a equipe.",
-        "Obrigada por fazer a diferença na vida de tantas pessoas através do trabalho.",
-        "Felicitações pelo prêmio recebido! Muito bem merecido pela qualidade do serviço!",
-        "Que sua semana seja repleta de alegrias, conquistas e muitas realizações.",
-        "Agradeço pela confiança depositada em nossos serviços ao longo dos anos.",
-        "Parabéns pela formatura! Que venham muitas oportunidades profissionais!",
-        "Muito obrigado pela apresentação inspiradora na conferência de ontem.",
-        "Feliz Dia das Mães para todas as colaboradoras! Vocês são incríveis!",
-        "Que orgulho saber do reconhecimento internacional recebido pela empresa!",
-        "Desejo uma Páscoa repleta de renovação e momentos especiais em família.",
-        "Parabéns pelo 10º aniversário da empresa! Que venham muitos outros!",
-        "Agradeço pela hospitalidade durante minha visita às instalações.",
-        "Feliz Dia dos Pais para todos os colaboradores! Aproveitam bem o dia!",
-        "Que satisfação ver o crescimento sustentável e responsável da organização!",
-        "Muito obrigado pelo convite para o evento de lançamento. Foi fantástico!",
-        "Desejo boas festas de fim de ano para todos os funcionários e famílias!",
-        "Parabéns pela certificação ISO obtida! Reflexo da qualidade do trabalho!",
-        "Feliz Dia Internacional da Mulher para todas as profissionais da empresa!",
-        "Que alegria saber da expansão para novos mercados! Sucesso garantido!",
-        "Obrigado pela oportunidade de participar do projeto piloto. Foi enriquecedor!",
-        "Desejo um 2024 repleto de inovações e conquistas para toda a equipe!",
-        "Parabéns pela conquista do prêmio de melhor empresa para trabalhar!",
-        "Muito grato pela mentoria e orientações valiosas durante o projeto.",
-        "Feliz aniversário! Que este novo ano de vida seja repleto de realizações!",
-        "Que orgulho fazer parte desta comunidade empresarial tão engajada!",
-        "Desejo uma semana produtiva e cheia de energia positiva para todos!",
-        "Parabéns pela implementação bem-sucedida da iniciativa de sustentabilidade!",
-        "Muito obrigado por compartilhar conhecimentos no workshop de capacitação.",
-        "Feliz Dia do Trabalhador! Reconhecimento merecido por toda dedicação!",
-        "Que satisfação ver os valores da empresa sendo vivenciados na prática!",
-        "Desejo muito sucesso na nova filial inaugurada! Crescimento merecido!",
-        "Parabéns pelo lançamento da campanha social! Iniciativa muito nobre!",
-        "Obrigado pela flexibilidade e compreensão durante o período de adaptação.",
-        "Feliz Dia dos Namorados! Que o amor esteja presente na vida de todos!",
-        "Que inspiração ver o engajamento da equipe com a responsabilidade social!",
-        "Desejo boas vindas aos novos colaboradores! Que se sintam em casa!",
-        "Parabéns pela modernização das instalações! Ambiente ainda melhor!",
-        "Muito grato pela cultura organizacional acolhedora e inspiradora.",
-        "Feliz Dia da Independência! Orgulho de fazer parte desta nação!",
-        "Que alegria ver a empresa sendo referência em inovação no setor!",
-        "Desejo um outono repleto de conquistas e momentos especiais para todos!",
-        "Parabéns pela política de diversidade e inclusão implementada!",
-        "Obrigado pela oportunidade de crescimento profissional oferecida.",
-        "Feliz Dia da Árvore! Que nossa consciência ambiental continue crescendo!",
-        "Que satisfação ver o comprometimento com a qualidade de vida dos funcionários!",
-        "Desejo um inverno aconchegante e cheio de momentos especiais em família!",
-        "Parabéns pela iniciativa de home office que promove equilíbrio vida-trabalho!",
-        "Muito obrigado pela palestra motivacional. Saí renovado e inspirado!",
-        "Feliz Dia do Meio Ambiente! Que nossa consciência ecológica cresça sempre!",
-        "Que orgulho ver a empresa apoiando causas sociais importantes na comunidade!",
-        "Desejo uma primavera florida e cheia de novos projetos para toda equipe!",
-        "Parabéns pela transparência na comunicação com todos os stakeholders!",
-        "Obrigado pela cultura de feedback construtivo que promove crescimento!",
-        "Feliz Dia Mundial da Saúde! Que o bem-estar seja prioridade sempre!",
-        "Que inspiração ver liderança feminina ocupando posições estratégicas!",
-        "Desejo um verão repleto de energia e realizações para todos!",
-        "Parabéns pela ética empresarial exemplar demonstrada em todas decisões!",
-        "Muito grato pelo ambiente colaborativo que estimula criatividade!",
-        "Feliz Dia da Consciência Negra! Viva a diversidade em nossa organização!",
-        "Que satisfação ver investimento contínuo em capacitação dos colaboradores!",
-        "Desejo feriado prolongado relaxante para recarregar as energias!",
-        "Parabéns pela governança corporativa transparente e responsável!",
-        "Obrigado por valorizar ideias inovadoras vindas de todos os níveis!",
-        "Feliz Dia Internacional da Paz! Que harmonia reine em nossos corações!",
-        "Que alegria ver programas de bem-estar promovendo saúde mental!",
-        "Desejo reuniões produtivas e decisões acertadas nesta semana!",
-        "Parabéns pela gestão sustentável que preserva recursos naturais!",
-        "Muito obrigado pela flexibilidade nos horários que facilita conciliação!",
-        "Feliz Dia da Educação! Investimento em conhecimento sempre compensa!",
-        "Que orgulho fazer parte de organização que valoriza desenvolvimento humano!",
-        "Desejo café da manhã energizante para começar bem esta segunda-feira!",
-        "Parabéns pela cultura organizacional que promove bem-estar coletivo!",
-        "Obrigado pela política de portas abertas que facilita comunicação!",
-        "Feliz Dia do Consumidor! Que foquemos sempre na satisfação total!",
-        "Que inspiração ver programas de voluntariado engajando colaboradores!",
-        "Desejo reunião de resultados positiva com metas superadas!",
-        "Parabéns pela modernização tecnológica que facilita nosso trabalho!",
-        "Muito grato pela oportunidade de fazer parte desta família empresarial!",
-        "Feliz Dia da Mulher Empreendedora! Força feminina transformando negócios!",
-        "Que satisfação ver investimento em infraestrutura melhorando ambiente!",
-        "Desejo almoço delicioso no novo refeitório inaugurado!",
-        "Parabéns pela comunicação interna eficiente que mantém todos informados!",
-        "Obrigado pela política de reconhecimento que valoriza bom desempenho!",
-        "Feliz Dia do Planeta Terra! Responsabilidade ambiental é compromisso nosso!",
-        "Que alegria ver programas de integração acolhendo novos talentos!",
-        "Desejo apresentação impactante para clientes na feira de negócios!",
-        "Parabéns pela inovação constante que mantém empresa competitiva!",
-        "Muito obrigado pela confiança depositada em minha capacidade profissional!",
-        "Feliz Dia do Livro! Conhecimento é ferramenta transformadora sempre!",
-        "Que orgulho ver responsabilidade social praticada concretamente!",
-        "Desejo workshop produtivo com aprendizados valiosos para todos!",
-        "Parabéns pela gestão participativa que valoriza opinião de todos!",
-        "Obrigado pela atmosfera positiva que torna trabalho mais prazeroso!",
-        "Feliz Dia da Família! Que equilibremos vida pessoal e profissional!",
-        "Que inspiração ver liderança jovem assumindo desafios importantes!",
-        "Desejo viagem corporativa segura e cheia de bons negócios!",
-        "Parabéns pela excelência operacional reconhecida pelo mercado!",
-        "Muito grato pela mentoria que acelera desenvolvimento de carreira!",
-        "Feliz Dia da Amizade! Que relacionamentos sejam sempre genuínos!",
-        "Que satisfação ver diversidade geracional enriquecendo nossa equipe!",
-        "Desejo evento de confraternização alegre para fortalecer vínculos!",
-        "Parabéns pela visão estratégica que antecipa tendências futuras!",
-        "Obrigado pela estabilidade que permite planejamento de longo prazo!",
-        "Feliz Dia da Gratidão! Reconhecimento sincero por tudo recebido!",
-        "Que alegria ver cultura de aprendizado contínuo sendo cultivada!",
-        "Desejo negociação bem-sucedida com fornecedores estratégicos!",
-        "Parabéns pela adaptabilidade demonstrada em tempos desafiadores!",
-        "Muito obrigado pela atmosfera colaborativa que potencializa resultados!",
-        "Feliz Dia da Criatividade! Inovação nasce de mentes abertas!",
-        "Que orgulho ver compromisso com excelência em todos processos!",
-        "Desejo treinamento enriquecedor que amplie competências técnicas!",
-        "Parabéns pela gestão eficiente que otimiza recursos disponíveis!",
-        "Obrigado pela flexibilidade que permite conciliar responsabilidades!",
-        "Feliz Dia da Esperança! Que futuro seja próspero para todos!",
-        "Que inspiração ver resiliência organizacional superando obstáculos!",
-        "Desejo auditoria tranquila com processos organizados e transparentes!",
-        "Parabéns pela cultura de segurança que protege todos colaboradores!",
-        "Muito grato pela oportunidade de contribuir com crescimento sustentável!",
-        "Feliz Dia da Tolerância! Respeito à diversidade fortalece organização!",
-        "Que satisfação ver programas de qualidade de vida surtindo efeito!",
-        "Desejo reunião estratégica produtiva definindo rumos futuros!",
-        "Parabéns pela comunicação assertiva que evita mal-entendidos!",
-        "Obrigado pela política de desenvolvimento que investe em pessoas!",
-        "Feliz Dia da Inovação! Criatividade transforma ideias em realidade!",
-        "Que alegria ver espírito empreendedor florescendo internamente!",
-        "Desejo lançamento exitoso do produto desenvolvido com dedicação!",
-        "Parabéns pela governança ética que orienta todas decisões!",
-        "Muito obrigado pela confiança que permite autonomia responsável!",
-        "Feliz Dia da Parceria! Colaboração gera resultados extraordinários!",
-        "Que orgulho ver sustentabilidade integrada ao modelo de negócio!",
-        "Desejo consultoria enriquecedora agregando valor aos processos!",
-        "Parabéns pela agilidade operacional que responde rapidamente ao mercado!",
-        "Obrigado pela cultura inclusiva que valoriza diferentes perspectivas!",
-        "Feliz Dia da Transformação! Mudanças positivas geram crescimento!",
-        "Que inspiração ver liderança inspiradora motivando equipes!",
-        "Desejo integração sistêmica bem-sucedida otimizando fluxos!",
-        "Parabéns pela visão humanizada que coloca pessoas no centro!",
-        "Muito grato pela estabilidade financeira que garante tranquilidade!",
-        "Feliz Dia da Excelência! Qualidade é compromisso de todos!",
-        "Que satisfação ver cultura organizacional sólida e inspiradora!",
-        "Desejo expansão internacional bem-planejada e bem-executada!",
-        "Parabéns pela transparência que fortalece relacionamentos!",
-        "Obrigado pela oportunidade de fazer diferença positiva!",
-        "Feliz Dia da Colaboração! União faz força em todos projetos!",
-        "Que alegria ver investimento contínuo em tecnologia de ponta!",
-        "Desejo certificação internacional reconhecendo nossa excelência!",
-        "Parabéns pela gestão participativa que engaja todos colaboradores!",
-        "Muito obrigado pela cultura de reconhecimento que motiva constantemente!",
-        "Feliz Dia da Sustentabilidade! Planeta agradece nossa consciência!",
-        "Que orgulho ver responsabilidade corporativa praticada diariamente!",
-        "Desejo parceria estratégica frutífera agregando valor mútuo!",
-        "Parabéns pela adaptação digital que moderniza operações!",
-        "Obrigado pela flexibilidade que permite equilíbrio vida-trabalho!",
-        "Feliz Dia da Diversidade! Diferenças enriquecem nossa organização!",
-        "Que inspiração ver inovação disruptiva transformando setor!",
-        "Desejo implementação suave de novos processos operacionais!",
-        "Parabéns pela liderança visionária que antecipa tendências!",
-        "Muito grato pela estabilidade que permite crescimento sustentável!",
-        "Feliz Dia da Qualidade! Excelência é nosso padrão sempre!",
-        "Que satisfação ver desenvolvimento de talentos internos!",
-        "Desejo auditoria externa positiva validando nossos processos!",
-        "Parabéns pela cultura de segurança que protege todos!",
-        "Obrigado pela oportunidade de liderar projetos desafiadores!",
-        "Feliz Dia da Ética! Integridade guia todas nossas ações!",
-        "Que alegria ver espírito colaborativo fortalecendo equipes!",
-        "Desejo migração tecnológica tranquila sem interrupções!",
-        "Parabéns pela gestão de mudanças eficiente e humanizada!",
-        "Muito obrigado pela confiança depositada em nossa capacidade!"
-    ]
-    
-    emails.extend(specific_emails)
-    
-    # Completar até 1000 emails se necessário
-    while len(emails) < 1000:
-        template = random.choice(all_templates)
-        email = template
-        
-        import re
-        placeholders = re.findall(r'\{(\w+)\}', template)
-        for placeholder in placeholders:
-            if placeholder in valores_improdutivos:
-                replacement = random.choice(valores_improdutivos[placeholder])
-                email = email.replace(f'{{{placeholder}}}', replacement)
-        
-        if email not in emails:  # Evitar duplicatas
-            emails.append(email)
-    
-    return emails[:1000]
+}
+
+
+# ==================== GERAÇÃO ====================
+
+def check_placeholders():
+    """Garante que todo placeholder dos templates tem valores (nenhum {placeholder} chega ao dataset)"""
+    for label, spec in LABELS.items():
+        missing = sorted({
+            name for template in spec['templates'] for name in _PLACEHOLDER.findall(template)
+            if not spec['values'].get(name)
+        })
+        if missing:
+            raise ValueError(f"Placeholders sem valores em {label}: {', '.join(missing)}")
+
+
+def fill_template(template: str, values: Dict[str, List[str]], rng: random.Random) -> str:
+    return _PLACEHOLDER.sub(lambda match: rng.choice(values[match.group(1)]), template)
+
+
+def compose_email(body: str, complements: List[str], rng: random.Random) -> str:
+    """Corpo com saudação, complemento e despedida opcionais"""
+    closing = rng.choice(CLOSINGS)
+    parts = [rng.choice(GREETINGS), body, rng.choice(complements),
+             f"{closing}\n{rng.choice(NAMES)}" if closing else ""]
+    return "\n".join(part for part in parts if part)
+
+
+def text_digest(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def generate_batch(task: Tuple[str, int, int, int]) -> Tuple[str, List[Tuple[int, str]]]:
+    """
+    Gera um lote de emails de uma classe (executado nos processos do pool)
+
+    O gerador do lote depende apenas da semente, da classe e do índice do
+    lote, então o resultado não depende do número de processos.
+    """
+    label, seed, batch_index, size = task
+    spec = LABELS[label]
+    rng = random.Random(f"{seed}:{label}:{batch_index}")
+    rows = []
+    for _ in range(size):
+        email = compose_email(fill_template(rng.choice(spec['templates']), spec['values'], rng),
+                              spec['complements'], rng)
+        rows.append((text_digest(email), email))
+    return label, rows
+
+
+def generate_rows(targets: Dict[str, int], seed: int, batch_size: int, pool, stats: Dict) -> Iterator[Tuple[str, str]]:
+    """
+    Emails únicos (texto, classe) até atingir o alvo de cada classe
+
+    Os emails escritos manualmente entram primeiro; depois, lotes gerados em
+    paralelo são consumidos na ordem em que foram submetidos (saída
+    reprodutível). A geração para se uma rodada inteira não trouxer emails
+    novos (combinações esgotadas).
+    """
+    seen = set()
+    counts = dict.fromkeys(targets, 0)
+
+    def accept(label: str, digest: int) -> bool:
+        if counts[label] >= targets[label]:
+            return False
+        if digest in seen:
+            stats['duplicates'] += 1
+            return False
+        seen.add(digest)
+        counts[label] += 1
+        return True
+
+    for label in targets:
+        for email in LABELS[label]['specific']:
+            if accept(label, text_digest(email)):
+                yield email, label
+
+    tasks_per_round = (getattr(pool, '_processes', 1) if pool else 1) * 2
+    batch_index = 0
+    while any(counts[label] < targets[label] for label in targets):
+        pending = [label for label in targets if counts[label] < targets[label]]
+        tasks = [(label, seed, batch_index + i, batch_size) for i in range(tasks_per_round) for label in pending]
+        batch_index += tasks_per_round
+        before = sum(counts.values())
+        batches = pool.imap(generate_batch, tasks) if pool else map(generate_batch, tasks)
+        for label, rows in batches:
+            for digest, email in rows:
+                if accept(label, digest):
+                    yield email, label
+        if sum(counts.values()) == before:
+            stats['exhausted'] = True
+            return
+
+
+# ==================== GRAVAÇÃO ====================
+
+def shard_path(output_dir: str, name: str, index: int, shards: int, fmt: str) -> str:
+    if shards == 1:
+        return os.path.join(output_dir, f"{name}.{fmt}")
+    return os.path.join(output_dir, f"{name}-{index:05d}-of-{shards:05d}.{fmt}")
+
+
+def write_shard(path: str, rows: List[Tuple[str, str]], fmt: str):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        if fmt == 'csv':
+            writer = csv.writer(f)
+            writer.writerow(['text', 'label'])
+            writer.writerows(rows)
+        else:
+            for text, label in rows:
+                f.write(json.dumps({'text': text, 'label': label}, ensure_ascii=False) + '\n')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Gera datasets balanceados de emails produtivos e improdutivos")
+    parser.add_argument("--rows", type=int, default=2000, help="Total de emails (metade de cada classe)")
+    parser.add_argument("--shards", type=int, default=1, help="Número de arquivos de saída")
+    parser.add_argument("--workers", type=int, default=1, help="Processos de geração")
+    parser.add_argument("--format", choices=['csv', 'jsonl'], default='csv')
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000, help="Emails por lote enviado a cada processo")
+    parser.add_argument("--output-dir", default=DATASETS_DIR)
+    parser.add_argument("--name", help="Prefixo dos arquivos (padrão: dataset_balanced_<rows>)")
+    return parser.parse_args()
+
 
 def main():
-    """Cria dataset balanceado e de alta qualidade"""
+    """Gera o dataset em shards e mostra a vazão da geração"""
+    args = parse_args()
     print("🚀 CRIANDO DATASET BALANCEADO DE ALTA QUALIDADE")
     print("="*60)
-    
-    # Gerar emails produtivos e improdutivos
-    print("📝 Gerando 1000 emails PRODUTIVOS...")
-    productive_emails = create_productive_emails()
-    
-    print("📝 Gerando 1000 emails IMPRODUTIVOS...")
-    unproductive_emails = create_unproductive_emails()
-    
-    # Criar DataFrame
-    data = []
-    
-    # Adicionar emails produtivos
-    for email in productive_emails:
-        data.append({'text': email, 'label': 'PRODUTIVO'})
-    
-    # Adicionar emails improdutivos
-    for email in unproductive_emails:
-        data.append({'text': email, 'label': 'IMPRODUTIVO'})
-    
-    # Criar DataFrame e embaralhar
-    df = pd.DataFrame(data)
-    df = df.sample(frac=1, random_state=42).reset_index(drop=True)
-    
-    # Análise do dataset criado
+
+    if args.rows < 2 or args.shards < 1 or args.workers < 1:
+        print("❌ Use --rows >= 2, --shards >= 1 e --workers >= 1")
+        return False
+    try:
+        check_placeholders()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+
+    name = args.name or f"dataset_balanced_{args.rows}"
+    os.makedirs(args.output_dir, exist_ok=True)
+    targets = {'PRODUTIVO': args.rows - args.rows // 2, 'IMPRODUTIVO': args.rows // 2}
+    shard_size = math.ceil(args.rows / args.shards)
+    stats = {'duplicates': 0, 'exhausted': False}
+    shuffle_rng = random.Random(args.seed)
+    label_counts = dict.fromkeys(targets, 0)
+    total_chars = 0
+    paths = []
+
+    print(f"📝 Gerando {args.rows:,} emails em {args.shards} shard(s) {args.format.upper()} "
+          f"com {args.workers} processo(s) (semente {args.seed})...")
+    start_time = time.time()
+    pool = Pool(args.workers) if args.workers > 1 else None
+    try:
+        buffer: List[Tuple[str, str]] = []
+
+        def flush():
+            # Cada shard é embaralhado e gravado assim que completa; só um shard fica em memória
+            shuffle_rng.shuffle(buffer)
+            path = shard_path(args.output_dir, name, len(paths), args.shards, args.format)
+            write_shard(path, buffer, args.format)
+            paths.append(path)
+            print(f"   💾 {os.path.basename(path)}: {len(buffer):,} emails "
+                  f"({sum(label_counts.values()) / (time.time() - start_time):,.0f} emails/s)")
+            buffer.clear()
+
+        for text, label in generate_rows(targets, args.seed, args.batch_size, pool, stats):
+            buffer.append((text, label))
+            label_counts[label] += 1
+            total_chars += len(text)
+            if len(buffer) >= shard_size:
+                flush()
+        if buffer:
+            flush()
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    elapsed = time.time() - start_time
+
+    total = sum(label_counts.values())
     print("\n📊 ANÁLISE DO DATASET CRIADO")
     print("="*40)
-    print(f"Total de registros: {len(df)}")
-    
-    class_counts = df['label'].value_counts()
-    for label, count in class_counts.items():
-        percentage = (count / len(df)) * 100
-        print(f"{label}: {count:,} ({percentage:.1f}%)")
-    
-    # Estatísticas de texto
-    df['text_length'] = df['text'].str.len()
-    df['word_count'] = df['text'].str.split().str.len()
-    
-    print(f"\nComprimento médio: {df['text_length'].mean():.1f} caracteres")
-    print(f"Palavras por email: {df['word_count'].mean():.1f}")
-    print(f"Textos únicos: {df['text'].nunique()}/{len(df)} ({df['text'].nunique()/len(df)*100:.1f}%)")
-    
-    # Salvar dataset
-    os.makedirs(os.path.join(os.path.dirname(__file__), "..", "datasets"), exist_ok=True)
-    filename = os.path.join(os.path.dirname(__file__), "..", "datasets", "dataset_balanced_2000.csv")
-    df[['text', 'label']].to_csv(filename, index=False, encoding='utf-8')
-    
-    print(f"\n💾 Dataset salvo como: {filename}")
+    print(f"Total de registros: {total:,}")
+    for label, count in label_counts.items():
+        print(f"{label}: {count:,} ({count / max(total, 1) * 100:.1f}%)")
+    print(f"Comprimento médio: {total_chars / max(total, 1):.1f} caracteres")
+    print(f"Duplicatas descartadas: {stats['duplicates']:,}")
+    print(f"\n⚡ Vazão: {total / elapsed:,.0f} emails/s ({elapsed:.2f}s, "
+          f"{total_chars / elapsed / 1024 / 1024:.2f} MB/s de texto)")
+
+    if stats['exhausted']:
+        print(f"⚠️ Combinações de templates esgotadas: {total:,} emails únicos de {args.rows:,} pedidos")
+    print(f"\n💾 {len(paths)} arquivo(s) salvo(s) em: {args.output_dir}")
+    if len(paths) == 1:
+        print(f"   {paths[0]}")
+
     print("✅ Dataset balanceado criado com sucesso!")
     print("\n🎯 Próximos passos:")
     print("1. Execute: python train_with_balanced_dataset.py")
     print("2. Use este dataset para treinar o modelo melhorado")
-    
-    # Verificar qualidade
-    print(f"\n🔍 Verificação de qualidade:")
-    print(f"✅ Sem valores nulos: {df.isnull().sum().sum() == 0}")
-    print(f"✅ Classes balanceadas: {abs(class_counts['PRODUTIVO'] - class_counts['IMPRODUTIVO']) <= 10}")
-    print(f"✅ Diversidade alta: {df['text'].nunique() / len(df) > 0.95}")
-    
-    return df
+    return not stats['exhausted']
+
 
 if __name__ == "__main__":
-    dataset = main()
\ No newline at end of file
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,271 @@
+# backend/scripts/distill_model.py
+"""
+Destilação da Random Forest em um modelo linear (modo fast do classificador).
+
+A floresta (professor) classifica o dataset e cópias aumentadas dos textos
+(palavras removidas ou trocadas de lugar, sem acentos, caixa alterada, texto
+truncado, saudação e assinatura adicionadas); uma regressão logística (aluno) é
+treinada com as probabilidades da floresta como rótulos suaves, sobre a mesma
+matriz [TF-IDF | features escaladas] que o classificador monta ao servir. O
+aluno reaproveita o vetorizador e o scaler da floresta: o custo por email cai
+para um produto esparso, sem percorrer centenas de árvores.
+
+O relatório mostra a concordância com a floresta em textos não vistos pelo
+aluno (originais e aumentados), a acurácia de ambos contra os rótulos do
+dataset e a latência por email de cada modelo. Com o dataset padrão, o mesmo
+do treinamento da floresta, a acurácia da floresta é medida em textos que ela
+já viu (teacher_accuracy_in_sample) e não estima a acurácia em emails novos. O artefato só é salvo se a concordância nos
+textos originais atingir o mínimo.
+
+Usage:
+    python distill_model.py
+    python distill_model.py --augment-factor 3 --min-agreement 0.97
+    python distill_model.py --teacher ../datasets/advanced_model_tuned.pkl --output ../datasets/advanced_model_fast.pkl
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import unicodedata
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import vstack
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+
+# Permitir importar o pacote app a partir de backend/scripts
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.repositories.advanced_model_repository import AdvancedModelRepository
+from app.services.advanced_classifier import AdvancedEmailClassifier
+from app.utils.preprocessing_cache import default_cache_path
+
+DATASETS_DIR = os.path.join(os.path.dirname(__file__), "..", "datasets")
+
+GREETINGS = ["Olá,", "Bom dia,", "Boa tarde, equipe.", "Prezados,", "Oi pessoal,"]
+SIGNATURES = ["Atenciosamente,\nMaria Souza", "Obrigado,\nCarlos", "Abraços,\nAna", "Att.\nEquipe Financeira"]
+
+
+# ==================== AUMENTO DE DADOS ====================
+
+def _strip_accents(text: str) -> str:
+    return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+
+
+def _drop_words(text: str, rng: random.Random) -> str:
+    words = text.split()
+    kept = [word for word in words if rng.random() > 0.15]
+    return ' '.join(kept or words)
+
+
+def _swap_words(text: str, rng: random.Random) -> str:
+    words = text.split()
+    for _ in range(max(1, len(words) // 10)):
+        if len(words) < 2:
+            break
+        i = rng.randrange(len(words) - 1)
+        words[i], words[i + 1] = words[i + 1], words[i]
+    return ' '.join(words)
+
+
+def _change_case(text: str, rng: random.Random) -> str:
+    return text.upper() if rng.random() < 0.5 else text.lower()
+
+
+def _truncate(text: str, rng: random.Random) -> str:
+    words = text.split()
+    return ' '.join(words[:max(3, int(len(words) * rng.uniform(0.4, 0.8)))])
+
+
+def _wrap(text: str, rng: random.Random) -> str:
+    return f"{rng.choice(GREETINGS)}\n\n{text}\n\n{rng.choice(SIGNATURES)}"
+
+
+AUGMENTATIONS = [
+    _drop_words,
+    _swap_words,
+    lambda text, rng: _strip_accents(text),
+    _change_case,
+    _truncate,
+    _wrap,
+]
+
+
+def augment(texts: List[str], factor: int, seed: int) -> List[str]:
+    """factor variações de cada texto, cada uma com uma ou duas transformações sorteadas"""
+    rng = random.Random(seed)
+    augmented = []
+    for text in texts:
+        for _ in range(factor):
+            variant = text
+            for transform in rng.sample(AUGMENTATIONS, rng.choice((1, 2))):
+                variant = transform(variant, rng)
+            augmented.append(variant)
+    return augmented
+
+
+# ==================== DESTILAÇÃO ====================
+
+def soft_label_rows(X, soft: np.ndarray, classes: np.ndarray):
+    """
+    Rótulos suaves para LogisticRegression: cada linha aparece uma vez por classe,
+    com peso igual à probabilidade dada pela floresta
+    """
+    n_classes = len(classes)
+    X_rows = vstack([X] * n_classes).tocsr()
+    y_rows = np.repeat(classes, X.shape[0])
+    weights = np.concatenate([soft[:, i] for i in range(n_classes)])
+    keep = weights > 0
+    return X_rows[keep], y_rows[keep], weights[keep]
+
+
+def measure_latency(classifier: AdvancedEmailClassifier, texts: List[str], mode: str) -> Dict[str, float]:
+    """Latência por email em classify (pré-processamento incluído) e só no predict_proba"""
+    _, model, _ = classifier._resolve_tier(mode)
+    classifier.classify(texts[0], mode=mode)  # aquecimento
+
+    start = time.perf_counter()
+    for text in texts:
+        classifier.classify(text, mode=mode)
+    classify_ms = (time.perf_counter() - start) / len(texts) * 1000
+
+    rows = [classifier.build_matrix([text]) for text in texts]
+    start = time.perf_counter()
+    for row in rows:
+        model.predict_proba(row)
+    predict_ms = (time.perf_counter() - start) / len(rows) * 1000
+    return {'classify_ms': classify_ms, 'predict_ms': predict_ms}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Destila a Random Forest em um modelo linear (modo fast)")
+    parser.add_argument("--teacher", default=os.getenv("ADVANCED_MODEL_PATH", os.path.join(DATASETS_DIR, "advanced_model.pkl")))
+    parser.add_argument("--dataset", default=os.path.join(DATASETS_DIR, "dataset_balanced_2000.csv"))
+    parser.add_argument("--output", default=os.getenv("FAST_MODEL_PATH", os.path.join(DATASETS_DIR, "advanced_model_fast.pkl")))
+    parser.add_argument("--report", help="Grava o relatório de concordância em JSON")
+    parser.add_argument("--augment-factor", type=int, default=2, help="Variações aumentadas por texto")
+    parser.add_argument("--hard-label-weight", type=float, default=0.2,
+                        help="Peso do rótulo do dataset nos textos originais (0 = só a floresta)")
+    parser.add_argument("--C", type=float, default=10.0, help="Inverso da regularização da regressão logística")
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--latency-samples", type=int, default=200)
+    parser.add_argument("--min-agreement", type=float, default=0.95,
+                        help="Concordância mínima com a floresta nos textos originais não vistos")
+    parser.add_argument("--workers", type=int, default=None, help="Processos do pré-processamento")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    print("⚗️ DESTILAÇÃO DO CLASSIFICADOR")
+    print("="*60)
+
+    if not os.path.exists(args.teacher):
+        print(f"❌ Modelo professor não encontrado: {args.teacher}")
+        return False
+    classifier = AdvancedEmailClassifier(model_repository=AdvancedModelRepository(args.teacher),
+                                         mode=AdvancedEmailClassifier.MODE_FOREST)
+    if classifier.model is None:
+        print("❌ Não foi possível carregar o modelo professor")
+        return False
+    teacher = classifier.model
+    classes = teacher.classes_
+
+    df = pd.read_csv(args.dataset).dropna(subset=['text', 'label'])
+    texts, labels = df['text'].astype(str).tolist(), df['label'].astype(str).to_numpy()
+    train_texts, test_texts, y_train, y_test = train_test_split(
+        texts, labels, test_size=args.test_size, random_state=args.seed, stratify=labels
+    )
+    train_augmented = augment(train_texts, args.augment_factor, args.seed)
+    test_augmented = augment(test_texts, 1, args.seed + 1)
+    print(f"📊 {len(train_texts)} textos de treino (+{len(train_augmented)} aumentados), "
+          f"{len(test_texts)} de teste (+{len(test_augmented)} aumentados)")
+
+    # Pré-processamento único para todos os conjuntos, com o cache em disco do treinamento
+    groups = [train_texts, train_augmented, test_texts, test_augmented]
+    all_texts = [text for group in groups for text in group]
+    start_time = time.time()
+    processed, stats = classifier.pipeline.preprocess_many(
+        all_texts, cache_path=default_cache_path(), workers=args.workers
+    )
+    X_all = classifier.build_matrix(all_texts, processed)
+    print(f"🔧 Matriz {X_all.shape} em {time.time() - start_time:.1f}s ({stats['cache_hits']} textos do cache)")
+
+    bounds = np.cumsum([0] + [len(group) for group in groups])
+    X_train, X_train_aug, X_test, X_test_aug = (X_all[bounds[i]:bounds[i + 1]] for i in range(len(groups)))
+
+    # Rótulos suaves da floresta; nos originais, misturados com o rótulo do dataset
+    print("🌲 Classificando com a floresta...")
+    soft_train = teacher.predict_proba(X_train)
+    soft_train_aug = teacher.predict_proba(X_train_aug)
+    hard_train = (y_train[:, None] == classes[None, :]).astype(float)
+    soft_train = (1 - args.hard_label_weight) * soft_train + args.hard_label_weight * hard_train
+
+    X_fit, y_fit, weights = soft_label_rows(
+        vstack([X_train, X_train_aug]).tocsr(), np.vstack([soft_train, soft_train_aug]), classes
+    )
+    print(f"🎓 Treinando regressão logística em {X_fit.shape[0]} linhas ponderadas...")
+    start_time = time.time()
+    student = LogisticRegression(C=args.C, max_iter=2000, random_state=args.seed)
+    student.fit(X_fit, y_fit, sample_weight=weights)
+    print(f"   Treinado em {time.time() - start_time:.1f}s")
+
+    teacher_test, student_test = teacher.predict(X_test), student.predict(X_test)
+    teacher_test_aug, student_test_aug = teacher.predict(X_test_aug), student.predict(X_test_aug)
+    agreement = {
+        'test': float(np.mean(teacher_test == student_test)),
+        'test_augmented': float(np.mean(teacher_test_aug == student_test_aug)),
+        # Com o dataset padrão a floresta já viu estes textos no treinamento: acurácia dentro da amostra
+        'teacher_accuracy_in_sample': float(np.mean(teacher_test == y_test)),
+        'student_accuracy': float(np.mean(student_test == y_test)),
+        'mean_probability_diff': float(np.mean(np.abs(teacher.predict_proba(X_test) - student.predict_proba(X_test)))),
+        'test_samples': len(test_texts),
+    }
+
+    classifier.distilled_model = student
+    classifier.distilled_pipeline = classifier.pipeline
+    latency_texts = test_texts[:args.latency_samples]
+    latency = {
+        mode: measure_latency(classifier, latency_texts, mode)
+        for mode in (AdvancedEmailClassifier.MODE_FOREST, AdvancedEmailClassifier.MODE_FAST)
+    }
+
+    print("\n📋 RELATÓRIO")
+    print(f"   Concordância com a floresta (teste): {agreement['test']:.2%}")
+    print(f"   Concordância com a floresta (teste aumentado): {agreement['test_augmented']:.2%}")
+    print(f"   Acurácia floresta (textos do treino dela): {agreement['teacher_accuracy_in_sample']:.2%}")
+    print(f"   Acurácia linear (textos não vistos): {agreement['student_accuracy']:.2%}")
+    print(f"   Diferença média de probabilidade: {agreement['mean_probability_diff']:.4f}")
+    print(f"\n{'modelo':<10}{'classify (ms)':>16}{'predict (ms)':>16}")
+    for mode, values in latency.items():
+        print(f"{mode:<10}{values['classify_ms']:>16.3f}{values['predict_ms']:>16.3f}")
+
+    report = {'teacher_path': args.teacher, 'agreement': agreement, 'latency': latency,
+              'augment_factor': args.augment_factor, 'hard_label_weight': args.hard_label_weight,
+              'C': args.C, 'seed': args.seed}
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n📄 Relatório salvo em: {args.report}")
+
+    if agreement['test'] < args.min_agreement:
+        print(f"❌ Concordância abaixo do mínimo ({args.min_agreement:.2%}); artefato não salvo")
+        return False
+
+    saved = AdvancedModelRepository(args.output).save(
+        classifier.pipeline.to_artifact(student, kind='distilled', **report, created_at=time.time())
+    )
+    if saved:
+        print(f"\n✅ Modelo destilado salvo em: {args.output}")
+        print("💡 Use CLASSIFIER_MODE=fast para servi-lo")
+    return saved
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
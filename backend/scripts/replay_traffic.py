@@ -0,0 +1,257 @@
+# backend/scripts/replay_traffic.py
+"""
+Replay de tráfego capturado contra dois alvos para comparação de modelos e performance.
+
+Cada alvo pode ser um artefato de modelo (carregado em um AdvancedEmailClassifier local)
+ou a URL de um servidor em execução. Os registros são lidos do arquivo de captura gerado
+com TRAFFIC_CAPTURE_PATH (apenas registros com texto retido podem ser reproduzidos).
+
+Usage:
+    python replay_traffic.py capture.jsonl --baseline ../datasets/advanced_model.pkl --candidate novo_modelo.pkl
+    python replay_traffic.py capture.jsonl --baseline http://localhost:8000 --candidate http://localhost:8001 --speed 10
+    python replay_traffic.py capture.jsonl --baseline a.pkl --candidate b.pkl --speed 0 --output relatorio.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Permitir importar o pacote app a partir de backend/scripts
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.repositories.traffic_capture_repository import TrafficCaptureRepository
+
+
+class ModelTarget:
+    """Alvo de replay baseado em um artefato de modelo carregado localmente"""
+
+    def __init__(self, model_path: str):
+        from app.services.advanced_classifier import AdvancedEmailClassifier
+        from app.repositories.advanced_model_repository import AdvancedModelRepository
+
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Modelo não encontrado: {model_path}")
+        self.name = os.path.basename(model_path)
+        self.classifier = AdvancedEmailClassifier(
+            model_path=model_path,
+            model_repository=AdvancedModelRepository(model_path)
+        )
+
+    def classify(self, text: str) -> Dict:
+        result = self.classifier.classify(text)
+        return {'classification': result['classification'], 'confidence': result['confidence']}
+
+
+class HttpTarget:
+    """Alvo de replay baseado em um servidor em execução (POST /api/classify)"""
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        self.name = base_url
+        self.url = base_url.rstrip('/') + '/api/classify'
+        self.timeout = timeout
+
+    def classify(self, text: str) -> Dict:
+        data = urllib.parse.urlencode({'text': text}).encode('utf-8')
+        request = urllib.request.Request(self.url, data=data, method='POST')
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            body = json.loads(response.read().decode('utf-8'))
+        return {'classification': body['classification'], 'confidence': body['confidence']}
+
+
+def build_target(spec: str):
+    """Cria o alvo a partir da especificação (URL http(s) ou caminho de artefato)"""
+    if spec.startswith(('http://', 'https://')):
+        return HttpTarget(spec)
+    return ModelTarget(spec)
+
+
+def timed_call(target, text: str) -> Dict:
+    start = time.perf_counter()
+    try:
+        result = target.classify(text)
+        result['error'] = None
+    except Exception as e:
+        result = {'classification': None, 'confidence': None, 'error': str(e)}
+    result['latency'] = time.perf_counter() - start
+    return result
+
+
+def load_replayable(path: str, limit: Optional[int]) -> List[Dict]:
+    """Carrega registros que possuem texto retido, ordenados pelo horário de chegada"""
+    records = [r for r in TrafficCaptureRepository.read(path) if r.get('text')]
+    records.sort(key=lambda r: r.get('ts') or 0)
+    if limit:
+        records = records[:limit]
+    return records
+
+
+def replay(records: List[Dict], baseline, candidate, speed: float, concurrency: int) -> List[Dict]:
+    """
+    Reproduz os registros contra os dois alvos.
+    speed=1 respeita os intervalos gravados, speed=N acelera N vezes e speed=0 dispara sem espera.
+    """
+    if not records:
+        return []
+
+    def run_pair(index: int, record: Dict) -> Dict:
+        # Alternar a ordem evita favorecer sistematicamente um dos alvos (cache quente, CPU livre)
+        if index % 2 == 0:
+            base_result = timed_call(baseline, record['text'])
+            cand_result = timed_call(candidate, record['text'])
+        else:
+            cand_result = timed_call(candidate, record['text'])
+            base_result = timed_call(baseline, record['text'])
+        return {'record': record, 'baseline': base_result, 'candidate': cand_result}
+
+    first_ts = records[0].get('ts') or 0
+    replay_start = time.perf_counter()
+    futures = []
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for index, record in enumerate(records):
+            if speed > 0:
+                scheduled = ((record.get('ts') or first_ts) - first_ts) / speed
+                delay = scheduled - (time.perf_counter() - replay_start)
+                if delay > 0:
+                    time.sleep(delay)
+            futures.append(executor.submit(run_pair, index, record))
+            if (index + 1) % 100 == 0:
+                print(f"   ... {index + 1}/{len(records)} registros disparados")
+        return [future.result() for future in futures]
+
+
+def _latency_summary(latencies: List[float]) -> Dict[str, float]:
+    if not latencies:
+        return {}
+    values = np.array(latencies) * 1000
+    return {
+        'mean_ms': float(values.mean()),
+        'p50_ms': float(np.percentile(values, 50)),
+        'p90_ms': float(np.percentile(values, 90)),
+        'p95_ms': float(np.percentile(values, 95)),
+        'p99_ms': float(np.percentile(values, 99)),
+        'max_ms': float(values.max())
+    }
+
+
+def build_report(results: List[Dict]) -> Dict:
+    """Calcula concordância de rótulos, deltas de confiança e distribuições de latência"""
+    ok = [r for r in results if not r['baseline']['error'] and not r['candidate']['error']]
+    agreements = [r['baseline']['classification'] == r['candidate']['classification'] for r in ok]
+    deltas = np.array([r['candidate']['confidence'] - r['baseline']['confidence'] for r in ok])
+
+    transitions: Dict[str, int] = {}
+    for r in ok:
+        key = f"{r['baseline']['classification']} -> {r['candidate']['classification']}"
+        transitions[key] = transitions.get(key, 0) + 1
+
+    report = {
+        'replayed': len(results),
+        'compared': len(ok),
+        'errors': {
+            'baseline': sum(1 for r in results if r['baseline']['error']),
+            'candidate': sum(1 for r in results if r['candidate']['error'])
+        },
+        'label_agreement': float(np.mean(agreements)) if agreements else None,
+        'label_transitions': transitions,
+        'confidence_delta': {},
+        'latency': {
+            'baseline': _latency_summary([r['baseline']['latency'] for r in results if not r['baseline']['error']]),
+            'candidate': _latency_summary([r['candidate']['latency'] for r in results if not r['candidate']['error']])
+        }
+    }
+    if len(deltas):
+        abs_deltas = np.abs(deltas)
+        report['confidence_delta'] = {
+            'mean': float(deltas.mean()),
+            'mean_abs': float(abs_deltas.mean()),
+            'p50_abs': float(np.percentile(abs_deltas, 50)),
+            'p95_abs': float(np.percentile(abs_deltas, 95)),
+            'max_abs': float(abs_deltas.max())
+        }
+    return report
+
+
+def print_report(report: Dict, baseline_name: str, candidate_name: str):
+    print("\n" + "="*60)
+    print("📊 RELATÓRIO DE REPLAY")
+    print("="*60)
+    print(f"Registros reproduzidos: {report['replayed']} (comparados: {report['compared']})")
+    print(f"Erros: baseline={report['errors']['baseline']} candidato={report['errors']['candidate']}")
+    if report['label_agreement'] is not None:
+        print(f"✅ Concordância de rótulos: {report['label_agreement']:.1%}")
+    for transition, count in sorted(report['label_transitions'].items()):
+        print(f"   {transition}: {count}")
+
+    delta = report['confidence_delta']
+    if delta:
+        print("\n📈 Delta de confiança (candidato - baseline):")
+        print(f"   média: {delta['mean']:+.4f} | média absoluta: {delta['mean_abs']:.4f} | "
+              f"p50: {delta['p50_abs']:.4f} | p95: {delta['p95_abs']:.4f} | máx: {delta['max_abs']:.4f}")
+
+    print("\n⏱️ Latência (ms):")
+    print(f"   {'métrica':<10}{baseline_name[:24]:>26}{candidate_name[:24]:>26}")
+    base_latency = report['latency']['baseline']
+    cand_latency = report['latency']['candidate']
+    for key in ('mean_ms', 'p50_ms', 'p90_ms', 'p95_ms', 'p99_ms', 'max_ms'):
+        base_value = f"{base_latency[key]:.2f}" if key in base_latency else '-'
+        cand_value = f"{cand_latency[key]:.2f}" if key in cand_latency else '-'
+        print(f"   {key[:-3]:<10}{base_value:>26}{cand_value:>26}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Replay de tráfego capturado contra dois modelos ou servidores")
+    parser.add_argument("capture", help="Arquivo de captura (JSON Lines)")
+    parser.add_argument("--baseline", required=True, help="Artefato .pkl ou URL do servidor de referência")
+    parser.add_argument("--candidate", required=True, help="Artefato .pkl ou URL do servidor candidato")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Fator de velocidade: 1 = tempo gravado, N = N vezes mais rápido, 0 = sem espera")
+    parser.add_argument("--concurrency", type=int, default=1, help="Requisições simultâneas (padrão: 1)")
+    parser.add_argument("--limit", type=int, default=None, help="Número máximo de registros")
+    parser.add_argument("--output", default=None, help="Salvar relatório em JSON")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    print("🔁 REPLAY DE TRÁFEGO CAPTURADO")
+    print("="*60)
+
+    records = load_replayable(args.capture, args.limit)
+    if not records:
+        print("❌ Nenhum registro com texto retido. Capture com TRAFFIC_CAPTURE_TEXT=redacted ou full.")
+        return False
+    print(f"📊 {len(records)} registros reproduzíveis carregados")
+
+    baseline = build_target(args.baseline)
+    candidate = build_target(args.candidate)
+    print(f"🅰️ Baseline: {baseline.name}")
+    print(f"🅱️ Candidato: {candidate.name}")
+
+    start = time.perf_counter()
+    results = replay(records, baseline, candidate, args.speed, args.concurrency)
+    elapsed = time.perf_counter() - start
+
+    report = build_report(results)
+    report['elapsed_seconds'] = elapsed
+    report['baseline'] = baseline.name
+    report['candidate'] = candidate.name
+    print_report(report, baseline.name, candidate.name)
+    print(f"\n⏱️ Replay concluído em {elapsed:.1f}s")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 Relatório salvo em: {args.output}")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
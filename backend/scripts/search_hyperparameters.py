@@ -0,0 +1,323 @@
+# backend/scripts/search_hyperparameters.py
+"""
+Busca de hiperparâmetros do classificador com custo de inferência.
+
+Explora tamanho e profundidade da floresta, faixa de n-gramas e tamanho do
+vocabulário do TF-IDF com successive halving: todos os candidatos são avaliados
+em uma fração pequena do dataset e só os melhores avançam para frações maiores.
+Cada candidato é medido em acurácia (validação cruzada paralela do
+TrainingDriver), latência de inferência para um email e por email em lote, e
+tamanho do artefato. Como o objetivo é um equilíbrio entre acurácia e custo, a
+seleção entre rodadas usa a ordem de Pareto e não apenas a acurácia.
+
+A latência medida é a do modelo (vetorização TF-IDF, escala das features e
+predict_proba); o pré-processamento NLTK custa o mesmo para qualquer candidato.
+
+Usage:
+    python search_hyperparameters.py
+    python search_hyperparameters.py --candidates 27 --eta 3 --cpu-budget 8
+    python search_hyperparameters.py --max-latency-ms 20 --output ../datasets/advanced_model.pkl
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import pickle
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import hstack
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+
+# Permitir importar o pacote app a partir de backend/scripts
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services.feature_pipeline import FeaturePipeline
+from app.services.training_driver import TrainingDriver
+from app.utils.preprocessing_cache import default_cache_path
+
+DATASETS_DIR = os.path.join(os.path.dirname(__file__), "..", "datasets")
+
+SEARCH_SPACE = {
+    'n_estimators': [50, 100, 200, 300],
+    'max_depth': [15, 25, None],
+    'ngram_range': [(1, 1), (1, 2), (1, 3)],
+    'max_features': [2000, 5000, 8000],
+}
+
+# Parâmetros fixos, iguais aos de train_with_balanced_dataset.py
+BASE_VECTORIZER_PARAMS = {'min_df': 2, 'max_df': 0.85, 'sublinear_tf': True, 'strip_accents': 'unicode'}
+BASE_MODEL_PARAMS = {
+    'min_samples_split': 3, 'min_samples_leaf': 1, 'max_features': 'sqrt',
+    'random_state': 42, 'class_weight': 'balanced', 'bootstrap': True
+}
+
+
+# ==================== CANDIDATOS ====================
+
+def build_candidates(count: int, seed: int) -> List[Dict[str, Any]]:
+    """Amostra candidatos da grade (todos se count >= tamanho da grade)"""
+    grid = [dict(zip(SEARCH_SPACE, values)) for values in itertools.product(*SEARCH_SPACE.values())]
+    if count < len(grid):
+        grid = random.Random(seed).sample(grid, count)
+    # Candidatos com o mesmo vetorizador em sequência reaproveitam as transformações dos folds
+    grid.sort(key=lambda c: (c['ngram_range'], c['max_features'], c['n_estimators'], c['max_depth'] or 0))
+    return [{'id': index, **params} for index, params in enumerate(grid)]
+
+
+def vectorizer_params(candidate: Dict[str, Any]) -> Dict[str, Any]:
+    return {**BASE_VECTORIZER_PARAMS, 'ngram_range': candidate['ngram_range'], 'max_features': candidate['max_features']}
+
+
+def model_params(candidate: Dict[str, Any]) -> Dict[str, Any]:
+    return {**BASE_MODEL_PARAMS, 'n_estimators': candidate['n_estimators'], 'max_depth': candidate['max_depth']}
+
+
+def describe(candidate: Dict[str, Any]) -> str:
+    return (f"árvores={candidate['n_estimators']} prof={candidate['max_depth']} "
+            f"ngram={candidate['ngram_range']} vocab={candidate['max_features']}")
+
+
+# ==================== MEDIÇÃO ====================
+
+def _median_ms(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000
+
+
+def evaluate(driver: TrainingDriver, candidate: Dict[str, Any], texts: np.ndarray, features: np.ndarray,
+             y: np.ndarray, dataset_key: str, batch_size: int) -> Dict[str, Any]:
+    """Acurácia em validação cruzada, latência (1 email e lote) e tamanho do artefato de um candidato"""
+    report = driver.cross_validate(
+        texts, features, y, vectorizer_params(candidate), model_params(candidate),
+        dataset_key=dataset_key, profile_batch=batch_size
+    )
+    profile = report['profile']
+
+    # Custo das transformações, medido com o vetorizador e o scaler do primeiro fold (já em cache)
+    transforms, _ = driver.get_fold_transforms(dataset_key, texts, features, y, vectorizer_params(candidate))
+    vectorizer, scaler = transforms[0]['vectorizer'], transforms[0]['scaler']
+    _, test_idx = driver.get_splits(dataset_key, y)[0]
+    batch_idx = test_idx[:profile['batch_size']]
+
+    def transform(indices):
+        hstack([vectorizer.transform(texts[indices]), scaler.transform(features[indices])]).tocsr()
+
+    transform_single_ms = _median_ms(lambda: transform(test_idx[:1]), 15)
+    transform_batch_ms = _median_ms(lambda: transform(batch_idx), 5)
+    transforms_bytes = len(pickle.dumps({'vectorizer': vectorizer, 'scaler': scaler},
+                                        protocol=pickle.HIGHEST_PROTOCOL))
+
+    return {
+        'cv_mean': report['cv_mean'],
+        'cv_std': report['cv_std'],
+        'single_ms': transform_single_ms + profile['predict_single_ms'],
+        'batch_ms_per_email': (transform_batch_ms + profile['predict_batch_ms']) / profile['batch_size'],
+        'size_mb': (profile['model_bytes'] + transforms_bytes) / (1024 * 1024),
+        'cv_seconds': report['wall_seconds'],
+        'vectorize_cached': report['transforms_cached']
+    }
+
+
+# ==================== PARETO ====================
+
+OBJECTIVES = (('cv_mean', -1), ('single_ms', 1), ('batch_ms_per_email', 1), ('size_mb', 1))
+
+
+def dominates(a: Dict[str, float], b: Dict[str, float]) -> bool:
+    """a domina b: não é pior em nenhum objetivo e é melhor em pelo menos um"""
+    no_worse = all(sign * a[key] <= sign * b[key] for key, sign in OBJECTIVES)
+    better = any(sign * a[key] < sign * b[key] for key, sign in OBJECTIVES)
+    return no_worse and better
+
+
+def pareto_ranks(results: List[Dict[str, Any]]) -> List[int]:
+    """Ordenação não dominada: 0 = fronteira de Pareto, 1 = fronteira após remover a primeira, ..."""
+    ranks = [-1] * len(results)
+    remaining = set(range(len(results)))
+    rank = 0
+    while remaining:
+        front = {i for i in remaining
+                 if not any(dominates(results[j]['metrics'], results[i]['metrics']) for j in remaining if j != i)}
+        for i in front:
+            ranks[i] = rank
+        remaining -= front
+        rank += 1
+    return ranks
+
+
+# ==================== SUCCESSIVE HALVING ====================
+
+def successive_halving(driver: TrainingDriver, candidates: List[Dict[str, Any]], texts: np.ndarray,
+                       features: np.ndarray, y: np.ndarray, eta: int, min_rows: int,
+                       batch_size: int, seed: int) -> List[Dict[str, Any]]:
+    """Avalia os candidatos em frações crescentes do dataset, mantendo 1/eta a cada rodada"""
+    rounds = max(1, math.ceil(math.log(len(candidates), eta)))
+    dataset_key = TrainingDriver.fingerprint(texts, y)
+    survivors = candidates
+    history = []
+    for round_index in range(rounds):
+        fraction = eta ** (round_index - rounds + 1)
+        rows = min(len(y), max(min_rows, int(len(y) * fraction)))
+        if rows < len(y):
+            subset, _ = train_test_split(np.arange(len(y)), train_size=rows, random_state=seed, stratify=y)
+            subset.sort()
+        else:
+            subset = np.arange(len(y))
+        print(f"\n🔄 Rodada {round_index + 1}/{rounds}: {len(survivors)} candidatos, {rows} linhas")
+
+        results = []
+        for candidate in survivors:
+            metrics = evaluate(driver, candidate, texts[subset], features[subset], y[subset],
+                               f"{dataset_key}-{rows}", batch_size)
+            results.append({'candidate': candidate, 'round': round_index, 'rows': rows, 'metrics': metrics})
+            print(f"   #{candidate['id']:<3} {describe(candidate):<52} acc={metrics['cv_mean']:.3f} "
+                  f"1 email={metrics['single_ms']:.1f}ms lote={metrics['batch_ms_per_email']:.2f}ms/email "
+                  f"{metrics['size_mb']:.1f}MB ({metrics['cv_seconds']:.1f}s)")
+
+        for result, rank in zip(results, pareto_ranks(results)):
+            result['pareto_rank'] = rank
+        history.extend(results)
+        if round_index < rounds - 1:
+            keep = max(1, math.ceil(len(results) / eta))
+            ranked = sorted(results, key=lambda r: (r['pareto_rank'], -r['metrics']['cv_mean']))
+            survivors = [result['candidate'] for result in ranked[:keep]]
+    return history
+
+
+def choose(final_results: List[Dict[str, Any]], tolerance: float, max_latency_ms: float) -> Dict[str, Any]:
+    """
+    Escolhe na fronteira de Pareto o candidato mais rápido com acurácia a até `tolerance`
+    da melhor (e, se definido, dentro do limite de latência)
+    """
+    front = [r for r in final_results if r['pareto_rank'] == 0]
+    best_accuracy = max(r['metrics']['cv_mean'] for r in front)
+    eligible = [r for r in front if r['metrics']['cv_mean'] >= best_accuracy - tolerance]
+    if max_latency_ms:
+        eligible = [r for r in eligible if r['metrics']['single_ms'] <= max_latency_ms] or eligible
+    return min(eligible, key=lambda r: (r['metrics']['single_ms'], r['metrics']['size_mb']))
+
+
+# ==================== EXECUÇÃO ====================
+
+def load_dataset(dataset_path: str, workers: int):
+    df = pd.read_csv(dataset_path)
+    pipeline = FeaturePipeline()
+    texts = df['text'].astype(str).tolist()
+    processed, stats = pipeline.preprocess_many(
+        texts, cache_path=default_cache_path(), workers=workers or None
+    )
+    print(f"✅ {len(df)} registros ({stats['cache_hits']} pré-processados do cache)")
+    features = pipeline.feature_matrix([pipeline.extract_features(text) for text in texts])
+    return np.asarray(processed, dtype=object), features, df['label'].values
+
+
+def train_final(candidate: Dict[str, Any], texts_train, feat_train, y_train, cpu_budget: int):
+    pipeline = FeaturePipeline()
+    X_train = pipeline.fit_transform(texts_train, feat_train, vectorizer_params(candidate))
+    model = RandomForestClassifier(**model_params(candidate), n_jobs=cpu_budget)
+    model.fit(X_train, y_train)
+    # A latência da busca foi medida com n_jobs=1, que também é o mais rápido para um email por vez
+    model.set_params(n_jobs=1)
+    return pipeline, model
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Busca de hiperparâmetros com acurácia, latência e tamanho")
+    parser.add_argument("--dataset", default=os.path.join(DATASETS_DIR, "dataset_balanced_2000.csv"))
+    parser.add_argument("--output", default=os.path.join(DATASETS_DIR, "advanced_model_tuned.pkl"),
+                        help="Artefato do candidato escolhido")
+    parser.add_argument("--report", default=os.path.join(DATASETS_DIR, "hyperparameter_search.json"),
+                        help="Relatório JSON com todas as medições")
+    parser.add_argument("--candidates", type=int, default=27, help="Candidatos amostrados da grade")
+    parser.add_argument("--eta", type=int, default=3, help="Fator de redução por rodada")
+    parser.add_argument("--min-rows", type=int, default=300, help="Mínimo de linhas na primeira rodada")
+    parser.add_argument("--folds", type=int, default=int(os.getenv("TRAINING_CV_FOLDS", "5")))
+    parser.add_argument("--cpu-budget", type=int, default=int(os.getenv("TRAINING_CPU_BUDGET", "0")),
+                        help="CPUs para a validação cruzada (0 = todos os núcleos)")
+    parser.add_argument("--batch-size", type=int, default=64, help="Tamanho do lote na medição de latência")
+    parser.add_argument("--accuracy-tolerance", type=float, default=0.005,
+                        help="Perda de acurácia aceita em troca de latência")
+    parser.add_argument("--max-latency-ms", type=float, default=0, help="Latência máxima por email (0 = sem limite)")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    print("🔍 BUSCA DE HIPERPARÂMETROS (ACURÁCIA x LATÊNCIA x TAMANHO)")
+    print("="*60)
+
+    if not os.path.exists(args.dataset):
+        print(f"❌ Dataset não encontrado: {args.dataset}")
+        return False
+
+    driver = TrainingDriver(n_splits=args.folds, random_state=args.seed, cpu_budget=args.cpu_budget or None)
+    texts, features, y = load_dataset(args.dataset, args.cpu_budget)
+    texts_train, texts_test, feat_train, feat_test, y_train, y_test = train_test_split(
+        texts, features, y, test_size=0.2, random_state=args.seed, stratify=y
+    )
+
+    candidates = build_candidates(args.candidates, args.seed)
+    print(f"📋 {len(candidates)} candidatos, eta={args.eta}, {driver.n_splits} folds, "
+          f"{driver.parallel_folds} folds em paralelo")
+    start = time.perf_counter()
+    history = successive_halving(driver, candidates, texts_train, feat_train, y_train,
+                                 args.eta, args.min_rows, args.batch_size, args.seed)
+    final_round = max(result['round'] for result in history)
+    final_results = [result for result in history if result['round'] == final_round]
+    chosen = choose(final_results, args.accuracy_tolerance, args.max_latency_ms)
+
+    print("\n" + "="*60)
+    print("🎯 FRONTEIRA DE PARETO (rodada final)")
+    print("="*60)
+    print(f"{'':2}{'#':<4}{'candidato':<52}{'acurácia':>9}{'1 email':>10}{'lote/email':>12}{'tamanho':>9}")
+    for result in sorted(final_results, key=lambda r: -r['metrics']['cv_mean']):
+        if result['pareto_rank'] != 0:
+            continue
+        metrics = result['metrics']
+        marker = "⭐" if result is chosen else "  "
+        print(f"{marker}{result['candidate']['id']:<4}{describe(result['candidate']):<52}{metrics['cv_mean']:>9.3f}"
+              f"{metrics['single_ms']:>8.1f}ms{metrics['batch_ms_per_email']:>10.2f}ms{metrics['size_mb']:>7.1f}MB")
+
+    print(f"\n🤖 Treinando o candidato escolhido: {describe(chosen['candidate'])}")
+    pipeline, model = train_final(chosen['candidate'], texts_train, feat_train, y_train, driver.cpu_budget)
+    test_accuracy = accuracy_score(y_test, model.predict(pipeline.transform_batch(texts_test, feat_test)))
+    with open(args.output, 'wb') as f:
+        pickle.dump(pipeline.to_artifact(model), f)
+
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump({
+            'search_space': {key: [list(v) if isinstance(v, tuple) else v for v in values]
+                             for key, values in SEARCH_SPACE.items()},
+            'eta': args.eta,
+            'folds': driver.n_splits,
+            'elapsed_seconds': time.perf_counter() - start,
+            'chosen': {'candidate': chosen['candidate'], 'metrics': chosen['metrics'], 'test_accuracy': test_accuracy},
+            'results': history
+        }, f, ensure_ascii=False, indent=2, default=list)
+
+    print(f"✅ Acurácia no teste: {test_accuracy:.1%}")
+    print(f"✅ Artefato salvo em: {args.output} ({os.path.getsize(args.output) / (1024 * 1024):.1f}MB)")
+    print(f"✅ Relatório salvo em: {args.report}")
+    print(f"💡 Para servir este modelo: ADVANCED_MODEL_PATH={args.output}")
+    reused = sum(1 for result in history if result['metrics']['vectorize_cached'])
+    print(f"⏱️ Busca concluída em {time.perf_counter() - start:.1f}s "
+          f"({reused} de {len(history)} avaliações reaproveitaram a vetorização)")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    exit(0 if success else 1)
@@ -2,146 +2,22 @@
 import pandas as pd
 import pickle
 import numpy as np
-import re
 import logging
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, accuracy_score, confusion_matrix
-from sklearn.preprocessing import StandardScaler
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from app.services.feature_pipeline import FEATURE_NAMES, FeaturePipeline
+from app.services.training_driver import TrainingDriver
+from app.utils.preprocessing_cache import default_cache_path
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def preprocess_text_optimized(text):
-    """Preprocessamento otimizado para o dataset balanceado"""
-    if not text:
-        return ""
-    
-    text = str(text).lower()
-    
-    # Preservar pontuação importante
-    text = re.sub(r'[^\w\s\?!.,;:()]', ' ', text)
-    text = re.sub(r'\s+', ' ', text)
-    
-    try:
-        import nltk
-        from nltk.corpus import stopwords
-        from nltk.tokenize import word_tokenize
-        from nltk.stem import RSLPStemmer
-        
-        # Palavras importantes que não devem ser removidas
-        important_words = {
-            'erro', 'bug', 'problema', 'falha', 'ajuda', 'suporte', 'urgente',
-            'obrigado', 'obrigada', 'parabéns', 'felicitações', 'gratidão',
-            'natal', 'aniversário', 'sucesso', 'não', 'sim', 'como', 'quando',
-            'muito', 'bem', 'mal', 'bom', 'ruim', 'preciso', 'solicito'
-        }
-        
-        stopwords_pt = set(stopwords.words('portuguese')) - important_words
-        stemmer = RSLPStemmer()
-        tokens = word_tokenize(text, language='portuguese')
-        
-        processed_tokens = []
-        for token in tokens:
-            if len(token) > 1 and token not in stopwords_pt:
-                try:
-                    stemmed = stemmer.stem(token)
-                    processed_tokens.append(stemmed)
-                except:
-                    processed_tokens.append(token)
-        
-        return ' '.join(processed_tokens)
-    except:
-        return text
-
-def extract_optimized_features(text):
-    """Extração de características otimizada"""
-    features = {}
-    
-    # Características básicas
-    features['length'] = len(text)
-    features['word_count'] = len(text.split())
-    features['sentence_count'] = text.count('.') + text.count('!') + text.count('?')
-    
-    # Densidade de informação
-    words = text.split()
-    unique_words = len(set(word.lower() for word in words))
-    features['unique_word_ratio'] = unique_words / len(words) if words else 0
-    features['avg_word_length'] = np.mean([len(word) for word in words]) if words else 0
-    
-    # Características de pontuação (indicadores emocionais)
-    features['question_marks'] = text.count('?')
-    features['exclamation_marks'] = text.count('!')
-    features['periods'] = text.count('.')
-    features['commas'] = text.count(',')
-    
-    # Intensidade emocional
-    features['uppercase_ratio'] = sum(1 for c in text if c.isupper()) / len(text) if text else 0
-    features['repeated_punctuation'] = len(re.findall(r'[!?]{2,}', text))
-    
-    # Padrões técnicos
-    features['has_error_codes'] = 1 if re.search(r'\b(erro|error)\s*\d+', text.lower()) else 0
-    features['has_numbers'] = len(re.findall(r'\d+', text))
-    features['has_urls'] = 1 if re.search(r'http|www', text.lower()) else 0
-    features['has_emails'] = 1 if re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text) else 0
-    
-    # Palavras-chave balanceadas
-    productive_keywords = [
-        'erro', 'bug', 'problema', 'falha', 'defeito', 'crash',
-        'preciso', 'solicito', 'ajuda', 'suporte', 'orientação',
-        'urgente', 'crítico', 'importante', 'prioritário',
-        'login', 'senha', 'acesso', 'sistema', 'configuração',
-        'status', 'andamento', 'protocolo', 'quando', 'como'
-    ]
-    
-    unproductive_keywords = [
-        'obrigado', 'obrigada', 'agradeço', 'gratidão',
-        'parabéns', 'felicitações', 'congratulações',
-        'sucesso', 'conquista', 'vitória',
-        'natal', 'aniversário', 'feriado', 'férias',
-        'feliz', 'alegria', 'celebrar', 'comemorar',
-        'abraços', 'saudações', 'desejo', 'tenha'
-    ]
-    
-    text_lower = text.lower()
-    
-    # Contagem ponderada de palavras-chave
-    productive_score = 0
-    for keyword in productive_keywords:
-        if keyword in text_lower:
-            # Dar peso maior para palavras no início
-            if text_lower.startswith(keyword):
-                productive_score += 2
-            else:
-                productive_score += 1
-    
-    unproductive_score = 0
-    for keyword in unproductive_keywords:
-        if keyword in text_lower:
-            if text_lower.startswith(keyword):
-                unproductive_score += 2
-            else:
-                unproductive_score += 1
-    
-    features['productive_keywords'] = productive_score
-    features['unproductive_keywords'] = unproductive_score
-    
-    # Ratio balanceado
-    total_keywords = productive_score + unproductive_score
-    if total_keywords > 0:
-        features['keyword_ratio'] = productive_score / total_keywords
-    else:
-        features['keyword_ratio'] = 0.5
-    
-    # Indicadores de formalidade
-    formal_indicators = ['prezados', 'atenciosamente', 'cordialmente', 'solicitação']
-    features['formality_score'] = sum(1 for indicator in formal_indicators if indicator in text_lower)
-    
-    return features
-
 def main():
     """Função principal de treinamento"""
     print("🚀 TREINANDO MODELO COM DATASET BALANCEADO")
@@ -169,16 +45,22 @@ def main():
         
         # 4. Preprocessar textos
         print("🔄 Preprocessando textos...")
-        df['processed_text'] = df['text'].apply(preprocess_text_optimized)
+        cache_path = default_cache_path()
+        # Mesmo pipeline (pré-processamento, features, TF-IDF e escala) usado pela API
+        pipeline = FeaturePipeline()
+        texts = df['text'].astype(str).tolist()
+        df['processed_text'], preprocess_stats = pipeline.preprocess_many(
+            texts, cache_path=cache_path, workers=int(os.getenv("PREPROCESS_WORKERS", "0")) or None
+        )
+        print(f"   {preprocess_stats['cache_hits']} do cache, {preprocess_stats['processed']} processados "
+              f"({preprocess_stats['workers']} processos, {preprocess_stats['seconds']:.1f}s)")
         
-        # 5. Extrair características
+        # 5. Extrair características (do texto original, como na classificação)
         print("🔄 Extraindo características...")
-        feature_dicts = df['processed_text'].apply(extract_optimized_features)
-        feature_df = pd.DataFrame(feature_dicts.tolist())
+        X_features = pipeline.feature_matrix([pipeline.extract_features(text) for text in texts])
         
         # 6. Preparar dados
         X_text = df['processed_text'].values
-        X_features = feature_df.values
         y = df['label'].values
         
         # 7. Dividir dados (80% treino, 20% teste)
@@ -190,47 +72,37 @@ def main():
         
         # 8. Vetorização TF-IDF otimizada
         print("🔄 Vetorizando textos com TF-IDF...")
-        vectorizer = TfidfVectorizer(
-            max_features=8000,  # Aumentar features
-            ngram_range=(1, 3),  # Incluir trigramas
-            min_df=2,
-            max_df=0.85,
-            sublinear_tf=True,
-            strip_accents='unicode'
-        )
-        
-        X_text_train_vec = vectorizer.fit_transform(X_text_train)
-        X_text_test_vec = vectorizer.transform(X_text_test)
-        
-        # 9. Normalizar características
-        scaler = StandardScaler()
-        X_feat_train_scaled = scaler.fit_transform(X_feat_train)
-        X_feat_test_scaled = scaler.transform(X_feat_test)
+        vectorizer_params = {
+            'max_features': 8000,  # Aumentar features
+            'ngram_range': (1, 3),  # Incluir trigramas
+            'min_df': 2,
+            'max_df': 0.85,
+            'sublinear_tf': True,
+            'strip_accents': 'unicode'
+        }
         
-        # 10. Combinar características
-        try:
-            from scipy.sparse import hstack
-            X_train_combined = hstack([X_text_train_vec, X_feat_train_scaled])
-            X_test_combined = hstack([X_text_test_vec, X_feat_test_scaled])
-            print("✅ Características textuais e numéricas combinadas")
-        except ImportError:
-            print("⚠️ Scipy não disponível, usando apenas texto")
-            X_train_combined = X_text_train_vec
-            X_test_combined = X_text_test_vec
+        # 9-10. Ajustar TF-IDF e normalização e combinar características
+        X_train_combined = pipeline.fit_transform(X_text_train, X_feat_train, vectorizer_params)
+        X_test_combined = pipeline.transform_batch(X_text_test, X_feat_test)
+        print("✅ Características textuais e numéricas combinadas")
         
         # 11. Treinar modelo otimizado
         print("🤖 Treinando Random Forest otimizado...")
+        model_params = {
+            'n_estimators': 300,  # Mais árvores
+            'max_depth': 25,      # Maior profundidade
+            'min_samples_split': 3,
+            'min_samples_leaf': 1,
+            'max_features': 'sqrt',
+            'random_state': 42,
+            'class_weight': 'balanced',  # Importante para classes balanceadas
+            'bootstrap': True
+        }
+        driver = TrainingDriver.from_env()
         model = RandomForestClassifier(
-            n_estimators=300,  # Mais árvores
-            max_depth=25,      # Maior profundidade
-            min_samples_split=3,
-            min_samples_leaf=1,
-            max_features='sqrt',
-            random_state=42,
-            class_weight='balanced',  # Importante para classes balanceadas
-            bootstrap=True,
+            **model_params,
             oob_score=True,
-            n_jobs=-1  # Usar todos os cores
+            n_jobs=driver.cpu_budget  # Usar o orçamento de CPU configurado
         )
         
         model.fit(X_train_combined, y_train)
@@ -240,21 +112,20 @@ def main():
         y_pred = model.predict(X_test_combined)
         accuracy = accuracy_score(y_test, y_pred)
         
-        # Cross-validation
+        # Cross-validation (folds em paralelo, vetorizador ajustado em cada fold)
+        cv_report = None
         try:
-            cv_scores = cross_val_score(model, X_train_combined, y_train, cv=5, scoring='accuracy')
-            cv_mean = cv_scores.mean()
-            cv_std = cv_scores.std()
-        except:
+            print(f"🔄 Cross-validation: {driver.n_splits} folds, orçamento de {driver.cpu_budget} CPUs...")
+            cv_report = driver.cross_validate(X_text_train, X_feat_train, y_train, vectorizer_params, model_params)
+            cv_mean = cv_report['cv_mean']
+            cv_std = cv_report['cv_std']
+        except Exception as e:
+            logger.warning(f"Cross-validation falhou: {e}")
             cv_mean = accuracy
             cv_std = 0
         
         # 13. Salvar modelo
-        model_data = {
-            'model': model,
-            'vectorizer': vectorizer,
-            'scaler': scaler
-        }
+        model_data = pipeline.to_artifact(model)
         
         model_path = os.path.join(os.path.dirname(__file__), "..", "datasets", "advanced_model.pkl")
         with open(model_path, 'wb') as f:
@@ -266,9 +137,11 @@ def main():
         print("="*60)
         print(f"✅ Acurácia no teste: {accuracy:.1%}")
         print(f"✅ Cross-validation: {cv_mean:.1%} (±{cv_std*2:.1%})")
+        if cv_report:
+            print(TrainingDriver.format_report(cv_report))
         if hasattr(model, 'oob_score_'):
             print(f"✅ Out-of-bag score: {model.oob_score_:.1%}")
-        print(f"✅ Modelo salvo em: {model_path}")
+        print(f"✅ Modelo salvo em: {model_path} (pipeline {FeaturePipeline.version()})")
         
         print("\n📋 Relatório de classificação detalhado:")
         print(classification_report(y_test, y_pred, zero_division=0))
@@ -298,23 +171,8 @@ def main():
         correct_predictions = 0
         
         for i, (text, expected) in enumerate(test_examples, 1):
-            # Processar exemplo
-            processed = preprocess_text_optimized(text)
-            features = extract_optimized_features(text)
-            
-            # Vetorizar
-            text_vec = vectorizer.transform([processed])
-            feat_array = np.array(list(features.values())).reshape(1, -1)
-            
-            if scaler:
-                feat_array = scaler.transform(feat_array)
-            
-            # Combinar
-            try:
-                from scipy.sparse import hstack
-                X_example = hstack([text_vec, feat_array])
-            except ImportError:
-                X_example = text_vec
+            # Processar exemplo pelo pipeline ajustado
+            X_example = pipeline.transform_texts([text])
             
             # Predizer
             prediction = model.predict(X_example)[0]
@@ -335,18 +193,14 @@ def main():
         if hasattr(model, 'feature_importances_'):
             print(f"\n🔍 Top 10 características mais importantes:")
             try:
-                feature_names = list(vectorizer.get_feature_names_out())
-                feature_names.extend([f'feat_{i}' for i in range(len(feature_df.columns))])
+                feature_names = list(pipeline.vectorizer.get_feature_names_out()) + list(FEATURE_NAMES)
                 
                 importances = model.feature_importances_
                 indices = np.argsort(importances)[::-1]
                 
                 for i in range(min(10, len(indices))):
                     idx = indices[i]
-                    if idx < len(vectorizer.get_feature_names_out()):
-                        name = feature_names[idx]
-                    else:
-                        name = f"característica_{idx}"
+                    name = feature_names[idx]
                     print(f"  {i+1:2d}. {name}: {importances[idx]:.4f}")
             except:
                 print("  Análise de importância não disponível")
@@ -0,0 +1,90 @@
+# backend/tests/test_document_classifier.py
+import pytest
+from app.services.document_classifier import DocumentClassifier
+from app.utils.document_chunking import aggregate_probabilities
+
+
+class _Window:
+    def apply(self, text):
+        return text
+
+
+class _FakeClassifier:
+    """Devolve, para cada trecho, as probabilidades registradas pelo primeiro caractere"""
+
+    text_window = _Window()
+
+    def __init__(self, probabilities):
+        self.probabilities = probabilities
+        self.calls = 0
+
+    def predict_proba_batch(self, texts):
+        self.calls += 1
+        return {
+            'tier': 'forest',
+            'classes': ['IMPRODUTIVO', 'PRODUTIVO'],
+            'probabilities': [self.probabilities[text[0]] for text in texts]
+        }
+
+    def extract_window_features(self, content, window):
+        return {}
+
+    def _generate_intelligent_response(self, prediction, content, features):
+        return ""
+
+
+def _document(keys):
+    return "\n\n".join(key * 300 for key in keys)
+
+
+def test_aggregate_max_renormalizes_class_maxima():
+    chunks = [{'PRODUTIVO': 0.9, 'IMPRODUTIVO': 0.1}, {'PRODUTIVO': 0.2, 'IMPRODUTIVO': 0.8}]
+    aggregate = aggregate_probabilities(chunks, [100, 100], "max")
+    assert aggregate['PRODUTIVO'] == pytest.approx(0.9 / 1.7)
+    assert aggregate['IMPRODUTIVO'] == pytest.approx(0.8 / 1.7)
+
+
+def test_aggregate_mean_and_length_weighted():
+    chunks = [{'PRODUTIVO': 1.0, 'IMPRODUTIVO': 0.0}, {'PRODUTIVO': 0.0, 'IMPRODUTIVO': 1.0}]
+    assert aggregate_probabilities(chunks, [100, 300], "mean")['PRODUTIVO'] == pytest.approx(0.5)
+    assert aggregate_probabilities(chunks, [100, 300], "length_weighted")['PRODUTIVO'] == pytest.approx(0.25)
+
+
+def test_aggregate_rejects_unknown_rule():
+    with pytest.raises(ValueError):
+        aggregate_probabilities([{'PRODUTIVO': 1.0}], [1], "median")
+
+
+def test_max_never_stops_before_a_later_chunk_can_flip_the_result():
+    classifier = _FakeClassifier({'p': [0.1, 0.9], 'i': [0.95, 0.05]})
+    document = DocumentClassifier(classifier, aggregation="max", batch_size=1, min_chunk_chars=100)
+    result = document.classify(_document('pi'))
+    assert result['classification'] == 'IMPRODUTIVO'
+    assert result['document']['chunks_classified'] == 2
+    assert not result['document']['early_stopped']
+
+
+def test_mean_stops_once_remaining_chunks_cannot_flip_the_result():
+    classifier = _FakeClassifier({'p': [0.0, 1.0], 'i': [1.0, 0.0]})
+    document = DocumentClassifier(classifier, aggregation="mean", batch_size=2, min_chunk_chars=100)
+    result = document.classify(_document('ppppi'))
+    assert result['classification'] == 'PRODUTIVO'
+    assert result['document']['early_stopped']
+    assert result['document']['chunks_classified'] == 4
+    assert classifier.calls == 2
+
+
+def test_mean_keeps_reading_while_remaining_chunks_can_flip_the_result():
+    classifier = _FakeClassifier({'p': [0.0, 1.0], 'i': [1.0, 0.0]})
+    document = DocumentClassifier(classifier, aggregation="mean", batch_size=1, min_chunk_chars=100)
+    result = document.classify(_document('piii'))
+    assert result['classification'] == 'IMPRODUTIVO'
+    assert not result['document']['early_stopped']
+
+
+def test_zero_max_chunks_means_no_limit():
+    classifier = _FakeClassifier({'p': [0.4, 0.6]})
+    document = DocumentClassifier(classifier, max_chunks=0, min_chunk_chars=100)
+    result = document.classify(_document('ppp'))
+    assert result['document']['chunks_classified'] == 3
+    assert not result['document']['truncated']
@@ -0,0 +1,120 @@
+# backend/tests/test_email_cleanup.py
+from app.utils.email_cleanup import clean_email
+
+
+def test_request_after_closing_line_is_kept():
+    text = 'Olá, bom dia!\nObrigado!\nPreciso resetar minha senha do portal, está bloqueada.'
+    cleaned, removed = clean_email(text)
+    assert cleaned == text
+    assert removed['signature'] == 0
+
+
+def test_error_report_after_att_is_kept():
+    text = 'Bom dia,\nsegue o relatório.\nAtt.\nO erro 500 voltou no relatório mensal, podem verificar?'
+    cleaned, _ = clean_email(text)
+    assert 'O erro 500 voltou' in cleaned
+
+
+def test_signature_block_after_closing_is_removed():
+    text = (
+        'Preciso do acesso ao sistema de notas fiscais hoje.\n\n'
+        'Atenciosamente,\n'
+        'João Silva\n'
+        'Analista Financeiro | ACME Ltda\n'
+        'Tel: (11) 99999-9999\n'
+        'joao.silva@acme.com.br\n'
+    )
+    cleaned, removed = clean_email(text)
+    assert cleaned == 'Preciso do acesso ao sistema de notas fiscais hoje.\n\nAtenciosamente,'
+    assert removed['signature'] > 0
+
+
+def test_signature_after_blank_line_is_removed():
+    cleaned, _ = clean_email('Podem verificar o chamado 123?\n\nObrigado!\n\nMaria\n')
+    assert cleaned == 'Podem verificar o chamado 123?\n\nObrigado!'
+
+
+def test_text_after_signature_block_is_kept():
+    text = 'Podem verificar o chamado 123?\n\nObrigado!\n\nMaria\n\nSegue anexo a planilha'
+    cleaned, _ = clean_email(text)
+    assert cleaned == text
+
+
+def test_dash_delimiter_starts_signature():
+    cleaned, _ = clean_email('Qual o status do pedido 4521?\n-- \nCarlos\nComercial')
+    assert cleaned == 'Qual o status do pedido 4521?'
+
+
+def test_gmail_reply_header_wrapped_in_two_lines():
+    text = (
+        'Podem verificar o chamado 123?\n\n'
+        'Em seg., 10 de mar. de 2025 às 10:00, Fulano <fulano@exemplo.com>\n'
+        'escreveu:\n'
+        '> mensagem antiga\n'
+    )
+    cleaned, removed = clean_email(text)
+    assert cleaned == 'Podem verificar o chamado 123?'
+    assert removed['quoted_history'] > 0
+
+
+def test_outlook_reply_header():
+    text = (
+        'Segue o comprovante solicitado.\n\n'
+        'De: Fulano <fulano@exemplo.com>\n'
+        'Enviado: segunda-feira, 10 de março de 2025 10:00\n'
+        'Para: suporte@exemplo.com\n'
+        'Assunto: RE: comprovante\n\n'
+        'Pode enviar o comprovante?'
+    )
+    cleaned, removed = clean_email(text)
+    assert cleaned == 'Segue o comprovante solicitado.'
+    assert removed['quoted_history'] > 0
+
+
+def test_disclaimer_paragraph_is_removed():
+    text = (
+        'Preciso de ajuda com o login do portal.\n\n'
+        'Esta mensagem pode conter informações confidenciais.\n'
+        'Se recebida por engano, apague-a.'
+    )
+    cleaned, removed = clean_email(text)
+    assert cleaned == 'Preciso de ajuda com o login do portal.'
+    assert removed['disclaimer'] > 0
+
+
+def test_request_starting_like_a_disclaimer_is_kept():
+    text = (
+        'Olá equipe,\n\n'
+        'Esta mensagem é para informar que o sistema de faturamento está fora do ar desde as 8h '
+        'e precisamos de suporte urgente.\n\n'
+        'Obrigado,\n'
+        'João'
+    )
+    cleaned, removed = clean_email(text)
+    assert 'sistema de faturamento está fora do ar' in cleaned
+    assert removed['disclaimer'] == 0
+
+
+def test_email_starting_like_a_disclaimer_is_kept():
+    text = (
+        'Bom dia,\n'
+        'Este email é para solicitar a liberação do acesso ao sistema de compras.\n'
+        'Aguardo retorno.\n\n'
+        'Atenciosamente,\n'
+        'Ana'
+    )
+    cleaned, removed = clean_email(text)
+    assert 'solicitar a liberação do acesso' in cleaned
+    assert removed['disclaimer'] == 0
+
+
+def test_disclaimer_after_signature_is_removed():
+    text = (
+        'Qual o prazo de entrega do pedido 4521?\n\n'
+        'Atenciosamente,\n'
+        'Carlos\n\n'
+        'Este e-mail pode conter informações sigilosas destinadas apenas ao destinatário.'
+    )
+    cleaned, removed = clean_email(text)
+    assert cleaned == 'Qual o prazo de entrega do pedido 4521?\n\nAtenciosamente,'
+    assert removed['disclaimer'] > 0
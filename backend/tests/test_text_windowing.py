@@ -0,0 +1,27 @@
+# backend/tests/test_text_windowing.py
+import pytest
+from app.utils.text_windowing import TextWindow
+
+
+@pytest.mark.parametrize('text', [
+    'a' * 5400 + ' ' * 1600,
+    ' ' * 2400 + 'b' * 5000,
+    'a' * 7000,
+    ' ' * 100 + 'a' * 7000,
+    'a' * 7000 + ' ' * 100,
+])
+def test_head_tail_without_cut_point_keeps_slices(text):
+    window = TextWindow(strategy=TextWindow.HEAD_TAIL, max_chars=4000)
+    assert len(window.apply(text)) == 4001
+
+
+def test_head_tail_cuts_at_whitespace():
+    text = ' '.join(f'palavra{i}' for i in range(1000))
+    window = TextWindow(strategy=TextWindow.HEAD_TAIL, max_chars=4000).apply(text)
+    head, tail = window.split('\n')
+    assert text.startswith(head) and text.endswith(tail)
+    assert set(head.split()) <= set(text.split()) and set(tail.split()) <= set(text.split())
+
+
+def test_short_text_is_unchanged():
+    assert TextWindow(max_chars=4000).apply('Preciso de ajuda com o sistema.') == 'Preciso de ajuda com o sistema.'